@@ -0,0 +1,15 @@
+# ==========================================
+# feniX-ML: Punto de entrada para `python -m app`
+# Descripción: Lanza la interfaz de línea de comandos (cli.py) sin cargar la interfaz gráfica.
+#              Los módulos de app/ se importan entre sí por nombre, así que se añade su carpeta
+#              al sys.path antes de importar la CLI.
+# ==========================================
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+sys.exit(main())
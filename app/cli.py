@@ -0,0 +1,507 @@
+# ==========================================
+# feniX-ML: Interfaz de línea de comandos (sin interfaz gráfica)
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Conversión, validación y vista previa HTML desde la terminal, pensada para
+#              servidores de compilación e integración continua. Solo importa tei_backend
+#              (nunca tkinter ni customtkinter) y lo hace de forma diferida, de modo que
+#              `--help` arranca sin cargar python-docx ni lxml.
+# Uso: python -m app {convert,validate,preview-html} PRINCIPAL.docx [opciones]
+#      python -m app convert PRINCIPAL.docx --validate [--fail-fast] -o SALIDA.xml
+#      python -m app site CARPETA -o SITIO [--header-mode minimo]
+#      Con --index BASE.sqlite, convert y site además indexan las ediciones en SQLite
+#      (versos, parlamentos, estrofas, notas y aparato; ver edition_index.py).
+#      python -m app validate-corpus CARPETA [--processes N] [--report-json R.json] [--report-html R.html]
+#      python -m app daemon [--port 8765] [--workers 2]
+#      Con --profile CARPETA (o FENIXML_PROFILE=CARPETA) cada conversión o validación
+#      deja un perfil .prof, pilas .collapsed y metadatos .json (ver profiling.py).
+# ==========================================
+
+# --- Importaciones
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+# Códigos de salida
+EXIT_OK = 0
+EXIT_VALIDATION_FAILED = 1
+EXIT_ERROR = 2
+
+
+# --- Carga diferida del backend
+def load_backend():
+    """
+    Importa tei_backend bajo demanda y devuelve (módulo, segundos de importación).
+    """
+    start = time.perf_counter()
+    import tei_backend
+    return tei_backend, time.perf_counter() - start
+
+
+def index_into(args, editions, timings: dict) -> Optional[dict]:
+    """
+    Con --index, guarda las ediciones (pares (DOCX principal, TEI)) en la base SQLite.
+    """
+    if not args.index:
+        return None
+    from edition_index import edition_source, index_editions
+
+    start = time.perf_counter()
+    counts = index_editions(args.index, [(edition_source(main_docx), tei) for main_docx, tei in editions])
+    timings["index_seconds"] = time.perf_counter() - start
+    return {"database": args.index, **counts}
+
+
+def emit_json(payload: dict) -> None:
+    json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+def write_text(text: str, output_path) -> None:
+    """
+    Escribe `text` en `output_path` o, si no se indica, en la salida estándar.
+    """
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+        if not text.endswith("\n"):
+            sys.stdout.write("\n")
+
+
+def convert_from_args(backend, args) -> str:
+    # El backend escribe advertencias con print(); se desvían a stderr para que
+    # stdout quede limpio (XML, HTML o JSON)
+    with contextlib.redirect_stdout(sys.stderr):
+        return backend.convert_docx_to_tei(
+            main_docx=args.main_docx,
+            notas_docx=args.notas,
+            aparato_docx=args.aparato,
+            metadata_docx=args.metadatos,
+            save=False,
+            header_mode=args.header_mode,
+        )
+
+
+# --- Subcomandos
+def run_convert(args, timings: dict) -> tuple[int, dict]:
+    backend, timings["import_seconds"] = load_backend()
+    if args.validate or args.fail_fast or args.checks:
+        return run_validated_convert(backend, args, timings)
+
+    start = time.perf_counter()
+    tei_content = convert_from_args(backend, args)
+    timings["convert_seconds"] = time.perf_counter() - start
+
+    write_text(tei_content, args.output)
+    return EXIT_OK, {
+        "main_docx": args.main_docx,
+        "output": args.output,
+        "bytes": len(tei_content.encode("utf-8")),
+        "index": index_into(args, [(args.main_docx, tei_content)], timings),
+    }
+
+
+def run_validated_convert(backend, args, timings: dict) -> tuple[int, dict]:
+    """
+    convert --validate: valida y convierte en una sola pasada (validate_and_convert).
+    Con --fail-fast no se escribe nada si hay errores. Termina con código 1 si hay errores,
+    también los que solo aparecen al generar (xml:id duplicados, who sin destino).
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        result = backend.validate_and_convert(
+            main_docx=args.main_docx,
+            notas_docx=args.notas,
+            aparato_docx=args.aparato,
+            metadata_docx=args.metadatos,
+            header_mode=args.header_mode,
+            fail_fast=args.fail_fast,
+            checks=args.checks,
+        )
+    timings["validate_convert_seconds"] = time.perf_counter() - start
+
+    messages = backend.render_findings(result.findings)
+    counts = backend.count_findings_by_severity(result.findings)
+    if not args.json:
+        for message in messages:
+            print(message, file=sys.stderr)
+    index = None
+    if result.tei is not None:
+        write_text(result.tei, args.output)
+        index = index_into(args, [(args.main_docx, result.tei)], timings)
+
+    return EXIT_VALIDATION_FAILED if counts["error"] else EXIT_OK, {
+        "main_docx": args.main_docx,
+        "output": args.output if result.tei is not None else None,
+        "bytes": len(result.tei.encode("utf-8")) if result.tei is not None else 0,
+        "converted": result.tei is not None,
+        "index": index,
+        "errors": counts["error"],
+        "warnings": counts["warning"],
+        "findings": [finding.to_dict() for finding in result.findings],
+        "messages": messages,
+    }
+
+
+def run_validate(args, timings: dict) -> tuple[int, dict]:
+    backend, timings["import_seconds"] = load_backend()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        run = backend.run_validators(args.main_docx, args.aparato, args.notas, checks=args.checks)
+    timings["validate_seconds"] = time.perf_counter() - start
+    timings["prepare_seconds"] = run.prepare_seconds
+    timings["check_seconds"] = run.check_seconds
+    findings = run.findings
+
+    messages = backend.render_findings(findings)
+    counts = backend.count_findings_by_severity(findings)
+    failed = counts["error"] > 0 or (args.strict and counts["warning"] > 0)
+
+    if args.export:
+        if args.export.lower().endswith(".csv"):
+            backend.export_findings_csv(findings, args.export)
+        else:
+            backend.export_findings_json(findings, args.export)
+
+    if not args.json:
+        for message in messages:
+            print(message)
+        if not messages:
+            print("✅ Validación completada sin avisos.")
+
+    return EXIT_VALIDATION_FAILED if failed else EXIT_OK, {
+        "main_docx": args.main_docx,
+        "notas_docx": args.notas,
+        "aparato_docx": args.aparato,
+        "errors": counts["error"],
+        "warnings": counts["warning"],
+        "findings": [finding.to_dict() for finding in findings],
+        "messages": messages,
+    }
+
+
+def run_preview_html(args, timings: dict) -> tuple[int, dict]:
+    backend, timings["import_seconds"] = load_backend()
+    from preview_html import build_preview_html, build_static_html, write_split_preview
+
+    start = time.perf_counter()
+    tei_content = convert_from_args(backend, args)
+    timings["convert_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if args.split:
+        written = write_split_preview(tei_content, args.output)
+        timings["render_seconds"] = time.perf_counter() - start
+        return EXIT_OK, {
+            "main_docx": args.main_docx,
+            "output": args.output,
+            "fragments": written[1:],
+            "bytes": sum(os.path.getsize(path) for path in written),
+        }
+
+    html_content = build_static_html(tei_content) if args.static else build_preview_html(tei_content)
+    timings["render_seconds"] = time.perf_counter() - start
+
+    write_text(html_content, args.output)
+    return EXIT_OK, {
+        "main_docx": args.main_docx,
+        "output": args.output,
+        "bytes": len(html_content.encode("utf-8")),
+    }
+
+
+def run_site(args, timings: dict) -> tuple[int, dict]:
+    """
+    Convierte todos los bundles de una carpeta y los publica como sitio HTML estático.
+    """
+    backend, timings["import_seconds"] = load_backend()
+    from corpus import discover_play_bundles
+    from preview_html import publish_static_site
+
+    bundles = discover_play_bundles(args.root)
+    pages = []
+    indexed = []
+    failures = []
+    used_slugs: set[str] = set()
+    start = time.perf_counter()
+    for bundle in bundles:
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                tei_content = backend.convert_docx_to_tei(
+                    main_docx=bundle.main_docx,
+                    notas_docx=bundle.notas_docx,
+                    aparato_docx=bundle.aparato_docx,
+                    metadata_docx=bundle.metadata_docx,
+                    save=False,
+                    header_mode=args.header_mode,
+                )
+        except (OSError, ValueError, RuntimeError) as e:
+            failures.append({"main_docx": bundle.main_docx, "error": str(e)})
+            if not args.json:
+                print(f"❌ {bundle.name}: {e}", file=sys.stderr)
+            continue
+
+        relative = os.path.splitext(os.path.relpath(bundle.main_docx, args.root))[0]
+        slug = base_slug = backend.normalize_id(relative) or "edicion"
+        suffix = 2
+        while slug in used_slugs:
+            slug = f"{base_slug}_{suffix}"
+            suffix += 1
+        used_slugs.add(slug)
+        pages.append((slug, tei_content))
+        indexed.append((bundle.main_docx, tei_content))
+    timings["convert_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    written = publish_static_site(pages, args.output)
+    timings["render_seconds"] = time.perf_counter() - start
+    index = index_into(args, indexed, timings)
+
+    if not args.json:
+        print(f"✅ {len(pages)} ediciones publicadas en {args.output}")
+    return EXIT_ERROR if failures or not pages else EXIT_OK, {
+        "root": args.root,
+        "output": args.output,
+        "pages": written,
+        "failures": failures,
+        "index": index,
+    }
+
+
+def run_validate_corpus(args, timings: dict) -> tuple[int, dict]:
+    """
+    Valida todos los bundles de una carpeta en paralelo y escribe el informe agregado.
+    """
+    _, timings["import_seconds"] = load_backend()
+    from corpus_validation import corpus_failed, validate_corpus, write_report_html, write_report_json
+
+    with contextlib.redirect_stdout(sys.stderr):
+        report = validate_corpus(args.root, args.processes)
+    timings["validate_seconds"] = report["timings"]["wall_seconds"]
+    timings["plays_validate_seconds"] = report["timings"]["validate_seconds"]
+    timings["processes"] = report["timings"]["processes"]
+
+    if args.report_json:
+        write_report_json(report, args.report_json)
+    if args.report_html:
+        write_report_html(report, args.report_html)
+
+    summary = report["summary"]
+    if not args.json:
+        for play in report["plays"]:
+            if play["failure"]:
+                print(f"❌ {play['name']}: {play['failure']}")
+            elif play["errors"] or play["warnings"]:
+                print(f"{'❌' if play['errors'] else '⚠️'} {play['name']}: "
+                      f"{play['errors']} errores, {play['warnings']} advertencias")
+        print(f"{summary['plays']} comedias validadas en {report['timings']['wall_seconds']:.1f} s: "
+              f"{summary['errors']} errores, {summary['warnings']} advertencias.")
+
+    failed = corpus_failed(report, args.strict)
+    result = {key: value for key, value in report.items() if key not in ("plays", "timings")}
+    result["plays"] = [
+        {key: value for key, value in play.items() if key not in ("findings", "messages")}
+        for play in report["plays"]
+    ]
+    result["report_json"] = args.report_json
+    result["report_html"] = args.report_html
+    return EXIT_VALIDATION_FAILED if failed else EXIT_OK, result
+
+
+# --- Argumentos
+def add_input_arguments(parser: argparse.ArgumentParser, with_metadata: bool = True) -> None:
+    parser.add_argument("main_docx", help="DOCX con el prólogo y la comedia")
+    parser.add_argument("--notas", help="DOCX de notas filológicas")
+    parser.add_argument("--aparato", help="DOCX de aparato crítico")
+    if with_metadata:
+        parser.add_argument("--metadatos", help="DOCX de metadatos para el teiHeader")
+        parser.add_argument(
+            "--header-mode", choices=("prolope", "minimo"), default="prolope",
+            help="Tipo de teiHeader (por defecto: prolope)",
+        )
+    parser.add_argument("--json", action="store_true", help="Emitir resultados y tiempos en JSON por stdout")
+    add_profile_argument(parser)
+
+
+def check_list(value: str) -> list[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def add_checks_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--checks", metavar="LISTA", type=check_list, default=None,
+        help="Comprobaciones separadas por comas (estilos, texto_principal, aparato, notas, "
+             "versos_partidos, lagunas, corchetes) o un preajuste: fast (solo el DOCX "
+             "principal, p. ej. antes de guardar) o full (todas, por defecto)",
+    )
+
+
+def add_index_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--index", metavar="BASE",
+        help="Indexar también las ediciones en esta base SQLite (se crea si no existe)",
+    )
+
+
+def add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile", metavar="CARPETA",
+        help="Perfilar conversión y validación y guardar .prof, .collapsed y .json en CARPETA",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="fenixml",
+        description="feniX-ML: conversión de ediciones teatrales DOCX a TEI/XML sin interfaz gráfica.",
+    )
+    parser.add_argument("--version", action="store_true", help="Mostrar la versión y salir")
+    subparsers = parser.add_subparsers(dest="command")
+
+    convert_parser = subparsers.add_parser("convert", help="Convertir DOCX a TEI/XML")
+    add_input_arguments(convert_parser)
+    convert_parser.add_argument("-o", "--output", help="Archivo XML de salida (por defecto: stdout)")
+    add_index_argument(convert_parser)
+    convert_parser.add_argument(
+        "--validate", action="store_true",
+        help="Validar en la misma pasada: hallazgos por stderr (o en el JSON) y código 1 si hay errores",
+    )
+    convert_parser.add_argument(
+        "--fail-fast", action="store_true",
+        help="Con errores de validación no convertir ni escribir la salida (implica --validate)",
+    )
+    add_checks_argument(convert_parser)
+    convert_parser.set_defaults(handler=run_convert)
+
+    validate_parser = subparsers.add_parser("validate", help="Validar los DOCX sin convertir")
+    add_input_arguments(validate_parser, with_metadata=False)
+    add_checks_argument(validate_parser)
+    validate_parser.add_argument(
+        "--strict", action="store_true",
+        help="Terminar con código 1 también cuando solo haya advertencias",
+    )
+    validate_parser.add_argument(
+        "--export", metavar="RUTA",
+        help="Guardar los hallazgos en un archivo .json o .csv",
+    )
+    validate_parser.set_defaults(handler=run_validate)
+
+    preview_parser = subparsers.add_parser("preview-html", help="Generar la vista previa HTML (CETEIcean)")
+    add_input_arguments(preview_parser)
+    preview_parser.add_argument("-o", "--output", help="Archivo HTML de salida (por defecto: stdout)")
+    preview_mode = preview_parser.add_mutually_exclusive_group()
+    preview_mode.add_argument(
+        "--static", action="store_true",
+        help="Renderizar el TEI en Python (XSLT) en lugar de con CETEIcean en el navegador",
+    )
+    preview_mode.add_argument(
+        "--split", action="store_true",
+        help="Escribir teiHeader, prólogo y cada acto como fragmentos que se cargan bajo demanda (requiere -o)",
+    )
+    preview_parser.set_defaults(handler=run_preview_html)
+
+    site_parser = subparsers.add_parser("site", help="Publicar una carpeta de ediciones como sitio HTML estático")
+    site_parser.add_argument("root", help="Carpeta con los bundles DOCX (se recorre recursivamente)")
+    site_parser.add_argument("-o", "--output", required=True, help="Carpeta de destino del sitio")
+    site_parser.add_argument(
+        "--header-mode", choices=("prolope", "minimo"), default="prolope",
+        help="Tipo de teiHeader (por defecto: prolope)",
+    )
+    site_parser.add_argument("--json", action="store_true", help="Emitir resultados y tiempos en JSON por stdout")
+    add_index_argument(site_parser)
+    add_profile_argument(site_parser)
+    site_parser.set_defaults(handler=run_site)
+
+    corpus_parser = subparsers.add_parser(
+        "validate-corpus", help="Validar en paralelo todas las ediciones de una carpeta",
+    )
+    corpus_parser.add_argument("root", help="Carpeta con los bundles DOCX (se recorre recursivamente)")
+    corpus_parser.add_argument(
+        "--processes", type=int,
+        help="Procesos de validación simultáneos (por defecto: núcleos disponibles)",
+    )
+    corpus_parser.add_argument("--report-json", metavar="RUTA", help="Guardar el informe agregado en JSON")
+    corpus_parser.add_argument("--report-html", metavar="RUTA", help="Guardar el informe agregado como página HTML")
+    corpus_parser.add_argument(
+        "--strict", action="store_true",
+        help="Terminar con código 1 también cuando solo haya advertencias",
+    )
+    corpus_parser.add_argument("--json", action="store_true", help="Emitir resultados y tiempos en JSON por stdout")
+    add_profile_argument(corpus_parser)
+    corpus_parser.set_defaults(handler=run_validate_corpus)
+
+    daemon_parser = subparsers.add_parser("daemon", help="Servicio local que mantiene el backend cargado")
+    daemon_parser.add_argument("--host", default="127.0.0.1", help="Interfaz de escucha (por defecto: 127.0.0.1)")
+    daemon_parser.add_argument("--port", type=int, default=8765, help="Puerto HTTP (por defecto: 8765)")
+    daemon_parser.add_argument("--workers", type=int, default=2, help="Trabajos simultáneos (por defecto: 2)")
+    daemon_parser.add_argument(
+        "--max-pending", type=int, default=16,
+        help="Trabajos en cola o en curso antes de rechazar peticiones (por defecto: 16)",
+    )
+
+    return parser
+
+
+# --- Punto de entrada
+def main(argv=None) -> int:
+    """
+    Ejecuta la CLI y devuelve el código de salida:
+    0 si todo fue bien, 1 si la validación encontró errores, 2 ante fallos de uso o E/S.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.version:
+        backend, _ = load_backend()
+        print(f"feniX-ML {backend.APP_VERSION}")
+        return EXIT_OK
+    if args.command is None:
+        parser.error("falta el subcomando (convert, validate, validate-corpus, preview-html, site o daemon)")
+    if args.command == "daemon":
+        from daemon import serve
+        serve(args.host, args.port, args.workers, args.max_pending)
+        return EXIT_OK
+
+    # Los archivos que faltan son un fallo de uso, no un resultado de validación
+    input_paths = [getattr(args, name, None) for name in ("main_docx", "notas", "aparato", "metadatos", "root")]
+    for path in input_paths:
+        if path and not os.path.exists(path):
+            print(f"❌ No existe el archivo: {path}", file=sys.stderr)
+            return EXIT_ERROR
+
+    # Con --json el documento tiene que ir a un archivo: stdout queda para el JSON
+    if args.command not in ("validate", "validate-corpus") and args.json and not args.output:
+        parser.error("--json requiere --output")
+    if getattr(args, "split", False) and not args.output:
+        parser.error("--split requiere --output")
+
+    import profiling
+    if args.profile:
+        profiling.set_profile_directory(args.profile)
+
+    timings: dict = {}
+    start = time.perf_counter()
+    try:
+        exit_code, result = args.handler(args, timings)
+    except (OSError, ValueError, RuntimeError) as e:
+        exit_code, result = EXIT_ERROR, {"error": str(e)}
+        if not args.json:
+            print(f"❌ {e}", file=sys.stderr)
+    timings["total_seconds"] = time.perf_counter() - start
+    if profiling.written_profiles:
+        result = {**result, "profiles": list(profiling.written_profiles)}
+
+    if args.json:
+        emit_json({"command": args.command, "ok": exit_code == EXIT_OK, **result, "timings": timings})
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# ==========================================
+# feniX-ML: Localización de ediciones (bundles DOCX) en un árbol de carpetas
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Agrupa los DOCX de cada comedia (prólogo y comedia, notas, aparato y
+#              metadatos) para procesos por lotes, pruebas de regresión y benchmarks.
+# ==========================================
+
+import os
+from typing import NamedTuple, Optional
+
+from tei_backend import normalize_text_for_matching
+
+
+class PlayBundle(NamedTuple):
+    main_docx: str
+    notas_docx: Optional[str] = None
+    aparato_docx: Optional[str] = None
+    metadata_docx: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """
+        Nombre legible del bundle: carpeta de la comedia + archivo principal.
+        """
+        folder = os.path.basename(os.path.dirname(self.main_docx))
+        return f"{folder}/{os.path.basename(self.main_docx)}"
+
+
+def classify_docx_filename(filename: str) -> Optional[str]:
+    """
+    Clasifica un DOCX por su nombre: "main", "notas", "aparato", "metadata" o None.
+    """
+    if filename.startswith("~$") or not filename.lower().endswith(".docx"):
+        return None
+    normalized = normalize_text_for_matching(os.path.splitext(filename)[0])
+    compact = normalized.replace(" ", "")
+    if "prologoycomedia" in compact:
+        return "main"
+    if "metadatos" in compact:
+        return "metadata"
+    if "aparato" in compact:
+        return "aparato"
+    if "notas" in compact:
+        return "notas"
+    return None
+
+
+def discover_play_bundles(root: str) -> list[PlayBundle]:
+    """
+    Recorre un árbol de carpetas y devuelve un bundle por cada DOCX principal.
+    Notas, aparato y metadatos se toman de la misma carpeta que el principal.
+    """
+    bundles: list[PlayBundle] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        by_kind: dict[str, list[str]] = {}
+        for filename in sorted(filenames):
+            kind = classify_docx_filename(filename)
+            if kind:
+                by_kind.setdefault(kind, []).append(os.path.join(dirpath, filename))
+
+        def first(kind):
+            paths = by_kind.get(kind)
+            return paths[0] if paths else None
+
+        for main_docx in by_kind.get("main", []):
+            bundles.append(PlayBundle(main_docx, first("notas"), first("aparato"), first("metadata")))
+    return bundles
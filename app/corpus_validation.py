@@ -0,0 +1,212 @@
+# ==========================================
+# feniX-ML: Validación por lotes de un corpus de ediciones
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Valida todas las ediciones (bundles DOCX) de un árbol de carpetas en un
+#              grupo de procesos y reúne los resultados en un único informe con recuentos
+#              por comedia y por categoría de hallazgo y los tiempos de cada validación.
+#              El informe se guarda como JSON y como página HTML estática.
+# Uso: python -m app validate-corpus CARPETA [--processes N] [--report-json informe.json]
+#                                            [--report-html informe.html]
+# ==========================================
+
+# --- Importaciones
+import html
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from corpus import PlayBundle, discover_play_bundles
+from profiling import get_profile_directory, set_profile_directory
+
+
+# --- Validación de un bundle (se ejecuta en el proceso de trabajo)
+def validate_bundle(bundle: PlayBundle) -> dict:
+    """
+    Valida un bundle y devuelve su entrada del informe. Un fallo al leer los DOCX
+    no detiene el lote: queda en "failure" y la comedia cuenta como no validada.
+    """
+    import tei_backend
+
+    entry = {
+        "name": bundle.name,
+        "main_docx": bundle.main_docx,
+        "notas_docx": bundle.notas_docx,
+        "aparato_docx": bundle.aparato_docx,
+        "failure": None,
+        "findings": [],
+        "messages": [],
+        "errors": 0,
+        "warnings": 0,
+        "categories": {},
+    }
+    start = time.perf_counter()
+    try:
+        findings = tei_backend.collect_validation_findings(bundle.main_docx, bundle.aparato_docx, bundle.notas_docx)
+    except Exception as e:
+        entry["failure"] = str(e) or type(e).__name__
+        findings = []
+    entry["seconds"] = time.perf_counter() - start
+
+    counts = tei_backend.count_findings_by_severity(findings)
+    entry["errors"], entry["warnings"] = counts["error"], counts["warning"]
+    for finding in findings:
+        entry["categories"][finding.category] = entry["categories"].get(finding.category, 0) + 1
+    entry["findings"] = [finding.to_dict() for finding in findings]
+    entry["messages"] = tei_backend.render_findings(findings)
+    return entry
+
+
+# --- Lote completo
+def validate_corpus(root: str, processes: Optional[int] = None) -> dict:
+    """
+    Valida todos los bundles de `root` y devuelve el informe agregado.
+    Con processes=1 se valida en este mismo proceso (útil para depurar).
+    """
+    bundles = discover_play_bundles(root)
+    processes = max(1, min(processes or os.cpu_count() or 1, len(bundles) or 1))
+
+    start = time.perf_counter()
+    if processes == 1:
+        plays = [validate_bundle(bundle) for bundle in bundles]
+    else:
+        # "spawn" como en gui_worker: mismo comportamiento en Windows, macOS y Linux
+        context = multiprocessing.get_context("spawn")
+        # --profile se fija en este proceso: los de trabajo lo reciben al arrancar
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=context,
+            initializer=set_profile_directory, initargs=(get_profile_directory(),),
+        ) as executor:
+            # map conserva el orden de descubrimiento aunque terminen en otro orden
+            plays = list(executor.map(validate_bundle, bundles))
+    wall_seconds = time.perf_counter() - start
+
+    return build_corpus_report(root, plays, processes, wall_seconds)
+
+
+def build_corpus_report(root: str, plays: list[dict], processes: int, wall_seconds: float) -> dict:
+    categories: dict[str, dict[str, int]] = {}
+    for play in plays:
+        for finding in play["findings"]:
+            counts = categories.setdefault(finding["category"], {"error": 0, "warning": 0, "plays": 0})
+            counts[finding["severity"]] = counts.get(finding["severity"], 0) + 1
+        for category in play["categories"]:
+            categories[category]["plays"] += 1
+
+    return {
+        "root": root,
+        "generated": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        "summary": {
+            "plays": len(plays),
+            "plays_with_errors": sum(1 for play in plays if play["errors"]),
+            "plays_with_warnings": sum(1 for play in plays if play["warnings"] and not play["errors"]),
+            "failures": sum(1 for play in plays if play["failure"]),
+            "errors": sum(play["errors"] for play in plays),
+            "warnings": sum(play["warnings"] for play in plays),
+        },
+        "categories": dict(sorted(categories.items())),
+        "timings": {
+            "processes": processes,
+            "wall_seconds": wall_seconds,
+            "validate_seconds": sum(play["seconds"] for play in plays),
+            "slowest": max(plays, key=lambda play: play["seconds"])["name"] if plays else None,
+        },
+        "plays": plays,
+    }
+
+
+def corpus_failed(report: dict, strict: bool = False) -> bool:
+    summary = report["summary"]
+    return bool(summary["errors"] or summary["failures"] or (strict and summary["warnings"]))
+
+
+# --- Informes
+def write_report_json(report: dict, path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def play_status(play: dict) -> tuple[str, str]:
+    if play["failure"]:
+        return "failure", "No validada"
+    if play["errors"]:
+        return "error", "Errores"
+    if play["warnings"]:
+        return "warning", "Advertencias"
+    return "ok", "Correcta"
+
+
+def render_report_html(report: dict) -> str:
+    """
+    Página HTML autónoma (sin JavaScript ni recursos externos) con el resumen, la tabla
+    de categorías y una fila por comedia; los avisos de cada una se despliegan con <details>.
+    """
+    e = html.escape
+    summary = report["summary"]
+    timings = report["timings"]
+
+    category_rows = "\n".join(
+        f"        <tr><td>{e(name)}</td><td>{counts['error']}</td><td>{counts['warning']}</td>"
+        f"<td>{counts['plays']}</td></tr>"
+        for name, counts in report["categories"].items()
+    )
+
+    play_rows = []
+    for play in report["plays"]:
+        status, label = play_status(play)
+        categories = ", ".join(f"{e(name)} ({count})" for name, count in sorted(play["categories"].items()))
+        details = e(play["failure"]) if play["failure"] else "<br>".join(e(message) for message in play["messages"])
+        detail_cell = f"<details><summary>{label}</summary>{details}</details>" if details else label
+        play_rows.append(
+            f'        <tr class="{status}"><td>{e(play["name"])}</td><td>{detail_cell}</td>'
+            f'<td>{play["errors"]}</td><td>{play["warnings"]}</td><td>{categories}</td>'
+            f'<td>{play["seconds"]:.2f}</td></tr>'
+        )
+
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <title>Validación del corpus</title>
+    <style>
+        body {{ font-family: "Segoe UI", sans-serif; margin: 2em; color: #142a40; }}
+        table {{ border-collapse: collapse; margin-bottom: 2em; }}
+        th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }}
+        th {{ background: #2b5988; color: #fff; }}
+        tr.error td:first-child {{ border-left: 6px solid #c0392b; }}
+        tr.failure td:first-child {{ border-left: 6px solid #6c757d; }}
+        tr.warning td:first-child {{ border-left: 6px solid #e0a800; }}
+        tr.ok td:first-child {{ border-left: 6px solid #2e8b57; }}
+        details {{ max-width: 60em; white-space: pre-wrap; }}
+    </style>
+</head>
+<body>
+    <h1>Validación del corpus</h1>
+    <p>{e(report["root"])} · {e(report["generated"])}</p>
+    <p>{summary["plays"]} comedias: {summary["plays_with_errors"]} con errores,
+       {summary["plays_with_warnings"]} solo con advertencias, {summary["failures"]} no validadas.
+       {summary["errors"]} errores y {summary["warnings"]} advertencias en total.</p>
+    <p>Tiempo: {timings["wall_seconds"]:.1f} s con {timings["processes"]} procesos
+       ({timings["validate_seconds"]:.1f} s de validación sumando todas las comedias).</p>
+    <h2>Por categoría</h2>
+    <table>
+        <tr><th>Categoría</th><th>Errores</th><th>Advertencias</th><th>Comedias</th></tr>
+{category_rows}
+    </table>
+    <h2>Por comedia</h2>
+    <table>
+        <tr><th>Comedia</th><th>Estado</th><th>Errores</th><th>Advertencias</th><th>Categorías</th><th>Segundos</th></tr>
+{chr(10).join(play_rows)}
+    </table>
+</body>
+</html>
+"""
+
+
+def write_report_html(report: dict, path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_report_html(report))
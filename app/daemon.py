@@ -0,0 +1,296 @@
+# ==========================================
+# feniX-ML: Servicio de conversión de larga duración (daemon)
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Mantiene tei_backend importado y atiende trabajos de conversión y validación
+#              por HTTP en localhost, con un grupo acotado de workers, caché de entradas ya
+#              analizadas compartida entre peticiones y latencia medida por trabajo.
+#              Incluye un cliente mínimo (DaemonClient) para scripts y tests.
+# Uso: python -m app daemon [--port 8765] [--workers 2] [--max-pending 16]
+# ==========================================
+
+# --- Importaciones
+import itertools
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import tei_backend
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+# --- Trabajos
+def run_convert_job(payload: dict) -> dict:
+    """
+    Convierte un bundle. Si se indica output_file el TEI se guarda en disco y no se devuelve.
+    Incluye los hallazgos de la generación (xml:id duplicados, notas sin adjuntar...).
+    """
+    findings = []
+    tei_content = tei_backend.convert_docx_to_tei(
+        main_docx=payload["main_docx"],
+        notas_docx=payload.get("notas_docx"),
+        aparato_docx=payload.get("aparato_docx"),
+        metadata_docx=payload.get("metadata_docx"),
+        save=False,
+        header_mode=payload.get("header_mode", "prolope"),
+        findings=findings,
+    )
+    report = {
+        "findings": [finding.to_dict() for finding in findings],
+        "messages": tei_backend.render_findings(findings),
+    }
+    output_file = payload.get("output_file")
+    if output_file:
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(tei_content)
+        return {"output": output_file, "bytes": len(tei_content.encode("utf-8")), **report}
+    return {"tei": tei_content, **report}
+
+
+def run_validate_job(payload: dict) -> dict:
+    run = tei_backend.run_validators(
+        payload["main_docx"],
+        payload.get("aparato_docx"),
+        payload.get("notas_docx"),
+        checks=payload.get("checks"),
+    )
+    return {
+        "findings": [finding.to_dict() for finding in run.findings],
+        "messages": tei_backend.render_findings(run.findings),
+        "check_seconds": run.check_seconds,
+    }
+
+
+JOB_HANDLERS = {
+    "convert": run_convert_job,
+    "validate": run_validate_job,
+}
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobStats:
+    """
+    Latencias acumuladas por tipo de trabajo (número, media y máximo en segundos).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_kind: dict[str, dict] = {}
+
+    def record(self, kind: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            stats = self._by_kind.setdefault(kind, {"jobs": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["jobs"] += 1
+            stats["errors"] += 0 if ok else 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                kind: {**stats, "mean_seconds": stats["total_seconds"] / stats["jobs"]}
+                for kind, stats in self._by_kind.items()
+            }
+
+
+class ConversionService:
+    """
+    Grupo acotado de workers con cola limitada: si hay más de `max_pending` trabajos
+    pendientes o en curso, los nuevos se rechazan en lugar de acumularse.
+
+    Los workers son hilos del mismo proceso para compartir la caché de entradas y los
+    módulos ya importados; cada trabajo se ejecuta completo en un worker.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 16, cache_entries: int = 64):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache = tei_backend.ParsedInputCache(cache_entries)
+        tei_backend.set_parsed_input_cache(self.cache)
+        self.stats = JobStats()
+        self.started_at = time.time()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fenixml-worker")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._job_ids = itertools.count(1)
+
+    def submit(self, kind: str, payload: dict) -> dict:
+        """
+        Ejecuta un trabajo y devuelve su resultado con tiempos de cola y de ejecución.
+        """
+        handler = JOB_HANDLERS[kind]
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(f"Hay {self.max_pending} trabajos pendientes; reinténtalo más tarde.")
+
+        job_id = next(self._job_ids)
+        submitted = time.perf_counter()
+
+        def execute():
+            started = time.perf_counter()
+            result = handler(payload)
+            return started, result
+
+        try:
+            future = self._executor.submit(execute)
+            try:
+                started, result = future.result()
+                ok = True
+            except Exception as e:
+                started, result, ok = submitted, {"error": str(e)}, False
+        finally:
+            self._slots.release()
+
+        finished = time.perf_counter()
+        timings = {
+            "queue_seconds": started - submitted,
+            "run_seconds": finished - started,
+            "total_seconds": finished - submitted,
+        }
+        self.stats.record(kind, timings["total_seconds"], ok)
+        print(f"[job {job_id}] {kind} {payload.get('main_docx')} -> "
+              f"{'ok' if ok else 'error'} en {timings['total_seconds']:.3f} s", file=sys.stderr)
+        return {"job": job_id, "command": kind, "ok": ok, **result, "timings": timings}
+
+    def status(self) -> dict:
+        return {
+            "version": tei_backend.APP_VERSION,
+            "uptime_seconds": time.time() - self.started_at,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "cache": self.cache.stats(),
+            "jobs": self.stats.snapshot(),
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        tei_backend.set_parsed_input_cache(None)
+
+
+# --- Servidor HTTP
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    server_version = "feniXML-daemon"
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send_json(200, self.server.service.status())
+        else:
+            self._send_json(404, {"ok": False, "error": f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self):
+        kind = self.path.strip("/")
+        if kind not in JOB_HANDLERS:
+            self._send_json(404, {"ok": False, "error": f"Ruta desconocida: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict) or not payload.get("main_docx"):
+                raise ValueError("Falta 'main_docx' en la petición")
+        except ValueError as e:
+            self._send_json(400, {"ok": False, "error": str(e)})
+            return
+
+        try:
+            result = self.server.service.submit(kind, payload)
+        except QueueFullError as e:
+            self._send_json(503, {"ok": False, "error": str(e)})
+            return
+        self._send_json(200 if result["ok"] else 422, result)
+
+    def log_message(self, format, *args):
+        # Cada trabajo ya deja su propia línea con la latencia
+        pass
+
+
+class DaemonServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: ConversionService):
+        super().__init__(address, DaemonRequestHandler)
+        self.service = service
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=2, max_pending=16) -> DaemonServer:
+    """
+    Crea el servidor sin arrancarlo. Con port=0 el sistema asigna un puerto libre
+    (ver server.server_address).
+    """
+    return DaemonServer((host, port), ConversionService(workers, max_pending))
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=2, max_pending=16) -> None:
+    server = create_server(host, port, workers, max_pending)
+    bound_host, bound_port = server.server_address[:2]
+    print(f"feniX-ML daemon escuchando en http://{bound_host}:{bound_port} ({workers} workers)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+
+# --- Cliente
+class DaemonClient:
+    """
+    Cliente mínimo del daemon. Cada método devuelve el JSON de respuesta como dict,
+    también cuando el trabajo falla (ok=False).
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout: float = 600):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def _request(self, path: str, payload=None) -> dict:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            headers={"Content-Type": "application/json"},
+            method="POST" if data is not None else "GET",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            return json.loads(e.read().decode("utf-8"))
+
+    def convert(self, main_docx, notas_docx=None, aparato_docx=None, metadata_docx=None,
+                header_mode="prolope", output_file=None) -> dict:
+        return self._request("/convert", {
+            "main_docx": main_docx,
+            "notas_docx": notas_docx,
+            "aparato_docx": aparato_docx,
+            "metadata_docx": metadata_docx,
+            "header_mode": header_mode,
+            "output_file": output_file,
+        })
+
+    def validate(self, main_docx, notas_docx=None, aparato_docx=None, checks=None) -> dict:
+        return self._request("/validate", {
+            "main_docx": main_docx,
+            "notas_docx": notas_docx,
+            "aparato_docx": aparato_docx,
+            "checks": checks,
+        })
+
+    def status(self) -> dict:
+        return self._request("/status")
@@ -0,0 +1,276 @@
+# ==========================================
+# feniX-ML: Índice SQLite de las ediciones convertidas
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Exportación opcional del TEI a una base de datos SQLite local con versos,
+#              parlamentos (con su @who), cambios de estrofa (milestone), notas y aparato
+#              con su xml:id y estadísticas por acto, para consultar todo el corpus sin
+#              recorrer cada XML. Cada edición se identifica por su DOCX principal:
+#              reindexarla solo reescribe sus filas, y si el TEI no ha cambiado no se toca.
+# Uso: python -m app convert PRINCIPAL.docx -o salida.xml --index ediciones.sqlite
+#      python -m app site CARPETA -o SITIO --index ediciones.sqlite
+# Ejemplos de consulta (sqlite3 ediciones.sqlite):
+#      SELECT p.title, count(*) FROM speeches s JOIN plays p ON p.id = s.play_id
+#          WHERE NOT s.resolved GROUP BY p.id;
+#      SELECT stanza, count(*) FROM verses GROUP BY stanza;
+#      SELECT p.title, n.xml_id, n.text FROM notes n JOIN plays p ON p.id = n.play_id
+#          WHERE n.verse_number = 329;
+# ==========================================
+
+# --- Importaciones
+import hashlib
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import lxml.etree as etree
+
+TEI_NS = "http://www.tei-c.org/ns/1.0"
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    title TEXT,
+    tei_sha256 TEXT NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS acts (
+    play_id INTEGER NOT NULL REFERENCES plays(id) ON DELETE CASCADE,
+    act INTEGER NOT NULL,
+    verses INTEGER NOT NULL,
+    speeches INTEGER NOT NULL,
+    unresolved_speeches INTEGER NOT NULL,
+    stanzas INTEGER NOT NULL,
+    notes INTEGER NOT NULL,
+    apparatus INTEGER NOT NULL,
+    PRIMARY KEY (play_id, act)
+);
+CREATE TABLE IF NOT EXISTS speeches (
+    play_id INTEGER NOT NULL REFERENCES plays(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    act INTEGER,
+    who TEXT,
+    resolved INTEGER NOT NULL,
+    speaker TEXT,
+    PRIMARY KEY (play_id, seq)
+);
+CREATE TABLE IF NOT EXISTS verses (
+    play_id INTEGER NOT NULL REFERENCES plays(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    act INTEGER,
+    speech INTEGER,
+    n TEXT,
+    number INTEGER,
+    part TEXT,
+    stanza TEXT,
+    text TEXT NOT NULL,
+    PRIMARY KEY (play_id, seq)
+);
+CREATE TABLE IF NOT EXISTS milestones (
+    play_id INTEGER NOT NULL REFERENCES plays(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    act INTEGER,
+    unit TEXT,
+    type TEXT,
+    first_verse TEXT,
+    PRIMARY KEY (play_id, seq)
+);
+CREATE TABLE IF NOT EXISTS notes (
+    play_id INTEGER NOT NULL REFERENCES plays(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    act INTEGER,
+    subtype TEXT NOT NULL,
+    xml_id TEXT,
+    verse_n TEXT,
+    verse_number INTEGER,
+    text TEXT NOT NULL,
+    PRIMARY KEY (play_id, seq)
+);
+CREATE INDEX IF NOT EXISTS verses_number ON verses (number, play_id);
+CREATE INDEX IF NOT EXISTS verses_stanza ON verses (stanza);
+CREATE INDEX IF NOT EXISTS speeches_who ON speeches (who);
+CREATE INDEX IF NOT EXISTS speeches_unresolved ON speeches (play_id) WHERE NOT resolved;
+CREATE INDEX IF NOT EXISTS milestones_type ON milestones (type);
+CREATE INDEX IF NOT EXISTS notes_verse ON notes (verse_number, subtype);
+CREATE INDEX IF NOT EXISTS notes_xml_id ON notes (xml_id);
+"""
+
+
+def tei(tag: str) -> str:
+    return f"{{{TEI_NS}}}{tag}"
+
+
+# --- Extracción de filas a partir del TEI
+class EditionRows(NamedTuple):
+    title: Optional[str]
+    acts: list[tuple]
+    speeches: list[tuple]
+    verses: list[tuple]
+    milestones: list[tuple]
+    notes: list[tuple]
+
+
+def verse_number(n: Optional[str]) -> Optional[int]:
+    match = re.match(r"\d+", n or "")
+    return int(match.group()) if match else None
+
+
+def plain_text(element) -> str:
+    """
+    Texto del elemento sin el contenido de sus notas (las notas van a su propia tabla).
+    """
+    parts = [element.text or ""]
+    for child in element:
+        if child.tag != tei("note"):
+            parts.append(plain_text(child))
+        parts.append(child.tail or "")
+    return " ".join("".join(parts).split())
+
+
+def extract_edition_rows(tei_content: str) -> EditionRows:
+    """
+    Recorre el TEI una vez en orden de documento y devuelve las filas de cada tabla
+    (sin play_id). Lo que queda fuera de los actos lleva act = NULL.
+    """
+    root = etree.fromstring(tei_content.encode("utf-8"), etree.XMLParser(huge_tree=True, collect_ids=False))
+    title = root.findtext(f".//{tei('titleStmt')}/{tei('title')}")
+    roles = {role.get(XML_ID) for role in root.iter(tei("role")) if role.get(XML_ID)}
+
+    acts: dict[int, dict] = {}
+    speeches, verses, milestones, notes = [], [], [], []
+    state = {"act": None, "speech": None, "stanza": None, "verse_n": None}
+    act_ends: list = []
+
+    def count(key: str):
+        if state["act"] is not None:
+            acts[state["act"]][key] += 1
+
+    for element in root.iter(tei("div"), tei("sp"), tei("l"), tei("milestone"), tei("note")):
+        # Al salir de un acto (el siguiente elemento ya no es descendiente) se cierra
+        while act_ends and not any(ancestor is act_ends[-1] for ancestor in element.iterancestors()):
+            act_ends.pop()
+            state["act"] = None
+        tag = etree.QName(element).localname
+
+        if tag == "div":
+            if element.get("subtype") == "ACTO":
+                state["act"] = len(acts) + 1
+                acts[state["act"]] = dict.fromkeys(
+                    ("verses", "speeches", "unresolved_speeches", "stanzas", "notes", "apparatus"), 0
+                )
+                act_ends.append(element)
+        elif tag == "sp":
+            who = element.get("who")
+            resolved = bool(who) and who.lstrip("#") in roles
+            speaker = element.find(tei("speaker"))
+            state["speech"] = len(speeches)
+            speeches.append((state["speech"], state["act"], who, int(resolved),
+                             plain_text(speaker) if speaker is not None else None))
+            count("speeches")
+            if not resolved:
+                count("unresolved_speeches")
+        elif tag == "l":
+            n = element.get("n")
+            state["verse_n"] = n or state["verse_n"]
+            verses.append((len(verses), state["act"], state["speech"], n, verse_number(n),
+                           element.get("part"), state["stanza"], plain_text(element)))
+            count("verses")
+        elif tag == "milestone":
+            state["stanza"] = element.get("type")
+            following = element.getnext()
+            first_verse = following.get("n") if following is not None and following.tag == tei("l") else None
+            milestones.append((len(milestones), state["act"], element.get("unit"), element.get("type"), first_verse))
+            count("stanzas")
+        elif element.get("subtype") in ("nota", "aparato"):
+            # Notas de verso: @n; notas de palabra: el verso que las contiene (o el anterior)
+            line = next(element.iterancestors(tei("l")), None)
+            n = element.get("n") or (line.get("n") if line is not None else None)
+            if n is None and state["act"] is not None:
+                n = state["verse_n"]
+            notes.append((len(notes), state["act"], element.get("subtype"), element.get(XML_ID), n,
+                          verse_number(n), plain_text(element)))
+            count("notes" if element.get("subtype") == "nota" else "apparatus")
+
+    act_rows = [(act, *(stats[key] for key in ("verses", "speeches", "unresolved_speeches",
+                                                 "stanzas", "notes", "apparatus")))
+                for act, stats in acts.items()]
+    return EditionRows(title, act_rows, speeches, verses, milestones, notes)
+
+
+# --- Base de datos
+def connect_index(db_path) -> sqlite3.Connection:
+    """
+    Abre (o crea) la base de datos del índice con el esquema actual.
+    """
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA foreign_keys = ON")
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        connection.close()
+        raise RuntimeError(f"El índice {db_path} tiene un esquema distinto ({version}); bórrelo para regenerarlo.")
+    connection.executescript(SCHEMA)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return connection
+
+
+def index_edition(connection: sqlite3.Connection, source: str, tei_content: str) -> bool:
+    """
+    Indexa (o reindexa) una edición. `source` la identifica, normalmente la ruta del DOCX
+    principal. Si el TEI es el mismo que ya estaba indexado no se escribe nada y devuelve
+    False; si no, sustituye solo las filas de esa edición en una transacción.
+    """
+    tei_hash = hashlib.sha256(tei_content.encode("utf-8")).hexdigest()
+    row = connection.execute("SELECT id, tei_sha256 FROM plays WHERE source = ?", (source,)).fetchone()
+    if row and row[1] == tei_hash:
+        return False
+
+    rows = extract_edition_rows(tei_content)
+    with connection:
+        if row:
+            # ON DELETE CASCADE borra versos, parlamentos, notas... de esta edición
+            connection.execute("DELETE FROM plays WHERE id = ?", (row[0],))
+        play_id = connection.execute(
+            "INSERT INTO plays (source, title, tei_sha256, indexed_at) VALUES (?, ?, ?, ?)",
+            (source, rows.title, tei_hash, datetime.now().isoformat(timespec="seconds")),
+        ).lastrowid
+        for table, values in (
+            ("acts", rows.acts),
+            ("speeches", rows.speeches),
+            ("verses", rows.verses),
+            ("milestones", rows.milestones),
+            ("notes", rows.notes),
+        ):
+            if values:
+                placeholders = ", ".join("?" * (len(values[0]) + 1))
+                connection.executemany(
+                    f"INSERT INTO {table} VALUES ({placeholders})",
+                    ((play_id, *value) for value in values),
+                )
+    return True
+
+
+def index_editions(db_path, editions) -> dict:
+    """
+    Indexa varias ediciones (iterable de (source, TEI)) con una sola conexión.
+    Devuelve cuántas se escribieron y cuántas no habían cambiado.
+    """
+    counts = {"indexed": 0, "unchanged": 0}
+    try:
+        connection = connect_index(db_path)
+        try:
+            for source, tei_content in editions:
+                counts["indexed" if index_edition(connection, source, tei_content) else "unchanged"] += 1
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        raise RuntimeError(f"No se pudo escribir el índice '{db_path}': {e}")
+    return counts
+
+
+def edition_source(main_docx: str) -> str:
+    return os.path.abspath(main_docx)
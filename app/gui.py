@@ -12,10 +12,9 @@ import os
 import sys
 import tkinter as tk
 import webbrowser
+import bisect
 import ctypes
 import json
-import threading
-import traceback
 from datetime import datetime
 from typing import Callable, Optional, Any, cast
 from tkinter import filedialog, messagebox
@@ -23,10 +22,22 @@ from tkinter import filedialog, messagebox
 # Usar CustomTkinter para esquinas redondeadas verdaderas
 import customtkinter as ctk
 
-from tei_backend import APP_VERSION, convert_docx_to_tei, validate_documents, generate_filename
-from visualizacion import vista_previa_xml, vista_previa_html
+from tei_backend import (
+    APP_VERSION,
+    export_findings_csv,
+    export_findings_json,
+)
+from gui_worker import ConversionWorker
+from validation_view import ValidationResultsModel, locate_in_tei
+from visualizacion import mostrar_xml
 from utils_icon import set_windows_icon, resource_path
 
+# Intervalo (ms) con el que la ventana consulta los resultados de los procesos de trabajo
+WORKER_POLL_MS = 100
+
+# Filas de la lista de avisos del modal de validación (se reutilizan al desplazarse)
+VALIDATION_LIST_ROWS = 10
+
 # Archivo de configuración para guardar preferencias
 CONFIG_FILE = os.path.join(os.path.expanduser("~"), ".fenixml_config.json")
 
@@ -241,6 +252,27 @@ def main_gui():
     ayuda_menu.add_command(label="Documentación técnica completa", command=abrir_instrucciones)
     ayuda_menu.add_command(label="Descargar plantillas DOCX", command=abrir_plantillas)
     menubar.add_cascade(label="Ayuda", menu=ayuda_menu)
+
+    # Menú de depuración: perfilado de conversión y validación (ver profiling.py)
+    profile_var = tk.BooleanVar(value=False)
+    profile_dir = {"path": None}
+
+    def elegir_carpeta_perfiles() -> bool:
+        path = filedialog.askdirectory(title="Carpeta para los perfiles")
+        if path:
+            profile_dir["path"] = path
+        return bool(path)
+
+    def on_toggle_profile():
+        if profile_var.get() and not profile_dir["path"] and not elegir_carpeta_perfiles():
+            profile_var.set(False)
+
+    depuracion_menu = tk.Menu(menubar, tearoff=0, font=("Segoe UI", menu_font))
+    depuracion_menu.add_checkbutton(
+        label="Perfilar conversión y validación", variable=profile_var, command=on_toggle_profile
+    )
+    depuracion_menu.add_command(label="Carpeta de perfiles...", command=elegir_carpeta_perfiles)
+    menubar.add_cascade(label="Depuración", menu=depuracion_menu)
     root.config(menu=menubar)
 
     # Variable para activar/desactivar el scroll
@@ -378,38 +410,19 @@ def main_gui():
     ctk.CTkLabel(frame_output, text="Validación y vista previa",
                  font=("Segoe UI", title_font, "bold")).grid(row=0, column=0, columnspan=2, sticky="w", padx=15, pady=(12,8))
 
-    def get_validation_warning_category(warning: str) -> str:
-        """
-        Clasifica un aviso de validación para poder filtrarlo en el modal.
+    def show_validation_modal(title, message=None, has_warnings=False, findings=None, header=None):
         """
-        normalized = warning.upper()
-        if "MÚLTIPLES" in normalized and "PARA VERSO" in normalized:
-            return "Notas múltiples por verso"
-        if "MÚLTIPLES" in normalized:
-            return "Notas múltiples por palabra"
-        if "LÍNEAS SIN ESTILO" in normalized or "ESTILO NO VÁLIDO" in normalized:
-            return "Estilos"
-        if "FORMATO INCORRECTO" in normalized:
-            return "Formato de notas"
-        if "VACÍA" in normalized or "VACIA" in normalized:
-            return "Notas vacías"
-        if "VERSO" in normalized and ("PARTIDO" in normalized or "NUMERACIÓN" in normalized):
-            return "Versos partidos y numeración"
-        if "LAGUNA DETECTADA" in normalized:
-            return "Lagunas"
-        if "VERSO CON CORCHETES" in normalized:
-            return "Versos con corchetes"
-        if "NO EXISTE" in normalized or "ARCHIVO" in normalized:
-            return "Archivos"
-        return "Otros"
-
-    def show_validation_modal(title, message=None, has_warnings=False, warnings=None):
+        Muestra un modal con los resultados de la validación.
+        Los hallazgos se muestran en una lista virtual (ValidationResultsModel): solo se
+        dibujan VALIDATION_LIST_ROWS filas, que se reutilizan al desplazarse, y los filtros
+        por categoría actualizan el índice sin volver a renderizar los avisos. El aviso
+        completo de la fila seleccionada aparece debajo y se puede situar en el XML.
         """
-        Muestra un modal con scroll para mensajes largos de validación.
-        """
-        warnings = warnings or []
-        if message is None:
-            message = "\n\n".join(warnings) if warnings else ""
+        findings = findings or []
+        model = ValidationResultsModel(
+            findings, hidden=[category for category, visible in validation_filter_state.items() if not visible]
+        )
+        show_list = has_warnings and len(model.findings) > 0
 
         modal = ctk.CTkToplevel(root)
         modal.title(title)
@@ -425,7 +438,7 @@ def main_gui():
         modal.minsize(520, 300)
 
         modal.grid_columnconfigure(0, weight=1)
-        modal.grid_rowconfigure(2, weight=1)
+        modal.grid_rowconfigure(3, weight=1)
 
         status_text = "Se han encontrado incidencias" if has_warnings else "Validación completada sin incidencias"
         ctk.CTkLabel(
@@ -435,10 +448,30 @@ def main_gui():
             anchor="w"
         ).grid(row=0, column=0, sticky="ew", padx=16, pady=(14, 8))
 
-        filter_vars: dict[str, tk.BooleanVar] = {}
-        filter_frame = ctk.CTkFrame(modal, fg_color="transparent")
-        if has_warnings and warnings:
-            categories = sorted({get_validation_warning_category(warning) for warning in warnings})
+        textbox = ctk.CTkTextbox(
+            modal,
+            wrap="word",
+            font=("Segoe UI", base_font + 1),
+            activate_scrollbars=True
+        )
+        textbox.grid(row=3, column=0, sticky="nsew", padx=16, pady=6)
+
+        def show_text(text):
+            if header:
+                text = f"{header}\n\n{text}"
+            textbox.configure(state="normal")
+            textbox.delete("1.0", tk.END)
+            textbox.insert("1.0", text)
+            textbox.configure(state="disabled")
+
+        buttons_frame = ctk.CTkFrame(modal, fg_color="transparent")
+        buttons_frame.grid(row=4, column=0, sticky="e", padx=16, pady=(6, 14))
+
+        if not show_list:
+            show_text(message if message is not None else "")
+        else:
+            # --- Filtros por categoría
+            filter_frame = ctk.CTkFrame(modal, fg_color="transparent")
             filter_frame.grid(row=1, column=0, sticky="ew", padx=16, pady=(0, 6))
             filter_frame.grid_columnconfigure(0, weight=1)
 
@@ -452,57 +485,178 @@ def main_gui():
             checks_frame = ctk.CTkFrame(filter_frame, fg_color="transparent")
             checks_frame.grid(row=1, column=0, sticky="ew")
 
-            for idx, category in enumerate(categories):
-                var = tk.BooleanVar(value=validation_filter_state.get(category, True))
+            filter_vars: dict[str, tk.BooleanVar] = {}
+            for idx, category in enumerate(model.categories):
+                var = tk.BooleanVar(value=model.is_visible(category))
                 filter_vars[category] = var
                 checkbox = ctk.CTkCheckBox(
                     checks_frame,
-                    text=category,
+                    text=f"{category} ({len(model.by_category[category])})",
                     variable=var,
-                    command=lambda: refresh_validation_text(),
+                    command=lambda category=category: on_toggle_category(category),
                     font=("Segoe UI", max(10, base_font - 1))
                 )
                 checkbox.grid(row=idx // 2, column=idx % 2, sticky="w", padx=(0, 18), pady=2)
 
-        textbox = ctk.CTkTextbox(
-            modal,
-            wrap="word",
-            font=("Segoe UI", base_font + 1),
-            activate_scrollbars=True
-        )
-        textbox.grid(row=2, column=0, sticky="nsew", padx=16, pady=6)
-
-        def refresh_validation_text():
-            if warnings and filter_vars:
-                for category, var in filter_vars.items():
-                    validation_filter_state[category] = var.get()
-
-                visible_warnings = [
-                    warning
-                    for warning in warnings
-                    if filter_vars[get_validation_warning_category(warning)].get()
-                ]
-                display_message = "\n\n".join(visible_warnings)
-                if not display_message:
-                    display_message = "No hay avisos visibles con los filtros seleccionados."
-            else:
-                display_message = message
-
-            textbox.configure(state="normal")
-            textbox.delete("1.0", tk.END)
-            textbox.insert("1.0", display_message)
-            textbox.configure(state="disabled")
+            # --- Lista virtual: un conjunto fijo de etiquetas que se reetiquetan al desplazarse
+            list_frame = ctk.CTkFrame(modal)
+            list_frame.grid(row=2, column=0, sticky="ew", padx=16, pady=6)
+            list_frame.grid_columnconfigure(0, weight=1)
+            row_height = base_font * 2 + 4
+            view = {"top": 0, "selected": 0 if len(model) else None}
+
+            row_labels = []
+            for slot in range(VALIDATION_LIST_ROWS):
+                label = ctk.CTkLabel(
+                    list_frame, text="", anchor="w", height=row_height, corner_radius=6,
+                    font=("Segoe UI", base_font)
+                )
+                label.grid(row=slot, column=0, sticky="ew", padx=(6, 0))
+                label.bind("<Button-1>", lambda _event, slot=slot: select_row(view["top"] + slot))
+                row_labels.append(label)
+
+            def scroll_list(*args):
+                # Protocolo yview de Tk: ("moveto", fracción) o ("scroll", n, "units"|"pages")
+                if args[0] == "moveto":
+                    view["top"] = int(float(args[1]) * len(model))
+                elif args[0] == "scroll":
+                    step = VALIDATION_LIST_ROWS if args[2] == "pages" else 1
+                    view["top"] += int(args[1]) * step
+                draw_rows()
+
+            scrollbar = ctk.CTkScrollbar(list_frame, command=scroll_list)
+            scrollbar.grid(row=0, column=1, rowspan=VALIDATION_LIST_ROWS, sticky="ns", padx=4, pady=4)
+
+            def draw_rows():
+                total = len(model)
+                view["top"] = max(0, min(view["top"], total - VALIDATION_LIST_ROWS))
+                for slot, label in enumerate(row_labels):
+                    row = view["top"] + slot
+                    if row < total:
+                        label.configure(
+                            text=model.summary(row),
+                            fg_color=("#dbe6f2", "#2b4560") if row == view["selected"] else "transparent",
+                        )
+                    else:
+                        label.configure(text="", fg_color="transparent")
+                if total:
+                    scrollbar.set(view["top"] / total, min(1.0, (view["top"] + VALIDATION_LIST_ROWS) / total))
+                else:
+                    scrollbar.set(0.0, 1.0)
+
+            def select_row(row):
+                if not 0 <= row < len(model):
+                    return
+                view["selected"] = row
+                if row < view["top"]:
+                    view["top"] = row
+                elif row >= view["top"] + VALIDATION_LIST_ROWS:
+                    view["top"] = row - VALIDATION_LIST_ROWS + 1
+                show_text(model.details(row))
+                btn_show_in_xml.configure(state="normal")
+                draw_rows()
+
+            def show_selection():
+                if view["selected"] is None:
+                    show_text("No hay avisos visibles con los filtros seleccionados.")
+                    btn_show_in_xml.configure(state="disabled")
+                    draw_rows()
+                else:
+                    select_row(view["selected"])
+
+            def on_toggle_category(category):
+                selected = model.rows[view["selected"]] if view["selected"] is not None else None
+                model.set_category_visible(category, filter_vars[category].get())
+                validation_filter_state[category] = filter_vars[category].get()
+                if not len(model):
+                    view["selected"] = None
+                elif selected is None:
+                    view["selected"] = 0
+                else:
+                    # La fila seleccionada sigue siéndolo si su categoría continúa visible
+                    row = bisect.bisect_left(model.rows, selected)
+                    view["selected"] = min(row, len(model) - 1)
+                show_selection()
+
+            def on_wheel(event):
+                units = -1 if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0 else 1
+                scroll_list("scroll", units * 3, "units")
+
+            for widget in (list_frame, *row_labels):
+                widget.bind("<MouseWheel>", on_wheel)
+                widget.bind("<Button-4>", on_wheel)
+                widget.bind("<Button-5>", on_wheel)
+            modal.bind("<Up>", lambda _event: select_row((view["selected"] or 0) - 1))
+            modal.bind("<Down>", lambda _event: select_row((view["selected"] or 0) + 1))
+
+            def show_in_xml():
+                """
+                Abre la vista previa del XML situada en el verso o el texto del aviso
+                seleccionado. Si las entradas no han cambiado se reutiliza la conversión.
+                """
+                if view["selected"] is None:
+                    return
+                finding = model.finding(view["selected"])
+
+                def open_preview(tei_content):
+                    position = locate_in_tei(tei_content, finding)
+                    if position is None:
+                        messagebox.showinfo(
+                            "Vista previa",
+                            "No se ha podido situar este aviso en el XML; se muestra desde el principio."
+                        )
+                    mostrar_xml(root, tei_content, position)
+
+                # La vista previa es otra ventana: el modal deja de capturar la entrada
+                modal.grab_release()
+                run_job("preview_xml", bundle_payload(), "Generando vista previa XML...", open_preview)
+
+            btn_show_in_xml = ctk.CTkButton(
+                buttons_frame,
+                text="Mostrar en el XML",
+                command=show_in_xml,
+                width=150,
+                corner_radius=12,
+                font=("Segoe UI", button_font)
+            )
+            btn_show_in_xml.grid(row=0, column=0, padx=(0, 8))
 
-        refresh_validation_text()
+            show_selection()
 
+        def export_findings():
+            path = filedialog.asksaveasfilename(
+                parent=modal,
+                title="Exportar avisos de validación",
+                defaultextension=".csv",
+                filetypes=[("CSV", "*.csv"), ("JSON", "*.json")],
+            )
+            if not path:
+                return
+            try:
+                if path.lower().endswith(".json"):
+                    export_findings_json(findings, path)
+                else:
+                    export_findings_csv(findings, path)
+            except OSError as e:
+                messagebox.showerror("Error", f"No se pudo exportar el informe:\n{e}", parent=modal)
+
+        if findings:
+            ctk.CTkButton(
+                buttons_frame,
+                text="Exportar…",
+                command=export_findings,
+                width=110,
+                corner_radius=12,
+                font=("Segoe UI", button_font)
+            ).grid(row=0, column=1, padx=(0, 8))
         ctk.CTkButton(
-            modal,
+            buttons_frame,
             text="Cerrar",
             command=modal.destroy,
             width=110,
             corner_radius=12,
             font=("Segoe UI", button_font)
-        ).grid(row=3, column=0, sticky="e", padx=16, pady=(6, 14))
+        ).grid(row=0, column=2)
 
         modal.bind("<Escape>", lambda _event: modal.destroy())
         modal.focus_force()
@@ -518,6 +672,19 @@ def main_gui():
         btn_validar.grid_configure(column=0, columnspan=1, padx=(15, 5))
         btn_ver_ultima_validacion.grid(row=1, column=1, padx=(5, 15), pady=(5,5), sticky="ew")
 
+    def bundle_payload():
+        """
+        Rutas seleccionadas y modo de encabezado, tal como los recibe el proceso de trabajo.
+        """
+        return {
+            "main_docx": entry_main.get(),
+            "notas_docx": entry_com.get() or None,
+            "aparato_docx": entry_apa.get() or None,
+            "metadata_docx": entry_meta.get() or None,
+            "header_mode": header_mode_var.get(),
+            "profile_dir": profile_dir["path"] if profile_var.get() else None,
+        }
+
     def on_validar():
         """
         Ejecuta la validación de los archivos seleccionados y muestra los avisos encontrados.
@@ -526,31 +693,23 @@ def main_gui():
             messagebox.showwarning("Validación", "Debe seleccionar un archivo principal.")
             return
 
-        def do_validation():
-            return validate_documents(
-                entry_main.get(),
-                notas_docx=entry_com.get() or None,
-                aparato_docx=entry_apa.get() or None
-            )
-
-        def on_success(avisos):
-            if avisos:
-                mensaje = "\n\n".join(avisos)
+        def on_success(findings):
+            if findings:
                 last_validation_result.clear()
                 last_validation_result.update({
-                    "message": mensaje,
-                    "warnings": avisos,
+                    "message": None,
+                    "findings": findings,
                     "has_warnings": True,
                     "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
                 })
                 show_last_validation_button()
-                show_validation_modal("Validación", has_warnings=True, warnings=avisos)
+                show_validation_modal("Validación", has_warnings=True, findings=findings)
             else:
                 mensaje = "No se han detectado incidencias."
                 last_validation_result.clear()
                 last_validation_result.update({
                     "message": mensaje,
-                    "warnings": [],
+                    "findings": [],
                     "has_warnings": False,
                     "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
                 })
@@ -560,7 +719,7 @@ def main_gui():
         def on_error(e):
             messagebox.showerror("Error", f"Error durante la validación:\n{str(e)}")
 
-        run_with_progress(do_validation, "Validando documentos...", on_success, on_error)
+        run_job("validate", bundle_payload(), "Validando documentos...", on_success, on_error)
 
     def on_ver_ultima_validacion():
         """
@@ -571,17 +730,12 @@ def main_gui():
             return
 
         timestamp = last_validation_result.get("timestamp")
-        message = last_validation_result.get("message", "")
-        warnings = last_validation_result.get("warnings", [])
-        if timestamp:
-            message = f"Validación guardada: {timestamp}\n\n{message}"
-            if warnings:
-                warnings = [f"Validación guardada: {timestamp}\n\n{warnings[0]}"] + list(warnings[1:])
         show_validation_modal(
             "Última validación",
-            message,
+            last_validation_result.get("message"),
             has_warnings=bool(last_validation_result.get("has_warnings")),
-            warnings=warnings
+            findings=last_validation_result.get("findings", []),
+            header=f"Validación guardada: {timestamp}" if timestamp else None,
         )
 
     # Botones de validación y vista previa
@@ -614,11 +768,8 @@ def main_gui():
             messagebox.showwarning("Vista previa", "Debe seleccionar un archivo principal.")
             return
         
-        def do_preview():
-            vista_previa_xml(entry_main, entry_com, entry_apa, entry_meta, root, header_mode_var.get())
-            return None
-        
-        run_with_progress(do_preview, "Generando vista previa XML...")
+        run_job("preview_xml", bundle_payload(), "Generando vista previa XML...",
+                lambda tei_content: mostrar_xml(root, tei_content))
     
     # Botón para previsualizar el XML
     btn_vista_previa_xml = ctk.CTkButton(frame_output,
@@ -638,11 +789,9 @@ def main_gui():
             messagebox.showwarning("Vista previa", "Debe seleccionar un archivo principal.")
             return
         
-        def do_preview():
-            vista_previa_html(entry_main, entry_com, entry_apa, entry_meta, header_mode_var.get())
-            return None
-        
-        run_with_progress(do_preview, "Generando vista previa HTML...")
+        run_job("preview_html", {**bundle_payload(), "preview_mode": html_mode_var.get()},
+                "Generando vista previa HTML...",
+                lambda page_path: webbrowser.open(f"file://{page_path}"))
     
     # Botón para previsualizar HTML
     btn_vista_previa_html = ctk.CTkButton(frame_output,
@@ -654,7 +803,34 @@ def main_gui():
         height=validation_button_height,
         font=("Segoe UI", button_font)
     )
-    btn_vista_previa_html.grid(row=3, column=0, columnspan=2, padx=15, pady=(5,15), sticky="ew")
+    btn_vista_previa_html.grid(row=3, column=0, columnspan=2, padx=15, pady=(5,5), sticky="ew")
+
+    # Modo de la vista previa HTML: CETEIcean en el navegador, estática (ya transformada)
+    # o por fragmentos (los actos se cargan bajo demanda)
+    html_mode_var = tk.StringVar(value="ceteicean")
+    radio_html_ceteicean = ctk.CTkRadioButton(frame_output,
+        text="HTML completo (CETEIcean)",
+        variable=html_mode_var,
+        value="ceteicean",
+        font=("Segoe UI", label_font)
+    )
+    radio_html_ceteicean.grid(row=4, column=0, columnspan=2, padx=15, pady=(0,5), sticky="w")
+
+    radio_html_static = ctk.CTkRadioButton(frame_output,
+        text="HTML estático (más rápido en comedias largas)",
+        variable=html_mode_var,
+        value="static",
+        font=("Segoe UI", label_font)
+    )
+    radio_html_static.grid(row=5, column=0, columnspan=2, padx=15, pady=(0,5), sticky="w")
+
+    radio_html_split = ctk.CTkRadioButton(frame_output,
+        text="HTML por actos (carga diferida)",
+        variable=html_mode_var,
+        value="split",
+        font=("Segoe UI", label_font)
+    )
+    radio_html_split.grid(row=6, column=0, columnspan=2, padx=15, pady=(0,15), sticky="w")
 
     # Columnas expandibles en frame_output
     frame_output.columnconfigure(0, weight=1) 
@@ -711,31 +887,16 @@ def main_gui():
         else:
             out = None
         
-        def do_conversion():
-            convert_docx_to_tei(
-                main_docx=entry_main.get(),
-                notas_docx=entry_com.get() or None,
-                aparato_docx=entry_apa.get() or None,
-                metadata_docx=entry_meta.get() or None,
-                output_file=out,
-                save=True,
-                header_mode=header_mode_var.get()
-            )
-            # Retornamos la ruta del archivo guardado
-            if out:
-                return os.path.abspath(out)
-            else:
-                return os.path.abspath(generate_filename(entry_main.get()) + ".xml")
-        
         def on_success(guardado):
             messagebox.showinfo("Conversión a XML-TEI completada", f"Archivo TEI generado en:\n{guardado}")
         
         def on_error(e):
-            error_details = traceback.format_exc()
-            print(f"Error en conversión:\n{error_details}")
+            print(f"Error en conversión:\n{e.details}")
             messagebox.showerror("Error en la conversión", f"Ocurrió un error durante la conversión:\n{str(e)}\n\nDetalles técnicos guardados en consola.")
         
-        run_with_progress(do_conversion, "Generando archivo XML-TEI...", on_success, on_error)
+        # El proceso de trabajo devuelve la ruta del archivo guardado
+        run_job("convert", {**bundle_payload(), "output_file": out}, "Generando archivo XML-TEI...",
+                on_success, on_error)
 
     # Altura adaptable botón de conversión
     conversion_button_height = max(36, int(window_height * 0.045))
@@ -751,6 +912,30 @@ def main_gui():
     )
     btn_convertir.grid(row=3, column=0, columnspan=3, padx=15, pady=15, sticky="ew")
 
+    # Avisos que detectó la última conversión (vista previa o guardado); oculto si no hay
+    last_conversion_findings: dict[str, Any] = {}
+
+    def on_ver_avisos_conversion():
+        timestamp = last_conversion_findings.get("timestamp")
+        show_validation_modal(
+            "Avisos de la conversión",
+            has_warnings=True,
+            findings=last_conversion_findings.get("findings", []),
+            header=f"Detectados al generar el TEI: {timestamp}" if timestamp else None,
+        )
+
+    btn_avisos_conversion = ctk.CTkButton(frame_conversion,
+        text="⚠️ Avisos de la última conversión",
+        command=on_ver_avisos_conversion,
+        fg_color="#6c757d",
+        hover_color="#5a6268",
+        corner_radius=15,
+        height=validation_button_height,
+        font=("Segoe UI", button_font)
+    )
+    btn_avisos_conversion.grid(row=4, column=0, columnspan=3, padx=15, pady=(0, 15), sticky="ew")
+    btn_avisos_conversion.grid_remove()
+
     # Columna expandible en frame_conversion
     frame_conversion.columnconfigure(1, weight=1)
     
@@ -770,61 +955,97 @@ def main_gui():
     progress_bar.set(0)
     progress_frame.pack_forget()  # Ocultar inicialmente
 
-    def run_with_progress(
-        task_func: Callable[[], Any],
+    def show_progress(message):
+        # Mostrar barra de progreso en modo indeterminado (sin valor específico)
+        progress_frame.pack(fill="x", padx=10, pady=(0, 5), before=footer_frame)
+        progress_label.configure(text=message)
+        progress_bar.configure(mode="indeterminate")
+        progress_bar.start()
+
+    def hide_progress():
+        # Detener animación y ocultar barra de progreso
+        progress_bar.stop()
+        progress_bar.configure(mode="determinate")
+        progress_bar.set(0)
+        progress_frame.pack_forget()
+
+    # --- Trabajos en segundo plano
+    # Validación, conversión y vistas previas se ejecutan en procesos aparte (gui_worker.py)
+    # con el backend ya importado; la ventana consulta sus resultados con root.after.
+    def on_conversion_findings(findings):
+        """
+        Guarda los hallazgos de la última conversión (xml:id duplicados, notas sin
+        adjuntar...) aparte de la última validación y los anuncia en el botón de avisos,
+        sin abrir ventanas: el modal solo se abre al pulsarlo.
+        """
+        last_conversion_findings.clear()
+        last_conversion_findings.update({
+            "findings": findings,
+            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        })
+        if findings:
+            btn_avisos_conversion.configure(text=f"⚠️ Avisos de la última conversión ({len(findings)})")
+            btn_avisos_conversion.grid()
+        else:
+            btn_avisos_conversion.grid_remove()
+
+    worker = ConversionWorker(on_conversion_findings=on_conversion_findings)
+    worker_polling = {"active": False}
+
+    def poll_worker():
+        if worker.poll():
+            root.after(WORKER_POLL_MS, poll_worker)
+        else:
+            worker_polling["active"] = False
+
+    def run_job(
+        kind: str,
+        payload: dict,
         message: str,
         on_success: Optional[Callable[[Any], None]] = None,
         on_error: Optional[Callable[[Exception], None]] = None
     ):
         """
-        Ejecuta una tarea en thread secundario mostrando barra de progreso indeterminada.
+        Envía un trabajo al proceso de trabajo mostrando barra de progreso indeterminada.
         
-        Mantiene la GUI responsiva durante operaciones largas (conversión, validación).
-        Usa root.after() para actualizar UI de forma thread-safe desde el worker.
+        La GUI no ejecuta el backend: solo consulta la cola de eventos cada WORKER_POLL_MS
+        mientras haya trabajos pendientes, así que la ventana sigue respondiendo y un
+        fallo del backend llega como error en lugar de cerrarla.
         
         Args:
-            task_func: Función sin argumentos que ejecuta la tarea, retorna un resultado.
+            kind: Tipo de trabajo ("validate", "convert", "preview_xml", "preview_html").
+            payload: Rutas y opciones del trabajo (ver bundle_payload).
             message: Texto a mostrar en la barra de progreso durante ejecución.
             on_success: Callback(result) opcional, ejecutado en thread principal si la tarea completa.
             on_error: Callback(exception) opcional, ejecutado en thread principal si hay error.
         """
-        def show_progress():
-            # Mostrar barra de progreso en modo indeterminado (sin valor específico)
-            progress_frame.pack(fill="x", padx=10, pady=(0, 5), before=footer_frame)
-            progress_label.configure(text=message)
-            progress_bar.configure(mode="indeterminate")
-            progress_bar.start()
-        
-        def hide_progress():
-            # Detener animación y ocultar barra de progreso
-            progress_bar.stop()
-            progress_bar.configure(mode="determinate")
-            progress_bar.set(0)
-            progress_frame.pack_forget()
-        
-        def worker():
-            # Ejecutar tarea en thread secundario manteniendo GUI responsiva
-            try:
-                # Mostrar barra de progreso en thread principal usando root.after()
-                root.after(0, show_progress)
-                result = task_func()
-                # Ocultar barra y ejecutar callback de éxito en thread principal
-                root.after(0, hide_progress)
-                if on_success is not None:
-                    success_cb = on_success
-                    root.after(0, lambda r=result, cb=success_cb: cb(r))
-            except Exception as e:
-                # Ocultar barra y ejecutar callback de error en thread principal
-                root.after(0, hide_progress)
-                if on_error is not None:
-                    error_cb = on_error
-                    root.after(0, lambda err=e, cb=error_cb: cb(err))
-                else:
-                    # Mostrar cuadro de error por defecto si no hay callback personalizado
-                    root.after(0, lambda err=e: messagebox.showerror("Error", str(err)))
-        
-        # Iniciar thread daemon (no bloquea cierre de aplicación)
-        threading.Thread(target=worker, daemon=True).start()
+        def finish():
+            if worker.pending == 0:
+                hide_progress()
+
+        def success(result):
+            finish()
+            if on_success is not None:
+                on_success(result)
+
+        def error(e):
+            finish()
+            if on_error is not None:
+                on_error(e)
+            else:
+                # Mostrar cuadro de error por defecto si no hay callback personalizado
+                print(f"Error en {kind}:\n{e.details}")
+                messagebox.showerror("Error", f"Se ha producido un error:\n{e}\n\nDetalles técnicos guardados en consola.")
+
+        show_progress(message)
+        worker.submit(kind, payload, success, error, lambda text: progress_label.configure(text=text))
+        if not worker_polling["active"]:
+            worker_polling["active"] = True
+            root.after(WORKER_POLL_MS, poll_worker)
+
+    def on_close():
+        worker.shutdown(timeout=0.5)
+        root.destroy()
 
     # --- Pie de página
     try:
@@ -870,5 +1091,9 @@ def main_gui():
     footer_text2.pack(anchor="w")
 
 
+    # Procesos de trabajo arrancados ya, para que el primer trabajo no espere a las importaciones
+    worker.start()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
     # Inicio del bucle principal
     root.mainloop()
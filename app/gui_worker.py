@@ -0,0 +1,365 @@
+# ==========================================
+# feniX-ML: Procesos de trabajo de la interfaz gráfica
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Ejecuta validación, conversión y vistas previas en procesos aparte que
+#              mantienen el backend importado. La conversión es trabajo de CPU en Python
+#              que retiene el GIL: en un hilo de la GUI congelaba la ventana, y así además
+#              dos trabajos usan dos núcleos y un fallo del backend no cierra la ventana.
+#              Resultados y avisos de progreso vuelven por una cola que la GUI consulta
+#              con root.after (ver ConversionWorker.poll). El TEI de la última conversión
+#              se conserva en la sesión y se reutiliza en vistas previas y guardado
+#              mientras las entradas no cambien (ver conversion_key). Los hallazgos que
+#              detecta la conversión (xml:id duplicados, notas sin adjuntar...) vuelven con
+#              el resultado para que la GUI los muestre. No importa tkinter.
+# ==========================================
+
+# --- Importaciones
+import itertools
+import multiprocessing
+import os
+import queue
+import traceback
+from typing import Any, Callable, NamedTuple, Optional
+
+DEFAULT_PROCESSES = 2
+CONVERSION_INPUTS = ("main_docx", "notas_docx", "aparato_docx", "metadata_docx")
+
+
+# --- Reutilización de la conversión en la sesión
+def conversion_key(payload: dict) -> Optional[tuple]:
+    """
+    Identifica una conversión: cada ruta de entrada con su fecha de modificación y su
+    tamaño, más el modo de encabezado. Si un archivo cambia en disco la clave cambia y
+    el TEI guardado deja de usarse. None si alguna entrada no se puede consultar.
+    """
+    parts = []
+    for name in CONVERSION_INPUTS:
+        path = payload.get(name)
+        if not path:
+            parts.append(None)
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        parts.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return (*parts, payload.get("header_mode", "prolope"))
+
+
+class ConversionOutput(NamedTuple):
+    """
+    Resultado de un trabajo que convierte: `result` es lo que recibe la GUI, `tei`
+    el TEI recién generado (None si se reutilizó el de la sesión) y `findings` los
+    hallazgos de esa conversión (None si no se convirtió).
+    """
+    result: Any
+    tei: Optional[str]
+    findings: Optional[tuple] = None
+
+
+# --- Trabajos (se ejecutan en el proceso de trabajo)
+def convert_payload(payload: dict, findings: list, **kwargs) -> str:
+    import tei_backend
+    return tei_backend.convert_docx_to_tei(
+        main_docx=payload["main_docx"],
+        notas_docx=payload.get("notas_docx"),
+        aparato_docx=payload.get("aparato_docx"),
+        metadata_docx=payload.get("metadata_docx"),
+        header_mode=payload.get("header_mode", "prolope"),
+        findings=findings,
+        **kwargs,
+    )
+
+
+def job_validate(payload: dict, report: Callable[[str], None]):
+    import tei_backend
+    return tei_backend.collect_validation_findings(
+        payload["main_docx"],
+        notas_docx=payload.get("notas_docx"),
+        aparato_docx=payload.get("aparato_docx"),
+    )
+
+
+def payload_tei(payload: dict, report: Callable[[str], None]) -> tuple[str, Optional[tuple]]:
+    """
+    TEI del trabajo: el que envía la GUI en "tei_content" si las entradas no han
+    cambiado desde la última conversión, o uno nuevo.
+    Devuelve (TEI, hallazgos de la conversión o None si se reutilizó el TEI).
+    """
+    tei_content = payload.get("tei_content")
+    if tei_content is not None:
+        report("Reutilizando la conversión de esta sesión...")
+        return tei_content, None
+    findings = []
+    return convert_payload(payload, findings, output_file=None, save=False), tuple(findings)
+
+
+def fresh_tei(tei_content: str, findings: Optional[tuple]) -> Optional[str]:
+    return tei_content if findings is not None else None
+
+
+def job_convert(payload: dict, report: Callable[[str], None]):
+    """
+    Convierte y guarda el TEI; devuelve la ruta absoluta del archivo escrito.
+    """
+    output_file = payload.get("output_file")
+    if not output_file:
+        # Sin ruta elegida, el backend decide el nombre del archivo a partir del título
+        findings = []
+        path = convert_payload(payload, findings, output_file=None, save=True)
+        return ConversionOutput(path, None, tuple(findings))
+    tei_content, findings = payload_tei(payload, report)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(tei_content)
+    return ConversionOutput(os.path.abspath(output_file), fresh_tei(tei_content, findings), findings)
+
+
+def job_preview_xml(payload: dict, report: Callable[[str], None]) -> ConversionOutput:
+    tei_content, findings = payload_tei(payload, report)
+    return ConversionOutput(tei_content, fresh_tei(tei_content, findings), findings)
+
+
+def job_preview_html(payload: dict, report: Callable[[str], None]) -> ConversionOutput:
+    """
+    Convierte y escribe la vista previa HTML; devuelve la ruta de la página.
+    """
+    from preview_html import write_preview_file
+    tei_content, findings = payload_tei(payload, report)
+    report("Generando la página HTML...")
+    page_path = write_preview_file(tei_content, payload.get("preview_mode", "ceteicean"))
+    return ConversionOutput(page_path, fresh_tei(tei_content, findings), findings)
+
+
+JOBS = {
+    "validate": job_validate,
+    "convert": job_convert,
+    "preview_xml": job_preview_xml,
+    "preview_html": job_preview_html,
+}
+CONVERSION_JOBS = {"convert", "preview_xml", "preview_html"}
+
+
+class WorkerEvent(NamedTuple):
+    kind: str          # "started", "progress", "done" o "error"
+    job_id: int
+    data: Any = None
+
+
+def worker_main(tasks, events) -> None:
+    """
+    Bucle del proceso de trabajo: importa el backend una vez y atiende trabajos
+    (job_id, tipo, payload) hasta recibir None.
+    """
+    import tei_backend  # noqa: F401  (importación en caliente)
+    import preview_html  # noqa: F401
+    from profiling import set_profile_directory
+
+    pid = os.getpid()
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, kind, payload = task
+        events.put(WorkerEvent("started", job_id, pid))
+        # El perfilado se activa desde el menú Depuración y viaja con cada trabajo
+        set_profile_directory(payload.get("profile_dir"))
+        try:
+            result = JOBS[kind](payload, lambda message: events.put(WorkerEvent("progress", job_id, message)))
+        except Exception as e:
+            events.put(WorkerEvent("error", job_id, (str(e) or type(e).__name__, traceback.format_exc())))
+        else:
+            events.put(WorkerEvent("done", job_id, result))
+
+
+# --- Lado de la GUI
+class WorkerError(Exception):
+    """
+    Error de un trabajo; `details` lleva la traza del proceso de trabajo.
+    """
+
+    def __init__(self, message: str, details: str = ""):
+        super().__init__(message)
+        self.details = details
+
+
+class PendingJob:
+    __slots__ = ("kind", "on_success", "on_error", "on_progress", "pid", "started", "conversion_key")
+
+    def __init__(self, kind, on_success, on_error, on_progress, conversion_key=None):
+        self.kind = kind
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.pid = None        # proceso al que se asignó
+        self.started = False   # si ese proceso ya avisó de que lo empieza
+        self.conversion_key = conversion_key
+
+
+class ConversionWorker:
+    """
+    Grupo pequeño y persistente de procesos de trabajo ("spawn", igual en Windows,
+    macOS y Linux). Los callbacks se ejecutan dentro de poll(), es decir, en el hilo
+    que la llama: la GUI lo hace desde root.after, por lo que pueden tocar widgets.
+    Cada proceso tiene su propia cola de tareas y cada trabajo se asigna al enviarlo
+    al proceso con menos trabajos pendientes, así que siempre se sabe qué proceso
+    tiene cada trabajo, aunque todavía no haya avisado de que lo empieza. Si un
+    proceso muere (p. ej. por un fallo de lxml o durante el arranque), sus trabajos
+    terminan con WorkerError y se arranca otro proceso en su lugar.
+
+    El TEI de la última conversión terminada se guarda aquí, en el proceso de la GUI
+    (los trabajos pueden caer en cualquier proceso), junto con su conversion_key: las
+    vistas previas y el guardado con las mismas entradas lo reciben en lugar de
+    convertir de nuevo. Con el perfilado activo siempre se convierte.
+
+    Los hallazgos de cada conversión nueva (lista vacía si no hay) se entregan a
+    `on_conversion_findings`, si se indica, antes que el resultado del trabajo; al
+    reutilizar el TEI no se vuelven a entregar.
+    """
+
+    def __init__(
+        self,
+        processes: int = DEFAULT_PROCESSES,
+        on_conversion_findings: Optional[Callable[[list], None]] = None,
+    ):
+        self._context = multiprocessing.get_context("spawn")
+        self._size = max(1, processes)
+        self._events = self._context.Queue()
+        self._processes = []
+        self._tasks: dict[int, Any] = {}  # pid → cola de tareas de ese proceso
+        self._jobs: dict[int, PendingJob] = {}
+        self._ids = itertools.count(1)
+        self._last_conversion: Optional[tuple[tuple, str]] = None
+        self.on_conversion_findings = on_conversion_findings
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    def start(self) -> None:
+        """
+        Arranca los procesos que falten. Se llama al abrir la GUI para que el primer
+        trabajo encuentre el backend ya importado.
+        """
+        while len(self._processes) < self._size:
+            tasks = self._context.Queue()
+            process = self._context.Process(
+                target=worker_main, args=(tasks, self._events),
+                name="fenixml-worker", daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+            self._tasks[process.pid] = tasks
+
+    def submit(
+        self,
+        kind: str,
+        payload: dict,
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_progress: Optional[Callable[[str], None]] = None,
+    ) -> int:
+        if kind not in JOBS:
+            raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+        self.start()
+        key = None
+        if kind in CONVERSION_JOBS and not payload.get("profile_dir"):
+            key = conversion_key(payload)
+            if key is not None and self._last_conversion is not None and self._last_conversion[0] == key:
+                payload = {**payload, "tei_content": self._last_conversion[1]}
+        load = {process.pid: 0 for process in self._processes}
+        for job in self._jobs.values():
+            if job.pid in load:
+                load[job.pid] += 1
+        pid = min(load, key=load.get)
+        job_id = next(self._ids)
+        job = self._jobs[job_id] = PendingJob(kind, on_success, on_error, on_progress, key)
+        job.pid = pid
+        self._tasks[pid].put((job_id, kind, payload))
+        return job_id
+
+    def forget_conversion(self) -> None:
+        """
+        Descarta el TEI guardado; el siguiente trabajo convierte desde cero.
+        """
+        self._last_conversion = None
+
+    def poll(self) -> int:
+        """
+        Procesa los eventos recibidos sin bloquear y comprueba que los procesos sigan
+        vivos. Devuelve cuántos trabajos quedan pendientes.
+        """
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(event)
+        self._reap_dead_processes()
+        return self.pending
+
+    def _dispatch(self, event: WorkerEvent) -> None:
+        job = self._jobs.get(event.job_id)
+        if job is None:
+            return
+        if event.kind == "started":
+            job.started = True
+        elif event.kind == "progress":
+            if job.on_progress is not None:
+                job.on_progress(event.data)
+        elif event.kind == "done":
+            del self._jobs[event.job_id]
+            result = event.data
+            if isinstance(result, ConversionOutput):
+                if result.tei is not None and job.conversion_key is not None:
+                    self._last_conversion = (job.conversion_key, result.tei)
+                if result.findings is not None and self.on_conversion_findings is not None:
+                    self.on_conversion_findings(list(result.findings))
+                result = result.result
+            if job.on_success is not None:
+                job.on_success(result)
+        else:
+            del self._jobs[event.job_id]
+            message, details = event.data
+            self._fail(job, WorkerError(message, details))
+
+    def _reap_dead_processes(self) -> None:
+        dead = [process for process in self._processes if not process.is_alive()]
+        if not dead:
+            return
+        # Puede haber eventos que el proceso envió antes de morir
+        while True:
+            try:
+                self._dispatch(self._events.get_nowait())
+            except queue.Empty:
+                break
+        for process in dead:
+            self._processes.remove(process)
+            self._tasks.pop(process.pid).close()
+            # También los que aún no había empezado: pudo sacarlos de su cola antes de morir
+            for job_id, job in list(self._jobs.items()):
+                if job.pid == process.pid:
+                    del self._jobs[job_id]
+                    self._fail(job, WorkerError(
+                        f"El proceso de trabajo terminó inesperadamente (código {process.exitcode})."
+                    ))
+        if self._jobs:
+            self.start()
+
+    @staticmethod
+    def _fail(job: PendingJob, error: WorkerError) -> None:
+        if job.on_error is not None:
+            job.on_error(error)
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """
+        Pide a los procesos que terminen y fuerza la salida de los que no lo hagan a tiempo.
+        """
+        for process in self._processes:
+            self._tasks[process.pid].put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._tasks = {}
@@ -9,6 +9,7 @@
 # ==========================================
 
 import ctypes
+import multiprocessing
 
 # Hacer que la app sea DPI-aware en Windows 10/11 para evitar desenfoque en pantallas HiDPI
 try:
@@ -16,9 +17,14 @@ try:
 except Exception:
     pass
 
-from gui import main_gui
-
 # --- Punto de entrada de la aplicación
 if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para los procesos de trabajo de la GUI
+    multiprocessing.freeze_support()
+
+    # La GUI se importa aquí: los procesos de trabajo ("spawn") vuelven a importar este
+    # módulo y no deben cargar tkinter ni customtkinter
+    from gui import main_gui
+
     # Lanza la interfaz gráfica principal de feniX-ML
     main_gui()
@@ -0,0 +1,847 @@
+# ==========================================
+# feniX-ML: Generación de la vista previa HTML de TEI/XML
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Construye el documento HTML autocontenido (CETEIcean + estilos + menú
+#              de navegación) a partir del TEI/XML generado. No depende de Tkinter,
+#              por lo que lo comparten la interfaz gráfica y la línea de comandos.
+#              Incluye además un modo estático: el TEI se transforma a HTML en Python con
+#              una XSLT compilada una vez por proceso y el menú se precalcula, de modo que
+#              la página no ejecuta CETEIcean al abrirse. El mismo renderizador publica
+#              un conjunto de ediciones como sitio estático. Ambos modos incrustan un
+#              índice de búsqueda (token normalizado → versos, personajes y notas).
+#              Para ediciones muy largas, la vista previa por fragmentos escribe
+#              teiHeader, prólogo y cada acto por separado y los carga bajo demanda.
+# ==========================================
+
+# --- Importaciones
+import html
+import json
+import os
+import sys
+import tempfile
+from functools import lru_cache
+from typing import NamedTuple
+
+# --- Utilidades de recursos
+def resource_path(relative_path):
+    """
+    Obtiene ruta absoluta compatible con PyInstaller usando _MEIPASS.
+    
+    Permite cargar recursos (JS, CSS, iconos) desde carpeta resources/ tanto en
+    modo desarrollo (script) como en modo empaquetado (PyInstaller).
+    
+    Args:
+        relative_path: Ruta relativa al recurso (p.ej. "resources/estilos.css").
+    
+    Returns:
+        str: Ruta absoluta válida en el sistema operativo actual.
+    """
+    try:
+        # Si está empaquetado con PyInstaller
+        base_path = sys._MEIPASS
+    except Exception:
+        # Si se ejecuta como script, usar el directorio del archivo actual
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, relative_path)
+
+@lru_cache(maxsize=None)
+def load_resource(filename):
+    """
+    Carga archivo de texto desde carpeta resources/ codificado en UTF-8.
+    Los recursos se leen una sola vez por proceso y solo cuando se necesitan.
+    
+    Args:
+        filename: Nombre del archivo relativo a resources/ (p.ej. "CETEIcean.js").
+    
+    Returns:
+        str: Contenido del archivo codificado en UTF-8.
+    """
+    path = resource_path(filename)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+# --- Plantilla HTML
+def build_preview_html(tei_content: str) -> str:
+    """
+    Devuelve el HTML autocontenido que renderiza el TEI con CETEIcean.
+    
+    Args:
+        tei_content: Documento TEI/XML como cadena.
+    
+    Returns:
+        str: Página HTML con JS, CSS y menú de navegación incrustados.
+    """
+    # El índice de búsqueda asigna ids a versos, parlamentos y notas: se pasa a
+    # CETEIcean el TEI ya anotado para que los resultados apunten a elementos reales.
+    tei_root = parse_tei(tei_content)
+    search_index = build_search_index(tei_root)
+    tei_content = serialize_tei(tei_root)
+
+    # Escapar de forma segura para JavaScript (evita interpretar secuencias como \f).
+    tei_content_js = json.dumps(tei_content)
+
+    html_template = f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <title>Edición Digital</title>
+    <style>
+    {load_resource("resources/estilos.css")}
+    </style>
+</head>
+<body>
+    <!-- Botón de toggle del menú -->
+    <button id="nav-toggle" class="nav-toggle-btn" title="Mostrar/Ocultar menú">☰</button>
+    
+    <!-- Menú de navegación lateral -->
+    <nav id="nav-menu">
+        <div class="nav-header">
+            <span class="nav-title">Navegación</span>
+        </div>
+        {SEARCH_BOX_HTML}
+        <ul id="nav-list">
+            <!-- Se llenará dinámicamente con JavaScript -->
+        </ul>
+    </nav>
+    
+    <div id="tei"></div>
+
+    <script type="application/json" id="search-index">{search_index_json(search_index)}</script>
+    <script>
+    {load_resource("resources/CETEIcean.js")}
+    </script>
+    <script>
+    {load_resource("resources/preview_search.js")}
+    </script>
+
+    <script>
+    document.addEventListener("DOMContentLoaded", function() {{
+        const ceteiInstance = new CETEI();
+        const htmlNode = ceteiInstance.makeHTML5({tei_content_js});
+        document.getElementById("tei").appendChild(htmlNode);
+        
+        // Generar menú de navegación después de renderizar el TEI
+        setTimeout(buildNavigationMenu, 100);
+    }});
+    
+    function buildNavigationMenu() {{
+        const navList = document.getElementById('nav-list');
+        const menuItems = [];
+        
+        // 1. Metadatos (teiHeader)
+        const teiHeader = document.querySelector('tei-teiheader, teiHeader');
+        if (teiHeader) {{
+            teiHeader.setAttribute('id', 'metadatos');
+            menuItems.push({{
+                id: 'metadatos',
+                text: 'Metadatos',
+                level: 1,
+                element: teiHeader
+            }});
+        }}
+        
+        // 2. Prólogo (front)
+        const prologo = document.querySelector('tei-div[type="Introducción"], [xml\\\\:id="prologo"]');
+        if (prologo) {{
+            menuItems.push({{
+                id: 'prologo',
+                text: 'Prólogo',
+                level: 1,
+                element: prologo
+            }});
+            
+            // Subsecciones del prólogo
+            const subsecciones = prologo.querySelectorAll('tei-div[type="subsection"]');
+            subsecciones.forEach((sub, idx) => {{
+                const head = sub.querySelector('tei-head');
+                if (head) {{
+                    const subId = 'prologo-sub-' + (idx + 1);
+                    sub.setAttribute('id', subId);
+                    // Clonar el head para eliminar notas y obtener texto limpio
+                    const cleanHead = head.cloneNode(true);
+                    cleanHead.querySelectorAll('tei-note, note').forEach(note => note.remove());
+                    const headText = cleanHead.textContent.trim();
+                    
+                    // Si el título empieza con "ACTO", es nivel 3 (argumento por actos)
+                    // Si no, es nivel 2 (subsección normal del prólogo)
+                    if (headText.match(/^Acto/i)) {{
+                        menuItems.push({{
+                            id: subId,
+                            text: headText,
+                            level: 3,
+                            element: sub
+                        }});
+                    }} else {{
+                        menuItems.push({{
+                            id: subId,
+                            text: headText,
+                            level: 2,
+                            element: sub
+                        }});
+                    }}
+                }}
+            }});
+        }}
+        
+        // 3. Título de la comedia
+        const titulo = document.querySelector('tei-head[type="mainTitle"]');
+        if (titulo) {{
+            titulo.setAttribute('id', 'titulo');
+            // Clonar para eliminar notas y obtener texto limpio
+            const cleanTitulo = titulo.cloneNode(true);
+            cleanTitulo.querySelectorAll('tei-note, note').forEach(note => note.remove());
+            menuItems.push({{
+                id: 'titulo',
+                text: cleanTitulo.textContent.trim(),
+                level: 1,
+                element: titulo
+            }});
+        }}
+        
+        // 4. Dedicatoria
+        const dedicatoria = document.querySelector('tei-div[type="dedicatoria"]');
+        if (dedicatoria) {{
+            dedicatoria.setAttribute('id', 'dedicatoria');
+            const head = dedicatoria.querySelector('tei-head');
+            let headText = 'Dedicatoria';
+            if (head) {{
+                const cleanHead = head.cloneNode(true);
+                cleanHead.querySelectorAll('tei-note, note').forEach(note => note.remove());
+                headText = cleanHead.textContent.trim();
+            }}
+            menuItems.push({{
+                id: 'dedicatoria',
+                text: headText,
+                level: 2,
+                element: dedicatoria
+            }});
+        }}
+        
+        // 5. Lista de personajes
+        const personajes = document.querySelector('tei-div[type="castList"]');
+        if (personajes) {{
+            personajes.setAttribute('id', 'personajes');
+            const head = personajes.querySelector('tei-head[type="castListTitle"], tei-head');
+            let headText = 'Personajes';
+            if (head) {{
+                const cleanHead = head.cloneNode(true);
+                cleanHead.querySelectorAll('tei-note, note').forEach(note => note.remove());
+                headText = cleanHead.textContent.trim();
+            }}
+            menuItems.push({{
+                id: 'personajes',
+                text: headText,
+                level: 2,
+                element: personajes
+            }});
+        }}
+        
+        // 6. Actos (nivel 2, igual que Dedicatoria y Personajes)
+        const actos = document.querySelectorAll('tei-div[subtype="ACTO"]');
+        actos.forEach((acto, idx) => {{
+            const actoId = 'acto' + (idx + 1);
+            acto.setAttribute('id', actoId);
+            const head = acto.querySelector('tei-head[type="acto"]');
+            let headText = 'Acto ' + (idx + 1);
+            if (head) {{
+                const cleanHead = head.cloneNode(true);
+                cleanHead.querySelectorAll('tei-note, note').forEach(note => note.remove());
+                headText = cleanHead.textContent.trim();
+            }}
+            menuItems.push({{
+                id: actoId,
+                text: headText,
+                level: 2,
+                element: acto
+            }});
+        }});
+        
+        // Construir el HTML del menú
+        menuItems.forEach(item => {{
+            const li = document.createElement('li');
+            li.className = 'nav-item nav-level-' + item.level;
+            
+            const a = document.createElement('a');
+            a.href = '#' + item.id;
+            a.textContent = item.text;
+            a.addEventListener('click', function(e) {{
+                e.preventDefault();
+                item.element.scrollIntoView({{ behavior: 'smooth', block: 'start' }});
+                
+                // Resaltar brevemente la sección
+                item.element.classList.add('nav-highlight');
+                setTimeout(() => item.element.classList.remove('nav-highlight'), 1500);
+            }});
+            
+            li.appendChild(a);
+            navList.appendChild(li);
+        }});
+        
+        // Toggle del menú
+        const navToggle = document.getElementById('nav-toggle');
+        const navMenu = document.getElementById('nav-menu');
+        navToggle.addEventListener('click', function() {{
+            navMenu.classList.toggle('nav-open');
+            document.body.classList.toggle('nav-open');
+        }});
+    }}
+    </script>
+</body>
+</html>
+"""
+    return html_template
+
+
+# --- Renderizado estático (XSLT)
+TEI_NS = "http://www.tei-c.org/ns/1.0"
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+STATIC_RESOURCES = (
+    "resources/estilos.css",
+    "resources/CETEIcean.js",
+    "resources/preview_search.js",
+    "resources/preview_static.js",
+)
+
+
+class NavItem(NamedTuple):
+    id: str
+    text: str
+    level: int
+
+
+@lru_cache(maxsize=None)
+def get_tei_html_transform():
+    """
+    Compila resources/tei_html.xsl una sola vez por proceso.
+    lxml se importa aquí para que la CLI no lo cargue si no hace falta.
+    """
+    from lxml import etree
+    return etree.XSLT(etree.parse(resource_path("resources/tei_html.xsl")))
+
+
+def heading_text(element) -> str:
+    """
+    Texto de un encabezado sin el contenido de sus notas (equivale al textContent
+    del clon sin tei-note que usa el menú de CETEIcean).
+    """
+    note_tag = f"{{{TEI_NS}}}note"
+
+    def collect(node):
+        if node.tag == note_tag:
+            return
+        if node.text:
+            yield node.text
+        for child in node:
+            yield from collect(child)
+            if child.tail:
+                yield child.tail
+
+    return "".join(collect(element)).strip()
+
+
+def build_navigation(tei_root) -> list[NavItem]:
+    """
+    Calcula el menú a partir de la estructura TEI con los mismos criterios que
+    buildNavigationMenu y asigna a cada destino su id (atributo `id` sin espacio de
+    nombres, que la XSLT copia al HTML).
+    """
+    ns = {"tei": TEI_NS}
+    items: list[NavItem] = []
+
+    def first(xpath, context=tei_root):
+        found = context.xpath(xpath, namespaces=ns)
+        return found[0] if found else None
+
+    def add(element, item_id, text, level):
+        element.set("id", item_id)
+        items.append(NavItem(item_id, text, level))
+
+    # 1. Metadatos (teiHeader)
+    tei_header = first("//tei:teiHeader")
+    if tei_header is not None:
+        add(tei_header, "metadatos", "Metadatos", 1)
+
+    # 2. Prólogo (front) y sus subsecciones
+    prologo = first("(//tei:div[@type='Introducción'] | //*[@xml:id='prologo'])[1]")
+    if prologo is not None:
+        add(prologo, "prologo", "Prólogo", 1)
+        subsections = prologo.xpath(".//tei:div[@type='subsection']", namespaces=ns)
+        for idx, sub in enumerate(subsections, start=1):
+            head = first(".//tei:head", sub)
+            if head is not None:
+                text = heading_text(head)
+                # Los títulos que empiezan por "Acto" (argumento por actos) van a nivel 3
+                add(sub, f"prologo-sub-{idx}", text, 3 if text.lower().startswith("acto") else 2)
+
+    # 3. Título de la comedia
+    titulo = first("//tei:head[@type='mainTitle']")
+    if titulo is not None:
+        add(titulo, "titulo", heading_text(titulo), 1)
+
+    # 4. Dedicatoria y 5. Lista de personajes
+    for div_type, item_id, default_text in (("dedicatoria", "dedicatoria", "Dedicatoria"),
+                                            ("castList", "personajes", "Personajes")):
+        div = first(f"//tei:div[@type='{div_type}']")
+        if div is not None:
+            head = first(".//tei:head", div)
+            add(div, item_id, heading_text(head) if head is not None else default_text, 2)
+
+    # 6. Actos
+    for idx, acto in enumerate(tei_root.xpath("//tei:div[@subtype='ACTO']", namespaces=ns), start=1):
+        head = first(".//tei:head[@type='acto']", acto)
+        add(acto, f"acto{idx}", heading_text(head) if head is not None else f"Acto {idx}", 2)
+
+    return items
+
+
+def render_navigation(items: list[NavItem], fragments=None) -> str:
+    """
+    Lista <li> del menú. Con `fragments` (id → fragmento) cada enlace indica además el
+    fragmento que hay que cargar antes de saltar (vista previa por fragmentos).
+    """
+    fragments = fragments or {}
+    return "\n".join(
+        f'        <li class="nav-item nav-level-{item.level}">'
+        f'<a href="#{html.escape(item.id)}"'
+        + (f' data-fragment="{html.escape(fragments[item.id])}"' if item.id in fragments else "")
+        + f'>{html.escape(item.text)}</a></li>'
+        for item in items
+    )
+
+
+# --- Índice de búsqueda
+SEARCH_BOX_HTML = """<div class="nav-search">
+            <input id="search-input" type="search" placeholder="Buscar versos, personajes, notas…" autocomplete="off">
+            <ul id="search-results"></ul>
+        </div>"""
+
+NOTE_KINDS = {"aparato": "Aparato", "nota": "Nota", "intro": "Nota del prólogo"}
+
+
+def parse_tei(tei_content: str):
+    """
+    Analiza el TEI con lxml. collect_ids=False: como el DOMParser del navegador, se
+    toleran xml:id repetidos.
+    """
+    from lxml import etree
+    parser = etree.XMLParser(collect_ids=False, huge_tree=True)
+    return etree.fromstring(tei_content.encode("utf-8"), parser)
+
+
+def serialize_tei(tei_root) -> str:
+    from lxml import etree
+    return etree.tostring(tei_root, encoding="unicode")
+
+
+def build_search_index(tei_root, fragments=None) -> dict:
+    """
+    Construye el índice invertido de la vista previa: cada token normalizado (misma
+    normalización que normalize_text_for_matching) apunta a la lista ordenada de
+    entradas en las que aparece. Las entradas son versos (texto sin notas; las partes
+    de un verso partido se suman al verso numerado), parlamentos (por el nombre del
+    personaje) y notas. A los elementos sin xml:id se les asigna un `id` para saltar
+    a ellos desde la página. El texto no se guarda en el índice: la página lo lee del
+    elemento al mostrar cada resultado.
+
+    Args:
+        tei_root: Raíz del TEI (se ignora si se pasan fragmentos).
+        fragments: Lista de TeiFragment en orden; el índice indica entonces en qué
+            posición empieza cada fragmento para cargarlo antes de saltar.
+
+    Returns:
+        dict: {"docs": [[id, tipo, etiqueta], ...],
+               "terms": [[token, [índices de docs]], ...]} con los tokens ordenados y,
+               con fragmentos, "fragments": [[nombre, primer índice], ...].
+    """
+    from tei_backend import normalize_text_for_matching
+
+    verse_tag = f"{{{TEI_NS}}}l"
+    sp_tag = f"{{{TEI_NS}}}sp"
+    note_tag = f"{{{TEI_NS}}}note"
+    speaker_tag = f"{{{TEI_NS}}}speaker"
+
+    docs = []
+    texts = []
+    used_ids = set()
+    last_verse = None
+
+    def add(element, item_id, kind, label, text):
+        if element.get(XML_ID) is not None:
+            item_id = element.get(XML_ID)
+        else:
+            element.set("id", item_id)
+        used_ids.add(item_id)
+        docs.append((item_id, kind, label))
+        texts.append([text])
+        return len(docs) - 1
+
+    fragment_starts = []
+    for fragment in fragments if fragments is not None else [TeiFragment(None, tei_root)]:
+        fragment_starts.append((fragment.name, len(docs)))
+        for element in fragment.root.iter(verse_tag, sp_tag, note_tag):
+            if element.tag == verse_tag:
+                text = heading_text(element)
+                number = element.get("n")
+                if number is None and element.get("part") and last_verse is not None:
+                    texts[last_verse].append(text)
+                    continue
+                item_id = f"v{number}" if number is not None else f"verso-{len(docs)}"
+                if item_id in used_ids:
+                    item_id = f"{item_id}-{len(docs)}"
+                last_verse = add(element, item_id, "verso", f"v. {number}" if number else "Verso", text)
+            elif element.tag == sp_tag:
+                speaker = next(element.iterchildren(speaker_tag), None)
+                if speaker is not None:
+                    name = heading_text(speaker)
+                    add(element, f"sp{len(docs)}", "personaje", name, name)
+            else:
+                kind = element.get("subtype") or element.get("type") or "nota"
+                add(element, f"nota-{len(docs)}", "nota", NOTE_KINDS.get(kind, "Nota"), "".join(element.itertext()))
+
+    postings: dict[str, list[int]] = {}
+    for idx, parts in enumerate(texts):
+        for token in set(normalize_text_for_matching(" ".join(parts)).split()):
+            postings.setdefault(token, []).append(idx)
+
+    index = {"docs": docs, "terms": [(token, postings[token]) for token in sorted(postings)]}
+    if fragments is not None:
+        index["fragments"] = fragment_starts
+    return index
+
+
+def search_index_json(index: dict) -> str:
+    """
+    JSON compacto para incrustar en <script type="application/json"> ("</" escapado).
+    """
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+class StaticRendering(NamedTuple):
+    title: str
+    navigation: list
+    body_html: str
+    search_index: dict
+
+
+def render_tei_static(tei_content: str) -> StaticRendering:
+    """
+    Transforma el TEI a HTML (elementos tei-*) y devuelve también el menú, el título y
+    el índice de búsqueda.
+    """
+    tei_root = parse_tei(tei_content)
+    navigation = build_navigation(tei_root)
+    search_index = build_search_index(tei_root)
+    body_html = str(get_tei_html_transform()(tei_root)).strip()
+    return StaticRendering(document_title(tei_root, navigation), navigation, body_html, search_index)
+
+
+def document_title(tei_root, navigation: list[NavItem]) -> str:
+    """
+    Título de la página: el del titleStmt o, sin teiHeader completo, el de la comedia.
+    """
+    titles = tei_root.xpath("//tei:titleStmt/tei:title", namespaces={"tei": TEI_NS})
+    title = " ".join("".join(titles[0].itertext()).split()) if titles else ""
+    if not title:
+        title = next((item.text for item in navigation if item.id == "titulo"), "")
+    return title or "Edición Digital"
+
+
+def build_static_html(tei_content: str, resource_prefix=None) -> str:
+    """
+    Devuelve una página HTML ya renderizada (sin makeHTML5 en el navegador).
+
+    Args:
+        tei_content: Documento TEI/XML como cadena.
+        resource_prefix: Si se indica (p.ej. "recursos/"), CSS y JS se enlazan desde esa
+            ruta en lugar de incrustarse; lo usa publish_static_site.
+    """
+    return render_static_page(render_tei_static(tei_content), resource_prefix)
+
+
+def render_static_page(rendering: StaticRendering, resource_prefix=None) -> str:
+    """
+    Monta la página completa a partir de un StaticRendering (ver build_static_html).
+    """
+    if resource_prefix is None:
+        styles = f"<style>\n    {load_resource(STATIC_RESOURCES[0])}\n    </style>"
+        scripts = "\n    ".join(
+            f"<script>\n    {load_resource(name)}\n    </script>" for name in STATIC_RESOURCES[1:]
+        )
+    else:
+        styles = f'<link rel="stylesheet" href="{resource_prefix}{os.path.basename(STATIC_RESOURCES[0])}">'
+        scripts = "\n    ".join(
+            f'<script src="{resource_prefix}{os.path.basename(name)}"></script>' for name in STATIC_RESOURCES[1:]
+        )
+
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <title>{html.escape(rendering.title)}</title>
+    {styles}
+</head>
+<body>
+    <!-- Botón de toggle del menú -->
+    <button id="nav-toggle" class="nav-toggle-btn" title="Mostrar/Ocultar menú">☰</button>
+    
+    <!-- Menú de navegación lateral (precalculado) -->
+    <nav id="nav-menu">
+        <div class="nav-header">
+            <span class="nav-title">Navegación</span>
+        </div>
+        {SEARCH_BOX_HTML}
+        <ul id="nav-list">
+{render_navigation(rendering.navigation)}
+        </ul>
+    </nav>
+    
+    <div id="tei">{rendering.body_html}</div>
+
+    <script type="application/json" id="search-index">{search_index_json(rendering.search_index)}</script>
+    {scripts}
+</body>
+</html>
+"""
+
+
+def publish_static_site(pages, output_dir) -> list[str]:
+    """
+    Publica varias ediciones como sitio estático: una página por edición, los recursos
+    CSS/JS compartidos en recursos/ y un index.html con la lista de títulos.
+
+    Args:
+        pages: Iterable de (nombre_archivo_sin_extensión, contenido TEI).
+        output_dir: Carpeta de destino (se crea si no existe).
+
+    Returns:
+        list[str]: Rutas de los archivos HTML escritos, index.html el último.
+    """
+    resources_dir = os.path.join(output_dir, "recursos")
+    os.makedirs(resources_dir, exist_ok=True)
+    for name in STATIC_RESOURCES:
+        with open(os.path.join(resources_dir, os.path.basename(name)), "w", encoding="utf-8") as f:
+            f.write(load_resource(name))
+
+    written = []
+    entries = []
+    for slug, tei_content in pages:
+        rendering = render_tei_static(tei_content)
+        page_path = os.path.join(output_dir, f"{slug}.html")
+        with open(page_path, "w", encoding="utf-8") as f:
+            f.write(render_static_page(rendering, resource_prefix="recursos/"))
+        written.append(page_path)
+        entries.append(f'        <li><a href="{html.escape(slug)}.html">{html.escape(rendering.title)}</a></li>')
+
+    index_path = os.path.join(output_dir, "index.html")
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <title>Ediciones</title>
+    <link rel="stylesheet" href="recursos/{os.path.basename(STATIC_RESOURCES[0])}">
+</head>
+<body>
+    <ul>
+{chr(10).join(entries)}
+    </ul>
+</body>
+</html>
+""")
+    written.append(index_path)
+    return written
+
+
+# --- Vista previa por fragmentos (carga diferida)
+SPLIT_RESOURCES = ("resources/CETEIcean.js", "resources/preview_search.js", "resources/preview_split.js")
+
+
+class TeiFragment(NamedTuple):
+    name: str
+    root: object
+
+
+def is_act(element) -> bool:
+    return element.tag == f"{{{TEI_NS}}}div" and element.get("subtype") == "ACTO"
+
+
+def split_tei_fragments(tei_root) -> list[TeiFragment]:
+    """
+    Reparte el TEI en documentos TEI independientes, en orden: "metadatos" (teiHeader),
+    "prologo" (front), "comedia" (lo que precede al primer acto: título, dedicatoria,
+    personajes…) y un fragmento por acto con el id que le dio el menú (acto1, acto2…).
+    Cada fragmento conserva sus contenedores (text, body, div de la comedia sin xml:id)
+    para que los selectores de estilos.css sigan aplicándose. Lo que sigue a un acto
+    dentro de la comedia va con ese acto. Los elementos se mueven: tei_root queda vacío.
+    """
+    from lxml import etree
+
+    def new_fragment(name, *path):
+        root = etree.Element(tei_root.tag, tei_root.attrib, nsmap=tei_root.nsmap)
+        parent = root
+        for element in path:
+            attrib = {key: value for key, value in element.attrib.items() if key not in (XML_ID, "id")}
+            parent = etree.SubElement(parent, element.tag, attrib)
+        fragments.append(TeiFragment(name, root))
+        return parent
+
+    fragments: list[TeiFragment] = []
+    act_count = 0
+    header = tei_root.find(f"{{{TEI_NS}}}teiHeader")
+    if header is not None:
+        new_fragment("metadatos").append(header)
+
+    text = tei_root.find(f"{{{TEI_NS}}}text")
+    if text is None:
+        return fragments
+    for part in list(text):
+        if part.tag == f"{{{TEI_NS}}}front":
+            new_fragment("prologo", text).append(part)
+            continue
+        if part.tag != f"{{{TEI_NS}}}body":
+            # back y otros: fragmento propio a continuación
+            new_fragment(etree.QName(part).localname, text).append(part)
+            continue
+
+        body_parent = new_fragment("comedia", text, part)
+        for child in list(part):
+            if not any(is_act(grandchild) for grandchild in child):
+                body_parent.append(child)
+                continue
+            # Contenedor de la comedia: se corta en cada acto
+            container = etree.SubElement(body_parent, child.tag, child.attrib)
+            container.text = child.text
+            for grandchild in list(child):
+                if is_act(grandchild):
+                    act_count += 1
+                    container = new_fragment(grandchild.get("id") or f"acto{act_count}", text, part, child)
+                container.append(grandchild)
+    return fragments
+
+
+def build_split_preview(tei_content: str, fragments_url: str):
+    """
+    Prepara la vista previa por fragmentos.
+
+    Args:
+        tei_content: Documento TEI/XML como cadena.
+        fragments_url: Ruta relativa (desde la página) de la carpeta de fragmentos.
+
+    Returns:
+        tuple[str, dict]: (HTML de la página, {nombre del fragmento: contenido del .js}).
+    """
+    tei_root = parse_tei(tei_content)
+    navigation = build_navigation(tei_root)
+    title = document_title(tei_root, navigation)
+    fragments = split_tei_fragments(tei_root)
+
+    nav_ids = {item.id for item in navigation}
+    nav_fragments = {}
+    for fragment in fragments:
+        for element in fragment.root.xpath(".//*[@id]"):
+            if element.get("id") in nav_ids:
+                nav_fragments[element.get("id")] = fragment.name
+    search_index = build_search_index(None, fragments)
+
+    scripts = {
+        fragment.name: f"fenixFragment({json.dumps(fragment.name)}, "
+                       f"{json.dumps(serialize_tei(fragment.root), ensure_ascii=False)});\n"
+        for fragment in fragments
+    }
+    sections = "\n".join(
+        f'        <section class="tei-fragment" id="frag-{html.escape(fragment.name)}" '
+        f'data-fragment="{html.escape(fragment.name)}"></section>'
+        for fragment in fragments
+    )
+    page_scripts = "\n    ".join(
+        f"<script>\n    {load_resource(name)}\n    </script>" for name in SPLIT_RESOURCES
+    )
+
+    page = f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <title>{html.escape(title)}</title>
+    <style>
+    {load_resource("resources/estilos.css")}
+    </style>
+</head>
+<body>
+    <!-- Botón de toggle del menú -->
+    <button id="nav-toggle" class="nav-toggle-btn" title="Mostrar/Ocultar menú">☰</button>
+    
+    <!-- Menú de navegación lateral (precalculado; cada enlace indica su fragmento) -->
+    <nav id="nav-menu">
+        <div class="nav-header">
+            <span class="nav-title">Navegación</span>
+        </div>
+        {SEARCH_BOX_HTML}
+        <ul id="nav-list">
+{render_navigation(navigation, nav_fragments)}
+        </ul>
+    </nav>
+    
+    <!-- Un hueco por fragmento: se rellenan al acercarse a la vista o desde el menú -->
+    <div id="tei" data-fragments="{html.escape(fragments_url)}">
+{sections}
+    </div>
+
+    <script type="application/json" id="search-index">{search_index_json(search_index)}</script>
+    {page_scripts}
+</body>
+</html>
+"""
+    return page, scripts
+
+
+def write_split_preview(tei_content: str, output_path) -> list[str]:
+    """
+    Escribe la vista previa por fragmentos: la página en output_path y un .js por
+    fragmento en la carpeta "<nombre>_fragmentos" junto a ella. Los fragmentos se
+    cargan con <script> (no con fetch) para que funcione también desde file://.
+
+    Returns:
+        list[str]: Rutas escritas, la página la primera.
+    """
+    output_path = os.path.abspath(output_path)
+    fragments_dirname = f"{os.path.splitext(os.path.basename(output_path))[0]}_fragmentos"
+    fragments_dir = os.path.join(os.path.dirname(output_path), fragments_dirname)
+    page, scripts = build_split_preview(tei_content, f"{fragments_dirname}/")
+
+    os.makedirs(fragments_dir, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(page)
+    written = [output_path]
+    for name, script in scripts.items():
+        path = os.path.join(fragments_dir, f"{name}.js")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(script)
+        written.append(path)
+    return written
+
+
+# --- Escritura de la vista previa
+PREVIEW_MODES = ("ceteicean", "static", "split")
+
+
+def write_preview_file(tei_content: str, mode: str = "ceteicean") -> str:
+    """
+    Escribe la vista previa en una ubicación temporal y devuelve la ruta de la página
+    para abrirla en el navegador.
+
+    Args:
+        tei_content: Documento TEI/XML como cadena.
+        mode: "ceteicean" (render en el navegador), "static" (XSLT en Python) o
+            "split" (página y fragmentos en una carpeta temporal propia).
+    """
+    if mode not in PREVIEW_MODES:
+        raise ValueError(f"Modo de vista previa desconocido: {mode}")
+    if mode == "split":
+        preview_dir = tempfile.mkdtemp(prefix="fenix_preview_")
+        return write_split_preview(tei_content, os.path.join(preview_dir, "vista_previa.html"))[0]
+
+    html_content = build_static_html(tei_content) if mode == "static" else build_preview_html(tei_content)
+    with tempfile.NamedTemporaryFile("w", delete=False, suffix=".html", encoding="utf-8") as tmp_file:
+        tmp_file.write(html_content)
+    return tmp_file.name
@@ -0,0 +1,211 @@
+# ==========================================
+# feniX-ML: Perfilado opcional de conversión y validación
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Cuando se activa (variable de entorno FENIXML_PROFILE, opción --profile de
+#              la CLI o menú Depuración de la GUI), cada ejecución de convert_docx_to_tei o
+#              collect_validation_findings escribe en la carpeta indicada:
+#                - <etiqueta>.prof: estadísticas de cProfile (pstats, snakeviz...).
+#                - <etiqueta>.collapsed: pilas muestreadas en formato "a;b;c N"
+#                  (flamegraph.pl, speedscope, inferno), con la fase como segundo marco.
+#                - <etiqueta>.json: hashes de los DOCX de entrada y límites de cada fase.
+#              La etiqueta es tipo_fecha_hash de las entradas_pid-número de sesión.
+#              Desactivado no cuesta nada: mark_stage solo consulta una variable.
+# ==========================================
+
+# --- Importaciones
+import cProfile
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+PROFILE_ENV_VAR = "FENIXML_PROFILE"
+SAMPLE_INTERVAL = 0.002
+
+_profile_directory: Optional[str] = None
+_local = threading.local()
+# Número de sesión dentro del proceso: junto con el pid distingue en la etiqueta dos
+# ejecuciones iguales en el mismo segundo (workers del daemon, procesos de la GUI)
+_session_numbers = itertools.count(1)
+
+# Rutas escritas en este proceso (la CLI las añade a su informe JSON)
+written_profiles: list[str] = []
+
+
+# --- Activación
+def set_profile_directory(directory: Optional[str]) -> None:
+    """
+    Activa el perfilado para este proceso escribiendo en `directory`. Con None se vuelve
+    a lo que diga la variable de entorno FENIXML_PROFILE.
+    """
+    global _profile_directory
+    _profile_directory = directory
+
+
+def get_profile_directory() -> Optional[str]:
+    return _profile_directory or os.environ.get(PROFILE_ENV_VAR) or None
+
+
+# --- Fases
+def mark_stage(name: str) -> None:
+    """
+    Cierra la fase en curso de la ejecución perfilada y abre `name`. Sin perfilado no hace nada.
+    """
+    session = getattr(_local, "session", None)
+    if session is not None:
+        session.mark_stage(name)
+
+
+def hash_file(path) -> Optional[str]:
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class ProfileSession:
+    """
+    Una ejecución perfilada: cProfile en el hilo que la lanza y un hilo que muestrea su
+    pila cada SAMPLE_INTERVAL segundos para las pilas colapsadas.
+    """
+
+    def __init__(self, kind: str, inputs: dict):
+        self.kind = kind
+        self.inputs = {
+            role: {"path": os.path.abspath(path), "sha256": hash_file(path)}
+            for role, path in inputs.items() if path
+        }
+        self.stages: list[dict] = []
+        self.stage = "inicio"
+        self.samples: Counter = Counter()
+        self.profiler = cProfile.Profile()
+        self.number = next(_session_numbers)
+        self._thread_id = threading.get_ident()
+        self._root_code = None
+        self._target_code = None
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name="fenixml-profile-sampler", daemon=True)
+
+    @property
+    def tag(self) -> str:
+        combined = hashlib.sha256("".join(
+            info["sha256"] or "" for _, info in sorted(self.inputs.items())
+        ).encode("ascii")).hexdigest()
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))
+        return f"{self.kind}_{stamp}_{combined[:8]}_{os.getpid()}-{self.number}"
+
+    def start(self, root_code, target_code) -> None:
+        # Solo se guardan los marcos por debajo de la función perfilada (`target_code`,
+        # llamada desde el envoltorio `root_code`)
+        self._root_code = root_code
+        self._target_code = target_code
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.mark_stage(self.stage)
+        self._sampler.start()
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+        self._stop.set()
+        self._sampler.join()
+        self._close_stage(time.perf_counter())
+        self.total_seconds = time.perf_counter() - self._t0
+
+    def mark_stage(self, name: str) -> None:
+        now = time.perf_counter()
+        self._close_stage(now)
+        self.stage = name
+        self.stages.append({"name": name, "start": now - self._t0})
+
+    def _close_stage(self, now: float) -> None:
+        if self.stages and "end" not in self.stages[-1]:
+            self.stages[-1]["end"] = now - self._t0
+            self.stages[-1]["seconds"] = self.stages[-1]["end"] - self.stages[-1]["start"]
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            code = None
+            while frame is not None and frame.f_code is not self._root_code:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            # Fuera de la función perfilada (el propio arranque o cierre de la sesión)
+            if frame is None or code is not self._target_code:
+                continue
+            stack.append(self.stage)
+            stack.append(self.kind)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, directory: str) -> list[str]:
+        """
+        Escribe .prof, .collapsed y .json en `directory` y devuelve sus rutas.
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.tag)
+        prof_path, collapsed_path, meta_path = f"{base}.prof", f"{base}.collapsed", f"{base}.json"
+
+        self.profiler.dump_stats(prof_path)
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "kind": self.kind,
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+                "total_seconds": self.total_seconds,
+                "python": sys.version.split()[0],
+                "inputs": self.inputs,
+                "stages": self.stages,
+                "sample_interval": SAMPLE_INTERVAL,
+                "samples": sum(self.samples.values()),
+                "files": {"prof": prof_path, "collapsed": collapsed_path},
+            }, f, ensure_ascii=False, indent=2)
+        return [prof_path, collapsed_path, meta_path]
+
+
+# --- Decorador
+def profiled(kind: str, inputs: tuple):
+    """
+    Perfila la función decorada cuando el perfilado está activo. `inputs` son los nombres
+    de los parámetros con rutas de DOCX cuyo hash identifica la ejecución. Las llamadas
+    anidadas (p.ej. validación dentro de una ejecución ya perfilada) no abren otra sesión.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            directory = get_profile_directory()
+            if not directory or getattr(_local, "session", None) is not None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            session = ProfileSession(kind, {name: bound.arguments.get(name) for name in inputs})
+            _local.session = session
+            session.start(sys._getframe().f_code, func.__code__)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                session.stop()
+                _local.session = None
+                paths = session.write(directory)
+                written_profiles.extend(paths)
+                print(f"Perfil guardado en {paths[0]}", file=sys.stderr)
+
+        return wrapper
+    return decorator
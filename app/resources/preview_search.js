@@ -0,0 +1,161 @@
+// feniX-ML: búsqueda en la vista previa.
+// El índice (token normalizado → entradas) lo precalcula preview_html.py y llega en
+// <script id="search-index">; la búsqueda no recorre el DOM: solo se consulta el índice
+// y se salta al id del resultado.
+document.addEventListener("DOMContentLoaded", function() {
+    const input = document.getElementById("search-input");
+    const results = document.getElementById("search-results");
+    const MAX_RESULTS = 50;
+    const SNIPPET_LENGTH = 90;
+    let index = null;
+
+    // Misma normalización que normalize_text_for_matching (tei_backend.py)
+    function normalize(text) {
+        return text.normalize("NFKD")
+            .replace(/[^\x00-\x7f]/g, "")
+            .toLowerCase()
+            .replace(/[^a-z0-9\s]+/g, " ")
+            .replace(/\s+/g, " ")
+            .trim();
+    }
+
+    // El JSON se analiza la primera vez que se busca, no al abrir la página
+    function loadIndex() {
+        if (!index) {
+            const data = JSON.parse(document.getElementById("search-index").textContent);
+            index = {
+                docs: data.docs,
+                tokens: data.terms.map(term => term[0]),
+                postings: new Map(data.terms),
+            };
+        }
+        return index;
+    }
+
+    // Entradas cuyos tokens empiezan por `prefix` (los tokens vienen ordenados)
+    function prefixPostings(prefix) {
+        const tokens = index.tokens;
+        let low = 0;
+        let high = tokens.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (tokens[mid] < prefix) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        const found = new Set();
+        for (let i = low; i < tokens.length && tokens[i].startsWith(prefix); i++) {
+            index.postings.get(tokens[i]).forEach(doc => found.add(doc));
+        }
+        return Array.from(found).sort((a, b) => a - b);
+    }
+
+    function search(query) {
+        const words = normalize(query).split(" ").filter(Boolean);
+        if (!words.length) {
+            return [];
+        }
+        loadIndex();
+        // Todas las palabras deben aparecer; la última se completa como prefijo
+        let matches = prefixPostings(words[words.length - 1]);
+        for (const word of words.slice(0, -1)) {
+            const postings = new Set(index.postings.get(word) || []);
+            matches = matches.filter(doc => postings.has(doc));
+        }
+        return matches;
+    }
+
+    // Fragmento del resultado leído del propio elemento (sin el contenido de sus notas)
+    function snippetFor(target, kind) {
+        let node = target;
+        if (kind === "verso") {
+            node = target.cloneNode(true);
+            node.querySelectorAll("tei-note").forEach(note => note.remove());
+        }
+        const text = node.textContent.replace(/\s+/g, " ").trim();
+        return text.length > SNIPPET_LENGTH ? text.slice(0, SNIPPET_LENGTH) + "…" : text;
+    }
+
+    function render(matches) {
+        results.innerHTML = "";
+        matches.slice(0, MAX_RESULTS).forEach(docIndex => {
+            const [id, kind, label] = index.docs[docIndex];
+            const li = document.createElement("li");
+            li.className = "search-result search-" + kind;
+            const a = document.createElement("a");
+            a.href = "#" + id;
+            a.dataset.doc = docIndex;
+            a.textContent = label;
+            li.appendChild(a);
+            const target = document.getElementById(id);
+            if (target && kind !== "personaje") {
+                const span = document.createElement("span");
+                span.className = "search-snippet";
+                span.textContent = snippetFor(target, kind);
+                li.appendChild(span);
+            }
+            results.appendChild(li);
+        });
+        if (matches.length > MAX_RESULTS) {
+            const li = document.createElement("li");
+            li.className = "search-more";
+            li.textContent = "… y " + (matches.length - MAX_RESULTS) + " resultados más";
+            results.appendChild(li);
+        }
+    }
+
+    let pending = null;
+    input.addEventListener("input", function() {
+        clearTimeout(pending);
+        pending = setTimeout(() => render(search(input.value)), 150);
+    });
+
+    // Fragmento que contiene una entrada (vista previa por fragmentos)
+    function fragmentOf(docIndex) {
+        let name = null;
+        for (const [fragment, start] of index.fragments) {
+            if (start > docIndex) {
+                break;
+            }
+            name = fragment;
+        }
+        return name;
+    }
+
+    function reveal(id) {
+        const target = document.getElementById(id);
+        if (!target) {
+            return;
+        }
+        target.scrollIntoView({ behavior: "smooth", block: "center" });
+        target.classList.add("nav-highlight");
+        setTimeout(() => target.classList.remove("nav-highlight"), 1500);
+    }
+
+    results.addEventListener("click", function(e) {
+        const link = e.target.closest("a");
+        if (!link) {
+            return;
+        }
+        e.preventDefault();
+        const id = link.getAttribute("href").slice(1);
+        if (!document.getElementById(id) && index.fragments && window.fenixLoadFragment) {
+            window.fenixLoadFragment(fragmentOf(Number(link.dataset.doc))).then(() => reveal(id));
+        } else {
+            reveal(id);
+        }
+    });
+
+    // "/" abre el menú y pone el foco en la búsqueda
+    document.addEventListener("keydown", function(e) {
+        if (e.key !== "/" || e.target === input) {
+            return;
+        }
+        e.preventDefault();
+        document.getElementById("nav-menu").classList.add("nav-open");
+        document.body.classList.add("nav-open");
+        input.focus();
+    });
+});
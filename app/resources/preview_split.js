@@ -0,0 +1,91 @@
+// feniX-ML: vista previa por fragmentos (carga diferida).
+// Cada fragmento (teiHeader, prólogo, comedia, acto1…) es un .js que llama a
+// fenixFragment(nombre, tei). Se cargan con <script> para que funcione desde file://:
+// el primero al abrir la página, el resto al acercarse a la vista o desde el menú.
+(function() {
+    const requests = new Map();   // nombre → Promise del fragmento
+    const resolvers = new Map();
+
+    // Llamado por cada archivo de fragmento al cargarse
+    window.fenixFragment = function(name, teiContent) {
+        const section = document.getElementById("frag-" + name);
+        if (!section.hasChildNodes()) {
+            section.appendChild(new CETEI().makeHTML5(teiContent));
+        }
+        const resolve = resolvers.get(name);
+        if (resolve) {
+            resolvers.delete(name);
+            resolve(section);
+        }
+    };
+
+    function loadFragment(name) {
+        if (!requests.has(name)) {
+            requests.set(name, new Promise(function(resolve, reject) {
+                resolvers.set(name, resolve);
+                const script = document.createElement("script");
+                script.src = document.getElementById("tei").dataset.fragments + name + ".js";
+                script.onerror = () => reject(new Error("No se pudo cargar el fragmento " + name));
+                document.body.appendChild(script);
+            }));
+        }
+        return requests.get(name);
+    }
+    // También lo usa la búsqueda para saltar a resultados de actos aún no cargados
+    window.fenixLoadFragment = loadFragment;
+
+    function reveal(id) {
+        const target = document.getElementById(id);
+        if (!target) {
+            return;
+        }
+        target.scrollIntoView({ behavior: "smooth", block: "start" });
+
+        // Resaltar brevemente la sección
+        target.classList.add("nav-highlight");
+        setTimeout(() => target.classList.remove("nav-highlight"), 1500);
+    }
+
+    document.addEventListener("DOMContentLoaded", function() {
+        const navMenu = document.getElementById("nav-menu");
+        const sections = Array.from(document.querySelectorAll(".tei-fragment"));
+
+        if (sections.length) {
+            loadFragment(sections[0].dataset.fragment);
+        }
+
+        // Los huecos vacíos ocupan una pantalla: solo se carga el que se acerca a la vista
+        if ("IntersectionObserver" in window) {
+            const observer = new IntersectionObserver(function(entries) {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
+                        observer.unobserve(entry.target);
+                        loadFragment(entry.target.dataset.fragment);
+                    }
+                });
+            }, { rootMargin: "200px 0px" });
+            sections.slice(1).forEach(section => observer.observe(section));
+        } else {
+            sections.slice(1).forEach(section => loadFragment(section.dataset.fragment));
+        }
+
+        document.getElementById("nav-toggle").addEventListener("click", function() {
+            navMenu.classList.toggle("nav-open");
+            document.body.classList.toggle("nav-open");
+        });
+
+        document.getElementById("nav-list").addEventListener("click", function(e) {
+            const link = e.target.closest("a");
+            if (!link) {
+                return;
+            }
+            e.preventDefault();
+            const id = link.getAttribute("href").slice(1);
+            if (link.dataset.fragment) {
+                loadFragment(link.dataset.fragment).then(() => reveal(id));
+            } else {
+                reveal(id);
+            }
+        });
+    });
+})();
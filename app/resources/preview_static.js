@@ -0,0 +1,38 @@
+// feniX-ML: comportamiento de las páginas HTML estáticas (menú y notas).
+// El TEI ya llega transformado y el menú precalculado: aquí solo se enlazan eventos,
+// delegados en el documento para no recorrer los elementos al cargar.
+document.addEventListener("DOMContentLoaded", function() {
+    const navMenu = document.getElementById("nav-menu");
+
+    document.getElementById("nav-toggle").addEventListener("click", function() {
+        navMenu.classList.toggle("nav-open");
+        document.body.classList.toggle("nav-open");
+    });
+
+    document.getElementById("nav-list").addEventListener("click", function(e) {
+        const link = e.target.closest("a");
+        if (!link) {
+            return;
+        }
+        const target = document.getElementById(link.getAttribute("href").slice(1));
+        if (!target) {
+            return;
+        }
+        e.preventDefault();
+        target.scrollIntoView({ behavior: "smooth", block: "start" });
+
+        // Resaltar brevemente la sección
+        target.classList.add("nav-highlight");
+        setTimeout(() => target.classList.remove("nav-highlight"), 1500);
+    });
+
+    document.getElementById("tei").addEventListener("click", function(e) {
+        const sup = e.target.closest(".sup-nota, .sup-aparato");
+        if (!sup) {
+            return;
+        }
+        const note = sup.closest("tei-note");
+        const content = note.querySelector(":scope > cetei-original");
+        showNoteModal(content.innerHTML.trim(), note.getAttribute("subtype"));
+    });
+});
@@ -0,0 +1,103 @@
+<?xml version="1.0" encoding="UTF-8"?>
+<!--
+  feniX-ML: TEI/XML -> HTML estático
+  Reproduce en el servidor la salida de CETEIcean (elementos tei-*, atributos originales,
+  notas como llamadas con el contenido oculto) para que estilos.css y el modal de notas
+  funcionen igual sin ejecutar makeHTML5 en el navegador.
+-->
+<xsl:stylesheet version="1.0"
+    xmlns:xsl="http://www.w3.org/1999/XSL/Transform"
+    xmlns:tei="http://www.tei-c.org/ns/1.0"
+    exclude-result-prefixes="tei">
+
+  <xsl:output method="html" encoding="UTF-8"/>
+
+  <xsl:variable name="upper" select="'ABCDEFGHIJKLMNOPQRSTUVWXYZ'"/>
+  <xsl:variable name="lower" select="'abcdefghijklmnopqrstuvwxyz'"/>
+
+  <xsl:template match="/">
+    <xsl:apply-templates select="*"/>
+  </xsl:template>
+
+  <!-- Atributos comunes: los originales más id, lang y class como hace CETEIcean -->
+  <xsl:template name="tei-attributes">
+    <xsl:if test="@xml:id">
+      <xsl:attribute name="id"><xsl:value-of select="@xml:id"/></xsl:attribute>
+    </xsl:if>
+    <xsl:if test="@xml:lang">
+      <xsl:attribute name="lang"><xsl:value-of select="@xml:lang"/></xsl:attribute>
+    </xsl:if>
+    <xsl:if test="@rendition">
+      <xsl:attribute name="class"><xsl:value-of select="translate(@rendition, '#', '')"/></xsl:attribute>
+    </xsl:if>
+    <!-- Copiado después: un id asignado por el menú de navegación tiene prioridad -->
+    <xsl:copy-of select="@*"/>
+    <xsl:attribute name="data-origname"><xsl:value-of select="local-name()"/></xsl:attribute>
+    <xsl:if test="not(node())">
+      <xsl:attribute name="data-empty"/>
+    </xsl:if>
+  </xsl:template>
+
+  <xsl:template match="tei:*">
+    <xsl:element name="{concat('tei-', translate(local-name(), $upper, $lower))}">
+      <xsl:call-template name="tei-attributes"/>
+      <xsl:if test="self::tei:head">
+        <xsl:attribute name="data-level"><xsl:value-of select="count(ancestor::*[tei:head])"/></xsl:attribute>
+      </xsl:if>
+      <xsl:apply-templates/>
+    </xsl:element>
+  </xsl:template>
+
+  <!-- Notas: llamada con icono y contenido oculto que abre el modal -->
+  <xsl:template match="tei:note">
+    <tei-note>
+      <xsl:call-template name="tei-attributes"/>
+      <xsl:choose>
+        <xsl:when test="@subtype = 'aparato'">
+          <sup class="sup-aparato"><svg width="0.9em" height="0.9em" viewBox="0 0 100 100"><rect x="10" y="10" width="80" height="80" fill="none" stroke="currentColor" stroke-width="14"/></svg></sup>
+        </xsl:when>
+        <xsl:otherwise>
+          <sup class="sup-nota"><svg width="0.9em" height="0.9em" viewBox="0 0 100 100"><circle cx="50" cy="50" r="45" fill="none" stroke="currentColor" stroke-width="14"/></svg></sup>
+        </xsl:otherwise>
+      </xsl:choose>
+      <cetei-original hidden="" data-original="">
+        <xsl:apply-templates/>
+      </cetei-original>
+    </tei-note>
+  </xsl:template>
+
+  <!-- Enlaces -->
+  <xsl:template match="tei:ref[@target]">
+    <tei-ref>
+      <xsl:call-template name="tei-attributes"/>
+      <a href="{@target}"><xsl:apply-templates/></a>
+    </tei-ref>
+  </xsl:template>
+
+  <xsl:template match="tei:ptr[@target]">
+    <tei-ptr>
+      <xsl:call-template name="tei-attributes"/>
+      <a href="{@target}"><xsl:value-of select="@target"/></a>
+    </tei-ptr>
+  </xsl:template>
+
+  <xsl:template match="tei:graphic[@url]">
+    <tei-graphic>
+      <xsl:call-template name="tei-attributes"/>
+      <img src="{@url}">
+        <xsl:copy-of select="@width | @height"/>
+      </img>
+    </tei-graphic>
+  </xsl:template>
+
+  <!-- Elementos de otros espacios de nombres y comentarios -->
+  <xsl:template match="*">
+    <xsl:copy>
+      <xsl:copy-of select="@*"/>
+      <xsl:apply-templates/>
+    </xsl:copy>
+  </xsl:template>
+
+  <xsl:template match="comment() | processing-instruction()"/>
+
+</xsl:stylesheet>
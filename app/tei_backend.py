@@ -7,10 +7,19 @@
 # ==========================================
 
 # --- Importaciones
+import contextlib
+import csv
+import gc
+import hashlib
+import io
+import json
 import os
 import re
+import threading
+import time
 import unicodedata
 import zipfile
+from bisect import bisect_left
 import lxml.etree as etree
 from docx import Document
 from docx.oxml.table import CT_Tbl
@@ -21,12 +30,107 @@ from docx.text.hyperlink import Hyperlink
 from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 from difflib import get_close_matches
-from typing import Any, Optional, TypedDict, cast
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+from profiling import get_profile_directory, mark_stage, profiled
 
 APP_VERSION = "1.3.1"
 TABLE_HEADER_MARKER = "^"
 
 
+# --- Caché de entradas ya analizadas
+class ParsedInputCache:
+    """
+    Caché LRU de resultados derivados de archivos de entrada (notas, aparato, metadatos,
+    notas al pie del prólogo, párrafos para validar). La clave incluye la ruta absoluta,
+    el mtime y el tamaño del archivo, así que editar el DOCX invalida la entrada.
+
+    Está desactivada por defecto; la activan procesos de larga duración (p.ej. el daemon)
+    con set_parsed_input_cache(). Los valores se comparten entre peticiones y no deben
+    modificarse.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_key(path) -> tuple:
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    def get_or_compute(self, kind: str, path, compute, *args):
+        key = (kind, self.file_key(path), args)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # El cálculo se hace fuera del lock: dos peticiones simultáneas pueden
+        # analizar el mismo archivo, pero nunca se bloquean entre sí
+        value = compute(path, *args)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_parsed_input_cache: Optional[ParsedInputCache] = None
+_scoped_input_cache = threading.local()
+
+
+def set_parsed_input_cache(cache: Optional[ParsedInputCache]) -> None:
+    """
+    Activa (o desactiva con None) la caché de entradas para todo el proceso.
+    """
+    global _parsed_input_cache
+    _parsed_input_cache = cache
+
+
+@contextlib.contextmanager
+def parsed_input_scope():
+    """
+    Dentro del bloque, y solo en este hilo, los análisis de entradas se reutilizan
+    aunque no haya caché global: así validación y conversión de una misma llamada leen
+    notas, aparato y metadatos una sola vez.
+    """
+    previous = getattr(_scoped_input_cache, "cache", None)
+    _scoped_input_cache.cache = previous or ParsedInputCache()
+    try:
+        yield
+    finally:
+        _scoped_input_cache.cache = previous
+
+
+def cached_parse(kind: str, path, compute, *args):
+    """
+    Devuelve compute(path, *args), reutilizando el resultado si la caché está activa
+    y el archivo no ha cambiado desde el último análisis.
+    """
+    cache = _parsed_input_cache or getattr(_scoped_input_cache, "cache", None)
+    if cache is None or not path or not os.path.exists(path):
+        return compute(path, *args)
+    return cache.get_or_compute(kind, path, compute, *args)
+
+
 # --- Funciones de escape XML
 def escape_xml(text):
     """
@@ -79,10 +183,15 @@ def render_hyperlink_content(target, rendered_runs):
 # --- Extracción y procesamiento de notas en el prólogo
 # Funciones para extraer y procesar notas a pie de página del prólogo o introducción.
 
-def extract_intro_footnotes(docx_path):
+def extract_intro_footnotes(docx_path, referenced_ids=None):
     """
-    Extrae todas las notas a pie de página de un archivo DOCX, preservando cursivas.
+    Extrae las notas a pie de página de un archivo DOCX, preservando cursivas.
     Devuelve un diccionario {id: note_text} con formato TEI (incluyendo <hi rend="italic">).
+
+    footnotes.xml se lee en streaming: cada w:footnote se renderiza al cerrarse y se
+    libera a continuación. Con `referenced_ids` solo se renderizan esas notas (ver
+    collect_footnote_reference_ids), de modo que el coste depende de las notas usadas
+    y no del tamaño de footnotes.xml.
     """
     ns = {
         "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
@@ -90,33 +199,55 @@ def extract_intro_footnotes(docx_path):
         "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
     }
     footnote_dict = {}
+    footnote_tag = qn("w:footnote")
+    type_attr = qn("w:type")
+    id_attr = qn("w:id")
 
     with zipfile.ZipFile(docx_path) as docx_zip:
         footnote_relationships = extract_footnote_relationships(docx_zip, ns)
         with docx_zip.open("word/footnotes.xml") as footnote_file:
-            root = etree.parse(footnote_file).getroot()
-
-            for note in root.xpath("//w:footnote[not(@w:type='separator')]", namespaces=ns):
-                note_id = note.get(qn("w:id"))
-                
-                parts = []
-                for child in note.iterchildren():
-                    if child.tag == qn("w:p"):
-                        paragraph_text = render_intro_footnote_paragraph(child, ns, footnote_relationships)
-                        if paragraph_text:
-                            parts.append(paragraph_text)
-                    elif child.tag == qn("w:tbl"):
-                        table_text = render_simple_wml_table(child, ns, footnote_relationships)
-                        if table_text:
-                            parts.append(table_text)
-                
-                full_text = "".join(parts)
-                if full_text.strip():
-                    footnote_dict[note_id] = full_text.strip()
+            for _, note in etree.iterparse(footnote_file, events=("end",), tag=footnote_tag):
+                note_id = note.get(id_attr)
+                if note.get(type_attr) != "separator" and (referenced_ids is None or note_id in referenced_ids):
+                    parts = []
+                    for child in note.iterchildren():
+                        if child.tag == qn("w:p"):
+                            paragraph_text = render_intro_footnote_paragraph(child, ns, footnote_relationships)
+                            if paragraph_text:
+                                parts.append(paragraph_text)
+                        elif child.tag == qn("w:tbl"):
+                            table_text = render_simple_wml_table(child, ns, footnote_relationships)
+                            if table_text:
+                                parts.append(table_text)
+
+                    full_text = "".join(parts)
+                    if full_text.strip():
+                        footnote_dict[note_id] = full_text.strip()
+
+                # Libera la nota ya procesada y las anteriores que sigan colgando de la raíz
+                note.clear()
+                parent = note.getparent()
+                while note.getprevious() is not None:
+                    del parent[0]
 
     return footnote_dict
 
 
+def collect_footnote_reference_ids(blocks) -> frozenset:
+    """
+    IDs de w:footnoteReference presentes en una lista de bloques python-docx
+    (párrafos o tablas), p.ej. el front-matter.
+    """
+    reference_tag = qn("w:footnoteReference")
+    id_attr = qn("w:id")
+    return frozenset(
+        reference.get(id_attr)
+        for block in blocks
+        for reference in block._element.iter(reference_tag)
+        if reference.get(id_attr)
+    )
+
+
 def extract_footnote_relationships(docx_zip, ns):
     """
     Lee word/_rels/footnotes.xml.rels para resolver hipervÃ­nculos de footnotes.xml.
@@ -140,7 +271,7 @@ def render_wml_run(run, ns):
     """
     Renderiza un run WML de una nota al pie del prólogo.
     """
-    is_italic = run.xpath(".//w:i", namespaces=ns) or run.xpath(".//w:iCs", namespaces=ns)
+    is_italic = next(run.iter(qn("w:i"), qn("w:iCs")), None) is not None
     run_parts = []
 
     for child in run.iterchildren():
@@ -155,7 +286,7 @@ def render_wml_run(run, ns):
     if not run_text:
         return ""
 
-    return render_text_chunk(run_text, italic=bool(is_italic))
+    return render_text_chunk(run_text, italic=is_italic)
 
 
 def render_wml_hyperlink(hyperlink, ns, relationships):
@@ -379,18 +510,428 @@ def normalize_text_for_matching(text: str) -> str:
     return normalized
 
 
-class PendingSplitVerse(TypedDict):
+# --- Seguimiento de versos partidos
+SPLIT_MISSING_FINAL = "Falta 'Partido_final' después de 'Partido_inicial'."
+SPLIT_MISSING_INITIAL_FOR_MEDIO = "Falta 'Partido_inicial' antes de este 'Partido_medio'."
+SPLIT_MISSING_INITIAL_FOR_FINAL = "Falta 'Partido_inicial' o 'Partido_medio' previo."
+
+
+class SplitVerseIssue(NamedTuple):
     verse_number: int
-    initial_text: str
-    parts: list[str]
-    has_notes: bool
+    para_index: Optional[int]
+    style: str
+    text: str
+    problem: str
+
+
+class SplitVerseGroup:
+    """
+    Verso partido en curso: número base, posición del Partido_inicial y partes vistas.
+    """
+    __slots__ = ("verse_number", "para_index", "initial_text", "parts", "next_part_index", "closed")
+
+    def __init__(self, verse_number, para_index, initial_text):
+        self.verse_number = verse_number
+        self.para_index = para_index
+        self.initial_text = initial_text
+        self.parts = [initial_text]
+        self.next_part_index = 1
+        self.closed = False
+
+
+class SplitVerseTracker:
+    """
+    Máquina de estados lineal para versos partidos, compartida por la conversión y
+    la validación. Cada párrafo se procesa en O(1):
+
+    - Una pila de grupos abiertos detecta Partido_inicial sin Partido_final antes
+      del siguiente verso numerado.
+    - El último estilo que incrementó la numeración decide si un Partido_medio o
+      Partido_final tiene un inicial previo válido.
+    - `anchor` es el grupo que da número base y sufijo (329a, 329b...) a las
+      partes siguientes; solo se libera con un Partido_final o un nuevo inicial.
+    """
+
+    def __init__(self):
+        self.open_groups: list[SplitVerseGroup] = []
+        self.anchor: Optional[SplitVerseGroup] = None
+        self.issues: list[SplitVerseIssue] = []
+        self.verse_count = 0
+        self.initial_count = 0
+        self.complete_count = 0
+        self._last_numbered_style: Optional[str] = None
+        self._medio_since_numbered = False
+
+    def _resolve_open_groups(self) -> None:
+        while self.open_groups:
+            group = self.open_groups.pop()
+            if not group.closed:
+                self.issues.append(SplitVerseIssue(
+                    group.verse_number, group.para_index, "Partido_inicial",
+                    group.initial_text, SPLIT_MISSING_FINAL
+                ))
+
+    def verse(self, verse_number, para_index=None, text="") -> None:
+        """
+        Registra un Verso normal: cierra (con error) cualquier inicial sin final.
+        """
+        self._resolve_open_groups()
+        self.verse_count += 1
+        self._last_numbered_style = "Verso"
+        self._medio_since_numbered = False
+
+    def start(self, verse_number, para_index=None, text="") -> SplitVerseGroup:
+        """
+        Registra un Partido_inicial y lo convierte en el ancla de numeración.
+        """
+        self._resolve_open_groups()
+        group = SplitVerseGroup(verse_number, para_index, text)
+        self.open_groups.append(group)
+        self.anchor = group
+        self.initial_count += 1
+        self._last_numbered_style = "Partido_inicial"
+        self._medio_since_numbered = False
+        return group
+
+    def continue_part(self, style, fallback_verse_number, para_index=None, text="") -> tuple[int, int]:
+        """
+        Registra un Partido_medio o Partido_final.
+
+        Devuelve (número base, índice de parte) para el sufijo alfabético. Sin ancla
+        se usa `fallback_verse_number` con índice 1, como en secuencias sin inicial.
+        """
+        is_final = style == "Partido_final"
+        valid = self._last_numbered_style == "Partido_inicial" or (is_final and self._medio_since_numbered)
+        if not valid:
+            self.issues.append(SplitVerseIssue(
+                fallback_verse_number, para_index, style, text,
+                SPLIT_MISSING_INITIAL_FOR_FINAL if is_final else SPLIT_MISSING_INITIAL_FOR_MEDIO
+            ))
+
+        if self.open_groups and not self.open_groups[-1].closed:
+            self.open_groups[-1].parts.append(text)
+            if is_final:
+                self.open_groups[-1].closed = True
+                self.complete_count += 1
+        if not is_final:
+            self._medio_since_numbered = True
+
+        anchor = self.anchor
+        if anchor is None:
+            return fallback_verse_number, 1
+        part_index = anchor.next_part_index
+        if is_final:
+            self.anchor = None
+        else:
+            anchor.next_part_index += 1
+        return anchor.verse_number, part_index
+
+    def finish(self) -> list[SplitVerseIssue]:
+        """
+        Cierra el recorrido y devuelve todos los problemas en orden de documento.
+        """
+        self._resolve_open_groups()
+        return self.issues
+
+    @property
+    def incomplete_count(self) -> int:
+        return self.initial_count - self.complete_count
+
+
+# --- Registro de xml:id
+XML_ID_ATTRIBUTE_PATTERN = re.compile(r'xml:id="([^"]*)"')
+
+
+class IdReference(NamedTuple):
+    target: str
+    element: str
+    paragraph_index: Optional[int]
+    snippet: str
+
+
+class IdRegistry:
+    """
+    Registro central de los xml:id de un documento, compartido por todos los emisores
+    (actos, castList, roles, notas de palabra y de verso, testigos del teiHeader).
+    Cada emisor registra el id en el momento de generarlo, en O(1): un id repetido
+    queda anotado al instante. Las referencias who="#…" se apuntan al emitirlas y se
+    resuelven en finish(), cuando ya se conocen todos los ids, sin recorrer el TEI.
+    """
+    __slots__ = ("owners", "duplicates", "references")
+
+    def __init__(self):
+        self.owners: dict[str, str] = {}
+        self.duplicates: list[IdReference] = []
+        self.references: list[IdReference] = []
+
+    def __contains__(self, xml_id: str) -> bool:
+        return xml_id in self.owners
 
+    def register(self, xml_id: str, element: str, paragraph_index: Optional[int] = None, snippet: str = "") -> str:
+        """
+        Registra `xml_id` como definido por `element` y lo devuelve sin cambios.
+        """
+        if xml_id in self.owners:
+            self.duplicates.append(IdReference(xml_id, element, paragraph_index, snippet))
+        else:
+            self.owners[xml_id] = element
+        return xml_id
+
+    def register_fragment(self, xml: str, element: str) -> None:
+        """
+        Registra los xml:id de un fragmento ya generado (el teiHeader, que puede venir de la caché).
+        """
+        for match in XML_ID_ATTRIBUTE_PATTERN.finditer(xml):
+            self.register(match.group(1), element)
+
+    def refer(self, target: str, element: str, paragraph_index: Optional[int] = None, snippet: str = "") -> str:
+        """
+        Apunta una referencia a `target` (sin '#') y lo devuelve sin cambios.
+        """
+        self.references.append(IdReference(target, element, paragraph_index, snippet))
+        return target
+
+    def finish(self, file: Optional[str] = None) -> list["ValidationFinding"]:
+        """
+        Devuelve los ids duplicados y las referencias sin destino como hallazgos,
+        en orden de documento dentro de cada tipo.
+        """
+        findings = [
+            ValidationFinding(
+                "duplicate_id", "error", file, duplicate.paragraph_index, None, duplicate.snippet,
+                {"xml_id": duplicate.target, "element": duplicate.element,
+                 "first_element": self.owners[duplicate.target]},
+            )
+            for duplicate in self.duplicates
+        ]
+        findings.extend(
+            ValidationFinding(
+                "dangling_reference", "error", file, reference.paragraph_index, None, reference.snippet,
+                {"xml_id": reference.target, "element": reference.element},
+            )
+            for reference in self.references
+            if reference.target not in self.owners
+        )
+        return findings
+
+
+# --- Consumo de notas y aparato
+VERSE_NOTE_KEY_PATTERN = re.compile(r'\d+[a-z]?')
+NOTE_MARKUP_PATTERN = re.compile(r'<[^>]+>')
+
+
+class NoteRequest(NamedTuple):
+    key: Any
+    index: int
+    paragraph_index: Optional[int]
+    snippet: str
+
+
+class TrackedNotes(dict):
+    """
+    Notas o aparato (ver extract_notes_with_italics) que anotan qué entradas llegan al
+    TEI. Cada adjunto se apunta en O(1) con attach()/attach_all(); las anotaciones del
+    texto que piden una entrada que no existe, con request_missing(). Es una copia
+    superficial: las listas son las mismas que las del dict de origen (p. ej. la caché).
+    """
+    __slots__ = ("note_type", "file", "attached", "missing")
+
+    def __init__(self, notes: dict, note_type: str, file: Optional[str] = None):
+        super().__init__(notes)
+        self.note_type = note_type
+        self.file = file
+        self.attached: set[tuple] = set()
+        self.missing: list[NoteRequest] = []
+
+    def attach(self, key, index: int) -> None:
+        self.attached.add((key, index))
+
+    def attach_all(self, key) -> None:
+        for index in range(len(self[key])):
+            self.attached.add((key, index))
+
+    def request_missing(self, key, index: int, paragraph_index: Optional[int] = None, snippet: str = "") -> None:
+        self.missing.append(NoteRequest(key, index, paragraph_index, snippet))
 
-def get_pending_split_verse(state: dict[str, Any]) -> Optional[PendingSplitVerse]:
+
+class NoteUsage:
     """
-    Devuelve el estado tipado del verso partido pendiente, si existe.
+    Seguimiento de notas y aparato de una conversión. render_tei_document envuelve con
+    track() los dicts que carga y finish() devuelve, al terminar, las entradas que no se
+    adjuntaron a ningún elemento (verso inexistente, palabra nunca marcada con @/% o
+    entradas sobrantes de una palabra) y las anotaciones que pidieron una entrada de más.
     """
-    return cast(Optional[PendingSplitVerse], state.get("pending_split_verse"))
+    __slots__ = ("tracked", "last_verse", "main_docx")
+
+    def __init__(self):
+        self.tracked: list[TrackedNotes] = []
+        self.last_verse: Optional[int] = None
+        self.main_docx: Optional[str] = None
+
+    def track(self, notes: dict, note_type: str, file: Optional[str] = None) -> TrackedNotes:
+        tracked = TrackedNotes(notes, note_type, file)
+        self.tracked.append(tracked)
+        return tracked
+
+    def finish(self) -> list["ValidationFinding"]:
+        findings = []
+        for notes in self.tracked:
+            requested = {request.key for request in notes.missing}
+            requested.update(key for key, _ in notes.attached)
+            for key, entries in notes.items():
+                for index, content in enumerate(entries):
+                    if (key, index) in notes.attached:
+                        continue
+                    if isinstance(key, int) or VERSE_NOTE_KEY_PATTERN.fullmatch(key):
+                        reason = "verse"
+                    else:
+                        reason = "surplus" if key in requested else "unmarked"
+                    findings.append(ValidationFinding(
+                        "unattached_note", "warning", notes.file, None,
+                        key if isinstance(key, int) else None,
+                        NOTE_MARKUP_PATTERN.sub("", content),
+                        {"note_type": notes.note_type, "key": key, "entry": index + 1,
+                         "entries": len(entries), "reason": reason, "last_verse": self.last_verse},
+                    ))
+        for notes in self.tracked:
+            findings.extend(
+                ValidationFinding(
+                    "over_requested_note", "warning", self.main_docx, request.paragraph_index, None,
+                    request.snippet,
+                    {"note_type": notes.note_type, "key": request.key, "entry": request.index + 1,
+                     "entries": len(notes.get(request.key, ()))},
+                )
+                for request in notes.missing
+            )
+        return findings
+
+
+# --- Representación compacta de párrafos
+# El cuerpo de la comedia se recorre varias veces (títulos, actos, dramatis, versos).
+# En lugar de mantener vivo todo el árbol de python-docx, se extrae una sola vez a
+# registros con __slots__ que apuntan a un único buffer de texto compartido.
+
+class RunRecord(NamedTuple):
+    text: str
+    italic: bool
+
+
+class ParagraphSnapshot:
+    """
+    Contenedor de columnas compartidas por todos los ParagraphRecord de un documento:
+    - buffer: texto de todos los párrafos y runs concatenado en un único str.
+    - style_names: tabla de nombres de estilo (cada registro guarda solo su índice).
+    - run_ends: offset final de cada run dentro del buffer.
+    """
+    __slots__ = ("buffer", "style_names", "run_ends", "records")
+
+    def __init__(self):
+        self.buffer = ""
+        self.style_names: list[Optional[str]] = []
+        self.run_ends = array("L")
+        self.records: list[ParagraphRecord] = []
+
+
+class ParagraphRecord:
+    """
+    Párrafo ligero e inmutable con la misma interfaz mínima que usa el parseo
+    (text, runs con text/italic y nombre de estilo).
+
+    Los runs de un párrafo ocupan posiciones consecutivas del buffer; si el texto
+    del párrafo coincide con la concatenación de sus runs no se duplica.
+    italic_mask es un bitmap: el bit i indica si el run i está en cursiva.
+    """
+    __slots__ = ("snapshot", "index", "style_id", "text_start", "text_end",
+                 "runs_start", "run_first", "run_count", "italic_mask")
+
+    def __init__(self, snapshot, index, style_id, text_start, text_end, runs_start, run_first, run_count, italic_mask):
+        self.snapshot = snapshot
+        self.index = index
+        self.style_id = style_id
+        self.text_start = text_start
+        self.text_end = text_end
+        self.runs_start = runs_start
+        self.run_first = run_first
+        self.run_count = run_count
+        self.italic_mask = italic_mask
+
+    @property
+    def style_name(self) -> Optional[str]:
+        return self.snapshot.style_names[self.style_id]
+
+    @property
+    def text(self) -> str:
+        return self.snapshot.buffer[self.text_start:self.text_end]
+
+    @property
+    def runs(self) -> list[RunRecord]:
+        snapshot = self.snapshot
+        buffer = snapshot.buffer
+        run_ends = snapshot.run_ends
+        runs = []
+        start = self.runs_start
+        for offset in range(self.run_count):
+            end = run_ends[self.run_first + offset]
+            runs.append(RunRecord(buffer[start:end], bool(self.italic_mask >> offset & 1)))
+            start = end
+        return runs
+
+    def __repr__(self):
+        return f"ParagraphRecord(index={self.index}, style={self.style_name!r}, text={self.text[:30]!r})"
+
+
+def build_paragraph_snapshot(paragraphs) -> ParagraphSnapshot:
+    """
+    Extrae una lista de párrafos python-docx a registros compactos.
+    El nombre de estilo se resuelve una vez por estilo distinto, no por párrafo.
+    """
+    snapshot = ParagraphSnapshot()
+    chunks: list[str] = []
+    offset = 0
+    style_ids: dict[Optional[str], int] = {}
+
+    for index, para in enumerate(paragraphs):
+        style_key = para._p.style
+        style_id = style_ids.get(style_key)
+        if style_id is None:
+            style = para.style
+            style_id = len(snapshot.style_names)
+            snapshot.style_names.append(style.name if style else None)
+            style_ids[style_key] = style_id
+
+        run_texts = []
+        italic_mask = 0
+        for run_idx, run in enumerate(para.runs):
+            run_texts.append(run.text)
+            if run.italic:
+                italic_mask |= 1 << run_idx
+
+        para_text = para.text
+        runs_text = "".join(run_texts)
+        if para_text == runs_text:
+            # Caso habitual: el texto del párrafo es exactamente el de sus runs.
+            text_start = offset
+            text_end = offset + len(para_text)
+        else:
+            # Hipervínculos u otros contenidos: el texto se guarda aparte antes de los runs.
+            chunks.append(para_text)
+            text_start = offset
+            text_end = offset + len(para_text)
+            offset = text_end
+
+        runs_start = offset
+        run_first = len(snapshot.run_ends)
+        for run_text in run_texts:
+            chunks.append(run_text)
+            offset += len(run_text)
+            snapshot.run_ends.append(offset)
+
+        snapshot.records.append(ParagraphRecord(
+            snapshot, index, style_id, text_start, text_end, runs_start, run_first, len(run_texts), italic_mask
+        ))
+
+    snapshot.buffer = "".join(chunks)
+    return snapshot
 
 
 def iter_document_blocks(doc: Any):
@@ -421,18 +962,6 @@ def get_front_blocks(doc: Any, title_paragraph: Paragraph):
     return front_blocks
 
 
-def extract_table_cell_contents(cell, footnotes_intro):
-    """
-    Extrae el contenido no vacío de todos los párrafos de una celda.
-    """
-    contents = []
-    for para in cell.paragraphs:
-        raw = extract_text_with_intro_notes(para, footnotes_intro).strip()
-        if raw:
-            contents.append(raw)
-    return contents
-
-
 def has_table_header_marker(cell_contents):
     """
     Indica si el primer pÃ¡rrafo no vacÃ­o de una celda empieza por el marcador de cabecera.
@@ -471,49 +1000,174 @@ def strip_table_header_marker_from_text(text):
     return re.sub(r'^\^\s?', '', text.strip(), count=1)
 
 
-def clean_marked_header_row_contents(row_cell_contents):
+def clean_marked_header_row_contents(row):
     """
     Elimina el marcador de cabecera de todas las celdas de una fila marcada.
     """
-    if not is_marked_table_header_row(row_cell_contents):
-        return row_cell_contents
-    return [strip_table_header_marker_from_contents(contents) for contents in row_cell_contents]
+    if not row.marked_header:
+        return row.contents
+    return [strip_table_header_marker_from_contents(contents) for contents in row.contents]
 
 
-def extract_docx_table_rows(table: Table, paragraph_renderer) -> list[list[list[str]]]:
+# --- Extracción de tablas WML en una sola pasada
+# Un único recorrido de w:tbl/w:tr/w:tc compartido por las tablas del prólogo, las de
+# footnotes.xml y las de notas/aparato. Evita `row.cells` de python-docx, que resuelve
+# columnas combinadas y fusiones verticales en cada acceso.
+
+WML_RUN_TEXT_TAGS = {
+    qn("w:tab"): "\t",
+    qn("w:ptab"): "\t",
+    qn("w:cr"): "\n",
+    qn("w:noBreakHyphen"): "-",
+}
+
+
+def wml_run_plain_text(run) -> str:
     """
-    Extrae una tabla python-docx al formato comÃºn: filas -> celdas -> pÃ¡rrafos.
+    Texto plano de un w:r con las mismas equivalencias que `Run.text` de python-docx.
     """
-    table_rows: list[list[list[str]]] = []
-    for row in table.rows:
-        row_cell_contents: list[list[str]] = []
-        for cell in row.cells:
-            cell_contents: list[str] = []
-            for para in cell.paragraphs:
-                cell_text = paragraph_renderer(para).strip()
-                if cell_text:
-                    cell_contents.append(cell_text)
-            row_cell_contents.append(cell_contents)
-        table_rows.append(row_cell_contents)
-    return table_rows
-
-
-def extract_wml_table_rows(table, ns, relationships=None) -> list[list[list[str]]]:
-    """
-    Extrae una tabla WML de footnotes.xml al formato comÃºn.
-    """
-    table_rows: list[list[list[str]]] = []
-    for row in table.xpath("./w:tr", namespaces=ns):
-        row_cell_contents: list[list[str]] = []
-        for cell in row.xpath("./w:tc", namespaces=ns):
-            cell_contents: list[str] = []
-            for para in cell.xpath("./w:p", namespaces=ns):
-                cell_text = render_intro_footnote_paragraph(para, ns, relationships).strip()
-                if cell_text:
-                    cell_contents.append(cell_text)
-            row_cell_contents.append(cell_contents)
-        table_rows.append(row_cell_contents)
-    return table_rows
+    parts = []
+    for child in run.iterchildren():
+        if child.tag == qn("w:t"):
+            parts.append(child.text or "")
+        elif child.tag == qn("w:br"):
+            if child.get(qn("w:type"), "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(WML_RUN_TEXT_TAGS.get(child.tag, ""))
+    return "".join(parts)
+
+
+def wml_paragraph_plain_text(paragraph) -> str:
+    """
+    Texto plano de un w:p, incluidos los hipervínculos (equivale a `Paragraph.text`).
+    """
+    parts = []
+    for child in paragraph.iterchildren():
+        if child.tag == qn("w:r"):
+            parts.append(wml_run_plain_text(child))
+        elif child.tag == qn("w:hyperlink"):
+            parts.extend(wml_run_plain_text(run) for run in child.iterchildren(qn("w:r")))
+    return "".join(parts)
+
+
+def wml_cell_property(tc, tag):
+    """
+    Devuelve el elemento ./w:tcPr/<tag> de una celda, o None.
+    """
+    tc_pr = tc.find(qn("w:tcPr"))
+    return None if tc_pr is None else tc_pr.find(qn(tag))
+
+
+class TableCellRecord:
+    """
+    Una celda w:tc ya leída: contenido renderizado por párrafo, texto plano y posición
+    en la rejilla. Las celdas que continúan una fusión vertical apuntan a la celda
+    origen (`origin`), que acumula `row_span`.
+    """
+    __slots__ = ("contents", "text", "grid_column", "grid_span", "row_span", "origin")
+
+    def __init__(self, contents, text, grid_column, grid_span):
+        self.contents = contents
+        self.text = text
+        self.grid_column = grid_column
+        self.grid_span = grid_span
+        self.row_span = 1
+        self.origin = self
+
+    @property
+    def continues_above(self) -> bool:
+        return self.origin is not self
+
+
+class TableRowRecord(NamedTuple):
+    """
+    Fila extraída. `contents` y `texts` siguen la vista pedida al extractor (rejilla
+    expandida o una entrada por w:tc); `texts` ya no lleva el marcador de cabecera.
+    """
+    cells: list
+    contents: list
+    texts: list
+    marked_header: bool
+
+
+class TableRecord(NamedTuple):
+    rows: list
+    column_count: int
+
+
+def extract_wml_table(tbl, paragraph_renderer, expand_spans=True) -> TableRecord:
+    """
+    Recorre una tabla WML una sola vez y devuelve contenido renderizado, texto plano,
+    cabeceras marcadas y combinaciones de celdas.
+
+    `paragraph_renderer` recibe cada w:p de la celda y devuelve su XML TEI. Con
+    `expand_spans` cada fila tiene una entrada por columna de la rejilla, como
+    `row.cells` de python-docx (las celdas combinadas se repiten y las continuaciones
+    verticales muestran la celda origen); sin él, una entrada por w:tc.
+    """
+    tbl_grid = tbl.find(qn("w:tblGrid"))
+    column_count = 0 if tbl_grid is None else len(tbl_grid.findall(qn("w:gridCol")))
+
+    rows: list[TableRowRecord] = []
+    cells_above: dict[int, TableCellRecord] = {}
+    for tr in tbl.iterchildren(qn("w:tr")):
+        grid_column = 0
+        tr_pr = tr.find(qn("w:trPr"))
+        grid_before = None if tr_pr is None else tr_pr.find(qn("w:gridBefore"))
+        if grid_before is not None:
+            grid_column = int(grid_before.get(qn("w:val"), 0))
+
+        row_cells: list[TableCellRecord] = []
+        cells_by_column: dict[int, TableCellRecord] = {}
+        for tc in tr.iterchildren(qn("w:tc")):
+            grid_span_el = wml_cell_property(tc, "w:gridSpan")
+            grid_span = 1 if grid_span_el is None else int(grid_span_el.get(qn("w:val"), 1))
+
+            contents = []
+            texts = []
+            for p in tc.iterchildren(qn("w:p")):
+                rendered = paragraph_renderer(p).strip()
+                if rendered:
+                    contents.append(rendered)
+                texts.append(wml_paragraph_plain_text(p))
+            cell = TableCellRecord(contents, "\n".join(texts), grid_column, grid_span)
+
+            v_merge = wml_cell_property(tc, "w:vMerge")
+            if v_merge is not None and v_merge.get(qn("w:val"), "continue") == "continue":
+                above = cells_above.get(grid_column)
+                if above is not None:
+                    cell.origin = above.origin
+                    cell.origin.row_span += 1
+
+            row_cells.append(cell)
+            cells_by_column[grid_column] = cell
+            grid_column += grid_span
+        cells_above = cells_by_column
+
+        if expand_spans:
+            layout = [cell.origin for cell in row_cells for _ in range(cell.origin.grid_span)]
+        else:
+            layout = row_cells
+        contents = [cell.contents for cell in layout]
+        rows.append(TableRowRecord(
+            row_cells,
+            contents,
+            [strip_table_header_marker_from_text(cell.text) for cell in layout],
+            is_marked_table_header_row(contents),
+        ))
+
+    return TableRecord(rows, column_count)
+
+
+def extract_docx_table(table: Table, paragraph_renderer) -> TableRecord:
+    """
+    Extrae una tabla python-docx; `paragraph_renderer` recibe objetos Paragraph.
+    """
+    return extract_wml_table(
+        table._tbl,
+        lambda p: paragraph_renderer(Paragraph(p, table)),
+    )
 
 
 def append_tei_cell(tei_lines, cell_contents, indent, attrs=""):
@@ -547,15 +1201,15 @@ def append_simple_table_cell(tei_lines, cell_contents, indent, attrs=""):
     append_tei_cell(tei_lines, cell_contents, indent, attrs=attrs)
 
 
-def render_simple_table_to_tei(table_rows, table_indent="          ", compact=False):
+def render_simple_table_to_tei(table: TableRecord, table_indent="          ", compact=False):
     """
     Renderiza una tabla TEI sencilla, compartida por prÃ³logo, footnotes y notas/aparato.
     """
     if compact:
         rows_xml = []
-        for row_cell_contents in table_rows:
-            marked_header = is_marked_table_header_row(row_cell_contents)
-            display_contents = clean_marked_header_row_contents(row_cell_contents)
+        for row in table.rows:
+            marked_header = row.marked_header
+            display_contents = clean_marked_header_row_contents(row)
             row_attrs = ' role="label"' if marked_header else ""
             cell_attrs = ' role="label"' if marked_header else ""
             cells_xml = [
@@ -568,9 +1222,9 @@ def render_simple_table_to_tei(table_rows, table_indent="          ", compact=Fa
     row_indent = f"{table_indent}  "
     cell_indent = f"{row_indent}  "
     tei = [f"{table_indent}<table>"]
-    for row_cell_contents in table_rows:
-        marked_header = is_marked_table_header_row(row_cell_contents)
-        display_contents = clean_marked_header_row_contents(row_cell_contents)
+    for row in table.rows:
+        marked_header = row.marked_header
+        display_contents = clean_marked_header_row_contents(row)
         row_attrs = ' role="label"' if marked_header else ""
         cell_attrs = ' role="label"' if marked_header else ""
         if not marked_header:
@@ -590,7 +1244,12 @@ def render_simple_wml_table(table, ns, relationships=None):
     """
     Convierte una tabla WML dentro de footnotes.xml al modelo TEI sencillo.
     """
-    return render_simple_table_to_tei(extract_wml_table_rows(table, ns, relationships), compact=True)
+    table_record = extract_wml_table(
+        table,
+        lambda p: render_intro_footnote_paragraph(p, ns, relationships),
+        expand_spans=False,
+    )
+    return render_simple_table_to_tei(table_record, compact=True)
 
 
 def is_versification_section(current_section: Optional[str]) -> bool:
@@ -632,43 +1291,6 @@ def is_versification_total_row(texts) -> bool:
     first = normalize_text_for_matching(texts[0])
     return first == "total"
 
-def uppercase_preserve_tags(text):
-    """
-    Convierte texto a mayúsculas preservando etiquetas XML.
-    Ejemplo: "<hi rend='italic'>palabra</hi>" → "<hi rend='italic'>PALABRA</hi>"
-    """
-    parts = re.split(r'(<[^>]+>)', text)
-    return ''.join(part.upper() if not part.startswith('<') else part for part in parts)
-
-
-def uppercase_preserve_tags_and_note_content(text):
-    """
-    Convierte texto a mayúsculas preservando etiquetas XML, pero sin alterar
-    el contenido interno de bloques <note ...>...</note>.
-
-    Útil para secciones que se muestran en mayúsculas (speaker, títulos, actos)
-    donde las notas editoriales deben conservar su capitalización original.
-    """
-    if not text:
-        return text
-
-    # Proteger temporalmente las notas completas para no alterar su contenido.
-    note_pattern = re.compile(r'(<note\b[^>]*>.*?</note>)', flags=re.IGNORECASE | re.DOTALL)
-    protected_notes = []
-
-    def _protect_note(match):
-        protected_notes.append(match.group(1))
-        return f"<<<NOTE_BLOCK_{len(protected_notes) - 1}>>>"
-
-    protected_text = note_pattern.sub(_protect_note, text)
-    uppercased = uppercase_preserve_tags(protected_text)
-
-    # Restaurar las notas exactamente como estaban.
-    for idx, note_block in enumerate(protected_notes):
-        uppercased = uppercased.replace(f"<<<NOTE_BLOCK_{idx}>>>", note_block)
-
-    return uppercased
-
 def strip_tei_tags_for_matching(text):
     """
     Devuelve texto plano para comparaciones internas, sin etiquetas TEI.
@@ -702,186 +1324,217 @@ def normalize_acot_context(annotation_context):
     return extract_initial_acot_reference(str(annotation_context))
 
 
-def extract_text_with_italics_and_annotations(para, nota_notes, aparato_notes, annotation_counter, section, annotation_context=None):
+# --- Modelo de tokens en línea (texto, cursiva, notas)
+class InlineToken(NamedTuple):
+    kind: str        # TOKEN_TEXT, TOKEN_ITALIC_OPEN, TOKEN_ITALIC_CLOSE o TOKEN_NOTE
+    value: str = ""  # texto sin escapar o, en las notas, el <note> ya serializado
+
+
+TOKEN_TEXT = "text"
+TOKEN_ITALIC_OPEN = "italic_open"
+TOKEN_ITALIC_CLOSE = "italic_close"
+TOKEN_NOTE = "note"
+
+# Marcas de cambio de cursiva dentro del texto de los runs: son caracteres de control que
+# no aparecen en Word y que \w no reconoce, así que una anotación no las atraviesa
+ITALIC_START_MARK = "\u0001"
+ITALIC_END_MARK = "\u0002"
+ANNOTATION_PATTERN = re.compile(r'(@%?|%)([\u0001\u0002]*)(\w+)')
+ITALIC_MARK_TOKENS = {
+    ITALIC_START_MARK: InlineToken(TOKEN_ITALIC_OPEN),
+    ITALIC_END_MARK: InlineToken(TOKEN_ITALIC_CLOSE),
+}
+
+
+def mark_italic_runs(runs) -> str:
     """
-    Extrae texto de un párrafo preservando cursivas y procesando anotaciones (@palabra, %palabra, @%palabra).
-    
-    Utiliza marcadores internos para cursivas antes de procesar anotaciones, evitando interferencias
-    entre símbolos de anotación y marcas de formato. Genera referencias XML con IDs únicos.
-    
-    Args:
-        para: Párrafo de python-docx con texto y formato.
-        nota_notes: Dict con notas filológicas {palabra_normalizada: contenido}.
-        aparato_notes: Dict con notas de aparato crítico {palabra_normalizada: contenido}.
-        annotation_counter: Dict para mantener sincronización de índices de notas.
-        section: Identificador de sección para generar xml:ids únicos.
-        annotation_context: contexto opcional para ubicar notas de aparato en acotaciones.
-    
-    Returns:
-        str: Texto con etiquetas XML de cursiva (<hi rend="italic">) y notas (<note>) integradas.
+    Concatena el texto de los runs señalando con ITALIC_START_MARK / ITALIC_END_MARK
+    cada cambio de cursiva (los runs contiguos con la misma cursiva quedan unidos).
     """
-    
-    # Función interna para normalizar palabras
-    def normalize_word(word):
-        normalized = unicodedata.normalize('NFKD', word)
-        normalized = normalized.encode('ASCII', 'ignore').decode('utf-8').lower().strip()
-        return normalized
-    
-    # Crear conjunto de todas las palabras que tienen anotaciones
-    all_keys = set()
-    if nota_notes:
-        all_keys.update(nota_notes.keys())
-    if aparato_notes:
-        all_keys.update(aparato_notes.keys())
-    
-    # Mantener contadores separados de notas filológicas y aparato crítico para sincronización secuencial
-    nota_counters = annotation_counter.setdefault("_occurrences_nota", {})
-    aparato_counters = annotation_counter.setdefault("_occurrences_aparato", {})
-    acot_context_ref = normalize_acot_context(annotation_context) if section == "stage" else None
-    
-    # PASO 1: Construir texto con placeholders de cursiva antes de procesar anotaciones
-    marked_text = ""
+    parts = []
     prev_italic = False
-    
-    for run in para.runs:
+    for run in runs:
         if not run.text:
             continue
-        
-        # Detectar cambios en cursiva y agregar marcadores
         if run.italic and not prev_italic:
-            marked_text += '<<<ITALIC_START>>>'
+            parts.append(ITALIC_START_MARK)
         elif not run.italic and prev_italic:
-            marked_text += '<<<ITALIC_END>>>'
-        
-        marked_text += run.text
+            parts.append(ITALIC_END_MARK)
+        parts.append(run.text)
         prev_italic = run.italic
-    
-    # Cerrar cursiva si quedó abierta
     if prev_italic:
-        marked_text += '<<<ITALIC_END>>>'
-    
-    # PASO 2: Procesar anotaciones (@palabra, %palabra, @%palabra)
-    # Usar placeholders Unicode para no interferir con regex mientras se preservan cursivas
-    
-    # Usar caracteres Unicode de control que no aparecen en texto normal
-    ITALIC_START_PLACEHOLDER = '\u0001'  # SOH - no causa conflicto con regex
-    ITALIC_END_PLACEHOLDER = '\u0002'    # STX - no causa conflicto con regex
-    
-    # Reemplazar marcadores temporales por placeholders para protegerlos del regex
-    text_with_placeholders = marked_text.replace('<<<ITALIC_START>>>', ITALIC_START_PLACEHOLDER)
-    text_with_placeholders = text_with_placeholders.replace('<<<ITALIC_END>>>', ITALIC_END_PLACEHOLDER)
-    
-    # Función para reemplazar anotaciones (@palabra, %palabra, @%palabra) con notas XML
-    # Maneja sincronización de múltiples notas por palabra (lista de anotaciones)
-    def replace_at_word(match):
-        symbol = match.group(1)  # '@', '%' o '@%'
-        placeholders_before = match.group(2) if match.group(2) else ''  # Placeholders entre símbolo y palabra
-        word = match.group(3)  # palabra
-        key = normalize_word(word)
-        
-        if key not in all_keys:
-            # Sin notas, solo quitar el símbolo y mantener placeholders
-            return placeholders_before + word
-        
-        # Construir las notas
+        parts.append(ITALIC_END_MARK)
+    return "".join(parts)
+
+
+def append_marked_text(tokens: list, chunk: str) -> None:
+    """
+    Añade a `tokens` el texto de `chunk` convirtiendo las marcas de cursiva en tokens.
+    """
+    start = 0
+    for idx, char in enumerate(chunk):
+        if char in ITALIC_MARK_TOKENS:
+            if idx > start:
+                tokens.append(InlineToken(TOKEN_TEXT, chunk[start:idx]))
+            tokens.append(ITALIC_MARK_TOKENS[char])
+            start = idx + 1
+    if start < len(chunk):
+        tokens.append(InlineToken(TOKEN_TEXT, chunk[start:]))
+
+
+def render_inline_tokens(tokens, uppercase: bool = False) -> str:
+    """
+    Serializa los tokens a TEI en una sola pasada: escapa el texto (en mayúsculas para
+    speaker y títulos si `uppercase`) y deja las notas tal cual, con su capitalización.
+    """
+    parts = []
+    for kind, value in tokens:
+        if kind == TOKEN_TEXT:
+            parts.append(escape_xml(value.upper() if uppercase else value))
+        elif kind == TOKEN_ITALIC_OPEN:
+            parts.append('<hi rend="italic">')
+        elif kind == TOKEN_ITALIC_CLOSE:
+            parts.append('</hi>')
+        else:
+            parts.append(value)
+    return "".join(parts).strip()
+
+
+def tokenize_text_with_annotations(para, nota_notes, aparato_notes, annotation_counter, section, annotation_context=None) -> list[InlineToken]:
+    """
+    Convierte los runs de un párrafo en tokens en línea, resolviendo las anotaciones
+    (@palabra, %palabra, @%palabra) contra las notas y el aparato.
+
+    Las notas se asignan en orden: la n-ésima aparición de @palabra recibe la n-ésima
+    nota de esa palabra (los contadores viven en annotation_counter, y sus xml:id se
+    registran en annotation_counter["_ids"] si existe, ver IdRegistry). En acotaciones
+    (section == "stage") las entradas de aparato que empiezan por una referencia tipo
+    165Acot solo se asignan a la acotación que coincide con `annotation_context`.
+    Si las notas son TrackedNotes, cada entrada adjuntada y cada anotación sin entrada
+    disponible quedan apuntadas en ellas.
+    """
+    nota_notes = {} if nota_notes is None else nota_notes
+    aparato_notes = {} if aparato_notes is None else aparato_notes
+
+    # Mantener contadores separados de notas filológicas y aparato crítico para sincronización secuencial
+    nota_counters = annotation_counter.setdefault("_occurrences_nota", {})
+    aparato_counters = annotation_counter.setdefault("_occurrences_aparato", {})
+    acot_context_ref = normalize_acot_context(annotation_context) if section == "stage" else None
+    ids = annotation_counter.get("_ids")
+    paragraph_index = getattr(para, "index", None)
+
+    def attach(notes, key, index):
+        if isinstance(notes, TrackedNotes):
+            notes.attach(key, index)
+
+    def request_missing(notes, key, index):
+        if isinstance(notes, TrackedNotes):
+            notes.request_missing(key, index, paragraph_index, para.text)
+
+    def note_token(prefix, subtype, key, index, content):
+        xml_id = re.sub(r'[^a-zA-Z0-9_]', '', f"{prefix}_{key}_{section}_{index + 1}").lower()
+        if ids is not None:
+            ids.register(xml_id, "note", getattr(para, "index", None), content)
+        return InlineToken(TOKEN_NOTE, f'<note subtype="{subtype}" xml:id="{xml_id}">{content}</note>')
+
+    def annotation_notes(symbol, key):
         notes = []
-        
+
         # Notas filológicas - solo si tiene @ (@ o @%)
         if '@' in symbol and key in nota_notes:
-            nota_index = nota_counters.get(key, 0)
-            # Validación defensiva: asegurar que nota_index nunca sea None
-            if nota_index is None:
-                nota_index = 0
+            nota_index = nota_counters.get(key) or 0
             nota_list = nota_notes[key] if isinstance(nota_notes[key], list) else [nota_notes[key]]
             if nota_index < len(nota_list):
-                content = nota_list[nota_index]
-                xml_id = f"n_{key}_{section}_{nota_index + 1}"
-                xml_id = re.sub(r'[^a-zA-Z0-9_]', '', xml_id).lower()
-                notes.append(f'<<<NOTE>>><note subtype="nota" xml:id="{xml_id}">{content}</note><<<ENDNOTE>>>')
+                notes.append(note_token("n", "nota", key, nota_index, nota_list[nota_index]))
+                attach(nota_notes, key, nota_index)
+            else:
+                request_missing(nota_notes, key, nota_index)
             nota_counters[key] = nota_index + 1
-        
+        elif '@' in symbol:
+            request_missing(nota_notes, key, 0)
+
         # Aparato crítico - solo si tiene % (% o @%)
         if '%' in symbol and key in aparato_notes:
-            aparato_index = aparato_counters.get(key, 0)
-            # Validación defensiva: asegurar que aparato_index nunca sea None
-            if aparato_index is None:
-                aparato_index = 0
+            aparato_index = aparato_counters.get(key) or 0
             aparato_list = aparato_notes[key] if isinstance(aparato_notes[key], list) else [aparato_notes[key]]
             if acot_context_ref and aparato_index < len(aparato_list):
                 first_ref = extract_initial_acot_reference(aparato_list[aparato_index])
                 if first_ref is None:
-                    content = aparato_list[aparato_index]
-                    xml_id = f"a_{key}_{section}_{aparato_index + 1}"
-                    xml_id = re.sub(r'[^a-zA-Z0-9_]', '', xml_id).lower()
-                    notes.append(f'<<<NOTE>>><note subtype="aparato" xml:id="{xml_id}">{content}</note><<<ENDNOTE>>>')
+                    notes.append(note_token("a", "aparato", key, aparato_index, aparato_list[aparato_index]))
+                    attach(aparato_notes, key, aparato_index)
                     aparato_counters[key] = aparato_index + 1
                 elif first_ref == acot_context_ref:
                     next_index = aparato_index
                     while next_index < len(aparato_list):
                         content = aparato_list[next_index]
-                        content_ref = extract_initial_acot_reference(content)
-                        if content_ref != acot_context_ref:
+                        if extract_initial_acot_reference(content) != acot_context_ref:
                             break
-                        xml_id = f"a_{key}_{section}_{next_index + 1}"
-                        xml_id = re.sub(r'[^a-zA-Z0-9_]', '', xml_id).lower()
-                        notes.append(f'<<<NOTE>>><note subtype="aparato" xml:id="{xml_id}">{content}</note><<<ENDNOTE>>>')
+                        notes.append(note_token("a", "aparato", key, next_index, content))
+                        attach(aparato_notes, key, next_index)
                         next_index += 1
                     aparato_counters[key] = next_index
             else:
                 if aparato_index < len(aparato_list):
-                    content = aparato_list[aparato_index]
-                    xml_id = f"a_{key}_{section}_{aparato_index + 1}"
-                    xml_id = re.sub(r'[^a-zA-Z0-9_]', '', xml_id).lower()
-                    notes.append(f'<<<NOTE>>><note subtype="aparato" xml:id="{xml_id}">{content}</note><<<ENDNOTE>>>')
+                    notes.append(note_token("a", "aparato", key, aparato_index, aparato_list[aparato_index]))
+                    attach(aparato_notes, key, aparato_index)
+                else:
+                    request_missing(aparato_notes, key, aparato_index)
                 aparato_counters[key] = aparato_index + 1
-        
-        # Devolver: placeholders + palabra + notas
-        return placeholders_before + word + ''.join(notes)
-    
-    # Regex para capturar anotaciones: símbolo(s), placeholders opcionales, palabra
-    # Grupo 1: @, % o @%  (símbolos de anotación)
-    # Grupo 2: \u0001|\u0002 opcionales (placeholders de cursiva entre símbolo y palabra)
-    # Grupo 3: \w+ (la palabra a anotar)
-    pattern = r'(@%?|%)([\u0001\u0002]*)(\w+)'
-    processed_text = re.sub(pattern, replace_at_word, text_with_placeholders)
-    
-    # PASO 3: Restaurar marcadores de cursiva
-    # Convertir placeholders de vuelta a marcadores legibles
-    processed_text = processed_text.replace(ITALIC_START_PLACEHOLDER, '<<<ITALIC_START>>>')
-    processed_text = processed_text.replace(ITALIC_END_PLACEHOLDER, '<<<ITALIC_END>>>')
-    
-    # PASO 4: Escapar XML (excepto notas y marcadores)
-    # Separar notas para no escapar su contenido XML ya procesado
-    parts = re.split(r'(<<<NOTE>>>.*?<<<ENDNOTE>>>)', processed_text, flags=re.DOTALL)
-    escaped_parts = []
-    for part in parts:
-        if part.startswith('<<<NOTE>>>'):
-            # Es una nota, solo quitar marcadores
-            note_content = part.replace('<<<NOTE>>>', '').replace('<<<ENDNOTE>>>', '')
-            escaped_parts.append(f'<<<NOTE>>>{note_content}<<<ENDNOTE>>>')
-        else:
-            # Es texto, escapar pero preservar marcadores de cursiva
-            # Separar por marcadores de cursiva
-            italic_parts = re.split(r'(<<<ITALIC_START>>>|<<<ITALIC_END>>>)', part)
-            for ip in italic_parts:
-                if ip in ['<<<ITALIC_START>>>', '<<<ITALIC_END>>>']:
-                    escaped_parts.append(ip)
-                else:
-                    escaped_parts.append(escape_xml(ip))
-    
-    processed_text = ''.join(escaped_parts)
-    
-    # PASO 5: Convertir marcadores internos a etiquetas XML
-    # Limpiar marcadores de delimitación de notas y convertir cursivas a <hi>
-    processed_text = processed_text.replace('<<<NOTE>>>', '').replace('<<<ENDNOTE>>>', '')
-    
-    # Convertir todos los marcadores de cursiva a etiquetas XML válidas
-    processed_text = processed_text.replace('<<<ITALIC_START>>>', '<hi rend="italic">')
-    processed_text = processed_text.replace('<<<ITALIC_END>>>', '</hi>')
-    
-    result = processed_text
-    
-    return result.strip()
+        elif '%' in symbol:
+            request_missing(aparato_notes, key, 0)
+        return notes
+
+    marked_text = mark_italic_runs(para.runs)
+    tokens: list[InlineToken] = []
+    if '@' not in marked_text and '%' not in marked_text:
+        append_marked_text(tokens, marked_text)
+        return tokens
+
+    position = 0
+    for match in ANNOTATION_PATTERN.finditer(marked_text):
+        append_marked_text(tokens, marked_text[position:match.start()])
+        symbol, marks_between, word = match.groups()
+        # Las marcas de cursiva entre símbolo y palabra se conservan; el símbolo se elimina
+        append_marked_text(tokens, marks_between)
+        tokens.append(InlineToken(TOKEN_TEXT, word))
+        key = normalize_text_key(word)
+        tokens.extend(annotation_notes(symbol, key))
+        position = match.end()
+    append_marked_text(tokens, marked_text[position:])
+    return tokens
+
+
+def normalize_text_key(word: str) -> str:
+    """
+    Clave de una palabra anotada: sin tildes y en minúsculas, como en extract_notes_with_italics.
+    """
+    normalized = unicodedata.normalize('NFKD', word)
+    return normalized.encode('ASCII', 'ignore').decode('utf-8').lower().strip()
+
+
+def extract_text_with_italics_and_annotations(para, nota_notes, aparato_notes, annotation_counter, section, annotation_context=None, uppercase=False):
+    """
+    Extrae texto de un párrafo preservando cursivas y procesando anotaciones (@palabra, %palabra, @%palabra).
+
+    Los runs se convierten una vez en tokens (tokenize_text_with_annotations) y se
+    serializan en una sola pasada (render_inline_tokens).
+
+    Args:
+        para: Párrafo de python-docx (o ParagraphRecord) con texto y formato.
+        nota_notes: Dict con notas filológicas {palabra_normalizada: contenido}.
+        aparato_notes: Dict con notas de aparato crítico {palabra_normalizada: contenido}.
+        annotation_counter: Dict para mantener sincronización de índices de notas.
+        section: Identificador de sección para generar xml:ids únicos.
+        annotation_context: contexto opcional para ubicar notas de aparato en acotaciones.
+        uppercase: texto en mayúsculas (speaker, títulos, actos) sin alterar las notas.
+
+    Returns:
+        str: Texto con etiquetas XML de cursiva (<hi rend="italic">) y notas (<note>) integradas.
+    """
+    tokens = tokenize_text_with_annotations(
+        para, nota_notes, aparato_notes, annotation_counter, section, annotation_context
+    )
+    return render_inline_tokens(tokens, uppercase)
 
 def merge_italic_text(text):
     """
@@ -958,6 +1611,9 @@ def get_paragraph_style_name(para) -> str:
     """
     Devuelve el nombre de estilo del párrafo o 'Normal' si no existe.
     """
+    if isinstance(para, ParagraphRecord):
+        style_name = para.style_name
+        return "Normal" if style_name is None else style_name
     return para.style.name if para.style else "Normal"
 
 
@@ -1038,18 +1694,39 @@ def append_repeated_title_heads(tei, title_paragraphs, nota_notes, aparato_notes
             nota_notes,
             aparato_notes,
             annotation_counter,
-            "head"
+            "head",
+            uppercase=True,
         )
-        processed_title = uppercase_preserve_tags_and_note_content(processed_title)
         head_type = "mainTitle" if idx == 0 else "subTitle"
         tei.append(f'          <head type="{head_type}" subtype="repeated">{processed_title}</head>')
 
 
+def take_verse_notes(notes: dict, key) -> list:
+    """
+    Entradas de una nota de verso; si las notas son TrackedNotes quedan como adjuntadas.
+    """
+    if isinstance(notes, TrackedNotes):
+        notes.attach_all(key)
+    return notes[key]
+
+
+def render_verse_notes(subtype, note_list, n, id_stem, ids, paragraph_index=None) -> str:
+    """
+    Notas de verso (nota o aparato) con xml:id {subtype}_{id_stem}_{k}, registrados en `ids`.
+    """
+    notes = []
+    for note_idx, content in enumerate(note_list, 1):
+        xml_id = ids.register(f"{subtype}_{id_stem}_{note_idx}", "note", paragraph_index, content)
+        notes.append(f'<note subtype="{subtype}" n="{n}" xml:id="{xml_id}">{content}</note>')
+    return "".join(notes)
+
+
 def open_act_block(tei, state, act_counter):
     """
     Abre el div del acto actual sin imponer todavía el orden interno de sus hijos.
     """
-    tei.append(f'        <div type="subsection" subtype="ACTO" n="{act_counter}" xml:id="acto{act_counter}">')
+    xml_id = state["ids"].register(f"acto{act_counter}", "div")
+    tei.append(f'        <div type="subsection" subtype="ACTO" n="{act_counter}" xml:id="{xml_id}">')
     state["in_act"] = True
 
 
@@ -1057,10 +1734,9 @@ def append_act_head(tei, act_para, nota_notes, aparato_notes, annotation_counter
     """
     Inserta el encabezado del acto respetando el momento en que aparece en Word.
     """
-    processed_text = extract_text_with_italics_and_annotations(
-        act_para, nota_notes, aparato_notes, annotation_counter, "head"
+    processed_text_upper = extract_text_with_italics_and_annotations(
+        act_para, nota_notes, aparato_notes, annotation_counter, "head", uppercase=True
     )
-    processed_text_upper = uppercase_preserve_tags_and_note_content(processed_text)
     tei.append(f'          <head type="acto">{processed_text_upper}</head>')
 
 
@@ -1095,6 +1771,7 @@ def append_dramatis_entries(
             else:
                 role_id = role_slug
                 global_characters[role_name_clean] = role_id
+            state["ids"].register(role_id, "role", para.index, role_name_clean)
             item_indent = state.get("cast_item_indent", "            ")
             tei.append(f'{item_indent}<castItem><role xml:id="{role_id}">{processed_role_name}</role></castItem>')
         elif style == "Prosa":
@@ -1113,6 +1790,7 @@ def open_cast_list_block(tei, state, processed_text, xml_id, inside_act=False):
     content_indent = '            ' if inside_act else '          '
     item_indent = '              ' if inside_act else '            '
 
+    state["ids"].register(xml_id, "div")
     tei.append(f'{div_indent}<div type="castList" xml:id="{xml_id}">')
     tei.append(f'{content_indent}<head type="castListTitle">{processed_text}</head>')
     tei.append(f'{content_indent}<castList>')
@@ -1124,16 +1802,117 @@ def open_cast_list_block(tei, state, processed_text, xml_id, inside_act=False):
 
 
 # --- Procesamiento de metadatos y front-matter
-def parse_metadata_docx(path, header_mode="prolope"):
+class MetadataRecord(NamedTuple):
+    """
+    Contenido de las tres tablas del DOCX de metadatos, como tuplas (clave, valor)
+    para que el registro sea inmutable y sirva de clave de caché.
+    """
+    main: tuple
+    source: tuple
+    witnesses: tuple
+
+
+class HeaderTemplate(NamedTuple):
+    """
+    Bloques fijos del teiHeader para un header_mode, ya unidos en texto.
+    """
+    revision_resp: str
+    markup_resp: str
+    title_stmt_extra: str
+    series_stmt: str
+    source_author: Optional[str]
+    include_parte: bool
+    coordinators_resp: str
+    availability: str
+    encoding_desc: str
+
+
+HEADER_TEMPLATES = {
+    "prolope": HeaderTemplate(
+        revision_resp='        <resp>Edición crítica digital revisada filológicamente por</resp>',
+        markup_resp='        <resp>Marcado XML-TEI automático revisado por</resp>',
+        title_stmt_extra="\n".join([
+            '      <respStmt>',
+            '        <resp>Codificado según los criterios de</resp>',
+            '        <name ref="https://datos.bne.es/entidad/XX4849774.html">Grupo de investigación PROLOPE, de la Universitat Autònoma de Barcelona</name>',
+            '      </respStmt>',
+        ]),
+        series_stmt="\n".join([
+            '    <seriesStmt>',
+            '      <title>Biblioteca Digital PROLOPE</title>',
+            '      <respStmt>',
+            '        <resp>Dirección de</resp>',
+            '        <persName ref="https://orcid.org/0000-0002-7429-9709"><forename>Ramón</forename> <surname>Valdés Gázquez</surname></persName>',
+            '      </respStmt>',
+            '      <idno type="URI">https://bibdigitalprolope.com/</idno>',
+            '    </seriesStmt>',
+        ]),
+        source_author="\n".join([
+            '          <author>',
+            '            <persName ref="http://datos.bne.es/persona/XX1719671"><forename>Félix Lope</forename><surname>de Vega Carpio</surname></persName>',
+            '          </author>',
+        ]),
+        include_parte=True,
+        coordinators_resp='            <resp>Coordinación del volumen a cargo de</resp>',
+        availability="\n".join([
+            '          <availability status="restricted">',
+            '            <p>Todos los derechos reservados.</p>',
+            '          </availability>',
+        ]),
+        encoding_desc="\n".join([
+            '  <encodingDesc>',
+            '    <editorialDecl>',
+            f'      <p>El texto se transformó desde archivos DOCX mediante un flujo semiautomático con feniX-ML (versión {APP_VERSION}).</p>',
+            '    </editorialDecl>',
+            '    <appInfo>',
+            f'      <application ident="feniX-ML" version="{APP_VERSION}">',
+            '        <label>feniX-ML</label>',
+            '        <desc>Conversor de ediciones críticas de teatro del Siglo de Oro de DOCX a XML-TEI, desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde (PROLOPE).</desc>',
+            '        <ref target="https://github.com/prolopeuab/feniX-ML">Repositorio y documentación</ref>',
+            '      </application>',
+            '    </appInfo>',
+            '  </encodingDesc>',
+            '</teiHeader>',
+        ]),
+    ),
+    "minimo": HeaderTemplate(
+        revision_resp='        <resp>Responsable/s revisión</resp>',
+        markup_resp='        <resp>Responsable marcado automático</resp>',
+        title_stmt_extra="",
+        series_stmt="",
+        # Modo mínimo: autor desde metadatos
+        source_author=None,
+        include_parte=False,
+        coordinators_resp='            <resp>Coordinadores volumen</resp>',
+        availability="",
+        encoding_desc="\n".join([
+            '  <encodingDesc>',
+            '    <appInfo>',
+            f'      <application ident="feniX-ML" version="{APP_VERSION}">',
+            '        <label>feniX-ML</label>',
+            '        <desc>Conversor de ediciones críticas de DOCX a XML-TEI.</desc>',
+            '        <ref target="https://github.com/prolopeuab/feniX-ML">https://github.com/prolopeuab/feniX-ML</ref>',
+            '      </application>',
+            '    </appInfo>',
+            '  </encodingDesc>',
+            '</teiHeader>',
+        ]),
+    ),
+}
+
+
+def get_header_template(header_mode: str) -> HeaderTemplate:
     """
-    Extrae metadatos de un archivo .docx estructurado en tablas y construye un teiHeader TEI/XML.
-    
-    Args:
-        path: Ruta al archivo DOCX de metadatos.
-        header_mode: "prolope" para header completo con datos PROLOPE, 
-                     "minimo" para header solo con datos del usuario y referencia a la app.
+    Plantilla del modo pedido; cualquier modo distinto de "prolope" usa la mínima.
+    """
+    return HEADER_TEMPLATES["prolope" if header_mode == "prolope" else "minimo"]
+
+
+def read_metadata_record(source) -> MetadataRecord:
     """
-    doc = Document(path)
+    Lee las tres tablas del DOCX de metadatos (ruta o archivo abierto).
+    """
+    doc = Document(source)
     tables = doc.tables
 
     if len(tables) < 3:
@@ -1142,30 +1921,29 @@ def parse_metadata_docx(path, header_mode="prolope"):
     # Tabla 1: Metadatos principales
     main_meta = {}
     for row in tables[0].rows:
-        if len(row.cells) >= 2:
-            key = row.cells[0].text.strip()
-            value = row.cells[1].text.strip()
-            main_meta[key] = value
+        cells = row.cells
+        if len(cells) >= 2:
+            main_meta[cells[0].text.strip()] = cells[1].text.strip()
 
     # Tabla 2: sourceDesc
     source_meta = {}
     for row in tables[1].rows:
-        if len(row.cells) >= 2:
-            key = row.cells[0].text.strip()
-            value = row.cells[1].text.strip()
-            source_meta[key] = value
+        cells = row.cells
+        if len(cells) >= 2:
+            source_meta[cells[0].text.strip()] = cells[1].text.strip()
 
     # Tabla 3: listWit (salta la primera fila)
     witnesses = []
     for i, row in enumerate(tables[2].rows):
         if i == 0:
             continue  # salta la fila guía "SIGLA TESTIMONIO | DESCRIPCIÓN"
-        if len(row.cells) >= 2:
-            siglum = row.cells[0].text.strip()
+        cells = row.cells
+        if len(cells) >= 2:
+            siglum = cells[0].text.strip()
 
             # Extrae el contenido de la segunda celda manteniendo la cursiva
             desc_parts = []
-            for run in row.cells[1].paragraphs[0].runs:
+            for run in cells[1].paragraphs[0].runs:
                 if run.italic:
                     desc_parts.append(f'<hi rend="italic">{run.text}</hi>')
                 else:
@@ -1175,42 +1953,110 @@ def parse_metadata_docx(path, header_mode="prolope"):
             if siglum and desc:
                 witnesses.append((siglum, desc))
 
-    # Construcción del teiHeader
-    tei = ['<teiHeader>', '  <fileDesc>', '    <titleStmt>']
+    return MetadataRecord(tuple(main_meta.items()), tuple(source_meta.items()), tuple(witnesses))
+
+
+# Registros ya leídos, indexados por el hash del contenido del DOCX: copias idénticas
+# del mismo archivo de metadatos (p.ej. en cada carpeta de un volumen) se leen una vez.
+METADATA_RECORD_CACHE_SIZE = 32
+_metadata_records: OrderedDict = OrderedDict()
+_metadata_records_lock = threading.Lock()
+
+
+def load_metadata_record(path) -> MetadataRecord:
+    """
+    Devuelve el MetadataRecord de un DOCX, reutilizándolo si ya se leyó un archivo con
+    el mismo contenido (sha1). Leer y resumir el archivo es mucho más barato que abrirlo
+    con python-docx.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
 
+    with _metadata_records_lock:
+        record = _metadata_records.get(digest)
+        if record is not None:
+            _metadata_records.move_to_end(digest)
+            return record
+
+    record = read_metadata_record(io.BytesIO(data))
+    with _metadata_records_lock:
+        _metadata_records[digest] = record
+        while len(_metadata_records) > METADATA_RECORD_CACHE_SIZE:
+            _metadata_records.popitem(last=False)
+    return record
+
+
+def render_resp_stmt(resp_line: str, names: str, indent: str) -> list[str]:
+    lines = [f'{indent}<respStmt>', resp_line]
+    for name in names.split(','):
+        lines.append(f'{indent}  <persName>{name.strip()}</persName>')
+    lines.append(f'{indent}</respStmt>')
+    return lines
+
+
+@lru_cache(maxsize=64)
+def render_volume_source_desc(header_mode: str, volume_title: str, parte: str, coordinators: str,
+                              pub_place: str, publisher: str, date: str, volume: str) -> tuple[str, str, str]:
+    """
+    Fragmentos de <monogr> comunes a todas las comedias de un volumen: títulos de serie
+    y parte, coordinación + availability, e inicio de <imprint>. En lotes que comparten
+    volumen se renderizan una sola vez.
+    """
+    template = get_header_template(header_mode)
+
+    titles = []
+    if volume_title:
+        titles.append(f'          <title level="s">{volume_title}</title>')
+    if template.include_parte and parte:
+        titles.append(f'          <title level="a">Parte {parte}</title>')
+
+    responsibility = []
+    if coordinators:
+        responsibility.extend(render_resp_stmt(template.coordinators_resp, coordinators, '          '))
+    if template.availability:
+        responsibility.append(template.availability)
+
+    imprint = [
+        '          <imprint>',
+        f'            <pubPlace>{pub_place}</pubPlace>',
+        f'            <publisher>{publisher}</publisher>',
+        f'            <date>{date}</date>',
+    ]
+    if volume:
+        imprint.append(f'            <biblScope unit="volume" n="{volume}">vol. {volume}</biblScope>')
+
+    return "\n".join(titles), "\n".join(responsibility), "\n".join(imprint)
+
+
+@lru_cache(maxsize=64)
+def render_tei_header(record: MetadataRecord, header_mode: str = "prolope") -> str:
+    """
+    Construye el teiHeader a partir de un MetadataRecord y la plantilla del modo.
+    El resultado se memoriza: previsualizar de nuevo la misma edición no lo recalcula.
+    """
+    template = get_header_template(header_mode)
+    main_meta = dict(record.main)
+    source_meta = dict(record.source)
+    tei = []
+
+    def add(block):
+        if block:
+            tei.append(block)
+
+    # titleStmt
+    tei.extend(['<teiHeader>', '  <fileDesc>', '    <titleStmt>'])
     tei.append(f'      <title>{main_meta.get("Título comedia", "")}</title>')
     tei.append(f'      <author><name>{main_meta.get("Autor", "")}</name></author>')
-
-    if 'Editor' in main_meta and main_meta['Editor']:
+    if main_meta.get('Editor'):
         tei.append(f'      <editor>{main_meta["Editor"]}</editor>')
+    if main_meta.get('Responsable/s revisión'):
+        tei.extend(render_resp_stmt(template.revision_resp, main_meta['Responsable/s revisión'], '      '))
+    if main_meta.get('Responsable marcado automático'):
+        tei.extend(render_resp_stmt(template.markup_resp, main_meta['Responsable marcado automático'], '      '))
+    add(template.title_stmt_extra)
 
-    if 'Responsable/s revisión' in main_meta and main_meta['Responsable/s revisión']:
-        tei.append('      <respStmt>')
-        if header_mode == "prolope":
-            tei.append('        <resp>Edición crítica digital revisada filológicamente por</resp>')
-        else:
-            tei.append('        <resp>Responsable/s revisión</resp>')
-        for name in main_meta['Responsable/s revisión'].split(','):
-            tei.append(f'        <persName>{name.strip()}</persName>')
-        tei.append('      </respStmt>')
-
-    if 'Responsable marcado automático' in main_meta and main_meta['Responsable marcado automático']:
-        tei.append('      <respStmt>')
-        if header_mode == "prolope":
-            tei.append('        <resp>Marcado XML-TEI automático revisado por</resp>')
-        else:
-            tei.append('        <resp>Responsable marcado automático</resp>')
-        for name in main_meta['Responsable marcado automático'].split(','):
-            tei.append(f'        <persName>{name.strip()}</persName>')
-        tei.append('      </respStmt>')
-
-    # Solo en modo PROLOPE: añadir referencia al grupo de investigación
-    if header_mode == "prolope":
-        tei.append('      <respStmt>')
-        tei.append('        <resp>Codificado según los criterios de</resp>')
-        tei.append('        <name ref="https://datos.bne.es/entidad/XX4849774.html">Grupo de investigación PROLOPE, de la Universitat Autònoma de Barcelona</name>')
-        tei.append('      </respStmt>')
-
+    # editionStmt, publicationStmt y seriesStmt
     tei.extend(['    </titleStmt>', '    <editionStmt>'])
     tei.append(f'      <edition>Versión {main_meta.get("Versión", "")}</edition>')
     tei.extend(['    </editionStmt>', '    <publicationStmt>'])
@@ -1218,112 +2064,95 @@ def parse_metadata_docx(path, header_mode="prolope"):
     tei.append(f'      <pubPlace>{main_meta.get("Lugar publicación", "")}</pubPlace>')
     tei.append(f'      <date>{main_meta.get("Fecha publicación", "")}</date>')
     tei.append('    </publicationStmt>')
-    
-    # Solo en modo PROLOPE: añadir seriesStmt
-    if header_mode == "prolope":
-        tei.append('    <seriesStmt>')
-        tei.append('      <title>Biblioteca Digital PROLOPE</title>')
-        tei.append('      <respStmt>')
-        tei.append('        <resp>Dirección de</resp>')
-        tei.append('        <persName ref="https://orcid.org/0000-0002-7429-9709"><forename>Ramón</forename> <surname>Valdés Gázquez</surname></persName>')
-        tei.append('      </respStmt>')
-        tei.append('      <idno type="URI">https://bibdigitalprolope.com/</idno>')
-        tei.append('    </seriesStmt>')
-
-    # sourceDesc
+    add(template.series_stmt)
+
+    # sourceDesc: datos de la comedia intercalados con los fragmentos del volumen
+    volume_titles, volume_responsibility, volume_imprint = render_volume_source_desc(
+        header_mode,
+        source_meta.get("Título volumen", ""),
+        source_meta.get("Parte", ""),
+        source_meta.get("Coordinadores volumen", ""),
+        source_meta.get("Lugar publicación", ""),
+        source_meta.get("Publicado por", ""),
+        source_meta.get("Fecha publicación", ""),
+        source_meta.get("Volumen", ""),
+    )
     tei.extend(['    <sourceDesc>', '      <biblStruct xml:lang="es">', '        <monogr>'])
-    
-    # Autor
-    if header_mode == "prolope":
-        tei.append('          <author>')
-        tei.append('            <persName ref="http://datos.bne.es/persona/XX1719671"><forename>Félix Lope</forename><surname>de Vega Carpio</surname></persName>')
-        tei.append('          </author>')
+    if template.source_author is not None:
+        tei.append(template.source_author)
     else:
-        # Modo mínimo: autor desde metadatos
         tei.append(f'          <author>{main_meta.get("Autor", "")}</author>')
-    
-    # Títulos
     tei.append(f'          <title type="main">{source_meta.get("Título comedia", "")}</title>')
-    if "Subtítulo" in source_meta and source_meta.get("Subtítulo"):
-        tei.append(f'          <title type="alt">{source_meta.get("Subtítulo", "")}</title>')
-    
-    # Título del volumen (si existe)
-    if source_meta.get("Título volumen"):
-        tei.append(f'          <title level="s">{source_meta.get("Título volumen", "")}</title>')
-    
-    # Solo en modo PROLOPE: añadir "Parte"
-    if header_mode == "prolope" and source_meta.get("Parte"):
-        tei.append(f'          <title level="a">Parte {source_meta.get("Parte", "")}</title>')
-    
-    # Editor (si existe)
-    if 'Editor' in main_meta and main_meta['Editor']:
+    if source_meta.get("Subtítulo"):
+        tei.append(f'          <title type="alt">{source_meta["Subtítulo"]}</title>')
+    add(volume_titles)
+    if main_meta.get('Editor'):
         tei.append(f'          <editor>{main_meta["Editor"]}</editor>')
-    
-    # Coordinadores del volumen (si existen)
-    if 'Coordinadores volumen' in source_meta and source_meta['Coordinadores volumen']:
-        tei.append('          <respStmt>')
-        if header_mode == "prolope":
-            tei.append('            <resp>Coordinación del volumen a cargo de</resp>')
-        else:
-            tei.append('            <resp>Coordinadores volumen</resp>')
-        for name in source_meta['Coordinadores volumen'].split(','):
-            tei.append(f'            <persName>{name.strip()}</persName>')
-        tei.append('          </respStmt>')
-    
-    # Solo en modo PROLOPE: añadir availability
-    if header_mode == "prolope":
-        tei.append('          <availability status="restricted">')
-        tei.append('            <p>Todos los derechos reservados.</p>')
-        tei.append('          </availability>')
-    
-    # Imprint
-    tei.append('          <imprint>')
-    tei.append(f'            <pubPlace>{source_meta.get("Lugar publicación", "")}</pubPlace>')
-    tei.append(f'            <publisher>{source_meta.get("Publicado por", "")}</publisher>')
-    tei.append(f'            <date>{source_meta.get("Fecha publicación", "")}</date>')
-    
-    # Volumen y páginas (si existen)
-    if source_meta.get("Volumen"):
-        tei.append(f'            <biblScope unit="volume" n="{source_meta.get("Volumen", "")}">vol. {source_meta.get("Volumen", "")}</biblScope>')
+    add(volume_responsibility)
+    tei.append(volume_imprint)
     if source_meta.get("Páginas"):
-        tei.append(f'            <biblScope unit="page">{source_meta.get("Páginas", "")}</biblScope>')
-    
-    tei.append('          </imprint>')
-    tei.append('        </monogr>')
-    tei.append('      </biblStruct>')
-    tei.append('      <listWit>')
-    for siglum, desc in witnesses:
+        tei.append(f'            <biblScope unit="page">{source_meta["Páginas"]}</biblScope>')
+    tei.extend(['          </imprint>', '        </monogr>', '      </biblStruct>', '      <listWit>'])
+    for siglum, desc in record.witnesses:
         tei.append(f'        <witness xml:id="{siglum}">')
         tei.append(f'          <label>{desc}</label>')
         tei.append('        </witness>')
-    tei.append('      </listWit>')
-    tei.append('    </sourceDesc>')
-    tei.append('  </fileDesc>')
-    tei.append('  <encodingDesc>')
-    
-    # Solo en modo PROLOPE: añadir editorialDecl
-    if header_mode == "prolope":
-        tei.append('    <editorialDecl>')
-        tei.append(f'      <p>El texto se transformó desde archivos DOCX mediante un flujo semiautomático con feniX-ML (versión {APP_VERSION}).</p>')
-        tei.append('    </editorialDecl>')
-    
-    # Siempre incluir appInfo (en ambos modos)
-    tei.append('    <appInfo>')
-    tei.append(f'      <application ident="feniX-ML" version="{APP_VERSION}">')
-    tei.append('        <label>feniX-ML</label>')
-    if header_mode == "prolope":
-        tei.append('        <desc>Conversor de ediciones críticas de teatro del Siglo de Oro de DOCX a XML-TEI, desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde (PROLOPE).</desc>')
-        tei.append('        <ref target="https://github.com/prolopeuab/feniX-ML">Repositorio y documentación</ref>')
-    else:
-        tei.append('        <desc>Conversor de ediciones críticas de DOCX a XML-TEI.</desc>')
-        tei.append('        <ref target="https://github.com/prolopeuab/feniX-ML">https://github.com/prolopeuab/feniX-ML</ref>')
-    tei.append('      </application>')
-    tei.append('    </appInfo>')
-    tei.append('  </encodingDesc>')
-    tei.append('</teiHeader>')
+    tei.extend(['      </listWit>', '    </sourceDesc>', '  </fileDesc>'])
 
+    tei.append(template.encoding_desc)
     return "\n".join(tei)
 
+
+def parse_metadata_docx(path, header_mode="prolope"):
+    """
+    Extrae metadatos de un archivo .docx estructurado en tablas y construye un teiHeader TEI/XML.
+    
+    Args:
+        path: Ruta al archivo DOCX de metadatos.
+        header_mode: "prolope" para header completo con datos PROLOPE, 
+                     "minimo" para header solo con datos del usuario y referencia a la app.
+    """
+    return render_tei_header(load_metadata_record(path), header_mode)
+
+class FrontParagraphRecord(NamedTuple):
+    """
+    Párrafo del front-matter renderizado una sola vez: XML TEI con las notas ya
+    insertadas, texto plano (para detectar títulos) y nombre del estilo.
+    """
+    rendered: str
+    text: str
+    style: str
+
+
+def iter_front_records(front_blocks, footnotes_intro):
+    """
+    Recorre los bloques del front-matter y devuelve las tablas tal cual y cada párrafo
+    con texto como FrontParagraphRecord. Los párrafos vacíos no se renderizan y el
+    nombre de estilo se resuelve una vez por estilo distinto.
+    """
+    style_names: dict[Optional[str], str] = {}
+    for block in front_blocks:
+        if isinstance(block, Table):
+            yield block
+            continue
+
+        text = wml_paragraph_plain_text(block._p).strip()
+        if not text:
+            continue
+
+        style_key = block._p.style
+        style_name = style_names.get(style_key)
+        if style_name is None:
+            style = block.style
+            style_name = style_names[style_key] = style.name if style else ""
+
+        yield FrontParagraphRecord(
+            extract_text_with_intro_notes(block, footnotes_intro),
+            text,
+            style_name,
+        )
+
+
 def process_front_paragraphs_with_tables(front_blocks, footnotes_intro):
     """
     Procesa bloques del front-matter generando secciones TEI <front> con soporte para tablas.
@@ -1349,11 +2178,9 @@ def process_front_paragraphs_with_tables(front_blocks, footnotes_intro):
 
     def flush_paragraph_buffer():
         nonlocal paragraph_buffer, in_sp_front
-        for p in paragraph_buffer:
-            text = extract_text_with_intro_notes(p, footnotes_intro)
-            style = ""
-            if p.style:
-                style = p.style.name
+        for record in paragraph_buffer:
+            text = record.rendered
+            style = record.style
 
             if style == "Quote":
                 if in_sp_front:
@@ -1405,17 +2232,14 @@ def process_front_paragraphs_with_tables(front_blocks, footnotes_intro):
             in_sp_front = False
 
 
-    for block in front_blocks:
-        if isinstance(block, Table):
+    for record in iter_front_records(front_blocks, footnotes_intro):
+        if isinstance(record, Table):
             flush_paragraph_buffer()
-            tei_front.append(process_table_to_tei(block, footnotes_intro, current_section=current_section))
+            tei_front.append(process_table_to_tei(record, footnotes_intro, current_section=current_section))
             continue
 
-        para = block
-        raw = extract_text_with_intro_notes(para, footnotes_intro)
-        text = para.text.strip() if para.text else ""
-        if not text:
-            continue
+        raw = record.rendered
+        text = record.text
 
         # Ignora "Introducción"
         if text.lower() == "introducción":
@@ -1448,7 +2272,7 @@ def process_front_paragraphs_with_tables(front_blocks, footnotes_intro):
             continue
 
         # Añade al buffer
-        paragraph_buffer.append(para)
+        paragraph_buffer.append(record)
 
     # Procesar cualquier contenido restante
     flush_paragraph_buffer()
@@ -1458,15 +2282,17 @@ def process_front_paragraphs_with_tables(front_blocks, footnotes_intro):
 
     return "\n".join(tei_front)
 
-def render_versification_table_to_tei(table_rows, plain_text_rows, ncols):
+def render_versification_table_to_tei(table: TableRecord):
     """
     Renderiza la tabla especial de sinopsis de versificaciÃ³n.
     """
     tei = ['          <table type="sinopsisversificacion">']
+    ncols = table.column_count
 
-    for row_cell_contents, texts in zip(table_rows, plain_text_rows):
-        marked_header = is_marked_table_header_row(row_cell_contents)
-        display_contents = clean_marked_header_row_contents(row_cell_contents)
+    for row in table.rows:
+        texts = row.texts
+        marked_header = row.marked_header
+        display_contents = clean_marked_header_row_contents(row)
         non_empty = [text for text in texts if text]
 
         if is_versification_act_heading(texts) and len(non_empty) == 1:
@@ -1537,19 +2363,15 @@ def process_table_to_tei(table, footnotes_intro=None, current_section=None):
     if footnotes_intro is None:
         footnotes_intro = {}
 
-    table_rows = extract_docx_table_rows(
+    table_record = extract_docx_table(
         table,
         lambda para: extract_text_with_intro_notes(para, footnotes_intro),
     )
-    plain_text_rows = [
-        [strip_table_header_marker_from_text(cell.text) for cell in row.cells]
-        for row in table.rows
-    ]
 
     if is_versification_section(current_section):
-        return render_versification_table_to_tei(table_rows, plain_text_rows, len(table.columns))
+        return render_versification_table_to_tei(table_record)
 
-    return render_simple_table_to_tei(table_rows)
+    return render_simple_table_to_tei(table_record)
 
 
 # --- ExtracciÃ³n de notas de notas y aparato
@@ -1688,7 +2510,7 @@ def extract_notes_with_italics(docx_path: str) -> dict:
     def table_to_tei(table: Table) -> str:
         """Convierte una tabla DOCX a XML TEI básico para incluirla dentro de una nota."""
         return render_simple_table_to_tei(
-            extract_docx_table_rows(table, extract_text_with_italics),
+            extract_docx_table(table, extract_text_with_italics),
             compact=True,
         )
 
@@ -1881,6 +2703,7 @@ def process_annotations_with_ids(text, nota_notes, aparato_notes, annotation_cou
 
 
 # --- Función principal de conversión DOCX → TEI
+@profiled("conversion", ("main_docx", "notas_docx", "aparato_docx", "metadata_docx"))
 def convert_docx_to_tei(
     main_docx: str,
     notas_docx: Optional[str] = None,
@@ -1889,10 +2712,12 @@ def convert_docx_to_tei(
     tei_header: Optional[str] = None,
     output_file: Optional[str] = None,
     save: bool = True,
-    header_mode: str = "prolope"
-) -> Optional[str]:
+    header_mode: str = "prolope",
+    findings: Optional[list["ValidationFinding"]] = None,
+) -> str:
     """
-    Convierte uno o más DOCX a un XML-TEI completo.
+    Convierte uno o más DOCX a un XML-TEI completo. Devuelve el TEI si save=False
+    y, si se guarda, la ruta absoluta del archivo escrito.
     
     Args:
         main_docx: Ruta al archivo DOCX principal.
@@ -1903,32 +2728,107 @@ def convert_docx_to_tei(
         output_file: Ruta donde guardar el archivo TEI (opcional).
         save: Si se debe guardar el archivo (por defecto True).
         header_mode: "prolope" para header completo, "minimo" para header básico.
+        findings: Lista a la que se añaden, en lugar de imprimirse, los hallazgos de la
+            generación: xml:id duplicados, referencias who sin destino y notas sin
+            adjuntar o pedidas de más (opcional; la usan la GUI y el daemon).
+    """
+    check_main_docx(main_docx)
+    header = resolve_tei_header(metadata_docx, tei_header, header_mode)
+    ids, note_usage = (IdRegistry(), NoteUsage()) if findings is not None else (None, None)
+    tei_str, title_key = render_tei_document(
+        load_main_document(main_docx), header, notas_docx, aparato_docx, ids, note_usage
+    )
+    if findings is not None:
+        findings.extend(ids.finish(main_docx) + note_usage.finish())
+
+    # Si no queremos guardar en disco, devolvemos el string
+    if not save:
+        return tei_str
+
+    # Si llegamos aquí, save == True: escribimos el fichero
+    if not output_file:
+        # Generamos nombre por defecto si hace falta
+        output_file = f"{title_key}.xml"
+
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(tei_str)
+    # Devolvemos la ruta escrita (con el nombre por defecto solo el backend la conoce)
+    return os.path.abspath(output_file)
+
+
+def check_main_docx(main_docx: str) -> None:
+    """
+    Chequeo de existencia y extensión del DOCX principal.
     """
-    #Chequeo de existencia del principal
     if not main_docx.lower().endswith(".docx"):
         raise ValueError(f"Se esperaba un .docx, pero se obtuvo: {main_docx}")
     if not os.path.exists(main_docx):
         raise FileNotFoundError(f"No existe el archivo principal: {main_docx}")
 
-    # Generación del header TEI a partir de metadata_docx si se proporciona
+
+def resolve_tei_header(metadata_docx: Optional[str], tei_header: Optional[str], header_mode: str) -> str:
+    """
+    teiHeader de la edición: generado a partir de metadata_docx si se proporciona,
+    el recibido en `tei_header` o, si no hay ninguno, una cabecera mínima de reserva.
+    """
+    mark_stage("cabecera")
     if metadata_docx:
         if not os.path.exists(metadata_docx):
             raise FileNotFoundError(f"No existe el archivo de metadatos: {metadata_docx}")
         try:
-            tei_header = parse_metadata_docx(metadata_docx, header_mode=header_mode)
+            return cached_parse("metadata", metadata_docx, parse_metadata_docx, header_mode)
         except Exception as e:
             raise RuntimeError(f"No se pudo parsear metadata DOCX '{metadata_docx}': {e}")
-    elif not tei_header:
-        # Cabecera mínima de reserva
-        tei_header_respaldo = "<teiHeader>…</teiHeader>"
+    return tei_header or "<teiHeader>…</teiHeader>"
+
+
+class MainDocument:
+    """
+    DOCX principal abierto: el árbol de python-docx (solo lo necesita el front) y sus
+    párrafos de primer nivel como registros compactos, que comparten conversión y
+    validación. render_tei_document suelta `doc` en cuanto renderiza el front.
+    """
+    __slots__ = ("path", "doc", "records")
 
-    header = tei_header if tei_header else tei_header_respaldo
+    def __init__(self, path: str, doc, records: list["ParagraphRecord"]):
+        self.path = path
+        self.doc = doc
+        self.records = records
 
-    # Carga del DOCX principal
+
+def load_main_document(main_docx: str) -> MainDocument:
+    mark_stage("lectura_docx")
     try:
         doc = Document(main_docx)
     except Exception as e:
         raise RuntimeError(f"Error al abrir el archivo DOCX principal '{main_docx}': {e}")
+    # Los párrafos de primer nivel se extraen una sola vez a registros compactos;
+    # el árbol de python-docx solo se conserva hasta renderizar el front.
+    return MainDocument(main_docx, doc, build_paragraph_snapshot(doc.paragraphs).records)
+
+
+def render_tei_document(
+    main_document: MainDocument,
+    header: str,
+    notas_docx: Optional[str] = None,
+    aparato_docx: Optional[str] = None,
+    ids: Optional[IdRegistry] = None,
+    note_usage: Optional[NoteUsage] = None,
+) -> tuple[str, str]:
+    """
+    Construye el TEI completo a partir del DOCX principal ya abierto.
+    Devuelve (TEI, clave del título para el nombre de archivo por defecto).
+    Los xml:id se registran en `ids`: al terminar, los duplicados y las referencias
+    who sin destino quedan en ids.finish(). Si no se pasa, se usa uno nuevo y sus
+    hallazgos se imprimen; quien lo pasa los recibe sin salida por pantalla. Del mismo
+    modo, las notas y el aparato sin adjuntar o pedidos de más quedan en
+    note_usage.finish(), y solo se imprimen si no se pasa `note_usage`.
+    """
+    main_docx = main_document.path
+    doc, main_document.doc = main_document.doc, None
+    doc_paragraphs = doc.paragraphs
+    paragraph_records = main_document.records
 
     # --- SEPARACIÓN FRONT/BODY BASADA EN 'Titulo_comedia' ---
 
@@ -1937,8 +2837,8 @@ def convert_docx_to_tei(
     # párrafo no vacío fuera del bloque de título.
     title_paragraphs = []
     found_first_title = False
-    for i, p in enumerate(doc.paragraphs):
-        style_name = p.style.name if p.style else ""
+    for i, p in enumerate(paragraph_records):
+        style_name = p.style_name or ""
         is_empty_for_parse = is_parse_empty_paragraph(p)
 
         if not found_first_title:
@@ -1956,7 +2856,7 @@ def convert_docx_to_tei(
             continue
 
         if style_name == "Titulo_comedia":
-            if looks_like_pre_act_sequence(doc.paragraphs, i, require_dramatis=True):
+            if looks_like_pre_act_sequence(paragraph_records, i, require_dramatis=True):
                 break
             title_paragraphs.append(i)
             if len(title_paragraphs) == 2:
@@ -1977,24 +2877,38 @@ def convert_docx_to_tei(
     # El body comienza después del último título válido (título o subtítulo).
     last_title_idx = title_paragraphs[-1]
     body_start_idx = last_title_idx + 1
-    front_blocks = get_front_blocks(doc, doc.paragraphs[title_idx])
-    body_paragraphs  = list(doc.paragraphs[body_start_idx:])
+    front_blocks = get_front_blocks(doc, doc_paragraphs[title_idx])
+    body_paragraphs = paragraph_records[body_start_idx:]
+
+    # Notas introductorias y renderizado del front (único uso del árbol python-docx)
+    mark_stage("front")
+    footnotes_intro = cached_parse(
+        "intro_footnotes", main_docx, extract_intro_footnotes, collect_footnote_reference_ids(front_blocks)
+    )
+    front_xml = process_front_paragraphs_with_tables(front_blocks, footnotes_intro)
+
+    # A partir de aquí solo se usan los registros compactos: se libera el documento.
+    # El paquete OPC de python-docx tiene referencias cíclicas, así que se fuerza
+    # la recolección antes de cargar notas y aparato.
+    del doc, doc_paragraphs, front_blocks
+    gc.collect()
 
     # --- Extracción del título ---
-    raw_title = doc.paragraphs[title_idx].text.strip()
+    raw_title = paragraph_records[title_idx].text.strip()
     # Generar la clave/slug a partir del título (sin marcadores @)
     clean_title_for_filename = re.sub(r'@', '', raw_title)
     title_key = generate_filename(clean_title_for_filename)
 
 
     # --- Determinación y validación de rutas de notas y aparato ---
+    mark_stage("notas")
     nota_notes = {}
     if notas_docx:
         if not notas_docx.lower().endswith(".docx"):
             raise ValueError(f"El archivo de notas debe ser .docx: {notas_docx}")
         if not os.path.exists(notas_docx):
             raise FileNotFoundError(f"No existe el archivo de notas: {notas_docx}")
-        nota_notes = extract_notes_with_italics(notas_docx)
+        nota_notes = cached_parse("notes", notas_docx, extract_notes_with_italics)
 
     aparato_notes = {}
     if aparato_docx:
@@ -2002,12 +2916,29 @@ def convert_docx_to_tei(
             raise ValueError(f"El archivo de aparato debe ser .docx: {aparato_docx}")
         if not os.path.exists(aparato_docx):
             raise FileNotFoundError(f"No existe el archivo de aparato: {aparato_docx}")
-        aparato_notes = extract_notes_with_italics(aparato_docx)
+        aparato_notes = cached_parse("notes", aparato_docx, extract_notes_with_italics)
+
+    # Seguimiento de qué entradas llegan al TEI (copias: la caché no se modifica)
+    print_note_findings = note_usage is None
+    if note_usage is None:
+        note_usage = NoteUsage()
+    note_usage.main_docx = main_docx
+    if notas_docx:
+        nota_notes = note_usage.track(nota_notes, "nota", notas_docx)
+    if aparato_docx:
+        aparato_notes = note_usage.track(aparato_notes, "aparato", aparato_docx)
 
-    
     # Contadores y estado
-    annotation_counter = {}
+    mark_stage("body")
+    print_id_findings = ids is None
+    if ids is None:
+        ids = IdRegistry()
+    ids.register_fragment(header, "teiHeader")
+    for fixed_id, element in (("front", "front"), ("prologo", "div"), ("body", "body"), ("comedia", "div"), ("titulo", "head")):
+        ids.register(fixed_id, element)
+    annotation_counter: dict[str, Any] = {"_ids": ids}
     state: dict[str, Any] = {
+        "ids": ids,
         "in_sp": False,
         "in_cast_list": False,
         "in_dedicatoria": False,
@@ -2016,10 +2947,9 @@ def convert_docx_to_tei(
         "cast_list_indent": None,
         "cast_item_indent": None,
         "cast_list_scope": None,
-        "pending_split_verse": None,
-        "current_split_verse": None,
-        "split_verse_part_index": None,
     }
+    # Versos partidos: sufijos alfabéticos y detección de secuencias incompletas
+    split_tracker = SplitVerseTracker()
     
     # Dramatis global y dramatis específico del acto actual
     global_characters = {}
@@ -2029,34 +2959,29 @@ def convert_docx_to_tei(
     verse_counter = 1
 
     # Título procesado con el mismo contador de anotaciones
-    title_para = doc.paragraphs[title_idx]
+    title_para = paragraph_records[title_idx]
+    # Título en mayúsculas (las notas conservan su capitalización)
     processed_title = extract_text_with_italics_and_annotations(
         title_para,
         nota_notes,
         aparato_notes,
         annotation_counter,
-        "head"
+        "head",
+        uppercase=True,
     )
-    # Convertir título a mayúsculas preservando etiquetas XML
-    processed_title = uppercase_preserve_tags_and_note_content(processed_title)
 
     # Subtítulo procesado (si existe)
     processed_subtitle = None
     if subtitle_idx is not None:
-        subtitle_para = doc.paragraphs[subtitle_idx]
+        subtitle_para = paragraph_records[subtitle_idx]
         processed_subtitle = extract_text_with_italics_and_annotations(
             subtitle_para,
             nota_notes,
             aparato_notes,
             annotation_counter,
-            "head"
+            "head",
+            uppercase=True,
         )
-        # Convertir subtítulo a mayúsculas preservando etiquetas XML
-        processed_subtitle = uppercase_preserve_tags_and_note_content(processed_subtitle)
-
-    # Notas introductorias
-    footnotes_intro = extract_intro_footnotes(main_docx)
-
 
     # --- Construcción de <front> y apertura de <body> ---
     tei = [
@@ -2071,7 +2996,7 @@ def convert_docx_to_tei(
     ]
 
     # Inserta el contenido de <front>, incluyendo notas introductorias y tablas
-    tei.append(process_front_paragraphs_with_tables(front_blocks, footnotes_intro))
+    tei.append(front_xml)
 
     # Cerramos el front y abrimos el body con el título principal (y subtítulo si existe)
     tei.extend([
@@ -2226,6 +3151,7 @@ def convert_docx_to_tei(
             processed_text = extract_text_with_italics_and_annotations(para, nota_notes, aparato_notes, annotation_counter, "head")
             if not state["in_dedicatoria"]:
                 # Primer head de la dedicatoria: abrir div y usar mainTitle
+                state["ids"].register("dedicatoria", "div", para.index, text_simple)
                 tei.append('        <div type="dedicatoria" xml:id="dedicatoria">')
                 tei.append(f'          <head type="mainTitle">{processed_text}</head>')
                 state["in_dedicatoria"] = True
@@ -2257,6 +3183,7 @@ def convert_docx_to_tei(
                 else:
                     role_id = role_slug
                     global_characters[role_name_clean] = role_id
+                state["ids"].register(role_id, "role", para.index, role_name_clean)
                 item_indent = state.get("cast_item_indent", "            ")
                 tei.append(f'{item_indent}<castItem><role xml:id="{role_id}">{processed_role_name}</role></castItem>')
 
@@ -2269,19 +3196,22 @@ def convert_docx_to_tei(
                 
                 # Procesar notas
                 if verse_counter in nota_notes:
-                    note_list = nota_notes[verse_counter]
+                    note_list = take_verse_notes(nota_notes, verse_counter)
                     # note_list siempre es una lista
-                    for note_idx, content in enumerate(note_list, 1):
-                        verse_text += f'<note subtype="nota" n="{verse_counter}" xml:id="nota_{verse_counter}_{note_idx}">{content}</note>'
+                    verse_text += render_verse_notes(
+                        "nota", note_list, verse_counter, verse_counter, ids, para.index
+                    )
                 
                 # Mismo tratamiento para aparato
                 if verse_counter in aparato_notes:
-                    aparato_list = aparato_notes[verse_counter]
+                    aparato_list = take_verse_notes(aparato_notes, verse_counter)
                     # aparato_list siempre es una lista
-                    for note_idx, content in enumerate(aparato_list, 1):
-                        verse_text += f'<note subtype="aparato" n="{verse_counter}" xml:id="aparato_{verse_counter}_{note_idx}">{content}</note>'
+                    verse_text += render_verse_notes(
+                        "aparato", aparato_list, verse_counter, verse_counter, ids, para.index
+                    )
                 
                 tei.append(f'            <l n="{verse_counter}">{verse_text}</l>')
+                split_tracker.verse(verse_counter)
                 verse_counter += 1
 
         elif style == "Laguna":
@@ -2298,47 +3228,39 @@ def convert_docx_to_tei(
             verse_text = extract_text_with_italics_and_annotations(para, nota_notes, aparato_notes, annotation_counter, "l")
             text_simple = para.text.strip()
             
-            # Inicializar estado del verso partido
-            state["current_split_verse"] = verse_counter
-            state["split_verse_part_index"] = 0
+            # Inicializar el verso partido como ancla de las partes siguientes
+            split_tracker.start(verse_counter, text=text_simple)
             
-            # Calcular sufijo alfabético para esta parte (primera parte = 'a')
-            letra = chr(97 + state["split_verse_part_index"])  # 97 = 'a' en ASCII
+            # Sufijo alfabético de la primera parte ('a')
+            letra = "a"
             verse_key_with_suffix = f"{verse_counter}{letra}"
             
-            pending_split_verse: PendingSplitVerse = {
-                "verse_number": verse_counter,
-                "initial_text": text_simple,
-                "parts": [text_simple],
-                "has_notes": verse_counter in nota_notes or verse_counter in aparato_notes or verse_key_with_suffix in nota_notes or verse_key_with_suffix in aparato_notes
-            }
-            state["pending_split_verse"] = pending_split_verse
-            
             # Procesar notas con clave que incluye sufijo (ej: "329a")
             # Buscar primero con sufijo, luego sin sufijo para retrocompatibilidad
             if verse_key_with_suffix in nota_notes:
-                note_list = nota_notes[verse_key_with_suffix]
-                for note_idx, content in enumerate(note_list, 1):
-                    verse_text += f'<note subtype="nota" n="{verse_key_with_suffix}" xml:id="nota_{verse_counter}{letra}_{note_idx}">{content}</note>'
+                note_list = take_verse_notes(nota_notes, verse_key_with_suffix)
+                verse_text += render_verse_notes(
+                    "nota", note_list, verse_key_with_suffix, f"{verse_counter}{letra}", ids, para.index
+                )
             elif verse_counter in nota_notes:
                 # Retrocompatibilidad: buscar sin sufijo
-                note_list = nota_notes[verse_counter]
-                for note_idx, content in enumerate(note_list, 1):
-                    verse_text += f'<note subtype="nota" n="{verse_key_with_suffix}" xml:id="nota_{verse_counter}{letra}_{note_idx}">{content}</note>'
+                note_list = take_verse_notes(nota_notes, verse_counter)
+                verse_text += render_verse_notes(
+                    "nota", note_list, verse_key_with_suffix, f"{verse_counter}{letra}", ids, para.index
+                )
             
             # Mismo tratamiento para aparato
             if verse_key_with_suffix in aparato_notes:
-                aparato_list = aparato_notes[verse_key_with_suffix]
-                for note_idx, content in enumerate(aparato_list, 1):
-                    verse_text += f'<note subtype="aparato" n="{verse_key_with_suffix}" xml:id="aparato_{verse_counter}{letra}_{note_idx}">{content}</note>'
+                aparato_list = take_verse_notes(aparato_notes, verse_key_with_suffix)
+                verse_text += render_verse_notes(
+                    "aparato", aparato_list, verse_key_with_suffix, f"{verse_counter}{letra}", ids, para.index
+                )
             elif verse_counter in aparato_notes:
                 # Retrocompatibilidad: buscar sin sufijo
-                aparato_list = aparato_notes[verse_counter]
-                for note_idx, content in enumerate(aparato_list, 1):
-                    verse_text += f'<note subtype="aparato" n="{verse_key_with_suffix}" xml:id="aparato_{verse_counter}{letra}_{note_idx}">{content}</note>'
-            
-            # Incrementar índice de parte para la siguiente parte del verso
-            state["split_verse_part_index"] += 1
+                aparato_list = take_verse_notes(aparato_notes, verse_counter)
+                verse_text += render_verse_notes(
+                    "aparato", aparato_list, verse_key_with_suffix, f"{verse_counter}{letra}", ids, para.index
+                )
             
             tei.append(f'            <l part="I" n="{verse_key_with_suffix}">{verse_text}</l>')
             verse_counter += 1
@@ -2348,43 +3270,26 @@ def convert_docx_to_tei(
             text_simple = para.text.strip()
             verse_text = extract_text_with_italics_and_annotations(para, nota_notes, aparato_notes, annotation_counter, "l")
             
-            # Recuperar número base del verso partido
-            if state.get("current_split_verse") is not None:
-                base_verse = state["current_split_verse"]
-                part_index = state.get("split_verse_part_index")
-                # Validación defensiva: asegurar que part_index nunca sea None
-                if part_index is None:
-                    part_index = 1
-            else:
-                # Fallback: si no hay estado, usar verso anterior (puede ocurrir en secuencias válidas)
-                base_verse = verse_counter - 1
-                part_index = 1
+            # Recuperar número base del verso partido; sin inicial previo se usa
+            # el verso anterior (puede ocurrir en secuencias válidas)
+            base_verse, part_index = split_tracker.continue_part("Partido_medio", verse_counter - 1, text=text_simple)
             
             # Calcular sufijo alfabético para esta parte (segunda parte = 'b', tercera = 'c', etc.)
             letra = chr(97 + part_index)  # 97 = 'a' en ASCII
             verse_key_with_suffix = f"{base_verse}{letra}"
             
-            pending = get_pending_split_verse(state)
-            if pending is not None:
-                pending["parts"].append(text_simple)
-            
             # Procesar notas con clave que incluye sufijo (ej: "329b", "329c")
             if verse_key_with_suffix in nota_notes:
-                note_list = nota_notes[verse_key_with_suffix]
-                for note_idx, content in enumerate(note_list, 1):
-                    verse_text += f'<note subtype="nota" n="{verse_key_with_suffix}" xml:id="nota_{base_verse}{letra}_{note_idx}">{content}</note>'
+                note_list = take_verse_notes(nota_notes, verse_key_with_suffix)
+                verse_text += render_verse_notes(
+                    "nota", note_list, verse_key_with_suffix, f"{base_verse}{letra}", ids, para.index
+                )
             
             if verse_key_with_suffix in aparato_notes:
-                aparato_list = aparato_notes[verse_key_with_suffix]
-                for note_idx, content in enumerate(aparato_list, 1):
-                    verse_text += f'<note subtype="aparato" n="{verse_key_with_suffix}" xml:id="aparato_{base_verse}{letra}_{note_idx}">{content}</note>'
-            
-            # Incrementar índice de parte para la siguiente parte
-            if "split_verse_part_index" in state and state["split_verse_part_index"] is not None:
-                state["split_verse_part_index"] += 1
-            else:
-                # Si no existe o es None, inicializar a 2 (ya procesamos la primera parte)
-                state["split_verse_part_index"] = 2
+                aparato_list = take_verse_notes(aparato_notes, verse_key_with_suffix)
+                verse_text += render_verse_notes(
+                    "aparato", aparato_list, verse_key_with_suffix, f"{base_verse}{letra}", ids, para.index
+                )
             
             tei.append(f'            <l part="M" n="{verse_key_with_suffix}">{verse_text}</l>')
 
@@ -2393,42 +3298,25 @@ def convert_docx_to_tei(
             text_simple = para.text.strip()
             verse_text = extract_text_with_italics_and_annotations(para, nota_notes, aparato_notes, annotation_counter, "l")
             
-            # Recuperar número base del verso partido
-            if state.get("current_split_verse") is not None:
-                base_verse = state["current_split_verse"]
-                part_index = state.get("split_verse_part_index")
-                # Validación defensiva: asegurar que part_index nunca sea None
-                if part_index is None:
-                    part_index = 1
-            else:
-                # Fallback: si no hay estado, usar verso anterior (puede ocurrir en secuencias válidas)
-                base_verse = verse_counter - 1
-                part_index = 1
+            # Recuperar número base del verso partido y liberar el ancla
+            base_verse, part_index = split_tracker.continue_part("Partido_final", verse_counter - 1, text=text_simple)
             
             # Calcular sufijo alfabético para esta parte final
             letra = chr(97 + part_index)  # 97 = 'a' en ASCII
             verse_key_with_suffix = f"{base_verse}{letra}"
             
-            pending = get_pending_split_verse(state)
-            if pending is not None:
-                pending["parts"].append(text_simple)
-                # El verso partido está completo, limpiar estado
-                state["pending_split_verse"] = None
-            
             # Procesar notas con clave que incluye sufijo (ej: "329c", "329d")
             if verse_key_with_suffix in nota_notes:
-                note_list = nota_notes[verse_key_with_suffix]
-                for note_idx, content in enumerate(note_list, 1):
-                    verse_text += f'<note subtype="nota" n="{verse_key_with_suffix}" xml:id="nota_{base_verse}{letra}_{note_idx}">{content}</note>'
+                note_list = take_verse_notes(nota_notes, verse_key_with_suffix)
+                verse_text += render_verse_notes(
+                    "nota", note_list, verse_key_with_suffix, f"{base_verse}{letra}", ids, para.index
+                )
             
             if verse_key_with_suffix in aparato_notes:
-                aparato_list = aparato_notes[verse_key_with_suffix]
-                for note_idx, content in enumerate(aparato_list, 1):
-                    verse_text += f'<note subtype="aparato" n="{verse_key_with_suffix}" xml:id="aparato_{base_verse}{letra}_{note_idx}">{content}</note>'
-            
-            # Limpiar estado del verso partido
-            state["current_split_verse"] = None
-            state["split_verse_part_index"] = None
+                aparato_list = take_verse_notes(aparato_notes, verse_key_with_suffix)
+                verse_text += render_verse_notes(
+                    "aparato", aparato_list, verse_key_with_suffix, f"{base_verse}{letra}", ids, para.index
+                )
             
             tei.append(f'            <l part="F" n="{verse_key_with_suffix}">{verse_text}</l>')
 
@@ -2452,8 +3340,9 @@ def convert_docx_to_tei(
         elif style == "Personaje":
             text_simple = para.text.strip()
             who_id = find_who_id_with_fallback(text_simple, current_act_characters, global_characters)
-            processed = extract_text_with_italics_and_annotations(
-                para, nota_notes, aparato_notes, annotation_counter, "speaker"
+            # speaker en mayúsculas, preservando etiquetas XML y notas
+            processed_upper = extract_text_with_italics_and_annotations(
+                para, nota_notes, aparato_notes, annotation_counter, "speaker", uppercase=True
             )
 
             # Cierra <sp> anterior si es necesario
@@ -2463,6 +3352,7 @@ def convert_docx_to_tei(
 
             # Abrir <sp> con who si está disponible
             if who_id:
+                state["ids"].refer(who_id, "sp", para.index, text_simple)
                 tei.append(f'        <sp who="#{who_id}">')
             else:
                 # No hay who_id (personaje no encontrado en dramatis personae)
@@ -2470,8 +3360,6 @@ def convert_docx_to_tei(
             
             # SIEMPRE insertar <speaker> en cada nuevo <sp>
             # Cada intervención es un <sp> separado y debe tener su propio <speaker>
-            # Convertir speaker a mayúsculas, preservando etiquetas XML
-            processed_upper = uppercase_preserve_tags_and_note_content(processed)
             tei.append(f'          <speaker>{processed_upper}</speaker>')
             
             state["in_sp"] = True
@@ -2500,14 +3388,25 @@ def convert_docx_to_tei(
 
 
     # Cierre final de todos los bloques aún abiertos
+    mark_stage("cierre")
     close_current_blocks(tei, state, current_act_characters)
 
     # Verificar si hay versos partidos incompletos al final del procesamiento
-    pending = get_pending_split_verse(state)
-    if pending is not None:
+    for issue in split_tracker.finish():
         print(f"⚠️ Advertencia: Verso partido incompleto detectado durante procesamiento:")
-        print(f"   Verso {pending['verse_number']}: '{pending['initial_text'][:50]}...'")
-        print(f"   - Falta Partido_final para completar el verso")
+        print(f"   Verso {issue.verse_number}: '{issue.text[:50]}...'")
+        print(f"   - {issue.problem}")
+
+    # Identificadores repetidos o referencias who sin destino, detectados al generar
+    if print_id_findings:
+        for message in render_findings(ids.finish(main_docx)):
+            print(message)
+
+    # Notas y aparato que no llegaron al TEI o anotaciones sin nota
+    note_usage.last_verse = verse_counter - 1
+    if print_note_findings:
+        for message in render_findings(note_usage.finish()):
+            print(message)
 
     # Cierre de secciones TEI
     tei.append('      </div>')  # cierra Texto
@@ -2519,81 +3418,111 @@ def convert_docx_to_tei(
 
     # Serializamos el TEI a string
     tei = [fragment for fragment in tei if isinstance(fragment, str)]
-    tei_str = "\n".join(tei)
+    return "\n".join(tei), title_key
 
-    # Si no queremos guardar en disco, devolvemos el string
-    if not save:
-        return tei_str
 
-    # Si llegamos aquí, save == True: escribimos el fichero
-    if not output_file:
-        # Generamos nombre por defecto si hace falta
-        output_file = f"{title_key}.xml"
+# --- Validación y análisis de los documentos
+def load_paragraph_records(docx_path) -> list["ParagraphRecord"]:
+    """
+    Abre un DOCX y devuelve sus párrafos de primer nivel como registros compactos.
+    El documento python-docx no sobrevive a la llamada.
+    """
+    return build_paragraph_snapshot(Document(docx_path).paragraphs).records
 
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(tei_str)
-    # Devolvemos None para indicar que se escribió en disco
-    return None
+class VerseEntry(NamedTuple):
+    para_index: int
+    verse_number: int
+    style: str
+    text: str
 
 
-# --- Validación y análisis de los documentos
-def count_verses_in_document(main_docx, include_dedication=False):
+class VerseMap:
     """
-    Cuenta los versos en un documento DOCX usando la misma lógica que el procesamiento principal.
-    
-    Args:
-        main_docx: Ruta al archivo DOCX
-        include_dedication: Si True, cuenta versos desde Titulo_comedia; si False, desde primer Acto
-    
-    Returns:
-        Lista de tuplas (paragraph_index, verse_number, style, text) para cada verso encontrado
+    Mapa de versos compartido por las validaciones: se construye en una sola pasada
+    y responde en O(log n) al número del último verso antes de un párrafo.
     """
-    doc = Document(main_docx)
-    verses = []
+    __slots__ = ("entries", "_numbered_positions", "_numbered_verses")
+
+    def __init__(self, entries: list[VerseEntry]):
+        self.entries = entries
+        # Solo Verso y Partido_inicial incrementan la numeración
+        numbered = [entry for entry in entries if entry.style in ("Verso", "Partido_inicial")]
+        self._numbered_positions = [entry.para_index for entry in numbered]
+        self._numbered_verses = [entry.verse_number for entry in numbered]
+
+    @property
+    def total_verses(self) -> int:
+        return len(self._numbered_verses)
+
+    def last_verse_before(self, para_index: int) -> int:
+        """
+        Número del último verso (Verso o Partido_inicial) anterior al párrafo, o 0.
+        """
+        position = bisect_left(self._numbered_positions, para_index)
+        return self._numbered_verses[position - 1] if position else 0
+
+
+def build_verse_map(paragraphs, include_dedication=False) -> VerseMap:
+    """
+    Recorre los párrafos una vez y numera los versos con la misma lógica que
+    count_verses_in_document a partir de registros compactos (ParagraphRecord).
+    """
+    entries: list[VerseEntry] = []
     found_start = False
     verse_counter = 1
-    
-    for para_idx, para in enumerate(doc.paragraphs):
-        style: str = (para.style.name or "") if para.style else ""
+    start_style = "Titulo_comedia" if include_dedication else "Acto"
+
+    for para_idx, para in enumerate(paragraphs):
+        style = para.style_name or ""
         text = para.text.strip() if para.text else ""
-        
+
         # Determinar punto de inicio según parámetro
         if not found_start:
-            start_style = "Titulo_comedia" if include_dedication else "Acto"
             if style == start_style and not is_parse_empty_paragraph(para):
                 found_start = True
                 if not include_dedication:  # Si empezamos en Acto, reiniciar contador
                     verse_counter = 1
             continue
-        
+
         # Aplicar los mismos filtros que en el procesamiento principal
         if is_parse_empty_paragraph(para):  # Párrafos vacíos para parseo
             continue
         if re.match(r'^\$\w+', text):  # Milestones
             continue
         if style in [
-            "Personaje", "Acot", "Prosa", 
+            "Personaje", "Acot", "Prosa",
             "Epigr_Dedic", "Epigr_Dramatis", "Dramatis_lista", "Epigr_final",
             "Acto", "Cita", "Heading 1", "Heading 2", "Heading 3", "Normal"
         ]:
             continue
-        
+
         # Contar versos reales (excluyendo Laguna que no incrementa numeración)
-        if style == "Verso":
-            verses.append((para_idx, verse_counter, style, text))
-            verse_counter += 1
-        elif style == "Partido_inicial":
-            verses.append((para_idx, verse_counter, style, text))
+        if style in ("Verso", "Partido_inicial"):
+            entries.append(VerseEntry(para_idx, verse_counter, style, text))
             verse_counter += 1
-        elif style in ["Partido_medio", "Partido_final"]:
+        elif style in ("Partido_medio", "Partido_final"):
             # Medio y final usan el número del inicial (counter - 1)
-            verses.append((para_idx, verse_counter - 1, style, text))
+            entries.append(VerseEntry(para_idx, verse_counter - 1, style, text))
         elif style == "Laguna":
             # Registrar laguna pero sin incrementar contador
-            verses.append((para_idx, verse_counter, style, text))
+            entries.append(VerseEntry(para_idx, verse_counter, style, text))
+
+    return VerseMap(entries)
+
+
+def count_verses_in_document(main_docx, include_dedication=False):
+    """
+    Cuenta los versos en un documento DOCX usando la misma lógica que el procesamiento principal.
     
-    return verses
+    Args:
+        main_docx: Ruta al archivo DOCX
+        include_dedication: Si True, cuenta versos desde Titulo_comedia; si False, desde primer Acto
+    
+    Returns:
+        Lista de tuplas (paragraph_index, verse_number, style, text) para cada verso encontrado
+    """
+    return build_verse_map(load_paragraph_records(main_docx), include_dedication).entries
 
 def get_verse_number_at_position(main_docx, target_para_index, include_dedication=False):
     """
@@ -2607,19 +3536,25 @@ def get_verse_number_at_position(main_docx, target_para_index, include_dedicatio
     Returns:
         int: Número del último verso antes de la posición, o 0 si no hay versos previos
     """
-    verses = count_verses_in_document(main_docx, include_dedication)
-    
-    # Buscar el último verso antes de la posición objetivo
-    last_verse_number = 0
-    for para_idx, verse_number, style, text in verses:
-        if para_idx < target_para_index:
-            # Solo contar versos que incrementan el contador (no medio/final)
-            if style in ["Verso", "Partido_inicial"]:
-                last_verse_number = verse_number
-        else:
-            break
-    
-    return last_verse_number
+    verse_map = build_verse_map(load_paragraph_records(main_docx), include_dedication)
+    return verse_map.last_verse_before(target_para_index)
+
+
+def analyze_split_verses(verse_map: VerseMap) -> SplitVerseTracker:
+    """
+    Recorre el mapa de versos una sola vez y devuelve el tracker ya cerrado,
+    con los problemas de versos partidos y los contadores de numeración.
+    """
+    tracker = SplitVerseTracker()
+    for entry in verse_map.entries:
+        if entry.style == "Verso":
+            tracker.verse(entry.verse_number, entry.para_index, entry.text)
+        elif entry.style == "Partido_inicial":
+            tracker.start(entry.verse_number, entry.para_index, entry.text)
+        elif entry.style in ("Partido_medio", "Partido_final"):
+            tracker.continue_part(entry.style, entry.verse_number, entry.para_index, entry.text)
+    tracker.finish()
+    return tracker
 
 def is_parse_empty_paragraph(para) -> bool:
     """
@@ -2673,7 +3608,7 @@ def is_empty_paragraph(para) -> bool:
     
     return False
 
-def should_skip_paragraph(para: Paragraph, text: str, style: str) -> bool:
+def should_skip_paragraph(para, text: str, style: str) -> bool:
     """
     Determina si un párrafo debe ser omitido durante la validación.
     """
@@ -2689,27 +3624,369 @@ def should_skip_paragraph(para: Paragraph, text: str, style: str) -> bool:
     if text.startswith("#"):
         return True
 
-    # Párrafos dentro de tablas (sinopsis, metadatos, etc.)
-    if para._element.xpath("ancestor::w:tbl"):
+    # Párrafos dentro de tablas (sinopsis, metadatos, etc.). Los registros compactos
+    # solo representan párrafos de primer nivel, que nunca están dentro de una tabla.
+    element = getattr(para, "_element", None)
+    if element is not None and element.xpath("ancestor::w:tbl"):
         return True
 
     return False
 
-def analyze_main_text(main_docx) -> list[str]:
+# --- Hallazgos de validación estructurados
+class ValidationFinding(NamedTuple):
+    """
+    Incidencia detectada por un validador. El texto para mostrar se genera aparte con
+    render_findings(); filtrar, contar o exportar solo necesita estos campos.
+
+    - code: identificador estable del tipo de incidencia (ver FINDING_CATEGORIES).
+    - severity: "error" o "warning".
+    - file: ruta del DOCX al que se refiere.
+    - paragraph_index: índice (desde 0) del párrafo en el DOCX, si aplica.
+    - verse_number: número de verso asociado, si aplica.
+    - snippet: texto completo del párrafo o nota implicado (se recorta al mostrarlo).
+    - context: datos propios de cada código (estilo, clave de nota, totales...).
+    """
+    code: str
+    severity: str
+    file: Optional[str] = None
+    paragraph_index: Optional[int] = None
+    verse_number: Optional[int] = None
+    snippet: str = ""
+    context: Optional[dict] = None
+
+    @property
+    def category(self) -> str:
+        return FINDING_CATEGORIES.get(self.code, "Otros")
+
+    def get(self, key: str, default=None):
+        return (self.context or {}).get(key, default)
+
+    def to_dict(self) -> dict:
+        return {
+            "code": self.code,
+            "severity": self.severity,
+            "category": self.category,
+            "file": self.file,
+            "paragraph_index": self.paragraph_index,
+            "verse_number": self.verse_number,
+            "snippet": self.snippet,
+            "context": self.context or {},
+        }
+
+
+# Categorías visibles en los filtros de la interfaz
+FINDING_CATEGORIES = {
+    "missing_file": "Archivos",
+    "invalid_style": "Estilos",
+    "unstyled_paragraph": "Estilos",
+    "note_format": "Formato de notas",
+    "multiple_notes_verse": "Notas múltiples por verso",
+    "multiple_notes_word": "Notas múltiples por palabra",
+    "empty_note": "Notas vacías",
+    "split_verse_incomplete": "Versos partidos y numeración",
+    "split_verse_numbering": "Versos partidos y numeración",
+    "laguna": "Lagunas",
+    "bracketed_verse": "Versos con corchetes",
+    "duplicate_id": "Identificadores",
+    "dangling_reference": "Identificadores",
+    "unattached_note": "Notas sin adjuntar",
+    "over_requested_note": "Notas sin adjuntar",
+}
+
+FINDING_CSV_FIELDS = ("code", "severity", "category", "file", "paragraph_index", "verse_number", "snippet", "context")
+
+
+def shorten_snippet(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def render_missing_file(group: list[ValidationFinding]) -> list[str]:
+    templates = {
+        "main": "❌ No existe el archivo principal: {path}",
+        "aparato": "❌ El archivo de notas de aparato: {path}",
+        "notas": "❌ El archivo de notas no existe: {path}",
+    }
+    return [templates[finding.get("role")].format(path=finding.file) for finding in group]
+
+
+def render_invalid_style(group: list[ValidationFinding]) -> list[str]:
+    return [
+        f"❌ Estilo no válido: {finding.get('style') or 'None'} — Texto: {finding.snippet[:60]}"
+        for finding in group
+    ]
+
+
+def render_unstyled_paragraphs(group: list[ValidationFinding]) -> list[str]:
+    count = len(group)
+    messages = [
+        f"❌ LÍNEAS SIN ESTILO DETECTADAS ({count})\n"
+        f"   Archivo: {os.path.basename(group[0].file or '')}\n"
+        f"   Revisa que todas las líneas tengan el estilo correcto aplicado."
+    ]
+
+    # Detalles de cada párrafo sin estilo (mostrar máximo 5)
+    for i, finding in enumerate(group[:5], 1):
+        if finding.verse_number:
+            # Hay versos antes, está dentro de un acto
+            location = f" (después del verso {finding.verse_number})"
+        elif finding.get("act"):
+            # Hay un acto definido pero aún no hay versos
+            location = f" (en {finding.get('act')}, antes del primer verso marcado)"
+        else:
+            # Está antes del primer acto (en dramatis personae o dedicatoria)
+            location = " (en dramatis personae o dedicatoria)"
+        messages.append(f"   {i}. «{shorten_snippet(finding.snippet, 60)}»{location}")
+
+    if count > 5:
+        remaining = count - 5
+        messages.append(f"   ... y {remaining} {'línea más' if remaining == 1 else 'líneas más'}")
+    return messages
+
+
+def render_note_format(group: list[ValidationFinding]) -> list[str]:
+    return [
+        f"❌ Formato incorrecto en archivo '{os.path.basename(finding.file or '')}' "
+        f"({finding.get('note_type')}, párrafo {finding.paragraph_index + 1}): "
+        f"Debe comenzar con 'NÚMERO:', '@PALABRA:' o '%PALABRA:'. "
+        f"Si es continuación de la nota anterior, une este párrafo al anterior en Word. "
+        f"→ Texto: {shorten_snippet(finding.snippet, 80)}"
+        for finding in group
+    ]
+
+
+def render_multiple_notes(group: list[ValidationFinding]) -> list[str]:
+    messages = []
+    for finding in group:
+        note_type, key, count = finding.get("note_type"), finding.get("key"), finding.get("count")
+        if finding.code == "multiple_notes_word":
+            # Determinar el símbolo correcto según el tipo de nota
+            symbol = '@' if note_type.lower() == 'nota' else '%'
+            messages.append(
+                f"⚠️ MÚLTIPLES {note_type.upper()}S PARA '{symbol}{key}' ({count})\n"
+                f"   Verifica que la asignación secuencial en el texto sea correcta."
+            )
+        else:
+            messages.append(
+                f"⚠️ MÚLTIPLES {note_type.upper()}S PARA VERSO {key} ({count})\n"
+                f"   Verifica que todas las {note_type}s sean correctas."
+            )
+    return messages
+
+
+def render_empty_notes(group: list[ValidationFinding]) -> list[str]:
+    messages = []
+    for finding in group:
+        note_type, key, entry = finding.get("note_type"), finding.get("key"), finding.get("entry")
+        target = f"'@{key}'" if isinstance(key, str) else f"verso {key}"
+        suffix = f" (entrada #{entry})" if entry is not None else ""
+        messages.append(f"❌ {note_type.capitalize()} vacía: {target}{suffix}")
+    return messages
+
+
+def render_split_verse_issues(group: list[ValidationFinding]) -> list[str]:
+    count = len(group)
+    plural_s = 's' if count > 1 else ''
+
+    # Encabezado
+    message = f"❌ ({count}) VERSO{plural_s.upper()} PARTIDO{plural_s.upper()} INCOMPLETO{plural_s.upper()}\n"
+    message += "Revisa los siguientes versos:\n\n"
+
+    # Listar cada verso con su problema
+    for finding in group:
+        message += f"Verso {finding.verse_number}. Texto: {shorten_snippet(finding.snippet, 50)}\n"
+        message += f"      Problema: {finding.get('problem')}\n\n"
+
+    return [message.rstrip()]
+
+
+def render_split_verse_numbering(group: list[ValidationFinding]) -> list[str]:
+    messages = []
+    for finding in group:
+        expected, actual = finding.get("expected"), finding.get("actual")
+        diff = actual - expected
+        plural_s = 's' if abs(diff) > 1 else ''
+        messages.append(
+            f"\n⚠️ DESAJUSTE EN LA NUMERACIÓN DE VERSOS\n"
+            f"Se esperan {expected} pero se numerarán {actual}. "
+            f"Hay una diferencia de {diff:+d} verso{plural_s} debido a versos partidos incompletos."
+        )
+    return messages
+
+
+def render_lagunas(group: list[ValidationFinding]) -> list[str]:
+    return [
+        f"⚠️ LAGUNA DETECTADA (después del verso {finding.verse_number})\n"
+        f"   Texto: {shorten_snippet(finding.snippet, 50)}\n"
+        f"   Revisa: ¿Es una laguna de extensión incierta o un verso específico faltante?\n"
+        f"   Si es un verso específico faltante, márcalo como 'Verso' con corchetes.\n"
+        f"   Total de versos actual: {finding.get('total_verses')}"
+        for finding in group
+    ]
+
+
+def render_bracketed_verses(group: list[ValidationFinding]) -> list[str]:
+    return [
+        f"⚠️ VERSO CON CORCHETES DETECTADO (verso {finding.verse_number})\n"
+        f"   Texto: {finding.snippet}\n"
+        f"   Revisa: ¿Es una laguna de extensión incierta?\n"
+        f"   Si no sabes cuántos versos faltan, márcalo como 'Laguna' para no contarlo.\n"
+        f"   Total de versos actual: {finding.get('total_verses')}"
+        for finding in group
+    ]
+
+
+def describe_paragraph(finding: ValidationFinding) -> str:
+    location = f" (párrafo {finding.paragraph_index + 1})" if finding.paragraph_index is not None else ""
+    snippet = f" «{shorten_snippet(finding.snippet, 50)}»" if finding.snippet else ""
+    return f"{location}{snippet}"
+
+
+def render_duplicate_ids(group: list[ValidationFinding]) -> list[str]:
+    return [
+        f"❌ XML:ID DUPLICADO '{finding.get('xml_id')}' en <{finding.get('element')}>"
+        f"{describe_paragraph(finding)}\n"
+        f"   Ya lo usa un <{finding.get('first_element')}> anterior: el TEI resultante no es válido."
+        for finding in group
+    ]
+
+
+def render_dangling_references(group: list[ValidationFinding]) -> list[str]:
+    return [
+        f"❌ REFERENCIA SIN DESTINO who=\"#{finding.get('xml_id')}\" en <{finding.get('element')}>"
+        f"{describe_paragraph(finding)}\n"
+        f"   Ningún elemento del documento tiene ese xml:id."
+        for finding in group
+    ]
+
+
+def describe_note_key(note_type: str, key) -> str:
+    if isinstance(key, int) or VERSE_NOTE_KEY_PATTERN.fullmatch(key):
+        return f"verso {key}"
+    return f"'{'@' if note_type == 'nota' else '%'}{key}'"
+
+
+def render_unattached_notes(group: list[ValidationFinding]) -> list[str]:
+    reasons = {
+        "verse": "no hay ningún verso con ese número",
+        "unmarked": "la palabra no aparece marcada en el texto",
+        "surplus": "hay más entradas que apariciones marcadas de la palabra",
+    }
+    count = len(group)
+    messages = [
+        f"⚠️ NOTAS SIN ADJUNTAR ({count}) en '{os.path.basename(group[0].file or '')}'\n"
+        f"   No aparecen en el TEI: revisa la clave de cada una."
+    ]
+    for finding in group:
+        note_type, key = finding.get("note_type"), finding.get("key")
+        reason = reasons[finding.get("reason")]
+        if finding.get("reason") == "verse" and finding.get("last_verse") is not None:
+            reason += f" (el último es el {finding.get('last_verse')})"
+        messages.append(
+            f"   - {note_type.capitalize()} a {describe_note_key(note_type, key)} "
+            f"(entrada {finding.get('entry')} de {finding.get('entries')}): {reason}. "
+            f"«{shorten_snippet(finding.snippet, 50)}»"
+        )
+    return messages
+
+
+def render_over_requested_notes(group: list[ValidationFinding]) -> list[str]:
+    messages = []
+    for finding in group:
+        note_type, key, entries = finding.get("note_type"), finding.get("key"), finding.get("entries")
+        available = f"solo hay {entries}" if entries else "no hay ninguna"
+        messages.append(
+            f"⚠️ ANOTACIÓN SIN {note_type.upper()}: {describe_note_key(note_type, key)} pide la "
+            f"entrada {finding.get('entry')} y {available}{describe_paragraph(finding)}"
+        )
+    return messages
+
+
+FINDING_RENDERERS = {
+    "missing_file": render_missing_file,
+    "invalid_style": render_invalid_style,
+    "unstyled_paragraph": render_unstyled_paragraphs,
+    "note_format": render_note_format,
+    "multiple_notes_verse": render_multiple_notes,
+    "multiple_notes_word": render_multiple_notes,
+    "empty_note": render_empty_notes,
+    "split_verse_incomplete": render_split_verse_issues,
+    "split_verse_numbering": render_split_verse_numbering,
+    "laguna": render_lagunas,
+    "bracketed_verse": render_bracketed_verses,
+    "duplicate_id": render_duplicate_ids,
+    "dangling_reference": render_dangling_references,
+    "unattached_note": render_unattached_notes,
+    "over_requested_note": render_over_requested_notes,
+}
+
+
+def group_findings(findings: list[ValidationFinding]) -> list[list[ValidationFinding]]:
+    """
+    Agrupa hallazgos consecutivos con el mismo código y archivo: algunos tipos
+    (líneas sin estilo, versos partidos) se muestran como un único aviso resumido.
+    """
+    groups: list[list[ValidationFinding]] = []
+    for finding in findings:
+        if groups and groups[-1][0].code == finding.code and groups[-1][0].file == finding.file:
+            groups[-1].append(finding)
+        else:
+            groups.append([finding])
+    return groups
+
+
+def render_finding_group(group: list[ValidationFinding]) -> list[str]:
+    return FINDING_RENDERERS[group[0].code](group)
+
+
+def render_findings(findings: list[ValidationFinding]) -> list[str]:
+    """
+    Convierte los hallazgos en los avisos de texto que se muestran al usuario.
+    """
+    messages: list[str] = []
+    for group in group_findings(findings):
+        messages.extend(render_finding_group(group))
+    return messages
+
+
+def export_findings_json(findings: list[ValidationFinding], path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([finding.to_dict() for finding in findings], f, ensure_ascii=False, indent=2)
+
+
+def export_findings_csv(findings: list[ValidationFinding], path) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FINDING_CSV_FIELDS)
+        writer.writeheader()
+        for finding in findings:
+            row = finding.to_dict()
+            row["context"] = json.dumps(row["context"], ensure_ascii=False) if row["context"] else ""
+            writer.writerow(row)
+
+
+def count_findings_by_severity(findings: list[ValidationFinding]) -> dict[str, int]:
+    counts = {"error": 0, "warning": 0}
+    for finding in findings:
+        counts[finding.severity] = counts.get(finding.severity, 0) + 1
+    return counts
+
+
+def analyze_main_text(main_docx, paragraphs=None, verse_map: Optional[VerseMap] = None) -> list[ValidationFinding]:
     """
-    Analiza el archivo principal y devuelve avisos de párrafos sin estilo
+    Analiza el archivo principal y devuelve los párrafos sin estilo
     solo en el cuerpo de la obra (tras Titulo_comedia), ignorando front matter
     y milestones ($.). Incluye dramatis personae pero no cuenta versos.
     """
-    warnings: list[str] = []
-    unstyled_paragraphs: list[tuple[str, str]] = []  # (text, location_info)
+    findings: list[ValidationFinding] = []
 
-    doc = Document(main_docx)
+    if paragraphs is None:
+        paragraphs = load_paragraph_records(main_docx)
+    if verse_map is None:
+        verse_map = build_verse_map(paragraphs)
     found_body = False
     last_act_name = None
 
-    for para_idx, para in enumerate(doc.paragraphs):
-        style = (para.style.name or "") if para.style else ""
+    for para_idx, para in enumerate(paragraphs):
+        style = para.style_name or ""
         text = para.text.strip() if para.text else ""
 
         # 1) Buscamos el inicio del body (incluyendo dramatis personae)
@@ -2728,280 +4005,123 @@ def analyze_main_text(main_docx) -> list[str]:
 
         # 3) Solo revisamos estilos 'Normal' o None para párrafos sin estilo
         if style in ["Normal", ""]:
-            # Obtener número del último verso antes de esta posición
-            last_verse = get_verse_number_at_position(main_docx, para_idx, include_dedication=False)
-            
-            # Determinar el contexto de localización
-            if last_verse > 0:
-                # Hay versos antes, está dentro de un acto
-                location_info = f" (después del verso {last_verse})"
-            elif last_act_name:
-                # Hay un acto definido pero aún no hay versos
-                location_info = f" (en {last_act_name}, antes del primer verso marcado)"
-            else:
-                # Está antes del primer acto (en dramatis personae o dedicatoria)
-                location_info = " (en dramatis personae o dedicatoria)"
-            
-            unstyled_paragraphs.append((text, location_info))
-
-    # 4) Tras recorrer todas las líneas, añadimos el warning si hay alguno
-    if unstyled_paragraphs:
-        count = len(unstyled_paragraphs)
-        warnings.append(
-            f"❌ LÍNEAS SIN ESTILO DETECTADAS ({count})\n"
-            f"   Archivo: {os.path.basename(main_docx)}\n"
-            f"   Revisa que todas las líneas tengan el estilo correcto aplicado."
-        )
-        
-        # Añadir detalles de cada párrafo sin estilo (mostrar máximo 5)
-        for i, (text, location) in enumerate(unstyled_paragraphs[:5], 1):
-            snippet = text[:60] + "..." if len(text) > 60 else text
-            warnings.append(f"   {i}. «{snippet}»{location}")
-        
-        if len(unstyled_paragraphs) > 5:
-            remaining = len(unstyled_paragraphs) - 5
-            warnings.append(f"   ... y {remaining} {'línea más' if remaining == 1 else 'líneas más'}")
-
-    return warnings
-
+            # El número del último verso y el acto en curso determinan la localización
+            findings.append(ValidationFinding(
+                "unstyled_paragraph", "error", main_docx, para_idx,
+                verse_map.last_verse_before(para_idx), text,
+                {"style": style, "act": last_act_name},
+            ))
 
+    return findings
 
 
 def analyze_notes(
     notes: dict, 
-    note_type: str
-) -> list[str]:
+    note_type: str,
+    docx_path: Optional[str] = None,
+) -> list[ValidationFinding]:
     """
     Analiza el dict de notas (aparato o nota) y devuelve
-    una lista de strings con posibles notas mal formateadas o múltiples.
+    los hallazgos de notas múltiples o vacías.
     """
-    warnings: list[str] = []
+    findings: list[ValidationFinding] = []
 
     for key, content in notes.items():
         # key puede ser int (verso) o str (palabra normalizada)
+        verse_number = key if isinstance(key, int) else None
         
         # Verificar si hay múltiples notas para la misma clave
         if isinstance(content, list) and len(content) > 1:
             if isinstance(key, str):
-                # Determinar el símbolo correcto según el tipo de nota
-                symbol = '@' if note_type.lower() == 'nota' else '%'
                 # Notas @palabra o %palabra con múltiples entradas
-                warnings.append(
-                    f"⚠️ MÚLTIPLES {note_type.upper()}S PARA '{symbol}{key}' ({len(content)})\n"
-                    f"   Verifica que la asignación secuencial en el texto sea correcta."
-                )
+                code = "multiple_notes_word"
             elif isinstance(key, int):
                 # Notas de verso con múltiples entradas
-                warnings.append(
-                    f"⚠️ MÚLTIPLES {note_type.upper()}S PARA VERSO {key} ({len(content)})\n"
-                    f"   Verifica que todas las {note_type}s sean correctas."
-                )
+                code = "multiple_notes_verse"
+            else:
+                code = None
+            if code:
+                findings.append(ValidationFinding(
+                    code, "warning", docx_path, None, verse_number, "",
+                    {"note_type": note_type, "key": key, "count": len(content)},
+                ))
         
         # Validar que el contenido no esté vacío
         if isinstance(content, list):
-            for i, text in enumerate(content, 1):
-                if not text.strip():
-                    if isinstance(key, str):
-                        warnings.append(f"❌ {note_type.capitalize()} vacía: '@{key}' (entrada #{i})")
-                    elif isinstance(key, int):
-                        warnings.append(f"❌ {note_type.capitalize()} vacía: verso {key} (entrada #{i})")
-        elif not str(content).strip():
+            entries = [(i, text) for i, text in enumerate(content, 1) if not text.strip()]
+        else:
             # Caso de contenido no-lista (por compatibilidad)
-            if isinstance(key, str):
-                warnings.append(f"❌ {note_type.capitalize()} vacía: '@{key}'")
-            elif isinstance(key, int):
-                warnings.append(f"❌ {note_type.capitalize()} vacía: verso {key}")
-
-    return warnings
+            entries = [(None, content)] if not str(content).strip() else []
+        if isinstance(key, (str, int)):
+            for entry, text in entries:
+                findings.append(ValidationFinding(
+                    "empty_note", "error", docx_path, None, verse_number, "",
+                    {"note_type": note_type, "key": key, "entry": entry},
+                ))
 
+    return findings
 
 
-def validate_split_verses_impact_on_numbering(main_docx) -> list[str]:
+def validate_split_verses_impact_on_numbering(main_docx, split_analysis: Optional[SplitVerseTracker] = None) -> list[ValidationFinding]:
     """
     Valida que los versos partidos incompletos no afecten la numeración total.
     Compara el número esperado de versos completos vs el número real.
     """
-    warnings: list[str] = []
+    findings: list[ValidationFinding] = []
     
-    # Obtener todos los versos
-    verses = count_verses_in_document(main_docx, include_dedication=False)
-    
-    total_verses = 0  # Versos normales
-    split_verse_initials = 0  # Partido_inicial (cada uno debería ser un verso)
-    split_verse_groups = 0  # Grupos completos de versos partidos (I + [M...] + F)
-    incomplete_splits = 0  # Partido_inicial sin Partido_final
-    
-    # Separar por tipo de verso
-    verse_sequence = [(style, text) for _, _, style, text in verses]
-    
-    # 2. Analizar secuencias de versos partidos
-    i = 0
-    while i < len(verse_sequence):
-        style, text = verse_sequence[i]
-        
-        if style == "Verso":
-            total_verses += 1
-            i += 1
-        elif style == "Partido_inicial":
-            split_verse_initials += 1
-            j = i + 1
-            found_final = False
-            
-            # Buscar el final correspondiente
-            while j < len(verse_sequence):
-                next_style, _ = verse_sequence[j]
-                if next_style == "Partido_final":
-                    found_final = True
-                    split_verse_groups += 1
-                    break
-                elif next_style in ["Partido_inicial", "Verso"]:
-                    break
-                j += 1
-            
-            if not found_final:
-                incomplete_splits += 1
-            
-            i = j + 1 if found_final else i + 1
-        else:  # Partido_medio, Partido_final
-            i += 1
+    if split_analysis is None:
+        split_analysis = analyze_split_verses(build_verse_map(load_paragraph_records(main_docx)))
     
-    # 3. Validaciones - Solo mostrar desajuste si existe
-    expected_total_verses = total_verses + split_verse_groups
-    actual_verse_increments = total_verses + split_verse_initials
+    # Cada Partido_inicial incrementa la numeración; solo los grupos completos
+    # (I + [M...] + F) cuentan como verso esperado
+    total_verses = split_analysis.verse_count
+    expected_total_verses = total_verses + split_analysis.complete_count
+    actual_verse_increments = total_verses + split_analysis.initial_count
     
+    # Validaciones - Solo mostrar desajuste si existe
     if actual_verse_increments != expected_total_verses:
-        diff = actual_verse_increments - expected_total_verses
-        plural_s = 's' if abs(diff) > 1 else ''
-        warnings.append(
-            f"\n⚠️ DESAJUSTE EN LA NUMERACIÓN DE VERSOS\n"
-            f"Se esperan {expected_total_verses} pero se numerarán {actual_verse_increments}. "
-            f"Hay una diferencia de {diff:+d} verso{plural_s} debido a versos partidos incompletos."
-        )
+        findings.append(ValidationFinding(
+            "split_verse_numbering", "warning", main_docx,
+            context={"expected": expected_total_verses, "actual": actual_verse_increments},
+        ))
     
-    return warnings
+    return findings
 
-def validate_split_verses(main_docx) -> list[str]:
+def validate_split_verses(main_docx, split_analysis: Optional[SplitVerseTracker] = None) -> list[ValidationFinding]:
     """
     Valida que los versos partidos sigan la secuencia lógica correcta:
     - Partido_inicial debe tener al menos un Partido_final después
     - Entre Partido_inicial y Partido_final puede haber 0 o más Partido_medio
     - No puede haber Partido_medio o Partido_final sin Partido_inicial previo
     """
-    warnings: list[str] = []
-    verse_problems: list[tuple[int, str, str]] = []  # (verse_num, text, problem_description)
-    
-    # Obtener todos los versos con su numeración correcta
-    verses = count_verses_in_document(main_docx, include_dedication=False)
-    
-    # 2. Validar secuencia de versos partidos y recopilar problemas
-    i = 0
-    while i < len(verses):
-        para_idx, verse_num, style, text = verses[i]
-        
-        if style == "Partido_inicial":
-            # Buscar el final correspondiente
-            j = i + 1
-            found_final = False
-            middle_count = 0
-            
-            while j < len(verses):
-                next_para_idx, next_verse_num, next_style, next_text = verses[j]
-                
-                if next_style == "Partido_medio" and next_verse_num == verse_num:
-                    middle_count += 1
-                elif next_style == "Partido_final" and next_verse_num == verse_num:
-                    found_final = True
-                    break
-                elif next_style in ["Verso", "Partido_inicial"]:
-                    # Nuevo verso antes de encontrar final
-                    break
-                j += 1
-            
-            if not found_final:
-                snippet = text[:50] + "..." if len(text) > 50 else text
-                verse_problems.append((
-                    verse_num,
-                    snippet,
-                    "Falta 'Partido_final' después de 'Partido_inicial'."
-                ))
-            
-            # Avanzar hasta después del grupo procesado
-            i = j + 1 if found_final else i + 1
-            
-        elif style == "Partido_medio":
-            # Partido_medio sin Partido_inicial previo
-            has_initial = False
-            for k in range(i - 1, -1, -1):
-                prev_para_idx, prev_verse_num, prev_style, prev_text = verses[k]
-                if prev_style == "Partido_inicial" and prev_verse_num == verse_num:
-                    has_initial = True
-                    break
-                elif prev_style in ["Verso"] or (prev_style == "Partido_inicial" and prev_verse_num != verse_num):
-                    break
-            
-            if not has_initial:
-                snippet = text[:50] + "..." if len(text) > 50 else text
-                verse_problems.append((
-                    verse_num,
-                    snippet,
-                    "Falta 'Partido_inicial' antes de este 'Partido_medio'."
-                ))
-            i += 1
-            
-        elif style == "Partido_final":
-            # Partido_final sin Partido_inicial previo
-            has_initial = False
-            for k in range(i - 1, -1, -1):
-                prev_para_idx, prev_verse_num, prev_style, prev_text = verses[k]
-                if prev_style in ["Partido_inicial", "Partido_medio"] and prev_verse_num == verse_num:
-                    has_initial = True
-                    break
-                elif prev_style in ["Verso"] or (prev_style in ["Partido_inicial", "Partido_final"] and prev_verse_num != verse_num):
-                    break
-            
-            if not has_initial:
-                snippet = text[:50] + "..." if len(text) > 50 else text
-                verse_problems.append((
-                    verse_num,
-                    snippet,
-                    "Falta 'Partido_inicial' o 'Partido_medio' previo."
-                ))
-            i += 1
-            
-        else:  # style == "Verso"
-            i += 1
-    
-    # 3. Construir mensaje consolidado si hay problemas
-    if verse_problems:
-        count = len(verse_problems)
-        plural_s = 's' if count > 1 else ''
-        
-        # Encabezado
-        message = f"❌ ({count}) VERSO{plural_s.upper()} PARTIDO{plural_s.upper()} INCOMPLETO{plural_s.upper()}\n"
-        message += "Revisa los siguientes versos:\n\n"
-        
-        # Listar cada verso con su problema
-        for verse_num, text, problem in verse_problems:
-            message += f"Verso {verse_num}. Texto: {text}\n"
-            message += f"      Problema: {problem}\n\n"
-        
-        warnings.append(message.rstrip())
-    
-    return warnings
+    # Una sola pasada lineal sobre el mapa de versos (ver SplitVerseTracker)
+    if split_analysis is None:
+        split_analysis = analyze_split_verses(build_verse_map(load_paragraph_records(main_docx)))
+
+    return [
+        ValidationFinding(
+            "split_verse_incomplete", "error", main_docx, issue.para_index,
+            issue.verse_number, issue.text, {"style": issue.style, "problem": issue.problem},
+        )
+        for issue in split_analysis.issues
+    ]
 
 
-def validate_Laguna(main_docx) -> list[str]:
+def validate_Laguna(main_docx, paragraphs=None, verse_map: Optional[VerseMap] = None) -> list[ValidationFinding]:
     """
     Valida que las lagunas marcadas como Laguna no sean versos específicos perdidos
     que deberían marcarse como Verso normal para mantener la numeración.
     """
-    warnings: list[str] = []
+    findings: list[ValidationFinding] = []
     
-    doc = Document(main_docx)
+    if paragraphs is None:
+        paragraphs = load_paragraph_records(main_docx)
+    if verse_map is None:
+        verse_map = build_verse_map(paragraphs)
     found_body = False
     
-    for para_idx, para in enumerate(doc.paragraphs):
-        style: str = (para.style.name or "") if para.style else ""
+    for para_idx, para in enumerate(paragraphs):
+        style: str = para.style_name or ""
         text = para.text.strip() if para.text else ""
         
         # Esperar hasta el inicio del cuerpo principal
@@ -3011,42 +4131,35 @@ def validate_Laguna(main_docx) -> list[str]:
             continue
         
         if style == "Laguna":
-            # Obtener el número de verso en la posición actual
-            verse_num = get_verse_number_at_position(main_docx, para_idx, include_dedication=False)
-            
-            # Contar total de versos para contexto
-            total_verses = len([v for v in count_verses_in_document(main_docx, include_dedication=False) 
-                              if v[2] in ["Verso", "Partido_inicial"]])
-            
-            snippet = text[:50] + "..." if len(text) > 50 else text
-            warnings.append(
-                f"⚠️ LAGUNA DETECTADA (después del verso {verse_num})\n"
-                f"   Texto: {snippet}\n"
-                f"   Revisa: ¿Es una laguna de extensión incierta o un verso específico faltante?\n"
-                f"   Si es un verso específico faltante, márcalo como 'Verso' con corchetes.\n"
-                f"   Total de versos actual: {total_verses}"
-            )
+            # Número de verso en la posición actual y total para contexto
+            findings.append(ValidationFinding(
+                "laguna", "warning", main_docx, para_idx,
+                verse_map.last_verse_before(para_idx), text,
+                {"total_verses": verse_map.total_verses},
+            ))
     
-    return warnings
+    return findings
 
 
-def validate_verso_con_corchetes(main_docx) -> list[str]:
+def validate_verso_con_corchetes(main_docx, paragraphs=None, verse_map: Optional[VerseMap] = None) -> list[ValidationFinding]:
     """
     Valida que los versos marcados como 'Verso' que contienen solo corchetes
     no sean lagunas que deberían marcarse como 'Laguna' para no contar en la numeración.
     """
-    warnings: list[str] = []
+    findings: list[ValidationFinding] = []
     
-    doc = Document(main_docx)
+    if paragraphs is None:
+        paragraphs = load_paragraph_records(main_docx)
+    if verse_map is None:
+        verse_map = build_verse_map(paragraphs)
     found_body = False
     
     # Patrón para detectar texto que consiste principalmente en corchetes con puntos o puntos suspensivos
-    import re
     # Incluye tanto puntos normales (.) como puntos suspensivos (…)
     corchetes_pattern = re.compile(r'^\s*\[[\.…]{1,}\]\s*$|^\s*\[\s*[\.…\s]+\s*\]\s*$')
     
-    for para_idx, para in enumerate(doc.paragraphs):
-        style = (para.style.name or "") if para.style else ""
+    for para_idx, para in enumerate(paragraphs):
+        style = para.style_name or ""
         text = para.text.strip() if para.text else ""
         
         # Esperar hasta el inicio del cuerpo principal
@@ -3056,25 +4169,17 @@ def validate_verso_con_corchetes(main_docx) -> list[str]:
             continue
         
         if style == "Verso" and corchetes_pattern.match(text):
-            # Obtener el número de verso en la posición actual
-            verse_num = get_verse_number_at_position(main_docx, para_idx, include_dedication=False)
-            
-            # Contar total de versos para contexto
-            total_verses = len([v for v in count_verses_in_document(main_docx, include_dedication=False) 
-                              if v[2] in ["Verso", "Partido_inicial"]])
-            
-            warnings.append(
-                f"⚠️ VERSO CON CORCHETES DETECTADO (verso {verse_num})\n"
-                f"   Texto: {text}\n"
-                f"   Revisa: ¿Es una laguna de extensión incierta?\n"
-                f"   Si no sabes cuántos versos faltan, márcalo como 'Laguna' para no contarlo.\n"
-                f"   Total de versos actual: {total_verses}"
-            )
+            # Número de verso en la posición actual y total para contexto
+            findings.append(ValidationFinding(
+                "bracketed_verse", "warning", main_docx, para_idx,
+                verse_map.last_verse_before(para_idx), text,
+                {"total_verses": verse_map.total_verses},
+            ))
     
-    return warnings
+    return findings
 
 
-def validate_note_format(docx_path: str, note_type: str) -> list[str]:
+def validate_note_format(docx_path: str, note_type: str, paragraphs=None) -> list[ValidationFinding]:
     """
     Valida que todas las entradas en el archivo de notas o aparato crítico
     sigan el formato correcto:
@@ -3082,17 +4187,15 @@ def validate_note_format(docx_path: str, note_type: str) -> list[str]:
     - @PALABRA: contenido (para notas filológicas, ej: @dedicatoria: Esta es una nota...)
     - %PALABRA: contenido (para aparato crítico, ej: %dedicatoria: Variante...)
     
-    Devuelve una lista de warnings con las entradas que no cumplan el formato.
+    Devuelve un hallazgo por cada entrada que no cumpla el formato.
+    `paragraphs` permite pasar los registros del archivo ya leídos (ver run_validators).
     """
-    warnings: list[str] = []
-    
-    if not docx_path or not os.path.exists(docx_path):
-        return warnings
+    findings: list[ValidationFinding] = []
     
-    # Obtener el nombre del archivo para mostrarlo en el mensaje
-    filename = os.path.basename(docx_path)
-    
-    doc = Document(docx_path)
+    if paragraphs is None:
+        if not docx_path or not os.path.exists(docx_path):
+            return findings
+        paragraphs = cached_parse("paragraph_records", docx_path, load_paragraph_records)
     
     # Patrón para validar el formato correcto
     # Debe comenzar con número:, @palabra: o %palabra:
@@ -3100,7 +4203,7 @@ def validate_note_format(docx_path: str, note_type: str) -> list[str]:
     pattern_nota = re.compile(r'^@[^@%\s]+:\s*')  # @palabra seguido de :
     pattern_aparato = re.compile(r'^%[^@%\s]+:\s*')  # %palabra seguido de :
     
-    for i, para in enumerate(doc.paragraphs, 1):
+    for para_idx, para in enumerate(paragraphs):
         text = para.text.strip()
         
         # Ignorar párrafos vacíos o con solo espacios en blanco
@@ -3114,99 +4217,340 @@ def validate_note_format(docx_path: str, note_type: str) -> list[str]:
 
         if not is_verse_format and not is_nota_format and not is_aparato_format:
             # El párrafo no cumple ninguno de los formatos válidos
-            snippet = text[:80] + "..." if len(text) > 80 else text
-            warnings.append(
-                f"❌ Formato incorrecto en archivo '{filename}' ({note_type}, párrafo {i}): "
-                f"Debe comenzar con 'NÚMERO:', '@PALABRA:' o '%PALABRA:'. "
-                f"Si es continuación de la nota anterior, une este párrafo al anterior en Word. "
-                f"→ Texto: {snippet}"
-            )
+            findings.append(ValidationFinding(
+                "note_format", "error", docx_path, para_idx, None, text,
+                {"note_type": note_type},
+            ))
     
-    return warnings
+    return findings
 
 
-def validate_documents(main_docx, aparato_docx=None, notas_docx=None) -> list[str]:
+# --- Registro de validadores
+# Cada comprobación se registra con un nombre, los datos que necesita (VALIDATION_INPUTS)
+# y su coste. run_validators prepara una sola vez los datos que piden las comprobaciones
+# elegidas y las ejecuta sobre ellos, midiendo el tiempo de cada una.
+
+VALIDATION_INPUTS = ("main", "verse_map", "notas", "aparato")
+# "cheap": recorre el principal, que casi todas necesitan; "expensive": lee y analiza
+# además otro DOCX (notas o aparato), lo que puede costar más que todo lo demás
+VALIDATION_COSTS = ("cheap", "expensive")
+# Las comprobaciones son Python puro y retienen el GIL: repartidas entre hilos no acaban
+# antes, así que por defecto se ejecutan una tras otra y el grupo de hilos es opcional
+DEFAULT_VALIDATION_WORKERS = 1
+
+ESTILOS_VALIDOS = {
+    "Titulo_comedia", "Acto", "Prosa", "Verso", "Partido_inicial",
+    "Partido_medio", "Partido_final", "Personaje", "Acot",
+    "Epigr_Dedic", "Epigr_Dramatis", "Dramatis_lista", "Epigr_final",
+    "Laguna"  # Nuevo estilo para lagunas de extensión incierta
+}
+# Estilos que se omiten en esta validación básica porque tienen validación específica
+SKIP_STYLES = {"Cita", "Heading 1", "Heading 2", "Heading 3", "Normal"}
+
+
+class NoteSource(NamedTuple):
+    path: str
+    paragraphs: list
+    notes: dict
+
+
+class ValidationData:
     """
-    Ejecuta las comprobaciones sobre los DOCX y devuelve una lista
-    de strings con los avisos encontrados (vacía si no hay warnings).
+    Datos de solo lectura compartidos por las comprobaciones de una validación:
+    registros de párrafo del principal ("main"), su mapa de versos ("verse_map") y
+    notas y aparato ya leídos ("notas", "aparato"). Solo se rellenan los que se piden.
     """
-    warnings: list[str] = []
+    __slots__ = ("main_docx", "notas_docx", "aparato_docx", "main", "verse_map", "notas", "aparato")
 
-    # 1) Comprueba existencia del principal
-    if not os.path.exists(main_docx):
-        warnings.append(f"❌ No existe el archivo principal: {main_docx}")
-        return warnings
-
-    # 2) Validación de estilos en el body
-    ESTILOS_VALIDOS = {
-        "Titulo_comedia", "Acto", "Prosa", "Verso", "Partido_inicial",
-        "Partido_medio", "Partido_final", "Personaje", "Acot",
-        "Epigr_Dedic", "Epigr_Dramatis", "Dramatis_lista", "Epigr_final",
-        "Laguna"  # Nuevo estilo para lagunas de extensión incierta
-    }
-    # Estilos que se omiten en esta validación básica porque tienen validación específica
-    SKIP_STYLES = {"Cita", "Heading 1", "Heading 2", "Heading 3", "Normal"}
-    doc = Document(main_docx)
-    found_body = False
+    def __init__(self, main_docx, notas_docx=None, aparato_docx=None):
+        self.main_docx = main_docx
+        self.notas_docx = notas_docx
+        self.aparato_docx = aparato_docx
+        self.main = None
+        self.verse_map = None
+        self.notas: Optional[NoteSource] = None
+        self.aparato: Optional[NoteSource] = None
+
+
+class Validator(NamedTuple):
+    name: str
+    check: Any
+    inputs: tuple
+    cost: str
+    description: str
+
+
+VALIDATORS: dict[str, Validator] = {}
+VALIDATION_PRESETS = {
+    "fast": lambda validator: validator.cost == "cheap",
+    "full": lambda validator: True,
+}
+
+
+def register_validator(name: str, inputs: tuple, cost: str = "cheap", description: str = ""):
+    """
+    Registra la función decorada como comprobación `name`. Recibe ValidationData y
+    devuelve sus hallazgos; el orden de registro es el orden de los avisos.
+    """
+    def decorator(check):
+        unknown = set(inputs) - set(VALIDATION_INPUTS)
+        if unknown or cost not in VALIDATION_COSTS:
+            raise ValueError(f"Validador '{name}' mal declarado: entradas {sorted(unknown)}, coste {cost}")
+        VALIDATORS[name] = Validator(name, check, tuple(inputs), cost, description)
+        return check
+    return decorator
+
+
+def select_validators(checks=None) -> list[Validator]:
+    """
+    Comprobaciones a ejecutar, en orden de registro. `checks` admite nombres de
+    comprobación y de preajuste ("fast": solo las baratas, p. ej. antes de guardar;
+    "full": todas, antes de publicar). None equivale a "full".
+    """
+    if checks is None:
+        return list(VALIDATORS.values())
+    selected = set()
+    for name in checks:
+        if name in VALIDATION_PRESETS:
+            selected.update(v.name for v in VALIDATORS.values() if VALIDATION_PRESETS[name](v))
+        elif name in VALIDATORS:
+            selected.add(name)
+        else:
+            available = ", ".join([*VALIDATION_PRESETS, *VALIDATORS])
+            raise ValueError(f"Comprobación desconocida: {name}. Disponibles: {available}")
+    return [validator for validator in VALIDATORS.values() if validator.name in selected]
 
-    for para in doc.paragraphs:
-        style = (para.style.name or "") if para.style else ""
+
+@register_validator("estilos", ("main",), description="Estilos de párrafo permitidos en el cuerpo")
+def check_styles(data: ValidationData) -> list[ValidationFinding]:
+    findings = []
+    found_body = False
+    for para_idx, para in enumerate(data.main):
+        style = para.style_name or ""
         text = para.text.strip() if para.text else ""
 
-        # 2.1) Esperar hasta el inicio de cuerpo
+        # Esperar hasta el inicio de cuerpo
         if not found_body:
             if style in ("Titulo_comedia", "Acto"):
                 found_body = True
             continue
 
-        # 2.2) Aplicar filtros comunes para omitir párrafos
+        # Aplicar filtros comunes para omitir párrafos
         if should_skip_paragraph(para, text, style):
             continue
-        
-        # 2.3) Omitir estilos específicos que no necesitan validación
+
+        # Omitir estilos específicos que no necesitan validación
         if style in SKIP_STYLES:
             continue
 
-        # 2.4) Validar estilo permitido (solo si no es un párrafo a omitir)
+        # Validar estilo permitido (solo si no es un párrafo a omitir)
         if style not in ESTILOS_VALIDOS:
-            snippet = text[:60]
-            warnings.append(f"❌ Estilo no válido: {style or 'None'} — Texto: {snippet}")
+            findings.append(ValidationFinding(
+                "invalid_style", "error", data.main_docx, para_idx, None, text, {"style": style},
+            ))
+    return findings
 
-    # 3) Análisis avanzado del texto principal (detección de párrafos sin estilo)
-    warnings.extend(analyze_main_text(main_docx))
 
-    # 4) Notas de aparato
-    if aparato_docx:
-        if not os.path.exists(aparato_docx):
-            warnings.append(f"❌ El archivo de notas de aparato: {aparato_docx}")
+@register_validator("texto_principal", ("main", "verse_map"), description="Párrafos sin estilo en el texto principal")
+def check_main_text(data: ValidationData) -> list[ValidationFinding]:
+    return analyze_main_text(data.main_docx, data.main, data.verse_map)
+
+
+@register_validator("aparato", ("aparato",), "expensive", "Formato y contenido del aparato crítico")
+def check_aparato(data: ValidationData) -> list[ValidationFinding]:
+    source = data.aparato
+    # Validar formato de entrada (NÚMERO: o @PALABRA:) y contenido de las notas
+    findings = validate_note_format(source.path, "aparato crítico", source.paragraphs)
+    findings.extend(analyze_notes(source.notes, "aparato", source.path))
+    return findings
+
+
+@register_validator("notas", ("notas",), "expensive", "Formato y contenido de las notas")
+def check_notas(data: ValidationData) -> list[ValidationFinding]:
+    source = data.notas
+    findings = validate_note_format(source.path, "notas", source.paragraphs)
+    findings.extend(analyze_notes(source.notes, "nota", source.path))
+    return findings
+
+
+@register_validator("versos_partidos", ("verse_map",), description="Versos partidos y su efecto en la numeración")
+def check_split_verses(data: ValidationData) -> list[ValidationFinding]:
+    split_analysis = analyze_split_verses(data.verse_map)
+    findings = validate_split_verses(data.main_docx, split_analysis)
+    findings.extend(validate_split_verses_impact_on_numbering(data.main_docx, split_analysis))
+    return findings
+
+
+@register_validator("lagunas", ("main", "verse_map"), description="Párrafos marcados como Laguna")
+def check_lagunas(data: ValidationData) -> list[ValidationFinding]:
+    return validate_Laguna(data.main_docx, data.main, data.verse_map)
+
+
+@register_validator("corchetes", ("main", "verse_map"), description="Versos con corchetes que podrían ser lagunas")
+def check_bracketed_verses(data: ValidationData) -> list[ValidationFinding]:
+    return validate_verso_con_corchetes(data.main_docx, data.main, data.verse_map)
+
+
+class ValidationRun(NamedTuple):
+    """
+    Resultado de run_validators: hallazgos en orden de registro, segundos de cada
+    comprobación ejecutada y de la preparación de datos compartidos.
+    """
+    findings: list[ValidationFinding]
+    check_seconds: dict[str, float]
+    prepare_seconds: float
+
+
+def load_note_source(path: str) -> NoteSource:
+    return NoteSource(
+        path,
+        cached_parse("paragraph_records", path, load_paragraph_records),
+        cached_parse("notes", path, extract_notes_with_italics),
+    )
+
+
+@profiled("validacion", ("main_docx", "aparato_docx", "notas_docx"))
+def run_validators(main_docx, aparato_docx=None, notas_docx=None, checks=None, paragraphs=None,
+                   workers: Optional[int] = None) -> ValidationRun:
+    """
+    Ejecuta las comprobaciones elegidas (ver select_validators). Los datos que declaran
+    se preparan antes, una sola vez y en este hilo (así aprovechan parsed_input_scope);
+    después se ejecutan las comprobaciones, que solo los leen: por defecto en este hilo
+    y, con `workers` > 1, repartidas entre varios hilos. En ese caso el tiempo de cada
+    una es el de CPU de su hilo (time.thread_time), que no cuenta la espera por el GIL.
+    Con el perfilado activo se ejecutan siempre en este hilo para que el perfil las vea.
+    Un archivo de notas o aparato inexistente da un hallazgo "missing_file" en el lugar
+    de la primera comprobación que lo necesita, que no se ejecuta.
+    """
+    validators = select_validators(checks)
+    if not os.path.exists(main_docx):
+        return ValidationRun([ValidationFinding("missing_file", "error", main_docx, context={"role": "main"})], {}, 0.0)
+
+    mark_stage("preparacion")
+    start = time.perf_counter()
+    needed = {name for validator in validators for name in validator.inputs}
+    data = ValidationData(main_docx, notas_docx, aparato_docx)
+    if needed & {"main", "verse_map"}:
+        # El documento principal se lee una sola vez y el mapa de versos se comparte
+        data.main = paragraphs if paragraphs is not None else cached_parse(
+            "paragraph_records", main_docx, load_paragraph_records
+        )
+    if "verse_map" in needed:
+        data.verse_map = build_verse_map(data.main)
+    missing: dict[str, ValidationFinding] = {}
+    for role, path in (("aparato", aparato_docx), ("notas", notas_docx)):
+        if role not in needed or not path:
+            continue
+        if not os.path.exists(path):
+            missing[role] = ValidationFinding("missing_file", "error", path, context={"role": role})
         else:
-            # Validar formato de entrada (NÚMERO: o @PALABRA:)
-            warnings.extend(validate_note_format(aparato_docx, "aparato crítico"))
-            # Validar contenido de las notas
-            aparato_notes = extract_notes_with_italics(aparato_docx)
-            warnings.extend(analyze_notes(aparato_notes, "aparato"))
+            setattr(data, role, load_note_source(path))
+    prepare_seconds = time.perf_counter() - start
 
-    # 5) Notas
-    if notas_docx:
-        if not os.path.exists(notas_docx):
-            warnings.append(f"❌ El archivo de notas no existe: {notas_docx}")
+    # Sin notas o aparato (o si falta el archivo) no se ejecutan sus comprobaciones
+    runnable = [
+        validator for validator in validators
+        if all(getattr(data, name) is not None for name in validator.inputs)
+    ]
+
+    workers = max(1, min(workers or DEFAULT_VALIDATION_WORKERS, len(runnable) or 1))
+    serial = workers == 1 or bool(get_profile_directory())
+    clock = time.perf_counter if serial else time.thread_time
+
+    def timed(validator: Validator) -> tuple[list[ValidationFinding], float]:
+        check_start = clock()
+        return validator.check(data), clock() - check_start
+
+    if serial:
+        results = []
+        for validator in runnable:
+            mark_stage(validator.name)
+            results.append(timed(validator))
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fenixml-validacion") as executor:
+            results = list(executor.map(timed, runnable))
+    by_name = dict(zip((validator.name for validator in runnable), results))
+
+    findings: list[ValidationFinding] = []
+    check_seconds: dict[str, float] = {}
+    for validator in validators:
+        if validator.name in by_name:
+            check_findings, check_seconds[validator.name] = by_name[validator.name]
+            findings.extend(check_findings)
         else:
-            # Validar formato de entrada (NÚMERO: o @PALABRA:)
-            warnings.extend(validate_note_format(notas_docx, "notas"))
-            # Validar contenido de las notas
-            nota_notes = extract_notes_with_italics(notas_docx)
-            warnings.extend(analyze_notes(nota_notes, "nota"))
+            for role in validator.inputs:
+                if role in missing:
+                    findings.append(missing.pop(role))
+    return ValidationRun(findings, check_seconds, prepare_seconds)
+
+
+def collect_validation_findings(main_docx, aparato_docx=None, notas_docx=None, paragraphs=None,
+                                checks=None) -> list[ValidationFinding]:
+    """
+    Ejecuta las comprobaciones sobre los DOCX y devuelve los hallazgos
+    estructurados en el orden en que se muestran (vacía si no hay incidencias).
+    `paragraphs` permite pasar los registros del principal ya leídos (validate_and_convert)
+    y `checks`, elegir comprobaciones o un preajuste (ver select_validators).
+    """
+    return run_validators(main_docx, aparato_docx, notas_docx, checks, paragraphs).findings
 
-    # 6) Validación de versos partidos
-    warnings.extend(validate_split_verses(main_docx))
-    warnings.extend(validate_split_verses_impact_on_numbering(main_docx))
 
-    # 7) Validación de lagunas marcadas como Laguna
-    warnings.extend(validate_Laguna(main_docx))
+class ValidatedConversion(NamedTuple):
+    """
+    Resultado de validate_and_convert: TEI (None si no se llegó a convertir) y hallazgos.
+    """
+    tei: Optional[str]
+    findings: list[ValidationFinding]
 
-    # 8) Validación de versos con corchetes que podrían ser lagunas
-    warnings.extend(validate_verso_con_corchetes(main_docx))
+    @property
+    def blocking(self) -> list[ValidationFinding]:
+        return [finding for finding in self.findings if finding.severity == "error"]
 
-    return warnings
+
+@profiled("validar_y_convertir", ("main_docx", "notas_docx", "aparato_docx", "metadata_docx"))
+def validate_and_convert(
+    main_docx: str,
+    notas_docx: Optional[str] = None,
+    aparato_docx: Optional[str] = None,
+    metadata_docx: Optional[str] = None,
+    tei_header: Optional[str] = None,
+    header_mode: str = "prolope",
+    fail_fast: bool = False,
+    checks=None,
+) -> ValidatedConversion:
+    """
+    Valida y convierte en una sola llamada: el DOCX principal se abre una vez y sus
+    registros de párrafo sirven a la validación y a la conversión, y notas, aparato y
+    metadatos se analizan una sola vez (parsed_input_scope).
+
+    Con `fail_fast`, si la validación encuentra errores (severidad "error") no se
+    convierte y `tei` es None. Si falta el DOCX principal tampoco se convierte.
+    `checks` elige las comprobaciones (ver select_validators).
+    Al convertir, los hallazgos incluyen los xml:id duplicados y las referencias who
+    sin destino que registró la generación (IdRegistry), y las notas sin adjuntar o
+    pedidas de más (NoteUsage).
+    """
+    with parsed_input_scope():
+        if not os.path.exists(main_docx):
+            return ValidatedConversion(None, collect_validation_findings(main_docx, aparato_docx, notas_docx, checks=checks))
+        check_main_docx(main_docx)
+        main_document = load_main_document(main_docx)
+        findings = collect_validation_findings(
+            main_docx, aparato_docx, notas_docx, paragraphs=main_document.records, checks=checks
+        )
+        if fail_fast and any(finding.severity == "error" for finding in findings):
+            return ValidatedConversion(None, findings)
+        header = resolve_tei_header(metadata_docx, tei_header, header_mode)
+        ids = IdRegistry()
+        note_usage = NoteUsage()
+        tei_str, _ = render_tei_document(main_document, header, notas_docx, aparato_docx, ids, note_usage)
+        # Los problemas de xml:id y de notas se detectan al generar, sin otra pasada de validación
+        return ValidatedConversion(tei_str, findings + ids.finish(main_docx) + note_usage.finish())
 
 
+def validate_documents(main_docx, aparato_docx=None, notas_docx=None) -> list[str]:
+    """
+    Ejecuta las comprobaciones sobre los DOCX y devuelve una lista
+    de strings con los avisos encontrados (vacía si no hay warnings).
+    """
+    return render_findings(collect_validation_findings(main_docx, aparato_docx, notas_docx))
@@ -0,0 +1,124 @@
+# ==========================================
+# feniX-ML: Modelo de la vista de resultados de validación
+# Desarrollado por Anna Abate, Emanuele Leboffe y David Merino Recalde
+# Grupo de investigación PROLOPE, Universitat Autònoma de Barcelona
+# Descripción: Índice categoría → hallazgos detrás del modal de validación de la GUI.
+#              La lista muestra una fila por hallazgo pero solo se generan los textos de
+#              las filas visibles; los filtros por categoría actualizan la lista de filas
+#              sin recalcular categorías ni volver a renderizar avisos. También sitúa un
+#              hallazgo (verso o párrafo) en el TEI para saltar a él en la vista previa.
+#              No importa tkinter.
+# ==========================================
+
+# --- Importaciones
+import heapq
+import re
+from typing import Iterable, Optional
+
+from tei_backend import ValidationFinding, escape_xml, group_findings, render_finding_group, shorten_snippet
+
+SEVERITY_ICONS = {"error": "❌", "warning": "⚠️"}
+
+
+class ValidationResultsModel:
+    """
+    Hallazgos de una validación indexados por categoría. `rows` son los índices (en
+    orden de validación) de los hallazgos de las categorías visibles; la GUI pide el
+    texto solo de las filas que dibuja (summary) y el de la fila seleccionada (details).
+    """
+    __slots__ = ("findings", "group_index", "groups", "by_category", "hidden", "rows", "_details")
+
+    def __init__(self, findings: Iterable[ValidationFinding], hidden: Iterable[str] = ()):
+        self.findings: list[ValidationFinding] = []
+        self.group_index: list[int] = []
+        self.groups = group_findings(list(findings))
+        self.by_category: dict[str, list[int]] = {}
+        for group_number, group in enumerate(self.groups):
+            for finding in group:
+                self.by_category.setdefault(finding.category, []).append(len(self.findings))
+                self.group_index.append(group_number)
+                self.findings.append(finding)
+        self.hidden = set(hidden) & set(self.by_category)
+        self.rows: list[int] = list(heapq.merge(*(
+            indices for category, indices in self.by_category.items() if category not in self.hidden
+        )))
+        self._details: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def categories(self) -> list[str]:
+        return sorted(self.by_category)
+
+    def is_visible(self, category: str) -> bool:
+        return category not in self.hidden
+
+    def set_category_visible(self, category: str, visible: bool) -> None:
+        """
+        Muestra u oculta una categoría tocando solo sus filas: al mostrarla se intercalan
+        sus índices (ya ordenados) con los visibles; al ocultarla se retiran.
+        """
+        if category not in self.by_category or visible == self.is_visible(category):
+            return
+        if visible:
+            self.hidden.discard(category)
+            self.rows = list(heapq.merge(self.rows, self.by_category[category]))
+        else:
+            self.hidden.add(category)
+            removed = set(self.by_category[category])
+            self.rows = [index for index in self.rows if index not in removed]
+
+    def finding(self, row: int) -> ValidationFinding:
+        return self.findings[self.rows[row]]
+
+    def details(self, row: int) -> str:
+        """
+        Aviso completo del grupo al que pertenece el hallazgo (como en render_findings).
+        Cada grupo se renderiza una vez, la primera vez que se selecciona una de sus filas.
+        """
+        group_number = self.group_index[self.rows[row]]
+        if group_number not in self._details:
+            self._details[group_number] = "\n\n".join(render_finding_group(self.groups[group_number]))
+        return self._details[group_number]
+
+    def summary(self, row: int) -> str:
+        """
+        Línea de la lista: severidad, categoría, ubicación y texto del hallazgo.
+        """
+        finding = self.finding(row)
+        parts = [f"{SEVERITY_ICONS.get(finding.severity, '•')} {finding.category}"]
+        location = describe_location(finding)
+        if location:
+            parts.append(location)
+        if finding.snippet:
+            parts.append(f"«{shorten_snippet(' '.join(finding.snippet.split()), 70)}»")
+        else:
+            headline = next((line for line in self.details(row).splitlines() if line.strip()), "")
+            parts.append(shorten_snippet(headline.strip(), 70))
+        return " · ".join(parts)
+
+
+def describe_location(finding: ValidationFinding) -> str:
+    if finding.verse_number is not None:
+        return f"verso {finding.verse_number}"
+    if finding.paragraph_index is not None:
+        return f"párrafo {finding.paragraph_index + 1}"
+    return ""
+
+
+def locate_in_tei(tei: str, finding: ValidationFinding) -> Optional[int]:
+    """
+    Posición (en caracteres) del hallazgo en el TEI: el verso <l n="…"> si tiene número
+    de verso y, si no, el comienzo de su texto. None si no se puede situar.
+    """
+    if finding.verse_number is not None:
+        match = re.search(rf'<l\b[^>]*\sn="{finding.verse_number}[a-z]?"', tei)
+        if match:
+            return match.start()
+    words = " ".join(finding.snippet.replace("@", "").replace("%", "").split())
+    if len(words) >= 4:
+        position = tei.find(escape_xml(words[:40]))
+        if position >= 0:
+            return position
+    return None
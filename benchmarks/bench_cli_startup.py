@@ -0,0 +1,110 @@
+# ==========================================
+# feniX-ML: Benchmark de arranque de la CLI
+# Descripción: Mide el tiempo de pared de procesos `python -m app` completos (arranque del
+#              intérprete + importaciones + trabajo) y comprueba que la CLI no carga
+#              tkinter ni customtkinter.
+# Uso: python benchmarks/bench_cli_startup.py [RUTA] [--repeat N] [--json salida.json]
+#                                             [--baseline previo.json]
+# ==========================================
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from common import (
+    REPO_ROOT,
+    TEST_DATA_DIR,
+    compare_with_baseline,
+    print_results_table,
+    save_results,
+)
+
+from corpus import discover_play_bundles
+
+GUI_MODULES = ("tkinter", "customtkinter")
+
+
+def run_cli(cli_args: list[str]) -> tuple[float, set[str]]:
+    """
+    Ejecuta `python -X importtime -m app ...` y devuelve (segundos, módulos importados).
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "app", *cli_args],
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+    )
+    elapsed = time.perf_counter() - start
+    # Formato de -X importtime: "import time: self | cumulative | módulo"
+    modules = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    return elapsed, modules
+
+
+def run_benchmark(root: str, repeat: int) -> list[dict]:
+    cases = [("--help", ["--help"]), ("--version", ["--version"])]
+    bundles = discover_play_bundles(root)
+    if bundles:
+        cases.append(("validate", ["validate", bundles[0].main_docx, "--json"]))
+
+    results = []
+    for name, cli_args in cases:
+        timings = []
+        imported: set[str] = set()
+        for _ in range(max(1, repeat)):
+            elapsed, imported = run_cli(cli_args)
+            timings.append(elapsed)
+        gui_modules = sorted(module for module in GUI_MODULES if module in imported)
+        results.append({
+            "name": name,
+            "startup_seconds": min(timings),
+            "startup_median_seconds": statistics.median(timings),
+            "modules": len(imported),
+            "gui_modules": ",".join(gui_modules) or "-",
+        })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de la CLI")
+    parser.add_argument("root", nargs="?", default=TEST_DATA_DIR, help="Carpeta con bundles DOCX")
+    parser.add_argument("--repeat", type=int, default=5, help="Procesos lanzados por caso")
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.root, args.repeat)
+    print_results_table(results, [
+        ("name", "Caso"),
+        ("startup_seconds", "Mejor (s)"),
+        ("startup_median_seconds", "Mediana (s)"),
+        ("modules", "Módulos"),
+        ("gui_modules", "GUI"),
+    ])
+
+    if args.json_path:
+        save_results(args.json_path, "cli_startup", results)
+
+    exit_code = 0
+    if any(result["gui_modules"] != "-" for result in results):
+        print("ERROR: la CLI ha importado módulos de la interfaz gráfica")
+        exit_code = 1
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, ["startup_seconds"])
+        for regression in regressions:
+            print(f"REGRESIÓN: {regression}")
+        if regressions:
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
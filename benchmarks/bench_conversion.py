@@ -0,0 +1,77 @@
+# ==========================================
+# feniX-ML: Benchmark de conversión DOCX -> TEI
+# Descripción: Mide tiempo y memoria pico de convert_docx_to_tei sobre las
+#              comedias de prueba (o cualquier árbol de bundles DOCX).
+# Uso: python benchmarks/bench_conversion.py [RUTA] [--repeat N] [--json salida.json]
+#                                            [--baseline previo.json]
+# ==========================================
+
+import argparse
+import os
+import sys
+
+from common import (
+    TEST_DATA_DIR,
+    compare_with_baseline,
+    measure_peak_memory,
+    measure_peak_rss,
+    measure_time,
+    print_results_table,
+    save_results,
+)
+
+from corpus import discover_play_bundles
+from tei_backend import convert_docx_to_tei
+
+
+def convert_bundle(bundle) -> str:
+    return convert_docx_to_tei(
+        main_docx=bundle.main_docx,
+        notas_docx=bundle.notas_docx,
+        aparato_docx=bundle.aparato_docx,
+        metadata_docx=bundle.metadata_docx,
+        save=False,
+    )
+
+
+def run_benchmark(root: str, repeat: int) -> list[dict]:
+    results = []
+    for bundle in discover_play_bundles(root):
+        results.append({
+            "name": os.path.relpath(bundle.main_docx, root),
+            "convert_seconds": measure_time(lambda: convert_bundle(bundle), repeat),
+            "convert_peak_bytes": measure_peak_memory(lambda: convert_bundle(bundle)),
+            "convert_peak_rss_bytes": measure_peak_rss(convert_bundle, bundle),
+        })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de conversión DOCX -> TEI")
+    parser.add_argument("root", nargs="?", default=TEST_DATA_DIR, help="Carpeta con bundles DOCX")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones para el tiempo (se toma el mejor)")
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.root, args.repeat)
+    print_results_table(results, [
+        ("name", "Bundle"),
+        ("convert_seconds", "Tiempo (s)"),
+        ("convert_peak_bytes", "Pico heap Python"),
+        ("convert_peak_rss_bytes", "Pico RSS"),
+    ])
+
+    if args.json_path:
+        save_results(args.json_path, "conversion", results)
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, ["convert_seconds", "convert_peak_bytes", "convert_peak_rss_bytes"])
+        for regression in regressions:
+            print(f"REGRESIÓN: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# ==========================================
+# feniX-ML: Benchmark del prólogo (front-matter)
+# Descripción: Mide el renderizado del front (párrafos, tablas y notas al pie del prólogo)
+#              y cuenta cuántas veces se renderiza cada párrafo. Con --scale se repite
+#              el prólogo K veces para simular introducciones de 40-80 páginas.
+# Uso: python benchmarks/bench_front_matter.py [RUTA] [--scale K] [--repeat N]
+#                                              [--json salida.json] [--baseline previo.json]
+# ==========================================
+
+import argparse
+import os
+import sys
+
+from docx import Document
+from docx.text.paragraph import Paragraph
+
+from common import (
+    TEST_DATA_DIR,
+    compare_with_baseline,
+    measure_time,
+    print_results_table,
+    save_results,
+)
+
+import tei_backend
+from corpus import discover_play_bundles
+
+
+def load_front(main_docx: str):
+    """
+    Devuelve (bloques del front, notas del prólogo) tal como los usa convert_docx_to_tei.
+    """
+    doc = Document(main_docx)
+    title = next(
+        (para for para in doc.paragraphs if para.style and para.style.name == "Titulo_comedia"),
+        None,
+    )
+    if title is None:
+        return [], {}
+    return tei_backend.get_front_blocks(doc, title), tei_backend.extract_intro_footnotes(main_docx)
+
+
+def count_paragraph_renders(front_blocks, footnotes_intro) -> int:
+    """
+    Ejecuta el front una vez contando las llamadas al renderizador de párrafos del prólogo
+    que no proceden de tablas.
+    """
+    original = tei_backend.extract_text_with_intro_notes
+    calls = 0
+
+    def counting_renderer(para, notes):
+        nonlocal calls
+        if isinstance(para._parent, tei_backend.Table):
+            return original(para, notes)
+        calls += 1
+        return original(para, notes)
+
+    tei_backend.extract_text_with_intro_notes = counting_renderer
+    try:
+        tei_backend.process_front_paragraphs_with_tables(front_blocks, footnotes_intro)
+    finally:
+        tei_backend.extract_text_with_intro_notes = original
+    return calls
+
+
+def run_benchmark(root: str, scale: int, repeat: int) -> list[dict]:
+    results = []
+    for bundle in discover_play_bundles(root):
+        front_blocks, footnotes_intro = load_front(bundle.main_docx)
+        if not front_blocks:
+            continue
+        front_blocks = front_blocks * max(1, scale)
+        paragraphs = [
+            block for block in front_blocks
+            if isinstance(block, Paragraph) and block.text.strip()
+        ]
+        results.append({
+            "name": os.path.relpath(bundle.main_docx, root),
+            "paragraphs": len(paragraphs),
+            "footnotes": len(footnotes_intro),
+            "renders_per_paragraph": count_paragraph_renders(front_blocks, footnotes_intro) / max(1, len(paragraphs)),
+            "front_seconds": measure_time(
+                lambda: tei_backend.process_front_paragraphs_with_tables(front_blocks, footnotes_intro),
+                repeat,
+            ),
+        })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del renderizado del prólogo")
+    parser.add_argument("root", nargs="?", default=TEST_DATA_DIR, help="Carpeta con bundles DOCX")
+    parser.add_argument("--scale", type=int, default=10, help="Veces que se repite cada prólogo")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones para el tiempo (se toma el mejor)")
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.root, args.scale, args.repeat)
+    print_results_table(results, [
+        ("name", "Bundle"),
+        ("paragraphs", "Párrafos"),
+        ("footnotes", "Notas"),
+        ("renders_per_paragraph", "Render/párrafo"),
+        ("front_seconds", "Tiempo (s)"),
+    ])
+
+    if args.json_path:
+        save_results(args.json_path, "front_matter", results)
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, ["front_seconds"])
+        for regression in regressions:
+            print(f"REGRESIÓN: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
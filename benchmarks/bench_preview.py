@@ -0,0 +1,88 @@
+# ==========================================
+# feniX-ML: Benchmark de la vista previa HTML
+# Descripción: Convierte cada comedia una vez y mide la construcción del índice de
+#              búsqueda frente al coste total de la vista previa (CETEIcean y estática),
+#              además del tamaño del índice incrustado en la página.
+# Uso: python benchmarks/bench_preview.py [RUTA] [--repeat N] [--json salida.json]
+#                                         [--baseline previo.json]
+# ==========================================
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+from common import (
+    TEST_DATA_DIR,
+    compare_with_baseline,
+    measure_time,
+    print_results_table,
+    save_results,
+)
+
+from bench_conversion import convert_bundle
+from corpus import discover_play_bundles
+from preview_html import (
+    build_preview_html,
+    build_search_index,
+    build_static_html,
+    parse_tei,
+    search_index_json,
+)
+
+
+def run_benchmark(root: str, repeat: int) -> list[dict]:
+    results = []
+    for bundle in discover_play_bundles(root):
+        with contextlib.redirect_stdout(io.StringIO()):
+            tei_content = convert_bundle(bundle)
+        index = build_search_index(parse_tei(tei_content))
+        results.append({
+            "name": os.path.relpath(bundle.main_docx, root),
+            "docs": len(index["docs"]),
+            "terms": len(index["terms"]),
+            "index_bytes": len(search_index_json(index).encode("utf-8")),
+            "tei_bytes": len(tei_content.encode("utf-8")),
+            # Se analiza fuera de la medición: el índice anota el árbol en su sitio
+            "index_seconds": measure_time(lambda: build_search_index(parse_tei(tei_content)), repeat)
+            - measure_time(lambda: parse_tei(tei_content), repeat),
+            "preview_seconds": measure_time(lambda: build_preview_html(tei_content), repeat),
+            "static_seconds": measure_time(lambda: build_static_html(tei_content), repeat),
+        })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de la vista previa HTML")
+    parser.add_argument("root", nargs="?", default=TEST_DATA_DIR, help="Carpeta con bundles DOCX")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones para el tiempo (se toma el mejor)")
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.root, args.repeat)
+    print_results_table(results, [
+        ("name", "Bundle"),
+        ("docs", "Entradas"),
+        ("terms", "Tokens"),
+        ("index_bytes", "Índice"),
+        ("tei_bytes", "TEI"),
+        ("index_seconds", "Índice (s)"),
+        ("preview_seconds", "CETEIcean (s)"),
+        ("static_seconds", "Estática (s)"),
+    ])
+
+    if args.json_path:
+        save_results(args.json_path, "preview", results)
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, ["index_seconds", "preview_seconds", "static_seconds"])
+        for regression in regressions:
+            print(f"REGRESIÓN: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
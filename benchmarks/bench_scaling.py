@@ -0,0 +1,148 @@
+# ==========================================
+# feniX-ML: Benchmark de escala con ediciones sintéticas
+# Descripción: Genera ediciones de tamaño creciente (synthetic.py) y mide conversión y
+#              validación en cada una. Para cada paso calcula el exponente de crecimiento
+#              log(t2/t1) / log(n2/n1): ~1 es lineal; por encima de --max-exponent se
+#              avisa de comportamiento superlineal y el script termina con código 1.
+# Uso: python benchmarks/bench_scaling.py [--sizes 1000,10000,100000] [--workdir CARPETA]
+#                                         [--repeat N] [--json salida.json]
+#                                         [--baseline previo.json]
+# ==========================================
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+
+from common import (
+    compare_with_baseline,
+    measure_peak_memory,
+    measure_peak_rss,
+    measure_time,
+    print_results_table,
+    save_results,
+)
+
+from bench_conversion import convert_bundle
+from synthetic import SyntheticSpec, bundle_for, generate_bundle
+from tei_backend import collect_validation_findings
+
+DEFAULT_SIZES = "1000,3000,10000,30000,100000"
+DEFAULT_MAX_EXPONENT = 1.3
+SCALED_METRICS = ("convert_seconds", "validate_seconds", "convert_peak_bytes")
+
+
+def spec_for(verses: int) -> SyntheticSpec:
+    """
+    Edición de `verses` versos con prólogo y notas al pie proporcionales (una comedia
+    de ~3000 versos suele llevar 40-80 páginas de prólogo).
+    """
+    return SyntheticSpec(
+        verses=verses,
+        acts=max(3, verses // 3000),
+        speakers=min(60, 8 + verses // 500),
+        front_paragraphs=max(20, verses // 25),
+        front_tables=max(1, verses // 1500),
+        footnotes=max(10, verses // 50),
+    )
+
+
+def validate_bundle(bundle) -> list:
+    return collect_validation_findings(bundle.main_docx, bundle.aparato_docx, bundle.notas_docx)
+
+
+def growth_exponent(previous: dict, current: dict, metric: str):
+    old, new = previous.get(metric), current.get(metric)
+    if not old or not new:
+        return None
+    return math.log(new / old) / math.log(current["verses"] / previous["verses"])
+
+
+def run_benchmark(sizes: list[int], workdir: str, repeat: int) -> list[dict]:
+    results = []
+    for verses in sizes:
+        spec = spec_for(verses)
+        folder = os.path.join(workdir, spec.name)
+        bundle = bundle_for(folder, spec)
+        # Las ediciones ya generadas se reutilizan (misma semilla, mismo documento)
+        if not all(os.path.exists(path) for path in bundle if path):
+            generate_bundle(folder, spec)
+        result = {
+            "name": spec.name,
+            "verses": verses,
+            "docx_bytes": os.path.getsize(bundle.main_docx),
+            "convert_seconds": measure_time(lambda: convert_bundle(bundle), repeat),
+            "validate_seconds": measure_time(lambda: validate_bundle(bundle), repeat),
+            "convert_peak_bytes": measure_peak_memory(lambda: convert_bundle(bundle)),
+            "convert_peak_rss_bytes": measure_peak_rss(convert_bundle, bundle),
+        }
+        result["seconds_per_1k"] = result["convert_seconds"] * 1000 / verses
+        if results:
+            for metric in SCALED_METRICS:
+                result[f"{metric}_exponent"] = growth_exponent(results[-1], result, metric)
+        results.append(result)
+    return results
+
+
+def find_superlinear(results: list[dict], max_exponent: float) -> list[str]:
+    warnings = []
+    for previous, result in zip(results, results[1:]):
+        for metric in SCALED_METRICS:
+            exponent = result.get(f"{metric}_exponent")
+            if exponent is not None and exponent > max_exponent:
+                warnings.append(
+                    f"{metric} {previous['verses']} -> {result['verses']} versos: exponente {exponent:.2f}"
+                )
+    return warnings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de escala con ediciones sintéticas")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Versos de cada edición (por defecto: {DEFAULT_SIZES})")
+    parser.add_argument("--workdir", help="Carpeta donde generar y conservar las ediciones (por defecto: temporal)")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones para el tiempo (se toma el mejor)")
+    parser.add_argument(
+        "--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT,
+        help=f"Exponente de crecimiento tolerado (por defecto: {DEFAULT_MAX_EXPONENT})",
+    )
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    if args.workdir:
+        results = run_benchmark(sizes, args.workdir, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run_benchmark(sizes, workdir, args.repeat)
+
+    print_results_table(results, [
+        ("verses", "Versos"),
+        ("docx_bytes", "DOCX"),
+        ("convert_seconds", "Conversión (s)"),
+        ("seconds_per_1k", "s / 1000 versos"),
+        ("convert_seconds_exponent", "Exp. conversión"),
+        ("validate_seconds", "Validación (s)"),
+        ("validate_seconds_exponent", "Exp. validación"),
+        ("convert_peak_bytes", "Pico heap Python"),
+        ("convert_peak_bytes_exponent", "Exp. heap"),
+        ("convert_peak_rss_bytes", "Pico RSS"),
+    ])
+
+    if args.json_path:
+        save_results(args.json_path, "scaling", results)
+
+    problems = [f"SUPERLINEAL: {warning}" for warning in find_superlinear(results, args.max_exponent)]
+    if args.baseline:
+        problems += [
+            f"REGRESIÓN: {regression}"
+            for regression in compare_with_baseline(results, args.baseline, ["convert_seconds", "validate_seconds", "convert_peak_bytes"])
+        ]
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
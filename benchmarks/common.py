@@ -0,0 +1,160 @@
+# ==========================================
+# feniX-ML: Utilidades comunes para los benchmarks
+# Descripción: Medición de tiempo y memoria pico, y comparación con resultados
+#              previos guardados en JSON para detectar regresiones.
+# ==========================================
+
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage, solo se mide el heap de Python
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_ROOT, "app")
+TEST_DATA_DIR = os.path.join(REPO_ROOT, "test")
+
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+# Margen tolerado antes de marcar una medición como regresión frente al baseline
+REGRESSION_TOLERANCE = 0.10
+
+
+def measure_time(func: Callable[[], Any], repeat: int = 1) -> float:
+    """
+    Devuelve el mejor tiempo (segundos) de `repeat` ejecuciones.
+    """
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_peak_memory(func: Callable[[], Any]) -> int:
+    """
+    Devuelve la memoria pico (bytes) reservada por Python durante `func`.
+    Se mide en una ejecución aparte porque tracemalloc ralentiza el proceso.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _read_peak_rss() -> int:
+    """
+    Pico de RSS del proceso actual en bytes. En Linux se usa VmHWM, porque
+    ru_maxrss se hereda del proceso padre a través de fork/exec.
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss viene en KB en Linux y en bytes en macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _peak_rss_probe(target: Callable[..., Any], args: tuple) -> int:
+    """
+    Se ejecuta en un proceso limpio: devuelve cuánto crece el pico de RSS durante target(*args).
+    """
+    before = _read_peak_rss()
+    target(*args)
+    return _read_peak_rss() - before
+
+
+def measure_peak_rss(target: Callable[..., Any], *args) -> Optional[int]:
+    """
+    Mide el crecimiento del pico de memoria del proceso (incluye lxml/libxml2,
+    invisible para tracemalloc). `target` debe ser una función de módulo serializable.
+    """
+    if resource is None:
+        return None
+    # Al deserializar target el proceso hijo ya importa sus módulos, de modo que
+    # la medición no incluye el coste de importar lxml/python-docx.
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(_peak_rss_probe, (target, args))
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def print_results_table(results: list[dict], columns: list[tuple[str, str]]) -> None:
+    """
+    Imprime los resultados como tabla de texto; columns = [(clave, cabecera)].
+    """
+    rows = [[header for _, header in columns]]
+    for result in results:
+        row = []
+        for key, _ in columns:
+            value = result.get(key, "")
+            if key.endswith("_bytes") and isinstance(value, (int, float)):
+                value = format_bytes(value)
+            elif isinstance(value, float):
+                value = f"{value:.3f}"
+            row.append(str(value))
+        rows.append(row)
+    widths = [max(len(row[idx]) for row in rows) for idx in range(len(columns))]
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+def compare_with_baseline(results: list[dict], baseline_path: str, metrics: list[str]) -> list[str]:
+    """
+    Compara con un JSON previo (mismo formato que save_results) y devuelve
+    las regresiones que superan REGRESSION_TOLERANCE.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {item["name"]: item for item in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if not previous:
+            continue
+        for metric in metrics:
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > REGRESSION_TOLERANCE:
+                regressions.append(f"{result['name']}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def save_results(path: str, benchmark: str, results: list[dict]) -> None:
+    payload = {
+        "benchmark": benchmark,
+        "python": sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,326 @@
+# ==========================================
+# feniX-ML: Generador de ediciones sintéticas
+# Descripción: Construye bundles DOCX válidos para feniX-ML (prólogo y comedia, notas y
+#              aparato) a partir de parámetros: actos, versos, personajes, anotaciones
+#              @/%, notas de verso, tablas y notas al pie del prólogo. Usa los estilos
+#              reales de las plantillas y es determinista para una misma semilla, de modo
+#              que los benchmarks de escala comparan siempre el mismo documento.
+# Uso: python benchmarks/synthetic.py CARPETA [--verses N] [--acts N] [--speakers N]
+#                                             [--seed N] ...
+# ==========================================
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import zipfile
+from typing import NamedTuple
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+import common  # noqa: F401  (añade app/ a sys.path)
+from corpus import PlayBundle
+
+# Estilos de párrafo de las plantillas de feniX-ML
+STYLES = (
+    "Titulo_comedia", "Epigr_Dramatis", "Dramatis_lista", "Acto", "Personaje", "Verso",
+    "Partido_inicial", "Partido_medio", "Partido_final", "Laguna", "Acot", "Prosa",
+    "Epigr_final", "Quote",
+)
+
+WORDS = (
+    "amor", "honor", "cielo", "noche", "fuego", "duque", "señor", "dama", "corte", "monte",
+    "viento", "tiempo", "pecho", "alma", "vida", "muerte", "guerra", "campo", "sombra",
+    "llanto", "fortuna", "secreto", "espada", "jardín", "ausencia", "lealtad", "engaño",
+    "estrella", "plata", "oro", "mar", "rey", "padre", "hijo", "gloria", "venganza",
+    "tierra", "celos", "mano", "palabra", "sol", "luna", "río", "flor", "puerta", "carta",
+)
+CONNECTORS = ("y", "que", "de", "en", "con", "por", "sin", "a", "el", "la", "mi", "tu", "su")
+SYLLABLES = ("al", "ba", "ce", "da", "fe", "ri", "lo", "mar", "cas", "tin", "ro", "dor", "li", "sa", "ne")
+
+FOOTNOTES_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"
+FOOTNOTES_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/footnotes"
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+class SyntheticSpec(NamedTuple):
+    """
+    Parámetros de una edición sintética. Las frecuencias se expresan como "uno de cada N".
+    """
+    verses: int = 1000
+    acts: int = 3
+    speakers: int = 12
+    speech_length: int = 6         # versos por parlamento (media)
+    word_notes_every: int = 40     # versos con @palabra (nota filológica)
+    apparatus_every: int = 30      # versos con %palabra (aparato crítico)
+    verse_notes_every: int = 10    # versos con nota "N: ..." en el archivo de notas
+    split_every: int = 12          # parlamentos que terminan en verso partido
+    stage_every: int = 8           # parlamentos seguidos de acotación
+    lagunas: int = 2
+    front_paragraphs: int = 40
+    front_tables: int = 2
+    footnotes: int = 20
+    seed: int = 1
+
+    @property
+    def name(self) -> str:
+        return f"Sintetica_{self.verses}v"
+
+
+# --- Texto
+def speaker_names(count: int, rng: random.Random) -> list[str]:
+    names: list[str] = []
+    seen = set()
+    while len(names) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).upper()
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def verse_words(rng: random.Random) -> list[str]:
+    return [
+        rng.choice(WORDS) if i % 2 == 0 else rng.choice(CONNECTORS)
+        for i in range(rng.randint(5, 7))
+    ]
+
+
+def note_text(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS + CONNECTORS) for _ in range(words)).capitalize() + "."
+
+
+# --- DOCX
+def new_document():
+    """
+    Documento vacío con los estilos de párrafo de feniX-ML. Devuelve (documento, {nombre: id}).
+    """
+    doc = Document()
+    styles = {"Normal": None}
+    for style_name in STYLES:
+        try:
+            style = doc.styles[style_name]
+        except KeyError:
+            style = doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+        styles[style_name] = style.style_id
+    return doc, styles
+
+
+def add_paragraph(doc, style_id, text: str, italic_word: str = ""):
+    # El estilo se asigna por id: `paragraph.style = nombre` recorre la tabla de estilos
+    # en cada párrafo y hacía cuadrática la generación de comedias largas
+    para = doc.add_paragraph(text)
+    if style_id:
+        para._p.get_or_add_pPr().style = style_id
+    if italic_word:
+        para.add_run(" ")
+        para.add_run(italic_word).italic = True
+    return para
+
+
+def add_footnote_reference(para, note_id: int) -> None:
+    run = para.add_run()._r
+    reference = OxmlElement("w:footnoteReference")
+    reference.set(qn("w:id"), str(note_id))
+    run.append(reference)
+
+
+def footnotes_xml(notes: list[str]) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
+        f'<w:footnotes xmlns:w="{W_NS}">',
+        '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>',
+        '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:r><w:continuationSeparator/></w:r></w:p></w:footnote>',
+    ]
+    for note_id, text in enumerate(notes, start=1):
+        parts.append(
+            f'<w:footnote w:id="{note_id}"><w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p></w:footnote>'
+        )
+    parts.append("</w:footnotes>")
+    return "".join(parts)
+
+
+def save_with_footnotes(doc, path: str, notes: list[str]) -> None:
+    """
+    Guarda el documento añadiendo word/footnotes.xml registrado en [Content_Types].xml y
+    en las relaciones del documento, como lo escribe Word (python-docx no crea notas al pie).
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".docx", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        doc.save(tmp_path)
+        with zipfile.ZipFile(tmp_path) as source, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                data = source.read(item.filename)
+                if item.filename == "[Content_Types].xml":
+                    data = data.replace(
+                        b"</Types>",
+                        f'<Override PartName="/word/footnotes.xml" ContentType="{FOOTNOTES_CONTENT_TYPE}"/></Types>'.encode("utf-8"),
+                    )
+                elif item.filename == "word/_rels/document.xml.rels":
+                    data = data.replace(
+                        b"</Relationships>",
+                        f'<Relationship Id="rIdFootnotes" Type="{FOOTNOTES_RELATIONSHIP}" Target="footnotes.xml"/></Relationships>'.encode("utf-8"),
+                    )
+                target.writestr(item, data)
+            target.writestr("word/footnotes.xml", footnotes_xml(notes))
+    finally:
+        os.remove(tmp_path)
+
+
+def write_notes_docx(path: str, entries: list[tuple[str, str]]) -> None:
+    doc = Document()
+    for key, text in entries:
+        doc.add_paragraph(f"{key}: {text}")
+    doc.save(path)
+
+
+# --- Edición completa
+def build_front(doc, styles, spec: SyntheticSpec, rng: random.Random) -> list[str]:
+    """
+    Prólogo con secciones "#", tablas con encabezado "^" y llamadas a notas al pie.
+    Devuelve el texto de las notas al pie en orden de id.
+    """
+    footnotes = [note_text(rng, 20) for _ in range(spec.footnotes)]
+    section_length = 10
+    tables_at = {round((i + 1) * spec.front_paragraphs / (spec.front_tables + 1)) for i in range(spec.front_tables)}
+    next_note = 1
+    para = add_paragraph(doc, styles["Normal"], "#Sección 1")
+    for i in range(spec.front_paragraphs):
+        if i and i % section_length == 0:
+            add_paragraph(doc, styles["Normal"], f"#Sección {i // section_length + 1}")
+        para = add_paragraph(doc, styles["Normal"], note_text(rng, 60), italic_word=rng.choice(WORDS))
+        if next_note <= spec.footnotes and i % max(1, spec.front_paragraphs // max(1, spec.footnotes)) == 0:
+            add_footnote_reference(para, next_note)
+            next_note += 1
+        if i in tables_at:
+            table = doc.add_table(rows=4, cols=3)
+            for col, header in enumerate(("^Acto", "^Estrofa", "^Versos")):
+                table.cell(0, col).text = header
+            for row in range(1, 4):
+                table.cell(row, 0).text = str(row)
+                table.cell(row, 1).text = rng.choice(("Redondillas", "Romance", "Décimas", "Quintillas"))
+                table.cell(row, 2).text = f"{row * 100}-{row * 100 + 99}"
+    # Notas que no cupieron en el recorrido: se llaman desde el último párrafo
+    while next_note <= spec.footnotes:
+        add_footnote_reference(para, next_note)
+        next_note += 1
+    return footnotes
+
+
+def bundle_for(folder: str, spec: SyntheticSpec) -> PlayBundle:
+    """
+    Rutas del bundle que generate_bundle escribe en `folder` para `spec`.
+    """
+    return PlayBundle(
+        main_docx=os.path.join(folder, f"{spec.name}_prologoycomedia.docx"),
+        notas_docx=os.path.join(folder, f"{spec.name}_Notas.docx"),
+        aparato_docx=os.path.join(folder, f"{spec.name}_Aparato.docx"),
+    )
+
+
+def generate_bundle(folder: str, spec: SyntheticSpec = SyntheticSpec()) -> PlayBundle:
+    """
+    Escribe en `folder` <nombre>_prologoycomedia.docx, <nombre>_Notas.docx y
+    <nombre>_Aparato.docx según `spec` y devuelve el bundle (sin metadatos: el
+    teiHeader de reserva basta para medir).
+    """
+    rng = random.Random(spec.seed)
+    os.makedirs(folder, exist_ok=True)
+    doc, styles = new_document()
+    footnotes = build_front(doc, styles, spec, rng)
+
+    notes: list[tuple[str, str]] = []
+    apparatus: list[tuple[str, str]] = []
+
+    def annotate(words: list[str], verse_number: int) -> list[str]:
+        if verse_number % spec.word_notes_every == 0:
+            notes.append((f"@{words[0]}", note_text(rng)))
+            words[0] = "@" + words[0]
+        if verse_number % spec.apparatus_every == 0:
+            apparatus.append((f"%{words[-1]}", f"{words[-1]} A : {rng.choice(WORDS)} B"))
+            words[-1] = "%" + words[-1]
+        if verse_number % spec.verse_notes_every == 0:
+            notes.append((str(verse_number), note_text(rng)))
+        return words
+
+    add_paragraph(doc, styles["Titulo_comedia"], f"Comedia %sintética de {spec.verses} versos")
+    apparatus.append(("%sintética", "sintética A : sintetica B"))
+    names = speaker_names(spec.speakers, rng)
+    add_paragraph(doc, styles["Epigr_Dramatis"], "Personas que hablan en ella")
+    for name in names:
+        add_paragraph(doc, styles["Dramatis_lista"], f"{name}, {rng.choice(WORDS)}")
+
+    verses_per_act = [spec.verses // spec.acts + (1 if i < spec.verses % spec.acts else 0) for i in range(spec.acts)]
+    laguna_at = {round((i + 1) * spec.verses / (spec.lagunas + 1)) for i in range(spec.lagunas)}
+    verse_number = 0
+    speech = 0
+    for act, act_verses in enumerate(verses_per_act, start=1):
+        add_paragraph(doc, styles["Acto"], f"Acto {act}")
+        add_paragraph(doc, styles["Acot"], f"Salen {names[0].capitalize()} y {names[1].capitalize()}")
+        add_paragraph(doc, styles["Normal"], f"${rng.choice(('Redondillas', 'Romance', 'Décimas'))}")
+        remaining = act_verses
+        speaker = 0
+        while remaining > 0:
+            speech += 1
+            add_paragraph(doc, styles["Personaje"], names[speaker % len(names)])
+            length = min(remaining, max(1, rng.randint(spec.speech_length // 2, spec.speech_length * 3 // 2)))
+            split = remaining - length > 0 and speech % spec.split_every == 0
+            for line in range(length - (1 if split else 0)):
+                verse_number += 1
+                words = annotate(verse_words(rng), verse_number)
+                italic = rng.choice(WORDS) if verse_number % 25 == 0 else ""
+                add_paragraph(doc, styles["Verso"], " ".join(words), italic_word=italic)
+                if verse_number in laguna_at:
+                    add_paragraph(doc, styles["Laguna"], "[…]")
+            remaining -= length
+            speaker = rng.randrange(len(names)) if speaker + 1 >= len(names) else speaker + 1
+            if split:
+                # Un verso repartido entre tres personajes (inicial, medio y final)
+                verse_number += 1
+                words = verse_words(rng)
+                thirds = (words[:2], words[2:4], words[4:])
+                for style, part in zip(("Partido_inicial", "Partido_medio", "Partido_final"), thirds):
+                    if style != "Partido_inicial":
+                        add_paragraph(doc, styles["Personaje"], names[speaker % len(names)])
+                        speaker += 1
+                    add_paragraph(doc, styles[style], " ".join(part))
+                notes.append((f"{verse_number}a", note_text(rng)))
+            if speech % spec.stage_every == 0:
+                add_paragraph(doc, styles["Acot"], f"Vase {names[speaker % len(names)].capitalize()}")
+    add_paragraph(doc, styles["Epigr_final"], "Fin de la comedia")
+
+    bundle = bundle_for(folder, spec)
+    save_with_footnotes(doc, bundle.main_docx, footnotes)
+    write_notes_docx(bundle.notas_docx, notes)
+    write_notes_docx(bundle.aparato_docx, apparatus)
+    return bundle
+
+
+def main(argv=None) -> int:
+    defaults = SyntheticSpec()
+    parser = argparse.ArgumentParser(description="Generar una edición sintética de feniX-ML")
+    parser.add_argument("folder", help="Carpeta de destino")
+    for field in SyntheticSpec._fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=getattr(defaults, field))
+    parser.add_argument("--clean", action="store_true", help="Vaciar la carpeta antes de generar")
+    args = parser.parse_args(argv)
+
+    if args.clean and os.path.isdir(args.folder):
+        shutil.rmtree(args.folder)
+    spec = SyntheticSpec(**{field: getattr(args, field) for field in SyntheticSpec._fields})
+    bundle = generate_bundle(args.folder, spec)
+    for path in bundle:
+        if path:
+            print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# ==========================================
+# feniX-ML: DOCX de prueba para los tests
+# Descripción: Genera DOCX mínimos con python-docx a partir de pares (texto, estilo).
+#              Los estilos que no existen en la plantilla se crean como estilos de
+#              párrafo, y se añade un word/footnotes.xml vacío como el de los DOCX
+#              que exporta Word, que el backend espera encontrar.
+# ==========================================
+
+import zipfile
+from pathlib import Path
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+EMPTY_FOOTNOTES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:footnotes xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'
+)
+
+
+def play_paragraphs(*verses: str) -> list[tuple[str, str]]:
+    """
+    Título, un acto y un personaje seguidos de un párrafo "Verso" por cada verso.
+    """
+    return [
+        ("Comedia de prueba", "Titulo_comedia"),
+        ("Acto primero", "Acto"),
+        ("ALGUIEN", "Personaje"),
+        *((verse, "Verso") for verse in verses),
+    ]
+
+
+def build_docx(path, paragraphs) -> str:
+    """
+    Escribe en `path` un DOCX con los párrafos (texto, estilo) y devuelve su ruta.
+    """
+    doc = Document()
+    for _, style_name in paragraphs:
+        try:
+            doc.styles[style_name]
+        except KeyError:
+            doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+    for text, style_name in paragraphs:
+        doc.add_paragraph(text).style = style_name
+    doc.save(str(path))
+    with zipfile.ZipFile(path, "a") as docx_zip:
+        docx_zip.writestr("word/footnotes.xml", EMPTY_FOOTNOTES)
+    return str(Path(path))
@@ -0,0 +1,258 @@
+# ==========================================
+# feniX-ML: Regresión de la salida TEI contra ediciones de referencia (golden)
+# Descripción: Convierte cada bundle de test/ (incluido test/comedias/) y compara el TEI
+#              con el guardado en tests/golden/ tras canonicalizar ambos con C14N. Si no
+#              coinciden, recorre los dos árboles a la vez y señala la primera divergencia
+#              con su acto, su verso y su ruta XPath. Además indica si la salida es idéntica
+#              byte a byte, para validar reescrituras del backend (otro motor de renderizado,
+#              modo paralelo...) que no deben cambiar nada.
+# Uso: python tests/golden_output.py [NOMBRE ...] [--processes N] [--bytes] [--update]
+#      NOMBRE filtra por la ruta del DOCX principal dentro de test/ (subcadena).
+#      --update reescribe los TEI de referencia: solo tras revisar un cambio buscado.
+# ==========================================
+
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from itertools import zip_longest
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import lxml.etree as etree
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CORPUS_DIR = REPO_ROOT / "test"
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+
+if str(REPO_ROOT / "app") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from corpus import PlayBundle, discover_play_bundles  # noqa: E402
+
+TEI_NS = "http://www.tei-c.org/ns/1.0"
+XML_PARSER = etree.XMLParser(huge_tree=True, collect_ids=False)
+SNIPPET_LIMIT = 80
+
+# "identical": mismos bytes; "equivalent": mismo C14N con bytes distintos (p. ej. sangría
+# o atributos reordenados); "different", "missing" (sin referencia) y "failed" (excepción).
+PASSING_STATUSES = {"identical", "equivalent", "updated", "unchanged"}
+
+
+class GoldenResult(NamedTuple):
+    name: str
+    status: str
+    seconds: float
+    detail: Optional[str] = None
+
+
+def bundle_name(bundle: PlayBundle) -> str:
+    """
+    Ruta del DOCX principal relativa a test/, con "/" como separador.
+    """
+    return Path(bundle.main_docx).relative_to(CORPUS_DIR).as_posix()
+
+
+def golden_path(name: str) -> Path:
+    return GOLDEN_DIR / Path(name).with_suffix(".xml")
+
+
+def convert_bundle(bundle: PlayBundle) -> str:
+    import tei_backend
+    # La conversión imprime avisos de progreso y de validación que aquí no interesan
+    with redirect_stdout(io.StringIO()):
+        return tei_backend.convert_docx_to_tei(
+            bundle.main_docx, bundle.notas_docx, bundle.aparato_docx, bundle.metadata_docx, save=False
+        )
+
+
+# --- Comparación
+def canonicalize(root) -> bytes:
+    return etree.tostring(root, method="c14n")
+
+
+def shorten(value: Optional[str]) -> str:
+    if value is None:
+        return "(nada)"
+    if not value.strip():
+        return repr(value)
+    value = " ".join(value.split())
+    return value[:SNIPPET_LIMIT] + "..." if len(value) > SNIPPET_LIMIT else value
+
+
+def describe_element(element) -> str:
+    if element is None:
+        return "(nada)"
+    return shorten(etree.tostring(element, with_tail=False, encoding="unicode"))
+
+
+def element_path(element) -> str:
+    """
+    Ruta legible del elemento con nombres locales (sin espacio de nombres TEI), p. ej.
+    /TEI/text/body/div/div[2]/sp[30]/l[4].
+    """
+    parts = []
+    while element is not None:
+        parent = element.getparent()
+        name = etree.QName(element).localname if isinstance(element.tag, str) else "comment()"
+        if parent is not None:
+            siblings = [child for child in parent if child.tag == element.tag]
+            if len(siblings) > 1:
+                name += f"[{siblings.index(element) + 1}]"
+        parts.append(name)
+        element = parent
+    return "/" + "/".join(reversed(parts))
+
+
+def element_difference(expected, actual) -> Optional[tuple[str, str, str]]:
+    """
+    Primera diferencia entre dos elementos sin mirar sus hijos:
+    (qué difiere, valor esperado, valor obtenido) o None si coinciden.
+    """
+    if expected is None or actual is None or expected.tag != actual.tag:
+        return "elemento", describe_element(expected), describe_element(actual)
+    if dict(expected.attrib) != dict(actual.attrib):
+        return "atributos", shorten(str(dict(expected.attrib))), shorten(str(dict(actual.attrib)))
+    if expected.text != actual.text:
+        return "texto", shorten(expected.text), shorten(actual.text)
+    if expected.tail != actual.tail:
+        return "texto tras el elemento", shorten(expected.tail), shorten(actual.tail)
+    return None
+
+
+def first_divergence(expected_root, actual_root) -> str:
+    """
+    Recorre ambos árboles en orden de documento y describe la primera diferencia
+    con el acto y el último verso (según la referencia) en que aparece.
+    """
+    act, verse = None, None
+    for expected, actual in zip_longest(expected_root.iter(), actual_root.iter()):
+        current = expected if expected is not None else actual
+        if current.tag == f"{{{TEI_NS}}}div" and current.get("subtype") == "ACTO":
+            act, verse = current.get("n"), None
+        elif current.tag == f"{{{TEI_NS}}}l" and current.get("n"):
+            verse = current.get("n")
+
+        difference = element_difference(expected, actual)
+        if difference is None:
+            continue
+        what, expected_value, actual_value = difference
+        path = element_path(current)
+        location = f"acto {act}" if act else "fuera de los actos"
+        if verse:
+            location += f", verso {verse}"
+        return (
+            f"{location} · {path}\n"
+            f"      {what} esperado: {expected_value}\n"
+            f"      {what} obtenido: {actual_value}"
+        )
+    return "los árboles coinciden aunque el C14N difiere"
+
+
+def compare_tei(expected: str, actual: str) -> tuple[str, Optional[str]]:
+    """
+    Devuelve (estado, detalle) según compare byte a byte, con C14N o estructuralmente.
+    """
+    if expected == actual:
+        return "identical", None
+    expected_root = etree.fromstring(expected.encode("utf-8"), XML_PARSER)
+    actual_root = etree.fromstring(actual.encode("utf-8"), XML_PARSER)
+    if canonicalize(expected_root) == canonicalize(actual_root):
+        return "equivalent", "mismo C14N, bytes distintos"
+    return "different", first_divergence(expected_root, actual_root)
+
+
+# --- Un bundle (se ejecuta en el proceso de trabajo)
+def check_bundle(bundle: PlayBundle, update: bool = False) -> GoldenResult:
+    name = bundle_name(bundle)
+    reference = golden_path(name)
+    start = time.perf_counter()
+    try:
+        tei = convert_bundle(bundle)
+    except Exception as e:
+        return GoldenResult(name, "failed", time.perf_counter() - start, str(e) or type(e).__name__)
+    seconds = time.perf_counter() - start
+
+    # newline="": se compara y se guarda exactamente lo que genera el backend
+    previous = None
+    if reference.exists():
+        with open(reference, "r", encoding="utf-8", newline="") as f:
+            previous = f.read()
+    if update:
+        if previous == tei:
+            return GoldenResult(name, "unchanged", seconds)
+        reference.parent.mkdir(parents=True, exist_ok=True)
+        with open(reference, "w", encoding="utf-8", newline="") as f:
+            f.write(tei)
+        return GoldenResult(name, "updated", seconds)
+    if previous is None:
+        return GoldenResult(name, "missing", seconds, f"no existe {reference.relative_to(REPO_ROOT).as_posix()}")
+    status, detail = compare_tei(previous, tei)
+    return GoldenResult(name, status, seconds, detail)
+
+
+def check_update(bundle: PlayBundle) -> GoldenResult:
+    return check_bundle(bundle, update=True)
+
+
+# --- Corpus completo
+def select_bundles(names: Optional[list[str]] = None) -> list[PlayBundle]:
+    bundles = discover_play_bundles(str(CORPUS_DIR))
+    if names:
+        bundles = [bundle for bundle in bundles if any(name in bundle_name(bundle) for name in names)]
+    return bundles
+
+
+def check_golden_outputs(
+    names: Optional[list[str]] = None, processes: Optional[int] = None, update: bool = False
+) -> list[GoldenResult]:
+    """
+    Compara (o con update=True, reescribe) el TEI de referencia de cada bundle de test/.
+    Los bundles se convierten en paralelo; el orden de los resultados es el de descubrimiento.
+    """
+    bundles = select_bundles(names)
+    job = check_update if update else check_bundle
+    processes = max(1, min(processes or os.cpu_count() or 1, len(bundles) or 1))
+    if processes == 1:
+        return [job(bundle) for bundle in bundles]
+    # "spawn" como en corpus_validation: mismo comportamiento en Windows, macOS y Linux
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        return list(executor.map(job, bundles))
+
+
+def golden_failed(results: list[GoldenResult], require_bytes: bool = False) -> bool:
+    passing = PASSING_STATUSES - ({"equivalent"} if require_bytes else set())
+    return not results or any(result.status not in passing for result in results)
+
+
+def format_result(result: GoldenResult) -> str:
+    line = f"{result.status:<10}  {result.seconds:6.2f} s  {result.name}"
+    if result.detail:
+        line += f"\n    {result.detail}"
+    return line
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compara el TEI de test/ con las referencias de tests/golden/.")
+    parser.add_argument("names", nargs="*", metavar="NOMBRE", help="Solo los bundles cuya ruta contenga NOMBRE")
+    parser.add_argument("--processes", type=int, default=None, help="Procesos de conversión (por defecto, uno por núcleo)")
+    parser.add_argument("--bytes", action="store_true", help="Exigir salida idéntica byte a byte, no solo el mismo C14N")
+    parser.add_argument("--update", action="store_true", help="Reescribir las referencias con la salida actual")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = check_golden_outputs(args.names, args.processes, args.update)
+    for result in results:
+        print(format_result(result))
+    failed = golden_failed(results, args.bytes)
+    print(f"{len(results)} bundles en {time.perf_counter() - start:.1f} s: {'FALLA' if failed else 'OK'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
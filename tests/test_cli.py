@@ -0,0 +1,126 @@
+import io
+import json
+import subprocess
+import sys
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from cli import EXIT_ERROR, EXIT_OK, EXIT_VALIDATION_FAILED, main  # noqa: E402
+
+
+class CommandLineTest(unittest.TestCase):
+    def _build_test_docx(self, output_path: Path, with_invalid_style: bool = False) -> None:
+        doc = Document()
+        for style_name in ["Titulo_comedia", "Acto", "Personaje", "Verso", "Estilo_raro"]:
+            try:
+                doc.styles[style_name]
+            except KeyError:
+                doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+
+        doc.add_paragraph("Comedia de prueba").style = "Titulo_comedia"
+        doc.add_paragraph("Acto primero").style = "Acto"
+        doc.add_paragraph("ALGUIEN").style = "Personaje"
+        doc.add_paragraph("verso de prueba").style = "Verso"
+        if with_invalid_style:
+            doc.add_paragraph("texto con estilo desconocido").style = "Estilo_raro"
+        doc.save(str(output_path))
+
+        empty_footnotes = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:footnotes xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'
+        )
+        with zipfile.ZipFile(output_path, "a") as docx_zip:
+            docx_zip.writestr("word/footnotes.xml", empty_footnotes)
+
+    def _run(self, argv: list[str]) -> tuple[int, str]:
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            exit_code = main(argv)
+        return exit_code, buffer.getvalue()
+
+    def test_validate_json_and_exit_codes(self):
+        with TemporaryDirectory() as tmp_dir:
+            valid_docx = Path(tmp_dir) / "valida.docx"
+            invalid_docx = Path(tmp_dir) / "invalida.docx"
+            self._build_test_docx(valid_docx)
+            self._build_test_docx(invalid_docx, with_invalid_style=True)
+
+            valid_code, valid_output = self._run(["validate", str(valid_docx), "--json"])
+            invalid_code, invalid_output = self._run(["validate", str(invalid_docx), "--json"])
+            missing_code, _ = self._run(["validate", str(Path(tmp_dir) / "no_existe.docx")])
+
+        self.assertEqual(valid_code, EXIT_OK)
+        self.assertTrue(json.loads(valid_output)["ok"])
+
+        self.assertEqual(invalid_code, EXIT_VALIDATION_FAILED)
+        report = json.loads(invalid_output)
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["errors"], 1)
+        self.assertEqual(report["findings"][0]["code"], "invalid_style")
+        self.assertEqual(report["findings"][0]["severity"], "error")
+        self.assertTrue(report["messages"][0].startswith("❌ Estilo no válido: Estilo_raro"))
+        self.assertIn("validate_seconds", report["timings"])
+
+        self.assertEqual(missing_code, EXIT_ERROR)
+
+    def test_convert_writes_tei_without_importing_tkinter(self):
+        with TemporaryDirectory() as tmp_dir:
+            docx_path = Path(tmp_dir) / "comedia.docx"
+            output_path = Path(tmp_dir) / "comedia.xml"
+            self._build_test_docx(docx_path)
+
+            script = (
+                "import sys; import cli; "
+                f"code = cli.main(['convert', {str(docx_path)!r}, '-o', {str(output_path)!r}, '--json']); "
+                "sys.stderr.write(str('tkinter' in sys.modules)); sys.exit(code)"
+            )
+            completed = subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=str(REPO_ROOT / "app"),
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+            )
+            tei = output_path.read_text(encoding="utf-8")
+
+        self.assertEqual(completed.returncode, EXIT_OK, completed.stderr)
+        self.assertTrue(completed.stderr.endswith("False"))
+        self.assertEqual(json.loads(completed.stdout)["output"], str(output_path))
+        self.assertIn('<l n="1">verso de prueba</l>', tei)
+
+    def test_convert_validate_and_fail_fast(self):
+        with TemporaryDirectory() as tmp_dir:
+            invalid_docx = Path(tmp_dir) / "invalida.docx"
+            output_path = Path(tmp_dir) / "comedia.xml"
+            blocked_path = Path(tmp_dir) / "bloqueada.xml"
+            self._build_test_docx(invalid_docx, with_invalid_style=True)
+
+            code, output = self._run(["convert", str(invalid_docx), "--validate", "-o", str(output_path), "--json"])
+            fast_code, fast_output = self._run(["convert", str(invalid_docx), "--fail-fast", "-o", str(blocked_path), "--json"])
+            converted = output_path.exists()
+            blocked = blocked_path.exists()
+
+        self.assertEqual(code, EXIT_VALIDATION_FAILED)
+        report = json.loads(output)
+        self.assertTrue(converted)
+        self.assertTrue(report["converted"])
+        self.assertEqual(report["findings"][0]["code"], "invalid_style")
+        self.assertIn("validate_convert_seconds", report["timings"])
+
+        self.assertEqual(fast_code, EXIT_VALIDATION_FAILED)
+        self.assertFalse(blocked)
+        self.assertFalse(json.loads(fast_output)["converted"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from corpus_validation import corpus_failed, render_report_html, validate_corpus  # noqa: E402
+from docx_factory import build_docx, play_paragraphs  # noqa: E402
+
+
+def build_bundle(folder: Path, with_invalid_style: bool) -> None:
+    folder.mkdir()
+    paragraphs = play_paragraphs("verso de <prueba>")
+    if with_invalid_style:
+        paragraphs.append(("texto con estilo desconocido", "Estilo_raro"))
+    build_docx(folder / f"{folder.name}_prologoycomedia.docx", paragraphs)
+
+
+class CorpusValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        build_bundle(self.root / "a_correcta", with_invalid_style=False)
+        build_bundle(self.root / "b_erronea", with_invalid_style=True)
+        (self.root / "c_rota").mkdir()
+        (self.root / "c_rota" / "Rota_prologoycomedia.docx").write_bytes(b"no es un docx")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parallel_report_aggregates_plays_and_categories(self):
+        report = validate_corpus(str(self.root), processes=2)
+
+        self.assertEqual(
+            [play["name"] for play in report["plays"]],
+            ["a_correcta/a_correcta_prologoycomedia.docx", "b_erronea/b_erronea_prologoycomedia.docx",
+             "c_rota/Rota_prologoycomedia.docx"],
+        )
+        correct, wrong, broken = report["plays"]
+        self.assertEqual((correct["errors"], correct["warnings"], correct["failure"]), (0, 0, None))
+        self.assertEqual(wrong["categories"], {"Estilos": 1})
+        self.assertTrue(wrong["messages"][0].startswith("❌ Estilo no válido: Estilo_raro"))
+        self.assertIsNotNone(broken["failure"])
+
+        self.assertEqual(report["summary"]["plays"], 3)
+        self.assertEqual(report["summary"]["plays_with_errors"], 1)
+        self.assertEqual(report["summary"]["failures"], 1)
+        self.assertEqual(report["categories"]["Estilos"], {"error": 1, "warning": 0, "plays": 1})
+        self.assertEqual(report["timings"]["processes"], 2)
+        self.assertTrue(corpus_failed(report))
+
+        page = render_report_html(report)
+        self.assertIn('<tr class="error"><td>b_erronea/b_erronea_prologoycomedia.docx</td>', page)
+        self.assertIn('<tr class="failure">', page)
+        self.assertNotIn("<prueba>", page)
+
+    def test_single_process_gives_the_same_findings(self):
+        parallel = validate_corpus(str(self.root), processes=2)
+        serial = validate_corpus(str(self.root), processes=1)
+        self.assertEqual(
+            [play["findings"] for play in serial["plays"]],
+            [play["findings"] for play in parallel["plays"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import sys
+import threading
+import unittest
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from daemon import DaemonClient, create_server  # noqa: E402
+from tei_backend import convert_docx_to_tei  # noqa: E402
+
+
+class ConversionDaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.server = create_server(port=0, workers=2, max_pending=4)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.client = DaemonClient(host, port, timeout=60)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.service.close()
+        self.thread.join()
+
+    @staticmethod
+    def _build_bundle(folder: Path) -> tuple[str, str]:
+        doc = Document()
+        for style_name in ["Titulo_comedia", "Acto", "Personaje", "Verso"]:
+            try:
+                doc.styles[style_name]
+            except KeyError:
+                doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+        doc.add_paragraph("Comedia de prueba").style = "Titulo_comedia"
+        doc.add_paragraph("Acto primero").style = "Acto"
+        doc.add_paragraph("ALGUIEN").style = "Personaje"
+        doc.add_paragraph("verso anotado").style = "Verso"
+        main_path = folder / "comedia.docx"
+        doc.save(str(main_path))
+        with zipfile.ZipFile(main_path, "a") as docx_zip:
+            docx_zip.writestr(
+                "word/footnotes.xml",
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:footnotes xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>',
+            )
+
+        notes = Document()
+        notes.add_paragraph("1: nota al primer verso")
+        notes_path = folder / "notas.docx"
+        notes.save(str(notes_path))
+        return str(main_path), str(notes_path)
+
+    def test_convert_and_validate_reuse_parsed_inputs(self):
+        with TemporaryDirectory() as tmp_dir:
+            main_docx, notas_docx = self._build_bundle(Path(tmp_dir))
+
+            first = self.client.convert(main_docx, notas_docx=notas_docx)
+            second = self.client.convert(main_docx, notas_docx=notas_docx)
+            validation = self.client.validate(main_docx, notas_docx=notas_docx)
+            status = self.client.status()
+            expected = convert_docx_to_tei(main_docx, notas_docx=notas_docx, save=False)
+
+        self.assertTrue(first["ok"])
+        self.assertEqual(first["tei"], expected)
+        self.assertEqual(second["tei"], expected)
+        self.assertIn('xml:id="nota_1_1"', second["tei"])
+        self.assertEqual((first["findings"], first["messages"]), ([], []))
+        self.assertGreater(second["job"], first["job"])
+        self.assertGreaterEqual(first["timings"]["total_seconds"], first["timings"]["run_seconds"])
+
+        self.assertTrue(validation["ok"])
+        self.assertEqual(validation["messages"], [])
+
+        self.assertGreater(status["cache"]["hits"], 0)
+        self.assertEqual(status["jobs"]["convert"]["jobs"], 2)
+        self.assertEqual(status["jobs"]["validate"]["jobs"], 1)
+
+    def test_failed_job_reports_error(self):
+        result = self.client.convert("/ruta/que/no/existe.docx")
+        self.assertFalse(result["ok"])
+        self.assertIn("No existe el archivo principal", result["error"])
+        self.assertEqual(self.client.status()["jobs"]["convert"]["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
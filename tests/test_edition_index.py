@@ -0,0 +1,91 @@
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from edition_index import connect_index, extract_edition_rows, index_edition, index_editions  # noqa: E402
+
+
+def build_tei(extra_verse: str = "") -> str:
+    return f"""<TEI xmlns="http://www.tei-c.org/ns/1.0">
+  <teiHeader><fileDesc><titleStmt><title>Comedia de prueba</title></titleStmt></fileDesc></teiHeader>
+  <text>
+    <front>
+      <div type="castList"><castList><castItem><role xml:id="rey">REY</role></castItem></castList></div>
+    </front>
+    <body>
+      <div type="subsection" subtype="ACTO" n="1" xml:id="acto1">
+        <sp who="#rey">
+          <speaker>REY</speaker>
+          <milestone unit="stanza" type="redondillas"/>
+          <l n="1">Vasallos, <hi rend="italic">no</hi> hay qué tratar:</l>
+          <note subtype="nota" n="1" xml:id="nota_1_1">1 Nota al verso.</note>
+          <l n="2" part="I">yo envío por mi <hi rend="italic">sobrino</hi><note subtype="aparato" xml:id="a_sobrino_l_1">sobrino A : hermano B</note>,</l>
+        </sp>
+        <sp>
+          <speaker>NADIE</speaker>
+          <l n="2" part="F">mi sobrino{extra_verse}</l>
+        </sp>
+      </div>
+      <div type="subsection" subtype="ACTO" n="2" xml:id="acto2">
+        <sp who="#desconocido">
+          <speaker>OTRO</speaker>
+          <milestone unit="stanza" type="romance"/>
+          <l n="3">ha de reinar.</l>
+        </sp>
+      </div>
+    </body>
+  </text>
+</TEI>"""
+
+
+class EditionIndexTest(unittest.TestCase):
+    def test_rows_follow_acts_speakers_and_stanzas(self):
+        rows = extract_edition_rows(build_tei())
+
+        self.assertEqual(rows.title, "Comedia de prueba")
+        self.assertEqual(rows.speeches, [(0, 1, "#rey", 1, "REY"), (1, 1, None, 0, "NADIE"), (2, 2, "#desconocido", 0, "OTRO")])
+        self.assertEqual(rows.verses[0], (0, 1, 0, "1", 1, None, "redondillas", "Vasallos, no hay qué tratar:"))
+        self.assertEqual(rows.verses[1][-1], "yo envío por mi sobrino,")
+        self.assertEqual(rows.verses[3][1:], (2, 2, "3", 3, None, "romance", "ha de reinar."))
+        self.assertEqual(rows.notes, [
+            (0, 1, "nota", "nota_1_1", "1", 1, "1 Nota al verso."),
+            (1, 1, "aparato", "a_sobrino_l_1", "2", 2, "sobrino A : hermano B"),
+        ])
+        self.assertEqual(rows.milestones, [(0, 1, "stanza", "redondillas", "1"), (1, 2, "stanza", "romance", "3")])
+        # acto, versos, parlamentos, sin resolver, estrofas, notas, aparato
+        self.assertEqual(rows.acts, [(1, 3, 2, 1, 1, 1, 1), (2, 1, 1, 1, 1, 0, 0)])
+
+    def test_reindexing_only_touches_the_changed_play(self):
+        with TemporaryDirectory() as tmp_dir:
+            db_path = str(Path(tmp_dir) / "ediciones.sqlite")
+            first = index_editions(db_path, [("a.docx", build_tei()), ("b.docx", build_tei())])
+            again = index_editions(db_path, [("a.docx", build_tei()), ("b.docx", build_tei(" y más"))])
+
+            connection = connect_index(db_path)
+            try:
+                plays = dict(connection.execute("SELECT source, id FROM plays"))
+                self.assertEqual(first, {"indexed": 2, "unchanged": 0})
+                self.assertEqual(again, {"indexed": 1, "unchanged": 1})
+                self.assertEqual(plays["a.docx"], 1)
+                self.assertEqual(connection.execute("SELECT count(*) FROM verses").fetchone()[0], 8)
+                self.assertEqual(
+                    connection.execute("SELECT text FROM verses WHERE play_id = ? AND seq = 2", (plays["b.docx"],)).fetchone(),
+                    ("mi sobrino y más",),
+                )
+                unresolved = connection.execute(
+                    "SELECT p.source, count(*) FROM speeches s JOIN plays p ON p.id = s.play_id "
+                    "WHERE NOT s.resolved GROUP BY p.source ORDER BY p.source"
+                ).fetchall()
+                self.assertEqual(unresolved, [("a.docx", 2), ("b.docx", 2)])
+                self.assertFalse(index_edition(connection, "a.docx", build_tei()))
+            finally:
+                connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from golden_output import compare_tei, format_result, golden_failed, check_golden_outputs  # noqa: E402
+
+
+TEI = (
+    '<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><body>'
+    '<div subtype="ACTO" n="1"><sp who="#rey"><l n="1">uno</l><l n="2">dos</l></sp></div>'
+    '<div subtype="ACTO" n="2"><sp who="#rey"><l n="3">tres</l><l n="4">cuatro</l></sp></div>'
+    '</body></text></TEI>'
+)
+
+
+class GoldenComparisonTest(unittest.TestCase):
+    def test_first_divergence_reports_act_and_verse(self):
+        status, detail = compare_tei(TEI, TEI.replace(">cuatro<", ">cinco<"))
+
+        self.assertEqual(status, "different")
+        self.assertTrue(detail.startswith("acto 2, verso 4 · /TEI/text/body/div[2]/sp/l[2]"), detail)
+        self.assertIn("texto esperado: cuatro", detail)
+        self.assertIn("texto obtenido: cinco", detail)
+
+    def test_canonical_equivalence_and_missing_elements(self):
+        spaced = TEI.replace('<sp who="#rey"><l n="1">', '<sp who="#rey" ><l n="1">')
+        self.assertEqual(compare_tei(TEI, TEI), ("identical", None))
+        self.assertEqual(compare_tei(TEI, spaced)[0], "equivalent")
+
+        status, detail = compare_tei(TEI, TEI.replace('<l n="2">dos</l>', ""))
+        self.assertEqual(status, "different")
+        self.assertIn("acto 1, verso 2", detail)
+        self.assertIn('elemento esperado: <l xmlns="http://www.tei-c.org/ns/1.0" n="2">dos</l>', detail)
+
+
+class GoldenOutputTest(unittest.TestCase):
+    def test_corpus_matches_golden_tei(self):
+        results = check_golden_outputs()
+
+        self.assertTrue(results)
+        self.assertFalse(
+            golden_failed(results, require_bytes=True),
+            "\n".join(format_result(result) for result in results if result.status != "identical"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+import docx_factory  # noqa: E402
+from gui_worker import ConversionWorker, WorkerError, job_convert  # noqa: E402
+
+LONG_PLAY = REPO_ROOT / "test" / "comedias" / "castigo" / "Castigo_prologoycomedia.docx"
+
+
+def build_docx(path: Path, verse: str = "verso de prueba") -> str:
+    return docx_factory.build_docx(path, docx_factory.play_paragraphs(verse))
+
+
+class ConvertJobTest(unittest.TestCase):
+    def test_default_output_path_is_the_file_the_backend_wrote(self):
+        previous_cwd = os.getcwd()
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx")
+            os.chdir(tmp_dir)
+            try:
+                output = job_convert({"main_docx": main_docx}, lambda message: None)
+            finally:
+                os.chdir(previous_cwd)
+
+            self.assertTrue(Path(output.result).is_file())
+            self.assertEqual(Path(output.result).parent, Path(tmp_dir).resolve())
+            self.assertIn("verso de prueba", Path(output.result).read_text(encoding="utf-8"))
+
+
+class ConversionWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.worker = ConversionWorker(processes=1)
+        self.results = {}
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def _submit(self, name, kind, payload, **callbacks):
+        self.worker.submit(
+            kind, payload,
+            on_success=lambda result: self.results.setdefault(name, ("ok", result)),
+            on_error=lambda error: self.results.setdefault(name, ("error", error)),
+            **callbacks,
+        )
+
+    def _wait(self, until=None, timeout=60):
+        deadline = time.monotonic() + timeout
+        while self.worker.poll() and time.monotonic() < deadline:
+            if until is not None and until():
+                return
+            time.sleep(0.02)
+
+    def test_jobs_return_results_and_progress(self):
+        progress = []
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx")
+            output = str(Path(tmp_dir) / "salida.xml")
+            self._submit("validate", "validate", {"main_docx": main_docx})
+            self._submit("xml", "preview_xml", {"main_docx": main_docx})
+            self._submit("convert", "convert", {"main_docx": main_docx, "output_file": output})
+            self._submit("html", "preview_html", {"main_docx": main_docx, "preview_mode": "static"},
+                         on_progress=progress.append)
+            self._wait()
+
+            self.assertEqual(self.results["validate"], ("ok", []))
+            self.assertEqual(self.results["xml"][0], "ok")
+            self.assertIn("<l n=\"1\">verso de prueba</l>", self.results["xml"][1])
+            self.assertEqual(self.results["convert"], ("ok", output))
+            self.assertTrue(Path(output).exists())
+            self.assertEqual(progress, ["Generando la página HTML..."])
+            self.assertIn("search-index", Path(self.results["html"][1]).read_text(encoding="utf-8"))
+
+    def test_unchanged_inputs_reuse_the_session_conversion(self):
+        progress = []
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx")
+            output = str(Path(tmp_dir) / "salida.xml")
+            self._submit("xml", "preview_xml", {"main_docx": main_docx})
+            self._wait()
+            self._submit("convert", "convert", {"main_docx": main_docx, "output_file": output},
+                         on_progress=progress.append)
+            self._wait()
+
+            self.assertEqual(progress, ["Reutilizando la conversión de esta sesión..."])
+            self.assertEqual(Path(output).read_text(encoding="utf-8"), self.results["xml"][1])
+
+            # Otro modo de encabezado o un archivo modificado obligan a convertir de nuevo
+            self._submit("minimo", "preview_xml", {"main_docx": main_docx, "header_mode": "minimo"},
+                         on_progress=progress.append)
+            self._wait()
+            build_docx(Path(main_docx), verse="verso cambiado en disco")
+            self._submit("changed", "preview_xml", {"main_docx": main_docx}, on_progress=progress.append)
+            self._wait()
+
+        self.assertEqual(len(progress), 1)
+        self.assertIn("verso cambiado en disco", self.results["changed"][1])
+
+    def test_conversion_findings_reach_the_gui_once(self):
+        received = []
+        self.worker.on_conversion_findings = received.append
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx")
+            notes = Document()
+            notes.add_paragraph("9: nota a un verso que no existe")
+            notas_docx = str(Path(tmp_dir) / "notas.docx")
+            notes.save(notas_docx)
+            payload = {"main_docx": main_docx, "notas_docx": notas_docx}
+            self._submit("xml", "preview_xml", payload)
+            self._wait()
+            # Con la conversión reutilizada no se repiten los avisos
+            self._submit("again", "preview_xml", payload)
+            self._wait()
+            # Una conversión nueva sin avisos lo comunica con una lista vacía
+            self._submit("clean", "preview_xml", {"main_docx": main_docx})
+            self._wait()
+
+        self.assertEqual(self.results["again"], self.results["xml"])
+        self.assertEqual(len(received), 2)
+        self.assertEqual([(f.code, f.get("key")) for f in received[0]], [("unattached_note", 9)])
+        self.assertEqual(received[1], [])
+
+    def test_process_dying_before_starting_its_job_fails_it(self):
+        # El proceso muere durante el arranque, antes de avisar de que empieza el trabajo
+        with TemporaryDirectory() as tmp_dir:
+            self._submit("early", "preview_xml", {"main_docx": build_docx(Path(tmp_dir) / "comedia.docx")})
+            self.worker._processes[0].kill()
+            self._wait()
+
+            status, error = self.results["early"]
+            self.assertEqual(status, "error")
+            self.assertIn("terminó inesperadamente", str(error))
+            self.assertEqual(self.worker.pending, 0)
+
+            self._submit("after", "validate", {"main_docx": build_docx(Path(tmp_dir) / "c.docx")})
+            self._wait()
+        self.assertEqual(self.results["after"], ("ok", []))
+
+    def test_backend_errors_come_back_with_details(self):
+        self._submit("missing", "preview_xml", {"main_docx": "/no/existe.docx"})
+        self._wait()
+
+        status, error = self.results["missing"]
+        self.assertEqual(status, "error")
+        self.assertIsInstance(error, WorkerError)
+        self.assertIn("Traceback", error.details)
+        self.assertEqual(self.worker.pending, 0)
+
+    @unittest.skipUnless(LONG_PLAY.exists(), "falta la comedia de prueba larga")
+    def test_crashed_process_fails_its_job_and_is_replaced(self):
+        self._submit("long", "preview_xml", {"main_docx": str(LONG_PLAY)})
+        self._wait(until=lambda: any(job.started for job in self.worker._jobs.values()))
+        self.worker._processes[0].kill()
+        self._wait()
+
+        status, error = self.results["long"]
+        self.assertEqual(status, "error")
+        self.assertIn("terminó inesperadamente", str(error))
+
+        with TemporaryDirectory() as tmp_dir:
+            self._submit("after", "validate", {"main_docx": build_docx(Path(tmp_dir) / "c.docx")})
+            self._wait()
+        self.assertEqual(self.results["after"], ("ok", []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from tei_backend import IdRegistry, convert_docx_to_tei, render_findings, validate_and_convert  # noqa: E402
+from docx_factory import build_docx  # noqa: E402
+
+
+class IdRegistryTest(unittest.TestCase):
+    def test_duplicates_and_dangling_references(self):
+        ids = IdRegistry()
+        ids.register_fragment('<listWit><witness xml:id="A"/><witness xml:id="B"/></listWit>', "teiHeader")
+        ids.register("rey", "role", 3, "REY")
+        ids.refer("rey", "sp", 5, "REY")
+        ids.refer("reina", "sp", 7, "REINA")
+        ids.register("A", "role", 9, "A")
+
+        findings = ids.finish("comedia.docx")
+
+        self.assertIn("B", ids)
+        self.assertEqual([(f.code, f.get("xml_id"), f.paragraph_index) for f in findings], [
+            ("duplicate_id", "A", 9),
+            ("dangling_reference", "reina", 7),
+        ])
+        self.assertEqual(findings[0].get("first_element"), "teiHeader")
+        self.assertTrue(render_findings(findings)[0].startswith("❌ XML:ID DUPLICADO 'A' en <role> (párrafo 10)"))
+
+    def test_conversion_reports_repeated_ids_without_a_validation_pass(self):
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx", [
+                ("Comedia de prueba", "Titulo_comedia"),
+                ("Dedicatoria", "Epigr_Dedic"),
+                ("Primera dedicatoria.", "Prosa"),
+                ("Acto primero", "Acto"),
+                ("REY", "Personaje"),
+                ("verso de prueba", "Verso"),
+                ("Otra dedicatoria", "Epigr_Dedic"),
+                ("Segunda dedicatoria.", "Prosa"),
+            ])
+            with redirect_stdout(io.StringIO()) as output:
+                result = validate_and_convert(main_docx)
+
+        duplicates = [finding for finding in result.findings if finding.code == "duplicate_id"]
+        self.assertEqual([(f.get("xml_id"), f.snippet) for f in duplicates], [("dedicatoria", "Otra dedicatoria")])
+        self.assertEqual(result.tei.count('xml:id="dedicatoria"'), 2)
+        # Quien recoge los hallazgos los recibe sin que se impriman
+        self.assertNotIn("XML:ID DUPLICADO", output.getvalue())
+        self.assertIn("XML:ID DUPLICADO 'dedicatoria'", "\n".join(render_findings(duplicates)))
+
+    def test_plain_conversion_prints_repeated_ids_once(self):
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx", [
+                ("Comedia de prueba", "Titulo_comedia"),
+                ("Dedicatoria", "Epigr_Dedic"),
+                ("Primera dedicatoria.", "Prosa"),
+                ("Acto primero", "Acto"),
+                ("REY", "Personaje"),
+                ("verso de prueba", "Verso"),
+                ("Otra dedicatoria", "Epigr_Dedic"),
+                ("Segunda dedicatoria.", "Prosa"),
+            ])
+            with redirect_stdout(io.StringIO()) as output:
+                convert_docx_to_tei(main_docx, save=False)
+
+        self.assertEqual(output.getvalue().count("XML:ID DUPLICADO 'dedicatoria'"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
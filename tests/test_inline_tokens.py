@@ -0,0 +1,78 @@
+import sys
+import unittest
+from pathlib import Path
+from typing import NamedTuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import (  # noqa: E402
+    TOKEN_ITALIC_CLOSE,
+    TOKEN_ITALIC_OPEN,
+    TOKEN_NOTE,
+    TOKEN_TEXT,
+    InlineToken,
+    RunRecord,
+    extract_text_with_italics_and_annotations,
+    render_inline_tokens,
+    tokenize_text_with_annotations,
+)
+
+
+class FakeParagraph(NamedTuple):
+    runs: list
+
+
+def paragraph(*runs) -> FakeParagraph:
+    return FakeParagraph([RunRecord(text, italic) for text, italic in runs])
+
+
+class InlineTokensTest(unittest.TestCase):
+    def test_runs_become_text_and_italic_tokens(self):
+        tokens = tokenize_text_with_annotations(
+            paragraph(("con ", False), ("cur", True), ("siva", True), (" fin", False)), {}, {}, {}, "l"
+        )
+        self.assertEqual(tokens, [
+            InlineToken(TOKEN_TEXT, "con "),
+            InlineToken(TOKEN_ITALIC_OPEN),
+            InlineToken(TOKEN_TEXT, "cursiva"),
+            InlineToken(TOKEN_ITALIC_CLOSE),
+            InlineToken(TOKEN_TEXT, " fin"),
+        ])
+
+    def test_annotation_symbol_outside_italic_word(self):
+        notes = {"noche": ["Primera.", "Segunda."]}
+        counter = {}
+        para = paragraph(("de @", False), ("noche", True), (" y @noche", False))
+        tokens = tokenize_text_with_annotations(para, notes, {}, counter, "l")
+
+        self.assertEqual([token.kind for token in tokens], [
+            TOKEN_TEXT, TOKEN_ITALIC_OPEN, TOKEN_TEXT, TOKEN_NOTE, TOKEN_ITALIC_CLOSE,
+            TOKEN_TEXT, TOKEN_TEXT, TOKEN_NOTE,
+        ])
+        self.assertEqual(
+            render_inline_tokens(tokens),
+            'de <hi rend="italic">noche<note subtype="nota" xml:id="n_noche_l_1">Primera.</note></hi>'
+            ' y noche<note subtype="nota" xml:id="n_noche_l_2">Segunda.</note>',
+        )
+        self.assertEqual(counter["_occurrences_nota"], {"noche": 2})
+
+    def test_uppercase_keeps_note_content_and_escapes_after_uppercasing(self):
+        aparato = {"duque": ["duque A : Duque B"]}
+        para = paragraph(("  el %duque & ", False), ("Febo", True), ("  ", False))
+        rendered = extract_text_with_italics_and_annotations(para, {}, aparato, {}, "speaker", uppercase=True)
+
+        self.assertEqual(
+            rendered,
+            'EL DUQUE<note subtype="aparato" xml:id="a_duque_speaker_1">duque A : Duque B</note>'
+            ' &amp; <hi rend="italic">FEBO</hi>',
+        )
+
+    def test_unknown_annotation_only_drops_the_symbol(self):
+        rendered = extract_text_with_italics_and_annotations(paragraph(("sin @nota <b>", False),), {}, {}, {}, "p")
+        self.assertEqual(rendered, "sin nota &lt;b&gt;")
+
+
+if __name__ == "__main__":
+    unittest.main()
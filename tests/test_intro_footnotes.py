@@ -0,0 +1,67 @@
+import sys
+import unittest
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import (  # noqa: E402
+    collect_footnote_reference_ids,
+    extract_intro_footnotes,
+    iter_document_blocks,
+)
+
+FOOTNOTES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:footnotes xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+    '<w:footnote w:id="1"><w:p><w:r><w:t>Primera nota.</w:t></w:r></w:p></w:footnote>'
+    '<w:footnote w:id="2"><w:p><w:r><w:t xml:space="preserve">Véase </w:t></w:r>'
+    '<w:r><w:rPr><w:i/></w:rPr><w:t>La Dorotea</w:t></w:r></w:p></w:footnote>'
+    '<w:footnote w:id="3"><w:p><w:r><w:t>Nota sin llamada.</w:t></w:r></w:p></w:footnote>'
+    '</w:footnotes>'
+)
+
+
+class IntroFootnotesTest(unittest.TestCase):
+    def _build_docx(self, folder: Path) -> str:
+        doc = Document()
+        para = doc.add_paragraph("Texto del prólogo")
+        reference = para.add_run()._r
+        reference.append(reference.makeelement(
+            "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}footnoteReference",
+            {"{http://schemas.openxmlformats.org/wordprocessingml/2006/main}id": "2"},
+        ))
+        path = folder / "prologo.docx"
+        doc.save(str(path))
+        with zipfile.ZipFile(path, "a") as docx_zip:
+            docx_zip.writestr("word/footnotes.xml", FOOTNOTES_XML)
+        return str(path)
+
+    def test_streaming_reader_renders_all_notes(self):
+        with TemporaryDirectory() as tmp_dir:
+            notes = extract_intro_footnotes(self._build_docx(Path(tmp_dir)))
+
+        self.assertEqual(notes, {
+            "1": "Primera nota.",
+            "2": 'Véase <hi rend="italic">La Dorotea</hi>',
+            "3": "Nota sin llamada.",
+        })
+
+    def test_only_referenced_notes_are_rendered(self):
+        with TemporaryDirectory() as tmp_dir:
+            docx_path = self._build_docx(Path(tmp_dir))
+            referenced = collect_footnote_reference_ids(iter_document_blocks(Document(docx_path)))
+            notes = extract_intro_footnotes(docx_path, referenced)
+
+        self.assertEqual(referenced, frozenset({"2"}))
+        self.assertEqual(list(notes), ["2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
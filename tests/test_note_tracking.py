@@ -0,0 +1,95 @@
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from tei_backend import NoteUsage, convert_docx_to_tei, render_findings, validate_and_convert  # noqa: E402
+from docx_factory import build_docx  # noqa: E402
+
+
+class NoteTrackingTest(unittest.TestCase):
+    def test_tracked_notes_are_a_copy(self):
+        source = {1: ["nota"], "palabra": ["a", "b"]}
+        usage = NoteUsage()
+        notes = usage.track(source, "nota", "notas.docx")
+        notes.attach_all(1)
+        notes.attach("palabra", 0)
+        notes["extra"] = ["c"]
+
+        findings = usage.finish()
+
+        self.assertNotIn("extra", source)
+        self.assertEqual([(f.get("key"), f.get("entry"), f.get("reason")) for f in findings], [
+            ("palabra", 2, "surplus"),
+            ("extra", 1, "unmarked"),
+        ])
+
+    def test_conversion_reports_unattached_and_over_requested_notes(self):
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx", [
+                ("Comedia de prueba", "Titulo_comedia"),
+                ("Acto primero", "Acto"),
+                ("REY", "Personaje"),
+                ("verso con @palabra", "Verso"),
+                ("otra @palabra aquí", "Verso"),
+                ("y @suelta sin nota", "Verso"),
+            ])
+            notas_docx = build_docx(Path(tmp_dir) / "notas.docx", [
+                ("1: nota al verso uno", "Normal"),
+                ("9: nota a un verso que no existe", "Normal"),
+                ("@palabra: primera nota", "Normal"),
+                ("@olvidada: palabra nunca marcada", "Normal"),
+            ])
+            with redirect_stdout(io.StringIO()) as output:
+                result = validate_and_convert(main_docx, notas_docx=notas_docx)
+
+        unattached = [f for f in result.findings if f.code == "unattached_note"]
+        self.assertEqual([(f.get("key"), f.get("reason"), f.severity) for f in unattached], [
+            (9, "verse", "warning"),
+            ("olvidada", "unmarked", "warning"),
+        ])
+        self.assertEqual(unattached[0].get("last_verse"), 3)
+        self.assertEqual(unattached[0].file, notas_docx)
+
+        over_requested = [f for f in result.findings if f.code == "over_requested_note"]
+        self.assertEqual([(f.get("key"), f.get("entry"), f.get("entries"), f.snippet) for f in over_requested], [
+            ("palabra", 2, 1, "otra @palabra aquí"),
+            ("suelta", 1, 0, "y @suelta sin nota"),
+        ])
+        self.assertIn('xml:id="nota_1_1"', result.tei)
+        self.assertIn("primera nota", result.tei)
+
+        messages = render_findings(unattached)
+        self.assertTrue(messages[0].startswith("⚠️ NOTAS SIN ADJUNTAR (2) en 'notas.docx'"))
+        self.assertIn("(el último es el 3)", messages[1])
+        # Quien recoge los hallazgos los recibe sin que se impriman
+        self.assertNotIn("NOTAS SIN ADJUNTAR", output.getvalue())
+
+    def test_plain_conversion_returns_findings_to_collecting_callers(self):
+        with TemporaryDirectory() as tmp_dir:
+            main_docx = build_docx(Path(tmp_dir) / "comedia.docx", [
+                ("Comedia de prueba", "Titulo_comedia"),
+                ("Acto primero", "Acto"),
+                ("REY", "Personaje"),
+                ("verso único", "Verso"),
+            ])
+            notas_docx = build_docx(Path(tmp_dir) / "notas.docx", [("4: nota perdida", "Normal")])
+            findings = []
+            with redirect_stdout(io.StringIO()) as collected:
+                tei = convert_docx_to_tei(main_docx, notas_docx=notas_docx, save=False, findings=findings)
+            with redirect_stdout(io.StringIO()) as printed:
+                self.assertEqual(convert_docx_to_tei(main_docx, notas_docx=notas_docx, save=False), tei)
+
+        self.assertEqual([(f.code, f.get("key"), f.severity) for f in findings], [("unattached_note", 4, "warning")])
+        self.assertNotIn("NOTAS SIN ADJUNTAR", collected.getvalue())
+        self.assertEqual(printed.getvalue().count("NOTAS SIN ADJUNTAR (1)"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
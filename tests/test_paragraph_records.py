@@ -0,0 +1,78 @@
+import sys
+import unittest
+from pathlib import Path
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import (  # noqa: E402
+    ParagraphRecord,
+    build_paragraph_snapshot,
+    extract_text_with_italics_and_annotations,
+    get_paragraph_style_name,
+    is_parse_empty_paragraph,
+)
+
+
+class ParagraphRecordsTest(unittest.TestCase):
+    def _build_document(self) -> Document:
+        doc = Document()
+        doc.styles.add_style("Verso", WD_STYLE_TYPE.PARAGRAPH)
+
+        para = doc.add_paragraph(style="Verso")
+        para.add_run("con ")
+        para.add_run("cursiva").italic = True
+        para.add_run(" y @nota")
+
+        doc.add_paragraph("   ")
+        doc.add_paragraph("texto\tcon tabulador")
+
+        para = doc.add_paragraph(style="Verso")
+        para.add_run("otra ")
+        para.add_run("más").italic = True
+        return doc
+
+    def test_records_match_python_docx_paragraphs(self):
+        doc = self._build_document()
+        paragraphs = doc.paragraphs
+        records = build_paragraph_snapshot(paragraphs).records
+
+        self.assertEqual(len(records), len(paragraphs))
+        for record, para in zip(records, paragraphs):
+            self.assertIsInstance(record, ParagraphRecord)
+            self.assertEqual(record.text, para.text)
+            self.assertEqual(get_paragraph_style_name(record), get_paragraph_style_name(para))
+            self.assertEqual(is_parse_empty_paragraph(record), is_parse_empty_paragraph(para))
+            self.assertEqual(
+                [(run.text, bool(run.italic)) for run in record.runs],
+                [(run.text, bool(run.italic)) for run in para.runs],
+            )
+
+    def test_records_render_like_python_docx_paragraphs(self):
+        doc = self._build_document()
+        paragraphs = doc.paragraphs
+        records = build_paragraph_snapshot(paragraphs).records
+        notes = {"nota": ["Contenido"]}
+
+        for record, para in zip(records, paragraphs):
+            self.assertEqual(
+                extract_text_with_italics_and_annotations(record, notes, {}, {}, "l"),
+                extract_text_with_italics_and_annotations(para, notes, {}, {}, "l"),
+            )
+
+    def test_snapshot_shares_one_text_buffer(self):
+        doc = self._build_document()
+        snapshot = build_paragraph_snapshot(doc.paragraphs)
+
+        self.assertEqual(snapshot.buffer, "con cursiva y @nota   texto\tcon tabuladorotra más")
+        self.assertEqual(snapshot.records[0].italic_mask, 0b010)
+        self.assertEqual(snapshot.records[3].italic_mask, 0b10)
+        self.assertFalse(hasattr(snapshot.records[0], "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
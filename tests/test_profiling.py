@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+import profiling  # noqa: E402
+from docx_factory import build_docx, play_paragraphs  # noqa: E402
+from tei_backend import collect_validation_findings, convert_docx_to_tei  # noqa: E402
+
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.tmp = Path(self.tmp_dir.name)
+        self.main_docx = build_docx(
+            self.tmp / "comedia.docx", play_paragraphs(*(f"verso de prueba {i}" for i in range(50)))
+        )
+        self.profile_dir = self.tmp / "perfiles"
+        del profiling.written_profiles[:]
+
+    def tearDown(self):
+        profiling.set_profile_directory(None)
+        del profiling.written_profiles[:]
+        self.tmp_dir.cleanup()
+
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ, {profiling.PROFILE_ENV_VAR: ""}):
+            convert_docx_to_tei(self.main_docx, save=False)
+        self.assertFalse(self.profile_dir.exists())
+        self.assertEqual(profiling.written_profiles, [])
+
+    def test_conversion_writes_profile_stacks_and_metadata(self):
+        profiling.set_profile_directory(str(self.profile_dir))
+        convert_docx_to_tei(self.main_docx, save=False)
+
+        prof_path, collapsed_path, meta_path = profiling.written_profiles
+        self.assertTrue(Path(prof_path).name.startswith("conversion_"))
+        self.assertEqual(Path(prof_path).suffix, ".prof")
+        self.assertTrue(Path(prof_path).stat().st_size > 0)
+
+        meta = json.loads(Path(meta_path).read_text(encoding="utf-8"))
+        expected_hash = hashlib.sha256(Path(self.main_docx).read_bytes()).hexdigest()
+        self.assertEqual(meta["inputs"]["main_docx"]["sha256"], expected_hash)
+        self.assertNotIn("notas_docx", meta["inputs"])
+        self.assertEqual(
+            [stage["name"] for stage in meta["stages"]],
+            ["inicio", "cabecera", "lectura_docx", "front", "notas", "body", "cierre"],
+        )
+        for previous, stage in zip(meta["stages"], meta["stages"][1:]):
+            self.assertEqual(previous["end"], stage["start"])
+
+        for line in Path(collapsed_path).read_text(encoding="utf-8").splitlines():
+            stack, count = line.rsplit(" ", 1)
+            frames = stack.split(";")
+            self.assertEqual(frames[0], "conversion")
+            self.assertIn(frames[1], {stage["name"] for stage in meta["stages"]})
+            self.assertTrue(frames[2].startswith("convert_docx_to_tei "))
+            self.assertGreater(int(count), 0)
+
+    def test_environment_variable_enables_validation_profile(self):
+        with mock.patch.dict(os.environ, {profiling.PROFILE_ENV_VAR: str(self.profile_dir)}):
+            findings = collect_validation_findings(self.main_docx)
+        self.assertEqual(findings, [])
+        self.assertEqual(len(profiling.written_profiles), 3)
+        self.assertTrue(all(Path(path).name.startswith("validacion_") for path in profiling.written_profiles))
+
+    def test_runs_in_the_same_second_do_not_overwrite_each_other(self):
+        profiling.set_profile_directory(str(self.profile_dir))
+        with mock.patch.object(profiling.time, "time", return_value=1_700_000_000.0):
+            convert_docx_to_tei(self.main_docx, save=False)
+            convert_docx_to_tei(self.main_docx, save=False)
+
+        self.assertEqual(len(set(profiling.written_profiles)), 6)
+        self.assertEqual(len(list(self.profile_dir.iterdir())), 6)
+        self.assertTrue(all(f"_{os.getpid()}-" in Path(path).name for path in profiling.written_profiles))
+
+    def test_mark_stage_outside_a_session_is_a_no_op(self):
+        profiling.mark_stage("body")
+        self.assertEqual(profiling.written_profiles, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
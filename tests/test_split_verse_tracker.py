@@ -0,0 +1,120 @@
+import sys
+import unittest
+import zipfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import (  # noqa: E402
+    SPLIT_MISSING_FINAL,
+    SPLIT_MISSING_INITIAL_FOR_MEDIO,
+    analyze_split_verses,
+    build_verse_map,
+    convert_docx_to_tei,
+    count_verses_in_document,
+    load_paragraph_records,
+    render_findings,
+    validate_split_verses,
+    validate_split_verses_impact_on_numbering,
+)
+
+
+class SplitVerseTrackerTest(unittest.TestCase):
+    BODY = [
+        ("Personaje", "ALGUIEN"),
+        ("Verso", "uno"),
+        ("Partido_inicial", "dos sin final"),
+        ("Verso", "tres"),
+        ("Partido_medio", "medio huérfano"),
+        ("Partido_final", "cierre tras medio"),
+        ("Partido_inicial", "cuatro a"),
+        ("Partido_medio", "cuatro b"),
+        ("Partido_final", "cuatro c"),
+        ("Laguna", "[...]"),
+        ("Verso", "cinco"),
+    ]
+
+    def _build_test_docx(self, output_path: Path) -> None:
+        doc = Document()
+        styles = doc.styles
+        for style_name in {"Titulo_comedia", "Acto"} | {style for style, _ in self.BODY}:
+            try:
+                styles[style_name]
+            except KeyError:
+                styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+
+        doc.add_paragraph("Comedia de prueba").style = "Titulo_comedia"
+        doc.add_paragraph("Acto primero").style = "Acto"
+        for style_name, text in self.BODY:
+            doc.add_paragraph(text).style = style_name
+        doc.save(str(output_path))
+
+        empty_footnotes = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:footnotes xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'
+        )
+        with zipfile.ZipFile(output_path, "a") as docx_zip:
+            docx_zip.writestr("word/footnotes.xml", empty_footnotes)
+
+    def test_verse_map_matches_legacy_tuples_and_positions(self):
+        with TemporaryDirectory() as tmpdir:
+            docx_path = Path(tmpdir) / "partidos.docx"
+            self._build_test_docx(docx_path)
+
+            verses = count_verses_in_document(str(docx_path))
+            verse_map = build_verse_map(load_paragraph_records(str(docx_path)))
+
+        self.assertEqual(
+            [(style, number) for _, number, style, _ in verses],
+            [
+                ("Verso", 1), ("Partido_inicial", 2), ("Verso", 3),
+                ("Partido_medio", 3), ("Partido_final", 3),
+                ("Partido_inicial", 4), ("Partido_medio", 4), ("Partido_final", 4),
+                ("Laguna", 5), ("Verso", 5),
+            ],
+        )
+        self.assertEqual(verse_map.total_verses, 5)
+        laguna = next(entry for entry in verse_map.entries if entry.style == "Laguna")
+        self.assertEqual(verse_map.last_verse_before(laguna.para_index), 4)
+        self.assertEqual(verse_map.last_verse_before(0), 0)
+
+    def test_single_pass_reports_issues_in_document_order(self):
+        with TemporaryDirectory() as tmpdir:
+            docx_path = Path(tmpdir) / "partidos.docx"
+            self._build_test_docx(docx_path)
+
+            analysis = analyze_split_verses(build_verse_map(load_paragraph_records(str(docx_path))))
+            split_warnings = render_findings(validate_split_verses(str(docx_path), analysis))
+            impact_warnings = render_findings(validate_split_verses_impact_on_numbering(str(docx_path)))
+
+        self.assertEqual(
+            [(issue.verse_number, issue.problem) for issue in analysis.issues],
+            [(2, SPLIT_MISSING_FINAL), (3, SPLIT_MISSING_INITIAL_FOR_MEDIO)],
+        )
+        self.assertEqual(analysis.incomplete_count, 1)
+        self.assertEqual(len(split_warnings), 1)
+        self.assertIn("❌ (2) VERSOS PARTIDOS INCOMPLETOS", split_warnings[0])
+        self.assertEqual(len(impact_warnings), 1)
+        self.assertIn("Se esperan 4 pero se numerarán 5", impact_warnings[0])
+
+    def test_conversion_suffixes_follow_tracker_anchor(self):
+        with TemporaryDirectory() as tmpdir:
+            docx_path = Path(tmpdir) / "partidos.docx"
+            self._build_test_docx(docx_path)
+
+            tei = convert_docx_to_tei(main_docx=str(docx_path), save=False)
+
+        self.assertIn('<l part="I" n="4a">cuatro a</l>', tei)
+        self.assertIn('<l part="M" n="4b">cuatro b</l>', tei)
+        self.assertIn('<l part="F" n="4c">cuatro c</l>', tei)
+        self.assertIn('<l n="5">cinco</l>', tei)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from preview_html import (  # noqa: E402
+    build_preview_html,
+    build_search_index,
+    build_static_html,
+    get_tei_html_transform,
+    parse_tei,
+    publish_static_site,
+    render_tei_static,
+    split_tei_fragments,
+    write_split_preview,
+)
+
+TEI = """<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0">
+<teiHeader><fileDesc><titleStmt><title>El castigo sin venganza</title></titleStmt></fileDesc></teiHeader>
+  <text>
+    <front xml:id="front">
+      <div type="Introducción" xml:id="prologo">
+        <head type="divTitle" subtype="MenuLevel_1">Prólogo</head>
+        <div type="subsection" n="1">
+          <head type="divTitle" subtype="MenuLevel_2">Estudio<note type="intro" n="1">Nota en un título.</note></head>
+        </div>
+        <div type="subsection" n="2">
+          <head type="divTitle" subtype="MenuLevel_2">Acto primero</head>
+        </div>
+      </div>
+    </front>
+    <body>
+      <div type="Texto" subtype="TEXTO" xml:id="comedia">
+        <head type="mainTitle" xml:id="titulo">EL CASTIGO SIN VENGANZA</head>
+        <div type="castList" xml:id="personajes">
+          <head type="castListTitle">Personas</head>
+          <castList><castItem><role xml:id="duque">DUQUE</role></castItem></castList>
+        </div>
+        <div type="subsection" subtype="ACTO" n="1" xml:id="acto1">
+          <head type="acto">ACTO PRIMERO</head>
+          <sp who="#duque"><speaker>DUQUE</speaker>
+            <l n="1">Linda noche<note subtype="aparato" xml:id="a_1">noche <hi rend="italic">A</hi></note></l>
+            <l n="2" part="I">¿Qué</l>
+          </sp>
+          <sp who="#duque"><speaker>DUQUE</speaker>
+            <l part="F">decís, Aurora?</l>
+          </sp>
+          <milestone unit="stanza" type="redondillas"/>
+        </div>
+        <div type="subsection" subtype="ACTO" n="2" xml:id="acto2">
+          <head type="acto">ACTO SEGUNDO</head>
+          <sp who="#duque"><speaker>DUQUE</speaker><l n="3">Aurora</l></sp>
+        </div>
+        <p>FIN</p>
+      </div>
+    </body>
+  </text>
+</TEI>
+"""
+
+
+class StaticHtmlTest(unittest.TestCase):
+    def test_navigation_is_precomputed_from_tei(self):
+        rendering = render_tei_static(TEI)
+
+        self.assertEqual(rendering.title, "El castigo sin venganza")
+        self.assertEqual(
+            [(item.id, item.text, item.level) for item in rendering.navigation],
+            [
+                ("metadatos", "Metadatos", 1),
+                ("prologo", "Prólogo", 1),
+                ("prologo-sub-1", "Estudio", 2),
+                ("prologo-sub-2", "Acto primero", 3),
+                ("titulo", "EL CASTIGO SIN VENGANZA", 1),
+                ("personajes", "Personas", 2),
+                ("acto1", "ACTO PRIMERO", 2),
+                ("acto2", "ACTO SEGUNDO", 2),
+            ],
+        )
+        self.assertIn('<tei-div type="subsection" n="1" id="prologo-sub-1"', rendering.body_html)
+        self.assertIn('<tei-teiheader id="metadatos"', rendering.body_html)
+
+    def test_elements_follow_ceteicean_conventions(self):
+        page = build_static_html(TEI)
+
+        self.assertIn('<tei-l n="1" id="v1" data-origname="l">Linda noche', page)
+        self.assertIn('<tei-role id="duque" xml:id="duque" data-origname="role">', page)
+        self.assertIn('data-origname="milestone" data-empty=""></tei-milestone>', page)
+        self.assertIn('<tei-head type="acto" data-origname="head" data-level="2">', page)
+        self.assertIn(
+            '<sup class="sup-aparato"><svg width="0.9em" height="0.9em" viewBox="0 0 100 100">', page
+        )
+        self.assertIn(
+            '<cetei-original hidden="" data-original="">noche '
+            '<tei-hi rend="italic" data-origname="hi">A</tei-hi></cetei-original>',
+            page,
+        )
+        self.assertIn('<li class="nav-item nav-level-2"><a href="#acto1">ACTO PRIMERO</a></li>', page)
+        self.assertNotIn("new CETEI()", page)
+        self.assertIs(get_tei_html_transform(), get_tei_html_transform())
+
+    def test_search_index_uses_matching_normalization(self):
+        tei_root = parse_tei(TEI)
+        index = build_search_index(tei_root)
+        docs = [tuple(doc) for doc in index["docs"]]
+        terms = dict(index["terms"])
+
+        self.assertEqual(docs[:4], [
+            ("nota-0", "nota", "Nota del prólogo"),
+            ("sp1", "personaje", "DUQUE"),
+            ("v1", "verso", "v. 1"),
+            ("a_1", "nota", "Aparato"),
+        ])
+        self.assertEqual([token for token, _ in index["terms"]], sorted(terms))
+        # Partes de un verso partido: se indexan con el verso numerado
+        self.assertEqual(terms["aurora"], [docs.index(("v2", "verso", "v. 2")), docs.index(("v3", "verso", "v. 3"))])
+        self.assertEqual(terms["que"], [docs.index(("v2", "verso", "v. 2"))])
+        self.assertEqual(terms["duque"], [1, 5, 6])
+        # Las notas no cuentan como texto del verso
+        self.assertEqual(terms["noche"], [2, 3])
+        self.assertEqual(tei_root.xpath("//*[@id='v2']")[0].get("part"), "I")
+
+    def test_preview_pages_embed_the_index(self):
+        dynamic = build_preview_html(TEI)
+        static = build_static_html(TEI)
+
+        for page in (dynamic, static):
+            self.assertIn('<script type="application/json" id="search-index">{"docs":[["nota-0",', page)
+            self.assertIn('<input id="search-input" type="search"', page)
+        self.assertIn('id=\\"v1\\"', dynamic)
+
+    def test_split_fragments_keep_document_order(self):
+        fragments = split_tei_fragments(parse_tei(TEI))
+        tei_ns = "{http://www.tei-c.org/ns/1.0}"
+
+        self.assertEqual([fragment.name for fragment in fragments],
+                         ["metadatos", "prologo", "comedia", "acto1", "acto2"])
+        comedia, acto2 = fragments[2].root, fragments[4].root
+        # La comedia conserva su xml:id; las copias del contenedor en cada acto no
+        self.assertEqual(len(comedia.xpath("//*[@xml:id='comedia']")), 1)
+        self.assertEqual(acto2.xpath("//*[@xml:id='comedia']"), [])
+        self.assertEqual([child.tag for child in acto2.find(f"{tei_ns}text/{tei_ns}body/{tei_ns}div")],
+                         [f"{tei_ns}div", f"{tei_ns}p"])
+        self.assertIsNone(comedia.find(f".//{tei_ns}l"))
+
+    def test_split_preview_writes_loadable_fragments(self):
+        with TemporaryDirectory() as tmp_dir:
+            written = write_split_preview(TEI, Path(tmp_dir) / "comedia.html")
+            page = Path(written[0]).read_text(encoding="utf-8")
+            acto2 = (Path(tmp_dir) / "comedia_fragmentos" / "acto2.js").read_text(encoding="utf-8")
+
+        self.assertEqual([Path(path).name for path in written],
+                         ["comedia.html", "metadatos.js", "prologo.js", "comedia.js", "acto1.js", "acto2.js"])
+        self.assertIn('<div id="tei" data-fragments="comedia_fragmentos/">', page)
+        self.assertIn('<a href="#acto2" data-fragment="acto2">ACTO SEGUNDO</a>', page)
+        self.assertIn('<a href="#prologo-sub-1" data-fragment="prologo">Estudio</a>', page)
+        self.assertIn('"fragments":[["metadatos",0],["prologo",0],["comedia",1],["acto1",1],["acto2",6]]', page)
+        self.assertNotIn("Linda noche", page)
+        self.assertTrue(acto2.startswith('fenixFragment("acto2", "<TEI xmlns='))
+        self.assertIn("<p>FIN</p>", acto2)
+
+    def test_publish_static_site_links_shared_resources(self):
+        with TemporaryDirectory() as tmp_dir:
+            written = publish_static_site([("castigo", TEI)], tmp_dir)
+            page = (Path(tmp_dir) / "castigo.html").read_text(encoding="utf-8")
+            index = (Path(tmp_dir) / "index.html").read_text(encoding="utf-8")
+            resources = sorted(path.name for path in (Path(tmp_dir) / "recursos").iterdir())
+
+        self.assertEqual([Path(path).name for path in written], ["castigo.html", "index.html"])
+        self.assertEqual(resources, ["CETEIcean.js", "estilos.css", "preview_search.js", "preview_static.js"])
+        self.assertIn('<link rel="stylesheet" href="recursos/estilos.css">', page)
+        self.assertIn('<script src="recursos/preview_static.js"></script>', page)
+        self.assertIn('<a href="castigo.html">El castigo sin venganza</a>', index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import lxml.etree as etree
+from docx import Document
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from synthetic import SyntheticSpec, generate_bundle  # noqa: E402
+from tei_backend import collect_validation_findings, convert_docx_to_tei  # noqa: E402
+
+TEI = {"tei": "http://www.tei-c.org/ns/1.0"}
+
+
+class SyntheticBundleTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = TemporaryDirectory()
+        cls.spec = SyntheticSpec(verses=240, acts=2, speakers=5, front_paragraphs=12, front_tables=1, footnotes=4)
+        cls.bundle = generate_bundle(cls.tmp_dir.name, cls.spec)
+        tei_content = convert_docx_to_tei(
+            main_docx=cls.bundle.main_docx,
+            notas_docx=cls.bundle.notas_docx,
+            aparato_docx=cls.bundle.aparato_docx,
+            save=False,
+        )
+        cls.tei = etree.fromstring(tei_content.encode("utf-8"), etree.XMLParser(collect_ids=False))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_requested_structure_is_converted(self):
+        numbers = {line.get("n").rstrip("abc") for line in self.tei.iterfind(".//tei:body//tei:l[@n]", TEI)}
+        self.assertEqual(numbers, {str(n) for n in range(1, self.spec.verses + 1)})
+        self.assertEqual(len(self.tei.findall(".//tei:body//tei:div[@subtype='ACTO']", TEI)), self.spec.acts)
+        self.assertEqual(len(self.tei.findall(".//tei:front//tei:table", TEI)), self.spec.front_tables)
+        self.assertEqual(len(self.tei.findall(".//tei:front//tei:note", TEI)), self.spec.footnotes)
+        self.assertTrue(self.tei.findall(".//tei:body//tei:l[@part='M']", TEI))
+        self.assertEqual(len(self.tei.findall(".//tei:body//tei:gap", TEI)), self.spec.lagunas)
+
+    def test_every_note_and_apparatus_entry_is_used(self):
+        for docx_path, subtype in ((self.bundle.notas_docx, "nota"), (self.bundle.aparato_docx, "aparato")):
+            entries = len([p for p in Document(docx_path).paragraphs if p.text.strip()])
+            used = self.tei.findall(f".//tei:note[@subtype='{subtype}']", TEI)
+            self.assertEqual(len(used), entries, subtype)
+
+    def test_generated_bundle_has_no_validation_errors(self):
+        findings = collect_validation_findings(self.bundle.main_docx, self.bundle.aparato_docx, self.bundle.notas_docx)
+        self.assertEqual([f for f in findings if f.severity == "error"], [])
+
+    def test_generation_is_deterministic(self):
+        with TemporaryDirectory() as other:
+            again = generate_bundle(other, self.spec)
+            for first, second in zip(self.bundle, again):
+                if first:
+                    self.assertEqual(
+                        [para.text for para in Document(first).paragraphs],
+                        [para.text for para in Document(second).paragraphs],
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
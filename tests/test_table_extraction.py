@@ -0,0 +1,90 @@
+import sys
+import unittest
+from pathlib import Path
+
+from docx import Document
+from lxml import etree
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import (  # noqa: E402
+    extract_docx_table,
+    extract_text_with_italics,
+    process_table_to_tei,
+    render_simple_wml_table,
+)
+
+
+class TableExtractionTest(unittest.TestCase):
+    def _build_merged_table(self):
+        doc = Document()
+        table = doc.add_table(rows=3, cols=3)
+        headers = ["^Acto", "^Estrofa", "^Versos"]
+        for cell, text in zip(table.rows[0].cells, headers):
+            cell.text = text
+        table.cell(1, 0).text = "Primero"
+        table.cell(1, 1).text = "redondillas"
+        table.cell(1, 2).text = "1-40"
+        table.cell(2, 1).text = "romance"
+        table.cell(2, 2).text = "41-120"
+        table.cell(1, 0).merge(table.cell(2, 0))
+        return table
+
+    def test_single_pass_matches_python_docx_layout(self):
+        table = self._build_merged_table()
+        record = extract_docx_table(table, extract_text_with_italics)
+
+        expected_contents = [
+            [[extract_text_with_italics(p) for p in cell.paragraphs if p.text.strip()] for cell in row.cells]
+            for row in table.rows
+        ]
+        self.assertEqual([row.contents for row in record.rows], expected_contents)
+        self.assertEqual(record.column_count, 3)
+        self.assertEqual([row.marked_header for row in record.rows], [True, False, False])
+        self.assertEqual(record.rows[0].texts, ["Acto", "Estrofa", "Versos"])
+
+        origin = record.rows[1].cells[0]
+        continuation = record.rows[2].cells[0]
+        self.assertEqual(origin.row_span, 2)
+        self.assertTrue(continuation.continues_above)
+        self.assertIs(continuation.origin, origin)
+        self.assertEqual(record.rows[2].texts[0], "Primero")
+
+    def test_grid_span_is_repeated_like_row_cells(self):
+        doc = Document()
+        table = doc.add_table(rows=2, cols=3)
+        table.cell(0, 0).merge(table.cell(0, 2)).text = "Sinopsis"
+        for cell, text in zip(table.rows[1].cells, ["a", "b", "c"]):
+            cell.text = text
+
+        record = extract_docx_table(table, extract_text_with_italics)
+        self.assertEqual(len(record.rows[0].cells), 1)
+        self.assertEqual(record.rows[0].cells[0].grid_span, 3)
+        self.assertEqual(record.rows[0].contents, [["Sinopsis"]] * 3)
+        self.assertEqual(record.rows[1].cells[2].grid_column, 2)
+
+        tei = process_table_to_tei(table)
+        self.assertEqual(tei.count('<cell role="data">'), 6)
+
+    def test_footnote_table_keeps_one_entry_per_wml_cell(self):
+        ns = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+        table = etree.fromstring(
+            '<w:tbl xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            '<w:tblGrid><w:gridCol/><w:gridCol/></w:tblGrid>'
+            '<w:tr><w:tc><w:tcPr><w:gridSpan w:val="2"/></w:tcPr>'
+            '<w:p><w:r><w:t>^Testimonios</w:t></w:r></w:p></w:tc></w:tr>'
+            '<w:tr><w:tc><w:p><w:r><w:rPr><w:i/></w:rPr><w:t>A</w:t></w:r></w:p></w:tc>'
+            '<w:tc><w:p><w:r><w:t>1625</w:t></w:r></w:p></w:tc></w:tr>'
+            '</w:tbl>'
+        )
+        self.assertEqual(
+            render_simple_wml_table(table, ns),
+            '<table><row role="label"><cell role="label">Testimonios</cell></row>'
+            '<row><cell><hi rend="italic">A</hi></cell><cell>1625</cell></row></table>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import shutil
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import (  # noqa: E402
+    load_metadata_record,
+    parse_metadata_docx,
+    render_volume_source_desc,
+)
+
+
+def build_metadata_docx(path: Path, title: str) -> None:
+    doc = Document()
+    main_rows = [("Título comedia", title), ("Autor", "Lope de Vega"), ("Editor", "Ana Pérez"),
+                 ("Responsable/s revisión", "Uno, Dos")]
+    source_rows = [("Título comedia", title), ("Título volumen", "Comedias de Lope"), ("Parte", "IX"),
+                   ("Coordinadores volumen", "Tres"), ("Lugar publicación", "Lérida"),
+                   ("Publicado por", "Milenio"), ("Fecha publicación", "2007"), ("Volumen", "2")]
+    for rows in (main_rows, source_rows, [("SIGLA TESTIMONIO", "DESCRIPCIÓN"), ("A", "Parte IX")]):
+        table = doc.add_table(rows=len(rows), cols=2)
+        for row, (key, value) in zip(table.rows, rows):
+            row.cells[0].text = key
+            row.cells[1].text = value
+    doc.save(str(path))
+
+
+class TeiHeaderTest(unittest.TestCase):
+    def test_header_modes_use_their_templates(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "metadatos.docx"
+            build_metadata_docx(path, "El castigo sin venganza")
+            prolope = parse_metadata_docx(str(path), "prolope")
+            minimo = parse_metadata_docx(str(path), "minimo")
+
+        self.assertIn("<title>Biblioteca Digital PROLOPE</title>", prolope)
+        self.assertIn('<title level="a">Parte IX</title>', prolope)
+        self.assertIn("<resp>Coordinación del volumen a cargo de</resp>", prolope)
+        self.assertNotIn("seriesStmt", minimo)
+        self.assertNotIn("Parte IX</title>", minimo)
+        self.assertIn("          <author>Lope de Vega</author>", minimo)
+        self.assertIn('<witness xml:id="A">', minimo)
+        self.assertTrue(minimo.endswith("</teiHeader>"))
+
+    def test_identical_files_and_shared_volume_are_reused(self):
+        with TemporaryDirectory() as tmp_dir:
+            first = Path(tmp_dir) / "uno" / "metadatos.docx"
+            copy = Path(tmp_dir) / "copia" / "metadatos.docx"
+            other = Path(tmp_dir) / "otra" / "metadatos.docx"
+            for path in (first, copy, other):
+                path.parent.mkdir()
+            build_metadata_docx(first, "Los Prados de León")
+            shutil.copyfile(first, copy)
+            build_metadata_docx(other, "El mejor mozo de España")
+
+            self.assertIs(load_metadata_record(str(copy)), load_metadata_record(str(first)))
+
+            parse_metadata_docx(str(first))
+            hits_before = render_volume_source_desc.cache_info().hits
+            header = parse_metadata_docx(str(other))
+
+        self.assertEqual(render_volume_source_desc.cache_info().hits, hits_before + 1)
+        self.assertIn('<title type="main">El mejor mozo de España</title>', header)
+        self.assertIn('<biblScope unit="volume" n="2">vol. 2</biblScope>', header)
+
+
+if __name__ == "__main__":
+    unittest.main()
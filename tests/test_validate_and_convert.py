@@ -0,0 +1,64 @@
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+from docx_factory import build_docx, play_paragraphs  # noqa: E402
+from tei_backend import collect_validation_findings, convert_docx_to_tei, validate_and_convert  # noqa: E402
+
+
+def build_notes(path: Path) -> None:
+    doc = Document()
+    doc.add_paragraph("@verso: nota al verso.")
+    doc.save(str(path))
+
+
+class ValidateAndConvertTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.notas = Path(self.tmp_dir.name) / "notas.docx"
+        build_notes(self.notas)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _main(self, with_invalid_style: bool) -> str:
+        path = Path(self.tmp_dir.name) / ("invalida.docx" if with_invalid_style else "valida.docx")
+        paragraphs = play_paragraphs("primer @verso", "segundo verso")
+        if with_invalid_style:
+            paragraphs.append(("texto con estilo desconocido", "Estilo_raro"))
+        return build_docx(path, paragraphs)
+
+    def test_fused_result_matches_separate_calls(self):
+        main_docx = self._main(with_invalid_style=True)
+        result = validate_and_convert(main_docx, notas_docx=str(self.notas))
+
+        self.assertEqual(result.findings, collect_validation_findings(main_docx, None, str(self.notas)))
+        self.assertEqual(result.tei, convert_docx_to_tei(main_docx, notas_docx=str(self.notas), save=False))
+        self.assertIn("nota al verso.", result.tei)
+        self.assertEqual([finding.code for finding in result.blocking], ["invalid_style"])
+
+    def test_fail_fast_skips_conversion_only_on_errors(self):
+        blocked = validate_and_convert(self._main(with_invalid_style=True), fail_fast=True)
+        self.assertIsNone(blocked.tei)
+        self.assertTrue(blocked.blocking)
+
+        clean = validate_and_convert(self._main(with_invalid_style=False), fail_fast=True)
+        self.assertEqual(clean.blocking, [])
+        self.assertIn("segundo verso", clean.tei)
+
+    def test_missing_main_document_returns_findings_only(self):
+        result = validate_and_convert(str(Path(self.tmp_dir.name) / "no_existe.docx"))
+        self.assertIsNone(result.tei)
+        self.assertEqual(result.findings[0].severity, "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import csv
+import json
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import (  # noqa: E402
+    collect_validation_findings,
+    count_findings_by_severity,
+    export_findings_csv,
+    export_findings_json,
+    group_findings,
+    render_findings,
+    validate_documents,
+)
+
+
+class ValidationFindingsTest(unittest.TestCase):
+    def _build_bundle(self, folder: Path) -> tuple[str, str]:
+        doc = Document()
+        for style_name in ["Titulo_comedia", "Acto", "Personaje", "Verso", "Laguna"]:
+            try:
+                doc.styles[style_name]
+            except KeyError:
+                doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+
+        doc.add_paragraph("Comedia de prueba").style = "Titulo_comedia"
+        doc.add_paragraph("Acto primero").style = "Acto"
+        doc.add_paragraph("ALGUIEN").style = "Personaje"
+        doc.add_paragraph("primer verso").style = "Verso"
+        for idx in range(7):
+            doc.add_paragraph(f"línea sin estilo {idx}")
+        doc.add_paragraph("[...]").style = "Laguna"
+        main_path = folder / "comedia.docx"
+        doc.save(str(main_path))
+
+        notes = Document()
+        notes.add_paragraph("1: primera nota")
+        notes.add_paragraph("1: segunda nota")
+        notes.add_paragraph("continuación sin clave")
+        notes_path = folder / "notas.docx"
+        notes.save(str(notes_path))
+        return str(main_path), str(notes_path)
+
+    def test_findings_are_structured_and_render_like_legacy_messages(self):
+        with TemporaryDirectory() as tmp_dir:
+            main_docx, notas_docx = self._build_bundle(Path(tmp_dir))
+            findings = collect_validation_findings(main_docx, notas_docx=notas_docx)
+            messages = validate_documents(main_docx, notas_docx=notas_docx)
+
+        self.assertEqual(
+            [finding.code for finding in findings],
+            ["unstyled_paragraph"] * 7 + ["note_format", "multiple_notes_verse", "laguna"],
+        )
+        unstyled = findings[0]
+        self.assertEqual((unstyled.paragraph_index, unstyled.verse_number), (4, 1))
+        self.assertEqual(unstyled.snippet, "línea sin estilo 0")
+        self.assertEqual(unstyled.category, "Estilos")
+        self.assertEqual(findings[7].file, notas_docx)
+        self.assertEqual(findings[7].paragraph_index, 2)
+        self.assertEqual(findings[8].get("count"), 2)
+        self.assertEqual(findings[9].paragraph_index, 11)
+        self.assertEqual(count_findings_by_severity(findings), {"error": 8, "warning": 2})
+
+        # Los siete párrafos sin estilo forman un único aviso resumido
+        self.assertEqual(len(group_findings(findings)), 4)
+        self.assertEqual(messages, render_findings(findings))
+        self.assertTrue(messages[0].startswith("❌ LÍNEAS SIN ESTILO DETECTADAS (7)"))
+        self.assertEqual(messages[1], "   1. «línea sin estilo 0» (después del verso 1)")
+        self.assertEqual(messages[6], "   ... y 2 líneas más")
+        self.assertIn("(notas, párrafo 3)", messages[7])
+
+    def test_export_to_json_and_csv(self):
+        with TemporaryDirectory() as tmp_dir:
+            main_docx, notas_docx = self._build_bundle(Path(tmp_dir))
+            findings = collect_validation_findings(main_docx, notas_docx=notas_docx)
+            json_path = Path(tmp_dir) / "avisos.json"
+            csv_path = Path(tmp_dir) / "avisos.csv"
+            export_findings_json(findings, json_path)
+            export_findings_csv(findings, csv_path)
+
+            exported = json.loads(json_path.read_text(encoding="utf-8"))
+            with open(csv_path, encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(exported), len(findings))
+        self.assertEqual(exported[-1]["code"], "laguna")
+        self.assertEqual(exported[-1]["context"], {"total_verses": 1})
+        self.assertEqual(len(rows), len(findings))
+        self.assertEqual(rows[8]["category"], "Notas múltiples por verso")
+        self.assertEqual(json.loads(rows[8]["context"])["key"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from tei_backend import ValidationFinding  # noqa: E402
+from validation_view import ValidationResultsModel, locate_in_tei  # noqa: E402
+
+
+def unstyled(index: int) -> ValidationFinding:
+    return ValidationFinding("unstyled_paragraph", "error", "comedia.docx", index, None, f"línea {index}")
+
+
+class ValidationResultsModelTest(unittest.TestCase):
+    def setUp(self):
+        self.findings = [
+            ValidationFinding("invalid_style", "error", "comedia.docx", 3, None, "texto raro", {"style": "Raro"}),
+            *[unstyled(index) for index in range(10, 5010)],
+            ValidationFinding("laguna", "warning", "comedia.docx", 6000, 120, "[...]", {"total_verses": 300}),
+        ]
+
+    def test_filters_update_rows_without_rendering(self):
+        model = ValidationResultsModel(self.findings, hidden=["Lagunas"])
+
+        self.assertEqual(model.categories, ["Estilos", "Lagunas"])
+        self.assertEqual(len(model), 5001)
+        model.set_category_visible("Lagunas", True)
+        self.assertEqual(len(model), 5002)
+        self.assertEqual(model.finding(5001).code, "laguna")
+        model.set_category_visible("Estilos", False)
+        self.assertEqual(model.rows, [5001])
+        model.set_category_visible("Estilos", True)
+        self.assertEqual(model.rows, list(range(5002)))
+        self.assertEqual(model._details, {})
+
+    def test_rows_render_on_demand(self):
+        model = ValidationResultsModel(self.findings)
+
+        self.assertEqual(model.summary(2), "❌ Estilos · párrafo 12 · «línea 11»")
+        self.assertEqual(model.summary(5001), "⚠️ Lagunas · verso 120 · «[...]»")
+        self.assertTrue(model.details(2).startswith("❌ LÍNEAS SIN ESTILO DETECTADAS (5000)"))
+        self.assertEqual(len(model._details), 1)
+        model.details(3)
+        self.assertEqual(len(model._details), 1)
+
+    def test_locate_in_tei(self):
+        tei = '<sp><l n="119">uno</l>\n<l part="I" n="120">dos &amp; tres</l></sp>'
+
+        self.assertEqual(locate_in_tei(tei, self.findings[-1]), tei.index('<l part="I" n="120"'))
+        by_text = ValidationFinding("invalid_style", "error", "comedia.docx", 8, None, "dos & tres")
+        self.assertEqual(locate_in_tei(tei, by_text), tei.index("dos &amp;"))
+        self.assertIsNone(locate_in_tei(tei, ValidationFinding("invalid_style", "error", snippet="no está")))
+
+
+if __name__ == "__main__":
+    unittest.main()
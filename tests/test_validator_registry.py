@@ -0,0 +1,85 @@
+import io
+import json
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "app"))
+
+from cli import EXIT_OK, main  # noqa: E402
+from tei_backend import (  # noqa: E402
+    VALIDATORS,
+    ValidationFinding,
+    register_validator,
+    run_validators,
+    select_validators,
+)
+
+TEST_DIR = REPO_ROOT / "test"
+MAIN_DOCX = str(TEST_DIR / "laberinto" / "test_laberinto_prologoycomedia.docx")
+NOTAS_DOCX = str(TEST_DIR / "laberinto" / "test_laberinto_notas.docx")
+APARATO_DOCX = str(TEST_DIR / "laberinto" / "test_laberinto_aparato.docx")
+
+
+class ValidatorRegistryTest(unittest.TestCase):
+    def test_presets_and_unknown_names(self):
+        self.assertEqual([v.name for v in select_validators(["fast"])],
+                         ["estilos", "texto_principal", "versos_partidos", "lagunas", "corchetes"])
+        self.assertEqual(select_validators(["full"]), list(VALIDATORS.values()))
+        self.assertEqual([v.name for v in select_validators(["notas", "estilos"])], ["estilos", "notas"])
+        with self.assertRaises(ValueError):
+            select_validators(["ortografia"])
+
+    def test_concurrent_run_keeps_order_and_times_each_check(self):
+        sequential = run_validators(MAIN_DOCX, APARATO_DOCX, NOTAS_DOCX)
+        concurrent = run_validators(MAIN_DOCX, APARATO_DOCX, NOTAS_DOCX, workers=4)
+
+        self.assertTrue(sequential.findings)
+        self.assertEqual(concurrent.findings, sequential.findings)
+        self.assertEqual(list(concurrent.check_seconds), list(VALIDATORS))
+
+        fast = run_validators(MAIN_DOCX, APARATO_DOCX, NOTAS_DOCX, checks=["fast"])
+        self.assertNotIn("notas", fast.check_seconds)
+        self.assertEqual(
+            fast.findings,
+            [f for f in sequential.findings if f.category not in ("Formato de notas", "Notas vacías")
+             and not f.code.startswith("multiple_notes")],
+        )
+
+    def test_missing_note_file_takes_the_place_of_its_check(self):
+        missing = str(TEST_DIR / "no_existe_notas.docx")
+        run = run_validators(MAIN_DOCX, None, missing, checks=["estilos", "notas", "lagunas"])
+
+        self.assertNotIn("notas", run.check_seconds)
+        codes = [finding.code for finding in run.findings]
+        self.assertEqual(codes.count("missing_file"), 1)
+        self.assertEqual(run.findings[codes.index("missing_file")].get("role"), "notas")
+
+    def test_registered_check_receives_shared_data(self):
+        @register_validator("prueba_versos", ("verse_map",))
+        def count_verses(data):
+            return [ValidationFinding("laguna", "warning", data.main_docx, context={"total": data.verse_map.total_verses})]
+
+        try:
+            run = run_validators(MAIN_DOCX, checks=["prueba_versos"])
+        finally:
+            del VALIDATORS["prueba_versos"]
+
+        self.assertEqual(list(run.check_seconds), ["prueba_versos"])
+        self.assertGreater(run.findings[0].get("total"), 0)
+
+    def test_cli_selects_checks_and_reports_their_times(self):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            code = main(["validate", MAIN_DOCX, "--notas", NOTAS_DOCX, "--checks", "estilos,lagunas", "--json"])
+        report = json.loads(buffer.getvalue())
+
+        self.assertIn(code, (EXIT_OK, 1))
+        self.assertEqual(list(report["timings"]["check_seconds"]), ["estilos", "lagunas"])
+
+
+if __name__ == "__main__":
+    unittest.main()